@@ -60,10 +60,13 @@ def create_app(config_name='default'):
     # 로깅 설정
     setup_logging(app)
     
-    # DB 로그 핸들러 활성화 (모든 로그를 DB에 저장)
+    # DB 로그 핸들러 활성화 (모든 로그를 로그 전용 DB에 저장)
     try:
         from app.services.db_log_handler import setup_db_logging
-        db_handler = setup_db_logging(db_path='instance/gym_system.db')
+        db_handler = setup_db_logging(
+            db_path='instance/gym_logs.db',
+            legacy_db_path='instance/gym_system.db'
+        )
         # Flask 앱 로거에도 추가
         if db_handler:
             app.logger.addHandler(db_handler)
@@ -80,6 +83,9 @@ def create_app(config_name='default'):
     socketio.init_app(app, cors_allowed_origins="*", async_mode=async_mode)
     app.logger.info(f"🧵 SocketIO async_mode={async_mode}")
     
+    # 서비스 컨테이너 (Locker/Member/NFC 서비스를 앱 시작 시 1회 생성)
+    setup_services(app)
+    
     # 블루프린트 등록
     register_blueprints(app)
     
@@ -106,6 +112,22 @@ def create_app(config_name='default'):
     return app
 
 
+def setup_services(app):
+    """앱 스코프 서비스 컨테이너 등록"""
+    from app.services.service_container import init_services
+    container = init_services(app)
+    
+    if container:
+        def publish_transaction_timeout(transaction):
+            """트랜잭션 만료 이벤트를 키오스크 화면에 전달"""
+            socketio.emit('transaction_event', {
+                'event_type': 'transaction_timeout',
+                'data': transaction
+            })
+        
+        container.tx_manager.add_expiry_listener(publish_transaction_timeout)
+
+
 def setup_shutdown_hook(app):
     """Flask 종료 시 DB 체크포인트 실행"""
     import atexit
@@ -114,6 +136,22 @@ def setup_shutdown_hook(app):
     def cleanup_on_exit():
         """앱 종료 시 정리 작업"""
         try:
+            # 대기 중인 쓰기 커밋 후 writer 스레드 종료
+            from database.write_queue import close_all_write_queues
+            close_all_write_queues()
+            
+            # 남은 로그 저장 후 로그 DB 종료
+            from app.services.db_log_handler import get_db_handler
+            from database.log_store import close_all_log_stores
+            db_handler = get_db_handler()
+            if db_handler:
+                db_handler.flush()
+            close_all_log_stores()
+            
+            # 커넥션 풀 정리 (유휴 커넥션 종료)
+            from database.connection_pool import close_all_pools
+            close_all_pools(checkpoint=False)
+            
             # WAL 체크포인트 실행
             db_path = 'instance/gym_system.db'
             conn = sqlite3.connect(db_path, timeout=5.0)
@@ -230,6 +268,20 @@ def setup_esp32_connection(app):
             manager = loop.run_until_complete(create_auto_esp32_manager())
             app.esp32_manager = manager
             
+            # 현장 문제 재현용 시리얼 캡처 (ESP32_CAPTURE_PATH가 있을 때만)
+            capture_path = os.environ.get("ESP32_CAPTURE_PATH")
+            if capture_path:
+                manager.start_capture(
+                    capture_path,
+                    max_bytes=int(os.environ.get("ESP32_CAPTURE_MAX_MB", "10")) * 1024 * 1024,
+                    backups=int(os.environ.get("ESP32_CAPTURE_BACKUPS", "5")),
+                )
+            
+            # 서비스 컨테이너에 실제 ESP32 매니저 주입
+            services = getattr(app, 'services', None)
+            if services:
+                services.attach_esp32_manager(manager)
+            
             app.logger.info("✅ ESP32 연결 완료")
             
             # 이벤트 핸들러 등록
@@ -251,9 +303,14 @@ def setup_esp32_connection(app):
 
 
 def setup_esp32_event_handlers(app, esp32_manager):
-    """ESP32 이벤트 핸들러 설정"""
+    """ESP32 이벤트 핸들러 설정
+
+    핸들러는 블로킹 작업(DB, 큐, socketio)을 하므로 동기 함수로 두고
+    ESP32Manager의 핸들러 스레드 풀에서 실행한다 (같은 센서의 이벤트는 순서대로).
+    센서 트랜잭션 처리는 add_sensor_event가 서비스 컨테이너의 센서 이벤트 워커로 넘긴다.
+    """
     
-    async def handle_barcode_scanned(event_data):
+    def handle_barcode_scanned(event_data):
         """바코드 스캔 이벤트 처리 - 폴링 방식"""
         barcode = event_data.get("barcode", "")
         device_id = event_data.get("device_id", "unknown")
@@ -276,36 +333,30 @@ def setup_esp32_event_handlers(app, esp32_manager):
         except Exception as e:
             app.logger.error(f"❌ 바코드 큐 추가 오류: {e}")
     
-    # 하드코딩 센서 매핑 (DB 폴백용)
-    # (addr, chip_idx, pin) → sensor_num
-    HARDCODED_SENSOR_MAPPING = {
-        # addr=0x26, Chip0 → 교직원 (S01-S10)
-        ("0x26", 0, 1): 1, ("0x26", 0, 0): 2, ("0x26", 0, 6): 3, ("0x26", 0, 5): 4,
-        ("0x26", 0, 4): 5, ("0x26", 0, 3): 6, ("0x26", 0, 2): 7, ("0x26", 0, 9): 8,
-        ("0x26", 0, 8): 9, ("0x26", 0, 7): 10,
-        # addr=0x23, Chip0 → 남성 (M01-M10)
-        ("0x23", 0, 1): 11, ("0x23", 0, 2): 12, ("0x23", 0, 0): 13, ("0x23", 0, 6): 14,
-        ("0x23", 0, 5): 15, ("0x23", 0, 3): 16, ("0x23", 0, 4): 17, ("0x23", 0, 9): 18,
-        ("0x23", 0, 7): 19, ("0x23", 0, 8): 20,
-        # addr=0x25, Chip1 → 남성 (M11-M20)
-        ("0x25", 1, 0): 21, ("0x25", 1, 3): 22, ("0x25", 1, 1): 23, ("0x25", 1, 2): 24,
-        ("0x25", 1, 5): 25, ("0x25", 1, 7): 26, ("0x25", 1, 4): 27, ("0x25", 1, 6): 28,
-        ("0x25", 1, 8): 29, ("0x25", 1, 9): 30,
-        # addr=0x26, Chip2 → 남성 (M21-M30, M34-M35, M38-M40)
-        ("0x26", 2, 5): 31, ("0x26", 2, 6): 32, ("0x26", 2, 7): 33, ("0x26", 2, 10): 34,
-        ("0x26", 2, 11): 35, ("0x26", 2, 9): 36, ("0x26", 2, 8): 37, ("0x26", 2, 14): 38,
-        ("0x26", 2, 13): 39, ("0x26", 2, 12): 40, ("0x26", 2, 0): 44, ("0x26", 2, 1): 45,
-        ("0x26", 2, 3): 48, ("0x26", 2, 2): 49, ("0x26", 2, 4): 50,
-        # addr=0x24, Chip1 → 남성 (M31-M33, M36-M37)
-        ("0x24", 1, 9): 41, ("0x24", 1, 7): 42, ("0x24", 1, 8): 43,
-        ("0x24", 1, 6): 46, ("0x24", 1, 5): 47,
-        # addr=0x27, Chip3 → 여성 (F01-F10)
-        ("0x27", 3, 0): 51, ("0x27", 3, 1): 52, ("0x27", 3, 3): 53, ("0x27", 3, 2): 54,
-        ("0x27", 3, 4): 55, ("0x27", 3, 5): 56, ("0x27", 3, 6): 57, ("0x27", 3, 8): 58,
-        ("0x27", 3, 7): 59, ("0x27", 3, 9): 60,
-    }
-    
-    async def handle_sensor_triggered(event_data):
+    # 센서 매핑 인덱스 (서비스 컨테이너가 없을 때는 기본 매핑만 사용)
+    from database import SensorMap
+    services = getattr(app, 'services', None)
+    sensor_map = services.sensor_map if services else SensorMap()
+    
+    # 센서 디바운스 window (system_settings에서 매 버스트 시작 때 조회, 캐시 조회라 DB 읽기 없음)
+    # sensor_debounce_ms: 기본 window, sensor_debounce_overrides: {"센서번호" 또는 "락카ID": ms}
+    settings_db = services.db if services else None
+    
+    def sensor_debounce_window(event_data):
+        if settings_db is None:
+            return None
+        overrides = settings_db.get_system_setting('sensor_debounce_overrides', None)
+        if overrides:
+            sensor_num, locker_id = sensor_map.resolve(
+                event_data.get("addr"), event_data.get("chip_idx"), event_data.get("pin"))
+            for key in (str(sensor_num), locker_id):
+                if key in overrides:
+                    return float(overrides[key])
+        return settings_db.get_system_setting('sensor_debounce_ms', None)
+    
+    esp32_manager.sensor_debouncer.configure(window_for=sensor_debounce_window)
+    
+    def handle_sensor_triggered(event_data):
         """센서 이벤트 처리"""
         app.logger.info(f"🔥 [DEBUG] 센서 이벤트 핸들러 호출됨! event_data: {event_data}")
         
@@ -317,25 +368,10 @@ def setup_esp32_event_handlers(app, esp32_manager):
         
         app.logger.info(f"📡 센서: Chip{chip_idx} Addr{addr} Pin{pin} = {raw_state} ({'ACTIVE' if active else 'INACTIVE'})")
         
-        # DB에서 센서 번호 조회 (DB 우선, 실패 시 하드코딩 폴백)
-        sensor_num = None
-        try:
-            from database.database_manager import DatabaseManager
-            db_manager = DatabaseManager()
-            if db_manager.connect():
-                sensor_num = db_manager.get_sensor_num_from_hardware(addr, chip_idx, pin)
-                if sensor_num:
-                    app.logger.info(f"🔍 DB 매핑: addr={addr}, chip={chip_idx}, pin={pin} → sensor_num={sensor_num}")
-        except Exception as db_error:
-            app.logger.warning(f"⚠️ DB 센서 조회 오류: {db_error}")
-        
-        # DB에 없으면 하드코딩 폴백
+        # 메모리 매핑 인덱스에서 센서 번호/락카 조회 (파일/DB 읽기 없음)
+        sensor_num, locker_id = sensor_map.resolve(addr, chip_idx, pin)
         if sensor_num is None:
-            sensor_num = HARDCODED_SENSOR_MAPPING.get((addr, chip_idx, pin))
-            if sensor_num:
-                app.logger.info(f"🔄 하드코딩 폴백: addr={addr}, chip={chip_idx}, pin={pin} → sensor_num={sensor_num}")
-            else:
-                app.logger.warning(f"🔍 매핑되지 않은 핀: addr={addr}, chip={chip_idx}, pin={pin}")
+            app.logger.warning(f"🔍 매핑되지 않은 핀: addr={addr}, chip={chip_idx}, pin={pin}")
         
         app.logger.info(f"🔥 [DEBUG] 핀 {pin} -> 센서 {sensor_num} 매핑")
         
@@ -343,7 +379,7 @@ def setup_esp32_event_handlers(app, esp32_manager):
             # 센서 이벤트 저장 (API에서 사용) - Flask 컨텍스트에서 실행
             from app.api.routes import add_sensor_event
             with app.app_context():
-                add_sensor_event(sensor_num, raw_state)
+                add_sensor_event(sensor_num, raw_state, locker_id=locker_id)
             app.logger.info(f"🔥 [DEBUG] 센서 이벤트 저장됨: 센서{sensor_num}, 상태{raw_state}")
             
             # 센서 큐에 저장 (폴링용)
@@ -390,7 +426,25 @@ def setup_esp32_event_handlers(app, esp32_manager):
             }
         })
     
-    async def handle_nfc_scanned(event_data):
+    def handle_sensor_snapshot(event_data):
+        """센서 스냅샷 처리: 매핑된 센서의 현재 상태를 한 번에 갱신
+        
+        놓친 엣지는 ESP32Manager가 스냅샷보다 먼저 sensor_triggered(reconciled)로 보낸다.
+        """
+        from app.api.routes import current_sensor_states
+        
+        updated = 0
+        for chip in event_data.get("chips", []):
+            mask = chip["mask"]
+            for pin, sensor_num in sensor_map.pins_for_chip(chip["addr"], chip["chip_idx"]).items():
+                if sensor_num in current_sensor_states:
+                    current_sensor_states[sensor_num] = 'HIGH' if mask >> pin & 1 else 'LOW'
+                    updated += 1
+        
+        app.logger.debug(f"📡 센서 스냅샷 #{event_data.get('seq')} ({event_data.get('trigger')}): "
+                         f"센서 {updated}개 상태 갱신")
+    
+    def handle_nfc_scanned(event_data):
         """NFC 스캔 이벤트 처리 - 폴링 방식"""
         nfc_uid = event_data.get("nfc_uid", "")
         device_id = event_data.get("device_id", "unknown")
@@ -414,7 +468,7 @@ def setup_esp32_event_handlers(app, esp32_manager):
         except Exception as e:
             app.logger.error(f"❌ NFC 큐 추가 오류: {e}")
     
-    async def handle_motor_completed(event_data):
+    def handle_motor_completed(event_data):
         """모터 완료 이벤트 처리"""
         action = event_data.get("action", "unknown")
         status = event_data.get("status", "unknown")
@@ -436,6 +490,7 @@ def setup_esp32_event_handlers(app, esp32_manager):
     esp32_manager.register_event_handler("barcode_scanned", handle_barcode_scanned)
     esp32_manager.register_event_handler("nfc_scanned", handle_nfc_scanned)
     esp32_manager.register_event_handler("sensor_triggered", handle_sensor_triggered)
+    esp32_manager.register_event_handler("sensor_snapshot", handle_sensor_snapshot)
     esp32_manager.register_event_handler("motor_completed", handle_motor_completed)
     
     app.logger.info("📡 ESP32 이벤트 핸들러 등록 완료")
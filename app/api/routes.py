@@ -4,10 +4,8 @@ REST API 엔드포인트
 
 from flask import jsonify, request, current_app
 from app.api import bp
-from app.services.locker_service import LockerService
-from app.services.member_service import MemberService
 from app.services.system_service import SystemService
-from app.services.barcode_service import BarcodeService
+from app.services.service_container import get_services
 import threading
 
 # 바코드 이벤트 큐 (WebSocket 대체)
@@ -29,6 +27,56 @@ def get_and_clear_last_barcode():
         return barcode
 
 
+# 문 닫기 전 손 끼임 방지 대기 (초)
+DOOR_CLOSE_DELAY = 3.0
+
+
+def _door_device_for_locker(locker_id: str) -> str:
+    """락커 구역에 맞는 ESP32 디바이스 ID"""
+    return 'esp32_staff' if locker_id.startswith('S') else 'esp32_male_female'
+
+
+def _schedule_door_close(locker_id: str):
+    """대여/반납 후 문 닫기 예약 (대기와 전송 모두 ESP32 통신 루프에서 처리)"""
+    esp32_manager = getattr(current_app, 'esp32_manager', None)
+    if not esp32_manager:
+        current_app.logger.warning('⚠️ ESP32 매니저 없음 - 문 닫기 건너뜀')
+        return
+
+    device_id = _door_device_for_locker(locker_id)
+    current_app.logger.info(f'🚪 문 닫기 예약: {locker_id} → {device_id} ({DOOR_CLOSE_DELAY:.0f}초 후)')
+    esp32_manager.client.log_result(
+        esp32_manager.client.send_command(device_id, "MOTOR_MOVE", delay=DOOR_CLOSE_DELAY, revs=-0.917, rpm=30),
+        f'🚪 문 닫기 ({locker_id})', current_app.logger
+    )
+
+
+def _move_all_doors(esp32_manager, revs: float, label: str):
+    """양쪽 ESP32에 모터 명령을 동시에 보내고 응답까지 대기
+
+    Returns:
+        (디바이스별 결과 문자열, 디바이스별 ack 요약)
+    """
+    device_ids = ["esp32_staff", "esp32_male_female"]
+    futures = {
+        device_id: esp32_manager.client.send_command(device_id, "MOTOR_MOVE", timeout=5.0, revs=revs, rpm=30)
+        for device_id in device_ids
+    }
+
+    results = {}
+    acks = {}
+    for device_id, future in futures.items():
+        try:
+            ack = future.result(timeout=10.0)
+            results[device_id] = "성공" if ack.ok else f"실패 ({ack.status})"
+            acks[device_id] = {'cmd_id': ack.cmd_id, 'status': ack.status, 'rtt_ms': ack.rtt_ms}
+            current_app.logger.info(f'{label} 명령: {device_id} - {ack.status}, rtt={ack.rtt_ms}ms')
+        except Exception as cmd_error:
+            results[device_id] = f"오류: {str(cmd_error)}"
+            current_app.logger.error(f'{label} 명령 전송 실패: {device_id}, {cmd_error}')
+    return results, acks
+
+
 @bp.route('/health')
 def health_check():
     """헬스 체크"""
@@ -55,7 +103,7 @@ def get_member_by_nfc(nfc_uid):
         실패: {status: "error", message, ...}
     """
     try:
-        locker_service = LockerService()
+        locker_service = get_services().locker_service
         
         # 1단계: NFC UID로 락카 번호 찾기
         cursor = locker_service.db.execute_query("""
@@ -158,7 +206,7 @@ def get_member_by_locker(locker_number):
         실패: {status: "error", message, ...}
     """
     try:
-        locker_service = LockerService()
+        locker_service = get_services().locker_service
         
         # DB에서 락카 상태 및 대여 정보 조회
         cursor = locker_service.db.execute_query("""
@@ -384,8 +432,7 @@ def clear_sensor_queue():
 def get_locker_by_sensor(sensor_num):
     """센서 번호로 락커 ID 조회"""
     try:
-        from app.services.locker_service import LockerService
-        locker_service = LockerService()
+        locker_service = get_services().locker_service
         
         locker_id = locker_service.get_locker_id_by_sensor(sensor_num)
         
@@ -439,28 +486,11 @@ def open_locker_door():
             device_id = 'esp32_male_female'
         
         try:
-            # 백그라운드 스레드에서 비동기 명령 실행
-            import threading
-            from flask import copy_current_request_context
-            
-            @copy_current_request_context
-            def send_motor_command():
-                import asyncio
-                try:
-                    # 새로운 이벤트 루프 생성
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    loop.run_until_complete(
-                        esp32_manager.send_command(device_id, "MOTOR_MOVE", revs=0.917, rpm=30)
-                    )
-                    loop.close()
-                    current_app.logger.info(f'🔓 모터 명령 실행 완료: {device_id}')
-                except Exception as e:
-                    current_app.logger.warning(f'모터 명령 실행 오류: {e}')
-            
-            # 백그라운드 스레드로 실행
-            thread = threading.Thread(target=send_motor_command, daemon=True)
-            thread.start()
+            # ESP32 통신 루프로 명령 전달 (응답은 기다리지 않음)
+            esp32_manager.client.log_result(
+                esp32_manager.client.send_command(device_id, "MOTOR_MOVE", revs=0.917, rpm=30),
+                f'🔓 모터 명령 ({zone})', current_app.logger
+            )
             
             t_end = time.time()
             current_app.logger.info(f'⏱️ [PERF-DOOR] ✅ 문 열기 명령 전송 완료: {(t_end - t_start)*1000:.2f}ms | 구역: {zone}')
@@ -571,9 +601,6 @@ def inject_barcode():
 def test_motor():
     """테스트용: 모터 직접 제어"""
     try:
-        import threading
-        from flask import copy_current_request_context
-        
         data = request.get_json()
         revs = data.get('revs', -0.917)  # 기본값: 닫기
         rpm = data.get('rpm', 30)
@@ -586,22 +613,11 @@ def test_motor():
                 'error': 'ESP32 매니저 없음'
             }), 500
         
-        @copy_current_request_context
-        def send_motor_command():
-            import asyncio
-            try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                loop.run_until_complete(
-                    esp32_manager.send_command("esp32_auto_0", "MOTOR_MOVE", revs=revs, rpm=rpm)
-                )
-                loop.close()
-                current_app.logger.info(f'🔧 모터 명령 실행: revs={revs}, rpm={rpm}')
-            except Exception as e:
-                current_app.logger.warning(f'모터 명령 오류: {e}')
-        
-        thread = threading.Thread(target=send_motor_command, daemon=True)
-        thread.start()
+        # ESP32 통신 루프로 명령 전달 (응답은 기다리지 않음)
+        esp32_manager.client.log_result(
+            esp32_manager.client.send_command("esp32_auto_0", "MOTOR_MOVE", revs=revs, rpm=rpm),
+            f'🔧 모터 명령 revs={revs}, rpm={rpm}', current_app.logger
+        )
         
         return jsonify({
             'success': True,
@@ -618,7 +634,7 @@ def test_motor():
 
 @bp.route('/test/inject-sensor', methods=['POST'])
 def inject_sensor():
-    """테스트용: 센서 큐에 직접 데이터 주입"""
+    """테스트용: 센서 큐에 직접 데이터 주입 (트랜잭션 연동은 센서 이벤트 워커로)"""
     try:
         import queue
         import time
@@ -643,6 +659,7 @@ def inject_sensor():
                 'active': (state == 'LOW'),
                 'timestamp': time.time()
             }
+            add_sensor_event(sensor_num, state, sensor_data['timestamp'])
             try:
                 sensor_queue.put_nowait(sensor_data)
                 current_app.logger.info(f"🧪 테스트: 센서 큐에 주입됨 - 센서{sensor_num}, 상태{state}")
@@ -693,7 +710,7 @@ def process_barcode():
         
         # 바코드 처리
         t_service_start = time.time()
-        barcode_service = BarcodeService()
+        barcode_service = get_services().barcode_service
         result = barcode_service.process_barcode(barcode)
         t_service_end = time.time()
         
@@ -728,13 +745,15 @@ def _capture_auth_photo(member_id: str, auth_method: str):
     """
     import threading
     
+    # 백그라운드 스레드에는 앱 컨텍스트가 없으므로 요청 중에 공유 DB 매니저를 잡아 둠
+    db = get_services().db
+    
     def capture_async():
         try:
             from app.services.camera_service import get_camera_service
             from app.services.drive_service import get_drive_service
             from datetime import datetime
             from pathlib import Path
-            from database.database_manager import DatabaseManager
             
             camera_service = get_camera_service()
             
@@ -753,9 +772,6 @@ def _capture_auth_photo(member_id: str, auth_method: str):
             
             if saved_path:
                 # DB에 로컬 경로 먼저 업데이트 + rental_id 가져오기
-                db = DatabaseManager('instance/gym_system.db')
-                db.connect()
-                
                 db.execute_query("""
                     UPDATE rentals 
                     SET rental_photo_path = ?, auth_method = ?
@@ -772,8 +788,6 @@ def _capture_auth_photo(member_id: str, auth_method: str):
                 rental_id_row = cursor.fetchone() if cursor else None
                 rental_id = rental_id_row[0] if rental_id_row else None
                 
-                db.close()
-                
                 import logging
                 bg_logger = logging.getLogger(__name__)
                 bg_logger.info(f'📸 인증 사진 촬영: {saved_path} (rental_id: {rental_id})')
@@ -787,14 +801,11 @@ def _capture_auth_photo(member_id: str, auth_method: str):
                                 logger = logging.getLogger(__name__)
                                 
                                 # 1. DB에 URL 저장
-                                db2 = DatabaseManager('instance/gym_system.db')
-                                db2.connect()
-                                db2.execute_query("""
+                                db.execute_query("""
                                     UPDATE rentals 
                                     SET rental_photo_url = ?
                                     WHERE rental_photo_path = ?
                                 """, (drive_url, s_path))
-                                db2.close()
                                 
                                 logger.info(f'☁️ 드라이브 업로드 완료: {drive_url}')
                                 
@@ -805,19 +816,15 @@ def _capture_auth_photo(member_id: str, auth_method: str):
                                         sheets = SheetsSync()
                                         if sheets.connect():
                                             # db_manager 전달하여 행 없으면 추가
-                                            db3 = DatabaseManager('instance/gym_system.db')
-                                            db3.connect()
-                                            
                                             # 🆕 rental_id 상태 확인하여 대여/반납 구분
-                                            cursor = db3.execute_query("SELECT status FROM rentals WHERE rental_id = ?", (r_id,))
+                                            cursor = db.execute_query("SELECT status FROM rentals WHERE rental_id = ?", (r_id,))
                                             status_row = cursor.fetchone() if cursor else None
                                             rental_status = status_row[0] if status_row else 'unknown'
                                             
                                             # 반납 완료 상태면 'return', 그 외에는 'rental'
                                             record_type = 'return' if rental_status == 'returned' else 'rental'
                                             
-                                            sheets.update_rental_photo(r_id, s_path, drive_url, db3, record_type)
-                                            db3.close()
+                                            sheets.update_rental_photo(r_id, s_path, drive_url, db, record_type)
                                             logger.info(f'📊 구글시트 업데이트 완료 (rental_id: {r_id}, type: {record_type})')
                                     except Exception as sync_error:
                                         logger.warning(f'구글시트 업데이트 오류 (무시): {sync_error}')
@@ -825,6 +832,8 @@ def _capture_auth_photo(member_id: str, auth_method: str):
                             except Exception as e:
                                 import logging
                                 logging.getLogger(__name__).warning(f'드라이브 URL 저장 오류: {e}')
+                            finally:
+                                db.release_thread_connection()
                     return upload_callback
                 
                 drive_service = get_drive_service()
@@ -836,6 +845,8 @@ def _capture_auth_photo(member_id: str, auth_method: str):
             # 사진 촬영 실패는 치명적이지 않음 - 로그만 남김
             import logging
             logging.getLogger(__name__).warning(f'인증 사진 촬영 오류: {e}')
+        finally:
+            db.release_thread_connection()
     
     # 비동기로 실행 (메인 응답 지연 방지)
     thread = threading.Thread(target=capture_async, daemon=True)
@@ -858,7 +869,7 @@ def process_rental():
                 'error': '필수 데이터가 누락되었습니다.'
             }), 400
         
-        locker_service = LockerService()
+        locker_service = get_services().locker_service
         
         if action == 'rental':
             # 간단한 대여 완료 처리 (문은 이미 열려있음)
@@ -944,46 +955,8 @@ def process_rental():
                     threading.Thread(target=async_update_rental_status, daemon=True).start()
                     current_app.logger.info(f'📊 구글시트 백그라운드 업데이트 시작: rental_id={rental_id_for_sync}, locker={locker_id}')
                 
-                # 🆕 문 닫기 로직 추가 (백그라운드 스레드)
-                import threading
-                from flask import copy_current_request_context
-                
-                @copy_current_request_context
-                def close_door_async():
-                    import asyncio
-                    import time
-                    
-                    # 3초 대기 (손 끼임 방지)
-                    current_app.logger.info(f'⏳ 손 끼임 방지 대기 중... (3초)')
-                    time.sleep(3)
-                    
-                    # locker_id에서 zone 판단하여 device_id 선택
-                    if locker_id.startswith('S'):
-                        device_id = 'esp32_staff'
-                    else:  # M or F
-                        device_id = 'esp32_male_female'
-                    
-                    # ESP32로 문 닫기 명령
-                    esp32_manager = getattr(current_app, 'esp32_manager', None)
-                    if esp32_manager:
-                        try:
-                            current_app.logger.info(f'🚪 문 닫기 명령 전송: {locker_id} → {device_id}')
-                            loop = asyncio.new_event_loop()
-                            asyncio.set_event_loop(loop)
-                            loop.run_until_complete(
-                                esp32_manager.send_command(device_id, "MOTOR_MOVE", revs=-0.917, rpm=30)
-                            )
-                            loop.close()
-                            current_app.logger.info(f'✅ 문 닫기 완료: {locker_id}')
-                        except Exception as e:
-                            current_app.logger.error(f'❌ 문 닫기 오류: {e}')
-                    else:
-                        current_app.logger.warning(f'⚠️ ESP32 매니저 없음 - 문 닫기 건너뜀')
-                
-                # 백그라운드 스레드로 문 닫기 실행
-                thread = threading.Thread(target=close_door_async, daemon=True)
-                thread.start()
-                current_app.logger.info(f'🔄 문 닫기 스레드 시작됨')
+                # 🆕 문 닫기 (3초 손 끼임 방지 대기는 ESP32 통신 루프에서)
+                _schedule_door_close(locker_id)
                 
                 result = {
                     'success': True,
@@ -1136,46 +1109,8 @@ def process_rental():
                         threading.Thread(target=async_append_return_record, daemon=True).start()
                         current_app.logger.info(f'📊 구글시트 반납 기록 백그라운드 업로드 시작: rental_id={rental_id_for_sync}')
                         
-                        # 🆕 문 닫기 로직 추가 (백그라운드 스레드)
-                        import threading
-                        from flask import copy_current_request_context
-                        
-                        @copy_current_request_context
-                        def close_door_async():
-                            import asyncio
-                            import time
-                            
-                            # 3초 대기 (손 끼임 방지)
-                            current_app.logger.info(f'⏳ 손 끼임 방지 대기 중... (3초)')
-                            time.sleep(3)
-                            
-                            # target_locker에서 zone 판단하여 device_id 선택
-                            if target_locker.startswith('S'):
-                                device_id = 'esp32_staff'
-                            else:  # M or F
-                                device_id = 'esp32_male_female'
-                            
-                            # ESP32로 문 닫기 명령
-                            esp32_manager = getattr(current_app, 'esp32_manager', None)
-                            if esp32_manager:
-                                try:
-                                    current_app.logger.info(f'🚪 문 닫기 명령 전송: {target_locker} → {device_id}')
-                                    loop = asyncio.new_event_loop()
-                                    asyncio.set_event_loop(loop)
-                                    loop.run_until_complete(
-                                        esp32_manager.send_command(device_id, "MOTOR_MOVE", revs=-0.917, rpm=30)
-                                    )
-                                    loop.close()
-                                    current_app.logger.info(f'✅ 문 닫기 완료: {target_locker}')
-                                except Exception as e:
-                                    current_app.logger.error(f'❌ 문 닫기 오류: {e}')
-                            else:
-                                current_app.logger.warning(f'⚠️ ESP32 매니저 없음 - 문 닫기 건너뜀')
-                        
-                        # 백그라운드 스레드로 문 닫기 실행
-                        thread = threading.Thread(target=close_door_async, daemon=True)
-                        thread.start()
-                        current_app.logger.info(f'🔄 문 닫기 스레드 시작됨')
+                        # 🆕 문 닫기 (3초 손 끼임 방지 대기는 ESP32 통신 루프에서)
+                        _schedule_door_close(target_locker)
                         
                         result = {
                             'success': True,
@@ -1223,7 +1158,7 @@ def record_timeout():
                 'error': '회원 ID가 필요합니다.'
             }), 400
         
-        locker_service = LockerService()
+        locker_service = get_services().locker_service
         
         # 최근 대여 기록 조회 (pending 또는 active 상태, 1시간 이내)
         from datetime import datetime, timedelta
@@ -1316,7 +1251,7 @@ def log_sensor_event():
                 'error': 'locker_id와 state가 필요합니다.'
             }), 400
         
-        locker_service = LockerService()
+        locker_service = get_services().locker_service
         
         # 현재 진행 중인 대여 기록 조회 (pending 또는 active)
         rental_id = None
@@ -1374,7 +1309,7 @@ def log_sensor_event():
 def get_member(member_id):
     """회원 정보 조회"""
     try:
-        member_service = MemberService()
+        member_service = get_services().member_service
         member = member_service.get_member(member_id)
         
         if member:
@@ -1400,8 +1335,7 @@ def get_member(member_id):
 def get_member_zones(member_id):
     """회원의 접근 가능한 락커 구역 조회"""
     try:
-        from app.services.member_service import MemberService
-        member_service = MemberService()
+        member_service = get_services().member_service
         member = member_service.get_member(member_id)
         
         if not member:
@@ -1450,12 +1384,11 @@ def get_lockers():
         status = request.args.get('status', 'all')  # available, occupied, all
         member_id = request.args.get('member_id')  # 회원 권한 체크용
         
-        locker_service = LockerService()
+        locker_service = get_services().locker_service
         
         # 회원 권한 체크가 필요한 경우
         if member_id:
-            from app.services.member_service import MemberService
-            member_service = MemberService()
+            member_service = get_services().member_service
             member = member_service.get_member(member_id)
             
             if member and not member.can_access_zone(zone):
@@ -1501,32 +1434,29 @@ def rent_locker(locker_id):
             }), 400
         
         # 새로운 트랜잭션 기반 LockerService 사용
-        locker_service = LockerService('instance/gym_system.db')
+        locker_service = get_services().locker_service
         
-        try:
-            # 비동기 메서드를 동기적으로 실행
-            import asyncio
-            result = asyncio.run(locker_service.rent_locker(locker_id, member_id))
-            
-            if result['success']:
-                return jsonify({
-                    'success': True,
-                    'transaction_id': result['transaction_id'],
-                    'locker_id': result['locker_id'],
-                    'member_id': result['member_id'],
-                    'member_name': result['member_name'],
-                    'step': result['step'],
-                    'message': result['message'],
-                    'timeout_seconds': result.get('timeout_seconds', 30)
-                })
-            else:
-                return jsonify({
-                    'success': False,
-                    'error': result['error'],
-                    'step': result.get('step', 'unknown')
-                }), 400
-        finally:
-            locker_service.close()
+        # 비동기 메서드를 동기적으로 실행
+        import asyncio
+        result = asyncio.run(locker_service.rent_locker(locker_id, member_id))
+        
+        if result['success']:
+            return jsonify({
+                'success': True,
+                'transaction_id': result['transaction_id'],
+                'locker_id': result['locker_id'],
+                'member_id': result['member_id'],
+                'member_name': result['member_name'],
+                'step': result['step'],
+                'message': result['message'],
+                'timeout_seconds': result.get('timeout_seconds', 30)
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'error': result['error'],
+                'step': result.get('step', 'unknown')
+            }), 400
             
     except Exception as e:
         current_app.logger.error(f'락카 대여 오류: {e}')
@@ -1540,7 +1470,7 @@ def rent_locker(locker_id):
 def return_locker(locker_id):
     """락카 반납 (기존 방식)"""
     try:
-        locker_service = LockerService()
+        locker_service = get_services().locker_service
         result = locker_service.return_locker(locker_id)
         
         if result['success']:
@@ -1578,7 +1508,7 @@ def nfc_return():
         
         current_app.logger.info(f"🔖 NFC 반납 API 호출: UID={nfc_uid}")
         
-        barcode_service = BarcodeService()
+        barcode_service = get_services().barcode_service
         result = barcode_service.process_nfc_return(nfc_uid)
         
         if result['success']:
@@ -1618,8 +1548,7 @@ def nfc_validate():
                 'error': 'NFC UID가 필요합니다.'
             }), 400
         
-        from app.services.nfc_service import NFCService
-        nfc_service = NFCService()
+        nfc_service = get_services().nfc_service
         result = nfc_service.validate_nfc_uid(nfc_uid)
         
         # valid → success로 변환 (프론트엔드 호환)
@@ -1664,30 +1593,27 @@ def rent_locker_by_sensor(member_id):
             }), 400
         
         # 센서 기반 LockerService 사용
-        locker_service = LockerService('instance/gym_system.db')
+        locker_service = get_services().locker_service
         
-        try:
-            # 비동기 메서드를 동기적으로 실행
-            import asyncio
-            result = asyncio.run(locker_service.rent_locker_by_sensor(member_id))
-            
-            if result['success']:
-                return jsonify({
-                    'success': True,
-                    'transaction_id': result['transaction_id'],
-                    'locker_id': result['locker_id'],
-                    'member_id': result['member_id'],
-                    'step': result['step'],
-                    'message': result['message']
-                })
-            else:
-                return jsonify({
-                    'success': False,
-                    'error': result['error'],
-                    'step': result.get('step', 'unknown')
-                }), 400
-        finally:
-            locker_service.close()
+        # 비동기 메서드를 동기적으로 실행
+        import asyncio
+        result = asyncio.run(locker_service.rent_locker_by_sensor(member_id))
+        
+        if result['success']:
+            return jsonify({
+                'success': True,
+                'transaction_id': result['transaction_id'],
+                'locker_id': result['locker_id'],
+                'member_id': result['member_id'],
+                'step': result['step'],
+                'message': result['message']
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'error': result['error'],
+                'step': result.get('step', 'unknown')
+            }), 400
             
     except Exception as e:
         current_app.logger.error(f'센서 기반 락카 대여 오류: {e}')
@@ -1708,30 +1634,27 @@ def return_locker_by_sensor(member_id):
             }), 400
         
         # 센서 기반 LockerService 사용
-        locker_service = LockerService('instance/gym_system.db')
+        locker_service = get_services().locker_service
         
-        try:
-            # 비동기 메서드를 동기적으로 실행
-            import asyncio
-            result = asyncio.run(locker_service.return_locker_by_sensor(member_id))
-            
-            if result['success']:
-                return jsonify({
-                    'success': True,
-                    'transaction_id': result['transaction_id'],
-                    'locker_id': result['locker_id'],
-                    'member_id': result['member_id'],
-                    'step': result['step'],
-                    'message': result['message']
-                })
-            else:
-                return jsonify({
-                    'success': False,
-                    'error': result['error'],
-                    'step': result.get('step', 'unknown')
-                }), 400
-        finally:
-            locker_service.close()
+        # 비동기 메서드를 동기적으로 실행
+        import asyncio
+        result = asyncio.run(locker_service.return_locker_by_sensor(member_id))
+        
+        if result['success']:
+            return jsonify({
+                'success': True,
+                'transaction_id': result['transaction_id'],
+                'locker_id': result['locker_id'],
+                'member_id': result['member_id'],
+                'step': result['step'],
+                'message': result['message']
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'error': result['error'],
+                'step': result.get('step', 'unknown')
+            }), 400
             
     except Exception as e:
         current_app.logger.error(f'센서 기반 락카 반납 오류: {e}')
@@ -1745,28 +1668,20 @@ def return_locker_by_sensor(member_id):
 def get_transaction_status(transaction_id):
     """트랜잭션 상태 조회"""
     try:
-        from database import TransactionManager, DatabaseManager
-        
-        db = DatabaseManager('instance/gym_system.db')
-        db.connect()
-        tx_manager = TransactionManager(db)
+        import asyncio
+        tx_manager = get_services().tx_manager
+        status = asyncio.run(tx_manager.get_transaction_status(transaction_id))
         
-        try:
-            import asyncio
-            status = asyncio.run(tx_manager.get_transaction_status(transaction_id))
-            
-            if status:
-                return jsonify({
-                    'success': True,
-                    'transaction': status
-                })
-            else:
-                return jsonify({
-                    'success': False,
-                    'error': '트랜잭션을 찾을 수 없습니다.'
-                }), 404
-        finally:
-            db.close()
+        if status:
+            return jsonify({
+                'success': True,
+                'transaction': status
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'error': '트랜잭션을 찾을 수 없습니다.'
+            }), 404
             
     except Exception as e:
         current_app.logger.error(f'트랜잭션 상태 조회 오류: {e}')
@@ -1780,23 +1695,16 @@ def get_transaction_status(transaction_id):
 def get_active_transactions():
     """활성 트랜잭션 목록 조회"""
     try:
-        from database import TransactionManager, DatabaseManager
-        
-        db = DatabaseManager('instance/gym_system.db')
-        db.connect()
-        tx_manager = TransactionManager(db)
+        import asyncio
+        tx_manager = get_services().tx_manager
+        transactions = asyncio.run(tx_manager.get_active_transactions())
         
-        try:
-            import asyncio
-            transactions = asyncio.run(tx_manager.get_active_transactions())
-            
-            return jsonify({
-                'success': True,
-                'transactions': transactions,
-                'count': len(transactions)
-            })
-        finally:
-            db.close()
+        return jsonify({
+            'success': True,
+            'transactions': transactions,
+            'count': len(transactions),
+            'lock_stats': tx_manager.get_lock_stats()
+        })
             
     except Exception as e:
         current_app.logger.error(f'활성 트랜잭션 조회 오류: {e}')
@@ -1810,18 +1718,13 @@ def get_active_transactions():
 def validate_member(member_id):
     """회원 유효성 검증 (SQLite 기반)"""
     try:
-        from app.services.member_service import MemberService
+        member_service = get_services().member_service
         
-        member_service = MemberService('instance/gym_system.db')
-        
-        try:
-            result = member_service.validate_member(member_id)
-            # Member 객체를 딕셔너리로 변환
-            if result.get('member'):
-                result['member'] = result['member'].to_dict()
-            return jsonify(result)
-        finally:
-            member_service.close()
+        result = member_service.validate_member(member_id)
+        # Member 객체를 딕셔너리로 변환
+        if result.get('member'):
+            result['member'] = result['member'].to_dict()
+        return jsonify(result)
         
     except Exception as e:
         current_app.logger.error(f'회원 검증 오류: {e}')
@@ -1855,7 +1758,7 @@ def system_status():
 def reconnect_esp32():
     """ESP32 재연결"""
     try:
-        system_service = SystemService()
+        system_service = SystemService(getattr(current_app, 'esp32_manager', None))
         result = system_service.reconnect_esp32()
         
         return jsonify({
@@ -1885,8 +1788,7 @@ def scan_barcode():
             }), 400
         
         # 바코드 타입 판별 및 처리
-        from app.services.barcode_service import BarcodeService
-        barcode_service = BarcodeService()
+        barcode_service = get_services().barcode_service
         result = barcode_service.process_barcode(barcode)
         
         return jsonify(result)
@@ -1974,7 +1876,6 @@ def emergency_exit():
 # ========== 센서 이벤트 저장소 및 트랜잭션 연동 ==========
 from collections import deque
 import time
-import asyncio
 
 # 최근 센서 이벤트 저장 (최대 100개)
 recent_sensor_events = deque(maxlen=100)
@@ -1982,21 +1883,15 @@ recent_sensor_events = deque(maxlen=100)
 # 각 센서의 현재 상태 저장 (지속적 상태 관리)
 current_sensor_states = {i: 'HIGH' for i in range(1, 141)}  # 1-140번 센서 초기값 HIGH
 
-# 센서 이벤트 핸들러 (전역 인스턴스)
-_sensor_handler = None
-
 def get_sensor_handler():
-    """센서 이벤트 핸들러 싱글톤 인스턴스 반환"""
-    global _sensor_handler
-    if _sensor_handler is None:
-        from app.services.sensor_event_handler import SensorEventHandler
-        # ESP32 매니저 가져오기 (문 열기/닫기용)
-        esp32_manager = getattr(current_app, 'esp32_manager', None)
-        _sensor_handler = SensorEventHandler('instance/gym_system.db', esp32_manager=esp32_manager)
-    return _sensor_handler
+    """센서 이벤트 핸들러 반환 (서비스 컨테이너 공유 인스턴스)"""
+    return get_services().sensor_handler
+
+def add_sensor_event(sensor_num, state, timestamp=None, locker_id=None):
+    """센서 이벤트 추가 및 트랜잭션 연동 처리
 
-def add_sensor_event(sensor_num, state, timestamp=None):
-    """센서 이벤트 추가 및 트랜잭션 연동 처리"""
+    locker_id를 주지 않으면 공유 센서 매핑 인덱스에서 조회한다.
+    """
     if timestamp is None:
         timestamp = time.time()
     
@@ -2015,16 +1910,9 @@ def add_sensor_event(sensor_num, state, timestamp=None):
             print(f"🔥 [상태업데이트] 센서{sensor_num}: {state} (지속상태)")
     
     # 기존 이벤트 저장 (호환성 유지)
-    # 🔥 센서 번호를 락커 ID로 매핑
-    locker_id = None
-    try:
-        import json
-        with open('/home/pi/gym-controller/config/sensor_mapping.json', 'r', encoding='utf-8') as f:
-            mapping_data = json.load(f)
-            locker_id = mapping_data.get('mapping', {}).get(str(sensor_num))
-    except Exception as e:
-        if has_app_context():
-            current_app.logger.warning(f"⚠️ 센서 매핑 로드 실패: {e}")
+    # 🔥 센서 번호를 락커 ID로 매핑 (메모리 인덱스, 파일 읽기 없음)
+    if locker_id is None and has_app_context():
+        locker_id = get_services().sensor_map.get_locker_id(sensor_num)
     
     event = {
         'sensor_num': sensor_num,
@@ -2035,78 +1923,16 @@ def add_sensor_event(sensor_num, state, timestamp=None):
     }
     recent_sensor_events.append(event)
     
-    # 🆕 트랜잭션 시스템과 연동 처리 (비동기)
+    # 🆕 트랜잭션 시스템 연동은 센서 이벤트 워커가 받은 순서대로 처리 (여기서는 넣기만 함)
     try:
         if has_app_context():
-            current_app.logger.info(f"🔥 [센서처리] 센서{sensor_num} 상태{state} 트랜잭션 연동 시작")
-        
-        sensor_handler = get_sensor_handler()
-        
-        # 비동기 처리를 위한 태스크 생성
-        async def process_sensor_event():
-            try:
-                if has_app_context():
-                    current_app.logger.info(f"🔥 [센서처리] 비동기 함수 실행 중...")
-                    
-                result = await sensor_handler.handle_sensor_event(sensor_num, state, timestamp)
-                
-                if has_app_context():
-                    current_app.logger.info(f"✅ [센서처리] 센서 이벤트 처리 결과: {result}")
-                else:
-                    print(f"센서 이벤트 처리 결과: {result}")
-                
-                # WebSocket으로 실시간 업데이트 전송 (향후 구현)
-                if result.get('completed'):
-                    if has_app_context():
-                        current_app.logger.info(f"🎉 트랜잭션 완료: {result.get('event_type')}")
-                    else:
-                        print(f"🎉 트랜잭션 완료: {result.get('event_type')}")
-                
-            except Exception as e:
-                if has_app_context():
-                    current_app.logger.error(f"센서 이벤트 비동기 처리 오류: {e}")
-                else:
-                    print(f"센서 이벤트 비동기 처리 오류: {e}")
+            current_app.logger.info(f"🔥 [센서처리] 센서{sensor_num} 상태{state} 트랜잭션 연동 요청")
         
-        # 이벤트 루프에서 실행 (Flask 동기 컨텍스트에서 실행)
-        try:
-            # 이미 실행 중인 루프가 있는지 확인
-            try:
-                loop = asyncio.get_running_loop()
-                # 실행 중인 루프가 있으면 백그라운드 스레드에서 실행
-                if has_app_context():
-                    current_app.logger.info(f"🔥 [센서처리] 실행중인 루프 발견, 백그라운드 스레드에서 실행")
-                
-                import threading
-                
-                # 현재 앱 객체 캡처 (클로저로 사용)
-                app = current_app._get_current_object()
-                
-                def run_in_thread():
-                    # Flask 앱 컨텍스트 생성 (요청 컨텍스트 없이)
-                    with app.app_context():
-                        app.logger.info(f"🔥 [센서처리] 백그라운드 스레드 시작")
-                        new_loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(new_loop)
-                        new_loop.run_until_complete(process_sensor_event())
-                        new_loop.close()
-                        app.logger.info(f"🔥 [센서처리] 백그라운드 스레드 완료")
-                
-                thread = threading.Thread(target=run_in_thread, daemon=True)
-                thread.start()
-                return  # 백그라운드 스레드 시작 후 종료
-                
-            except RuntimeError:
-                # 실행 중인 루프가 없으면 직접 실행
-                if has_app_context():
-                    current_app.logger.info(f"🔥 [센서처리] 새로운 루프에서 직접 실행")
-                asyncio.run(process_sensor_event())
-                
-        except Exception as e:
+        if not get_services().sensor_worker.submit(sensor_num, state, timestamp):
             if has_app_context():
-                current_app.logger.error(f"센서 이벤트 루프 실행 오류: {e}")
+                current_app.logger.warning(f"⚠️ 센서 이벤트 워커가 받지 못함: 센서{sensor_num} 상태{state}")
             else:
-                print(f"센서 이벤트 루프 실행 오류: {e}")
+                print(f"⚠️ 센서 이벤트 워커가 받지 못함: 센서{sensor_num} 상태{state}")
             
     except Exception as e:
         if has_app_context():
@@ -2176,20 +2002,11 @@ def hardware_motor_move():
                 'error': 'ESP32가 연결되지 않았습니다.'
             })
         
-        # ESP32로 모터 이동 명령 전송 (비동기 처리)
-        import asyncio
-        try:
-            # MOTOR_MOVE 명령으로 직접 회전수 제어 (음수 회전수 지원)
-            result = asyncio.run(esp32_manager.send_command(
-                device_id,  # 지정된 ESP32로 전송
-                "MOTOR_MOVE",
-                revs=revs,
-                rpm=rpm,
-                accel=accel
-            ))
-        except Exception as cmd_error:
-            current_app.logger.error(f'모터 명령 전송 실패: {cmd_error}')
-            result = {'success': False, 'error': str(cmd_error)}
+        # ESP32 통신 루프로 모터 이동 명령 전달 (음수 회전수 지원, 응답은 기다리지 않음)
+        esp32_manager.client.log_result(
+            esp32_manager.client.send_command(device_id, "MOTOR_MOVE", revs=revs, rpm=rpm, accel=accel),
+            f'모터 이동 {revs}회전', current_app.logger
+        )
         
         return jsonify({
             'success': True,
@@ -2224,17 +2041,15 @@ def hardware_auto_mode():
                 'error': 'ESP32가 연결되지 않았습니다.'
             })
         
-        # ESP32로 자동 모드 설정 명령 전송 (비동기 처리)
-        import asyncio
-        try:
-            result = asyncio.run(esp32_manager.send_command(
-                "esp32_auto_0",  # 자동 감지된 디바이스 ID
-                "SET_AUTO_MODE",
-                enabled=enabled
-            ))
-        except Exception as cmd_error:
-            current_app.logger.error(f'자동모드 명령 전송 실패: {cmd_error}')
-            result = {'success': False, 'error': str(cmd_error)}
+        # ESP32 통신 루프로 자동 모드 설정 명령 전달 (응답 없는 명령이라 전송 완료까지만 대기)
+        ack = esp32_manager.client.send_command_sync(
+            "esp32_auto_0",  # 자동 감지된 디바이스 ID
+            "SET_AUTO_MODE",
+            timeout=1.0,
+            enabled=enabled
+        )
+        if not ack.ok:
+            current_app.logger.error(f'자동모드 명령 전송 실패: {ack.status} ({ack.error})')
         
         return jsonify({
             'success': True,
@@ -2272,8 +2087,7 @@ def hardware_test_barcode():
             })
         
         # 테스트 바코드 데이터 시뮬레이션
-        from app.services.barcode_service import BarcodeService
-        barcode_service = BarcodeService()
+        barcode_service = get_services().barcode_service
         result = barcode_service.process_barcode(barcode)
         
         # ESP32에 바코드 이벤트 알림 (선택사항)
@@ -2324,6 +2138,22 @@ def hardware_sensor_events():
         return jsonify([])
 
 
+@bp.route('/hardware/sensor_worker')
+def hardware_sensor_worker():
+    """센서 이벤트 워커 상태 (큐 깊이, 대기시간/처리시간 분포, 버림/오류 수)"""
+    try:
+        return jsonify({
+            'success': True,
+            'worker': get_services().sensor_worker.get_stats()
+        })
+    except Exception as e:
+        current_app.logger.error(f'센서 워커 상태 조회 오류: {e}')
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @bp.route('/hardware/sensor_status')
 def hardware_sensor_status():
     """현재 센서 상태 조회 (ESP32에서 직접 가져오기)"""
@@ -2337,17 +2167,15 @@ def hardware_sensor_status():
                 'sensors': {}
             })
         
-        import asyncio
         try:
-            # ESP32에 상태 요청
-            result = asyncio.run(esp32_manager.send_command(
-                "esp32_auto_0",  # 자동 감지된 디바이스 ID
-                "GET_STATUS"
-            ))
+            # ESP32에 센서 스냅샷 요청 (응답은 기다리지 않고, 대기 중인 요청이 있으면 병합됨)
+            # 스냅샷이 오면 sensor_snapshot 핸들러가 current_sensor_states 전체를 갱신
+            esp32_manager.client.log_result(
+                esp32_manager.client.send_command("esp32_auto_0", "GET_SENSORS"),  # 자동 감지된 디바이스 ID
+                "🔥 [센서상태] ESP32 센서 스냅샷 요청", current_app.logger
+            )
             
-            current_app.logger.info(f"🔥 [센서상태] ESP32 응답: {result}")
-            
-            # 🔥 현재 저장된 센서 상태 반환 (지속적 상태 관리)
+            # 🔥 현재 저장된 센서 상태 반환 (엣지 이벤트 + 주기 스냅샷으로 유지)
             sensor_states = current_sensor_states.copy()
             
             current_app.logger.info(f"🔥 [센서상태] 현재 센서 상태: {sensor_states}")
@@ -2380,7 +2208,7 @@ def hardware_reconnect():
     """ESP32 재연결"""
     try:
         # 기존 연결 해제 후 재연결
-        system_service = SystemService()
+        system_service = SystemService(getattr(current_app, 'esp32_manager', None))
         result = system_service.reconnect_esp32()
         
         if result['success']:
@@ -2729,7 +2557,7 @@ def register_face(member_id):
         from app.services.face_service import get_face_service
         
         # 회원 존재 확인
-        member_service = MemberService()
+        member_service = get_services().member_service
         member = member_service.get_member(member_id)
         
         if not member:
@@ -3001,8 +2829,6 @@ def search_members():
         }
     """
     try:
-        from app.services.member_service import MemberService
-
         # 쿼리 파라미터 가져오기
         query = request.args.get('q', '').strip()
         limit = int(request.args.get('limit', 20))
@@ -3022,7 +2848,7 @@ def search_members():
             }), 400
 
         # 회원 검색
-        member_service = MemberService()
+        member_service = get_services().member_service
 
         # LIKE 검색을 위한 쿼리 생성
         search_pattern = f'%{query}%'
@@ -3165,8 +2991,7 @@ def reload_face_embeddings():
 def get_nfc_mappings():
     """전체 NFC-락커 매핑 조회"""
     try:
-        from app.services.nfc_service import NFCService
-        nfc_service = NFCService()
+        nfc_service = get_services().nfc_service
 
         mappings = nfc_service.get_all_nfc_mappings()
 
@@ -3210,10 +3035,9 @@ def register_nfc():
                 'error': '락커 번호와 NFC UID가 모두 필요합니다.'
             }), 400
 
-        from app.services.nfc_service import NFCService
         from app.services.sheets_sync import SheetsSync
 
-        nfc_service = NFCService()
+        nfc_service = get_services().nfc_service
         result = nfc_service.register_nfc_tag(locker_number, nfc_uid)
 
         if result['success']:
@@ -3252,10 +3076,9 @@ def register_nfc():
 def unregister_nfc(locker_number):
     """NFC 등록 해제"""
     try:
-        from app.services.nfc_service import NFCService
         from app.services.sheets_sync import SheetsSync
 
-        nfc_service = NFCService()
+        nfc_service = get_services().nfc_service
         result = nfc_service.unregister_nfc_tag(locker_number)
 
         if result['success']:
@@ -3294,16 +3117,8 @@ def unregister_nfc(locker_number):
 @bp.route('/sensor/mappings', methods=['GET'])
 def get_sensor_mappings():
     """모든 센서 매핑 조회"""
-    db_manager = None
     try:
-        from database.database_manager import DatabaseManager
-
-        db_manager = DatabaseManager()
-        if not db_manager.connect():
-            return jsonify({
-                'success': False,
-                'error': '데이터베이스 연결 실패'
-            }), 500
+        db_manager = get_services().db
 
         mappings = db_manager.get_all_sensor_mappings()
 
@@ -3328,15 +3143,11 @@ def get_sensor_mappings():
             'success': False,
             'error': f'센서 매핑 조회 중 오류가 발생했습니다: {str(e)}'
         }), 500
-    finally:
-        if db_manager:
-            db_manager.close()
 
 
 @bp.route('/sensor/lookup', methods=['GET'])
 def lookup_sensor_mapping():
     """addr, chip_idx, pin으로 현재 매핑된 락커 조회"""
-    db_manager = None
     try:
         addr = request.args.get('addr')
         chip_idx = request.args.get('chip_idx', type=int)
@@ -3348,14 +3159,7 @@ def lookup_sensor_mapping():
                 'error': 'addr, chip_idx, pin 파라미터가 필요합니다.'
             }), 400
 
-        from database.database_manager import DatabaseManager
-
-        db_manager = DatabaseManager()
-        if not db_manager.connect():
-            return jsonify({
-                'success': False,
-                'error': '데이터베이스 연결 실패'
-            }), 500
+        db_manager = get_services().db
 
         mapping = db_manager.get_sensor_mapping_by_hardware(addr, chip_idx, pin)
 
@@ -3379,15 +3183,11 @@ def lookup_sensor_mapping():
             'success': False,
             'error': f'센서 매핑 조회 중 오류가 발생했습니다: {str(e)}'
         }), 500
-    finally:
-        if db_manager:
-            db_manager.close()
 
 
 @bp.route('/sensor/register', methods=['POST'])
 def register_sensor_mapping():
     """센서 매핑 등록"""
-    db_manager = None
     try:
         data = request.get_json()
         if not data:
@@ -3408,14 +3208,7 @@ def register_sensor_mapping():
                 'error': 'addr, chip_idx, pin, locker_id 모두 필요합니다.'
             }), 400
 
-        from database.database_manager import DatabaseManager
-
-        db_manager = DatabaseManager()
-        if not db_manager.connect():
-            return jsonify({
-                'success': False,
-                'error': '데이터베이스 연결 실패'
-            }), 500
+        db_manager = get_services().db
 
         # 센서 번호는 locker_id에서 추출 (M01 -> 1, F01 -> 51, S01 -> 1)
         if locker_id.startswith('M'):
@@ -3440,6 +3233,9 @@ def register_sensor_mapping():
         success = db_manager.add_sensor_mapping(addr, chip_idx, pin, sensor_num, locker_id)
 
         if success:
+            # 센서 이벤트 경로가 쓰는 메모리 매핑 갱신
+            get_services().sensor_map.reload()
+
             # 구글 시트 동기화
             try:
                 from app.services.sheets_sync import SheetsSync
@@ -3474,28 +3270,20 @@ def register_sensor_mapping():
             'success': False,
             'error': '센서 매핑 등록 중 오류가 발생했습니다.'
         }), 500
-    finally:
-        if db_manager:
-            db_manager.close()
 
 
 @bp.route('/sensor/unregister/<locker_id>', methods=['DELETE'])
 def unregister_sensor_mapping(locker_id):
     """센서 매핑 해제"""
-    db_manager = None
     try:
-        from database.database_manager import DatabaseManager
-
-        db_manager = DatabaseManager()
-        if not db_manager.connect():
-            return jsonify({
-                'success': False,
-                'error': '데이터베이스 연결 실패'
-            }), 500
+        db_manager = get_services().db
 
         success = db_manager.delete_sensor_mapping(locker_id)
 
         if success:
+            # 센서 이벤트 경로가 쓰는 메모리 매핑 갱신
+            get_services().sensor_map.reload()
+
             # 구글 시트 동기화
             try:
                 from app.services.sheets_sync import SheetsSync
@@ -3522,9 +3310,6 @@ def unregister_sensor_mapping(locker_id):
             'success': False,
             'error': '센서 매핑 해제 중 오류가 발생했습니다.'
         }), 500
-    finally:
-        if db_manager:
-            db_manager.close()
 
 
 # ==========================================
@@ -3534,8 +3319,6 @@ def unregister_sensor_mapping(locker_id):
 @bp.route('/esp32/door/open-all', methods=['POST'])
 def open_all_doors():
     """전체 문 열기 (양쪽 ESP32 모두)"""
-    import asyncio
-    
     try:
         esp32_manager = getattr(current_app, 'esp32_manager', None)
         if not esp32_manager:
@@ -3546,32 +3329,17 @@ def open_all_doors():
 
         current_app.logger.info('전체 문 열기 시작 (esp32_staff + esp32_male_female)')
 
-        # 두 ESP32 모두에 모터 명령 전송
-        results = {}
-        device_ids = ["esp32_staff", "esp32_male_female"]
+        # 두 ESP32 모두에 모터 명령을 동시에 보내고 모터 응답(motor_moved/motor_completed)까지 대기
+        results, acks = _move_all_doors(esp32_manager, revs=0.917, label='문 열기')
 
-        for device_id in device_ids:
-            try:
-                # 비동기 함수를 동기적으로 호출
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                success = loop.run_until_complete(
-                    esp32_manager.send_command(device_id, "MOTOR_MOVE", revs=0.917, rpm=30)
-                )
-                loop.close()
-                results[device_id] = "성공" if success else "실패"
-                current_app.logger.info(f'문 열기 명령 전송: {device_id} - {"성공" if success else "실패"}')
-            except Exception as cmd_error:
-                results[device_id] = f"오류: {str(cmd_error)}"
-                current_app.logger.error(f'문 열기 명령 전송 실패: {device_id}, {cmd_error}')
-
-        # 하나라도 성공하면 전체 성공으로 처리
-        overall_success = any("성공" in result for result in results.values())
+        # 하나라도 모터 응답이 오면 전체 성공으로 처리
+        overall_success = any(result == "성공" for result in results.values())
 
         return jsonify({
             'success': overall_success,
-            'message': '전체 문 열기 명령 전송 완료',
-            'results': results
+            'message': '전체 문 열기 명령 완료',
+            'results': results,
+            'acks': acks
         })
 
     except Exception as e:
@@ -3585,8 +3353,6 @@ def open_all_doors():
 @bp.route('/esp32/door/close-all', methods=['POST'])
 def close_all_doors():
     """전체 문 닫기 (양쪽 ESP32 모두)"""
-    import asyncio
-    
     try:
         esp32_manager = getattr(current_app, 'esp32_manager', None)
         if not esp32_manager:
@@ -3597,32 +3363,17 @@ def close_all_doors():
 
         current_app.logger.info('전체 문 닫기 시작 (esp32_staff + esp32_male_female)')
 
-        # 두 ESP32 모두에 모터 명령 전송
-        results = {}
-        device_ids = ["esp32_staff", "esp32_male_female"]
+        # 두 ESP32 모두에 모터 명령을 동시에 보내고 모터 응답까지 대기
+        results, acks = _move_all_doors(esp32_manager, revs=-0.917, label='문 닫기')
 
-        for device_id in device_ids:
-            try:
-                # 비동기 함수를 동기적으로 호출
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                success = loop.run_until_complete(
-                    esp32_manager.send_command(device_id, "MOTOR_MOVE", revs=-0.917, rpm=30)
-                )
-                loop.close()
-                results[device_id] = "성공" if success else "실패"
-                current_app.logger.info(f'문 닫기 명령 전송: {device_id} - {"성공" if success else "실패"}')
-            except Exception as cmd_error:
-                results[device_id] = f"오류: {str(cmd_error)}"
-                current_app.logger.error(f'문 닫기 명령 전송 실패: {device_id}, {cmd_error}')
-
-        # 하나라도 성공하면 전체 성공으로 처리
-        overall_success = any("성공" in result for result in results.values())
+        # 하나라도 모터 응답이 오면 전체 성공으로 처리
+        overall_success = any(result == "성공" for result in results.values())
 
         return jsonify({
             'success': overall_success,
-            'message': '전체 문 닫기 명령 전송 완료',
-            'results': results
+            'message': '전체 문 닫기 명령 완료',
+            'results': results,
+            'acks': acks
         })
 
     except Exception as e:
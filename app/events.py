@@ -42,8 +42,8 @@ def handle_barcode_scan(data):
         current_app.logger.info(f'바코드 스캔: {barcode} (타입: {scan_type})')
         
         # 바코드 처리
-        from app.services.barcode_service import BarcodeService
-        barcode_service = BarcodeService()
+        from app.services.service_container import get_services
+        barcode_service = get_services().barcode_service
         result = barcode_service.process_barcode(barcode, scan_type)
         
         # 처리 결과를 클라이언트로 전송
@@ -87,8 +87,8 @@ def handle_locker_selection(data):
         current_app.logger.info(f'락카 선택: {locker_id} (회원: {member_id})')
         
         # 락카 대여 처리
-        from app.services.locker_service import LockerService
-        locker_service = LockerService()
+        from app.services.service_container import get_services
+        locker_service = get_services().locker_service
         result = locker_service.rent_locker(locker_id, member_id)
         
         if result['success']:
@@ -128,7 +128,7 @@ def handle_system_command(data):
         current_app.logger.info(f'시스템 명령: {command}')
         
         from app.services.system_service import SystemService
-        system_service = SystemService()
+        system_service = SystemService(getattr(current_app, 'esp32_manager', None))
         
         if command == 'restart_system':
             result = system_service.restart_system()
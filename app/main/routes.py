@@ -4,39 +4,22 @@
 
 from flask import render_template, current_app, request, jsonify
 from app.main import bp
-from app.services.locker_service import LockerService
-from app.services.member_service import MemberService
+from app.services.service_container import get_services
 
 
 def get_gym_name() -> str:
-    """DB에서 헬스장 이름 가져오기"""
+    """DB에서 헬스장 이름 가져오기 (설정 캐시)"""
     try:
-        from database.database_manager import DatabaseManager
-        db = DatabaseManager('instance/gym_system.db')
-        db.connect()
-        cursor = db.execute_query(
-            "SELECT setting_value FROM system_settings WHERE setting_key = 'gym_name'"
-        )
-        result = cursor.fetchone() if cursor else None
-        db.close()
-        return result[0] if result else '헬스장'
+        return str(get_services().db.get_system_setting('gym_name', '헬스장'))
     except Exception as e:
         current_app.logger.warning(f"헬스장 이름 조회 실패: {e}")
         return '헬스장'
 
 
 def get_admin_password() -> str:
-    """DB에서 관리자 비밀번호 가져오기"""
+    """DB에서 관리자 비밀번호 가져오기 (설정 캐시)"""
     try:
-        from database.database_manager import DatabaseManager
-        db = DatabaseManager('instance/gym_system.db')
-        db.connect()
-        cursor = db.execute_query(
-            "SELECT setting_value FROM system_settings WHERE setting_key = 'admin_password'"
-        )
-        result = cursor.fetchone() if cursor else None
-        db.close()
-        return result[0] if result else '1234'
+        return str(get_services().db.get_system_setting('admin_password', '1234'))
     except Exception as e:
         current_app.logger.warning(f"관리자 비밀번호 조회 실패: {e}")
         return '1234'
@@ -61,21 +44,24 @@ def member_check():
     auth_method = request.args.get('auth_method', 'barcode')  # 인증 방법
     
     if member_id:
-        member_service = MemberService()
+        member_service = get_services().member_service
         member = member_service.get_member(member_id)
         
         if member:
             # 트랜잭션 시작 (센서 이벤트 핸들러가 감지할 수 있도록)
-            from app.services.locker_service import LockerService
             from database.transaction_manager import TransactionType
             import asyncio
             
-            locker_service = LockerService()
+            locker_service = get_services().locker_service
             tx_type = TransactionType.RENTAL if action == 'rental' else TransactionType.RETURN
             
             try:
-                # 트랜잭션 시작
-                tx_result = asyncio.run(locker_service.tx_manager.start_transaction(member_id, tx_type))
+                # 트랜잭션 시작 (반납은 대여중인 락카만, 대여는 접근 가능한 구역만 잠금)
+                if action != 'rental' and member.currently_renting:
+                    lock_scope = {'locker_number': member.currently_renting}
+                else:
+                    lock_scope = {'zones': member.allowed_zones}
+                tx_result = asyncio.run(locker_service.tx_manager.start_transaction(member_id, tx_type, **lock_scope))
                 if tx_result['success']:
                     current_app.logger.info(f"✅ 트랜잭션 시작: {tx_result['transaction_id']} ({action})")
                 else:
@@ -268,7 +254,7 @@ def locker_select():
     member_id = request.args.get('member_id', '')
     zone = request.args.get('zone', 'MALE')  # MALE, FEMALE, STAFF 구역
     
-    locker_service = LockerService()
+    locker_service = get_services().locker_service
     available_lockers = locker_service.get_available_lockers(zone)
     
     return render_template('pages/locker_select.html',
@@ -12,10 +12,12 @@ from app.services.nfc_service import NFCService
 class BarcodeService:
     """바코드 스캔 및 처리 비즈니스 로직"""
     
-    def __init__(self):
-        self.member_service = MemberService()
-        self.locker_service = LockerService()
-        self.nfc_service = NFCService()
+    def __init__(self, member_service: MemberService = None,
+                 locker_service: LockerService = None,
+                 nfc_service: NFCService = None):
+        self.member_service = member_service or MemberService()
+        self.locker_service = locker_service or LockerService()
+        self.nfc_service = nfc_service or NFCService()
     
     def process_barcode(self, barcode: str, scan_type: str = 'auto') -> Dict:
         """바코드 처리 메인 로직"""
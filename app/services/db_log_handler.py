@@ -1,7 +1,7 @@
 """
 DB 로그 핸들러
 
-로그를 SQLite DB에 저장하여 나중에 구글시트로 동기화
+로그를 운영 DB와 분리된 로그 전용 SQLite DB에 저장하여 나중에 구글시트로 동기화
 """
 
 import logging
@@ -16,23 +16,26 @@ import re
 class DBLogHandler(logging.Handler):
     """로그를 SQLite DB에 저장하는 핸들러"""
     
-    def __init__(self, db_path: str = 'instance/gym_system.db', 
+    def __init__(self, db_path: str = 'instance/gym_logs.db', 
                  min_level: int = logging.DEBUG,
                  batch_size: int = 50,
-                 flush_interval: float = 10.0):
+                 flush_interval: float = 10.0,
+                 legacy_db_path: Optional[str] = None):
         """
         초기화
         
         Args:
-            db_path: SQLite DB 경로
+            db_path: 로그 DB 경로 (운영 DB와 별도 파일)
             min_level: 최소 로그 레벨 (INFO 이상만 저장)
             batch_size: 배치 저장 크기
             flush_interval: 자동 flush 간격 (초)
+            legacy_db_path: 기존 system_logs가 남아 있는 운영 DB 경로 (시작 시 로그 DB로 이전)
         """
         super().__init__(level=min_level)
         self.db_path = db_path
         self.batch_size = batch_size
         self.flush_interval = flush_interval
+        self.legacy_db_path = legacy_db_path
         
         self._queue = Queue()
         self._lock = threading.Lock()
@@ -103,9 +106,14 @@ class DBLogHandler(logging.Handler):
     
     def _worker_loop(self):
         """백그라운드 DB 저장 루프"""
-        import sqlite3
         import time
         
+        if self.legacy_db_path:
+            try:
+                self._get_store().migrate_legacy_logs(self.legacy_db_path)
+            except Exception as e:
+                print(f"[DBLogHandler] Legacy log migration error: {e}")
+        
         last_flush = time.time()
         batch = []
         
@@ -133,32 +141,15 @@ class DBLogHandler(logging.Handler):
             except Exception as e:
                 print(f"[DBLogHandler] Worker error: {e}")
     
+    def _get_store(self):
+        """로그 저장소 조회"""
+        from database.log_store import get_log_store
+        return get_log_store(self.db_path)
+    
     def _save_batch(self, batch: list):
-        """배치로 DB에 저장"""
-        import sqlite3
-        
+        """배치로 로그 DB에 저장"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            for entry in batch:
-                cursor.execute("""
-                    INSERT INTO system_logs 
-                    (log_level, logger_name, message, member_id, rental_id, locker_number, extra_data, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    entry['log_level'],
-                    entry['logger_name'],
-                    entry['message'],
-                    entry['member_id'],
-                    entry['rental_id'],
-                    entry['locker_number'],
-                    entry['extra_data'],
-                    entry['created_at']
-                ))
-            
-            conn.commit()
-            conn.close()
+            self._get_store().append_many(batch)
             
         except Exception as e:
             print(f"[DBLogHandler] Save batch error: {e}")
@@ -186,13 +177,15 @@ class DBLogHandler(logging.Handler):
 _db_handler: Optional[DBLogHandler] = None
 
 
-def setup_db_logging(db_path: str = 'instance/gym_system.db', 
-                     min_level: int = logging.DEBUG) -> DBLogHandler:
+def setup_db_logging(db_path: str = 'instance/gym_logs.db', 
+                     min_level: int = logging.DEBUG,
+                     legacy_db_path: Optional[str] = None) -> DBLogHandler:
     """DB 로깅 설정"""
     global _db_handler
     
     if _db_handler is None:
-        _db_handler = DBLogHandler(db_path=db_path, min_level=min_level)
+        _db_handler = DBLogHandler(db_path=db_path, min_level=min_level,
+                                   legacy_db_path=legacy_db_path)
         
         # 루트 로거에 핸들러 추가
         root_logger = logging.getLogger()
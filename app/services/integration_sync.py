@@ -158,6 +158,9 @@ class IntegrationSync:
                         except Exception as e:
                             logger.error(f"[IntegrationSync] DB 저장 실패: {key}, {e}")
             
+            if db_manager and settings:
+                db_manager.invalidate_settings_cache()
+            
             # 캐시 저장
             self._save_gym_settings_cache(settings)
             
@@ -8,7 +8,7 @@ from typing import List, Dict, Optional
 from app.models.locker import Locker
 from app.models.rental import Rental
 from app.services.member_service import MemberService
-from database import DatabaseManager, TransactionManager
+from database import DatabaseManager, TransactionManager, get_transaction_manager, SensorMap, get_sensor_map
 from database.transaction_manager import TransactionType, TransactionStep, TransactionStatus
 import logging
 
@@ -18,24 +18,43 @@ logger = logging.getLogger(__name__)
 class LockerService:
     """락카 대여/반납 비즈니스 로직 (트랜잭션 기반)"""
     
-    def __init__(self, db_path: str = 'instance/gym_system.db'):
+    def __init__(self, db_path: str = 'instance/gym_system.db',
+                 db_manager: Optional[DatabaseManager] = None,
+                 tx_manager: Optional[TransactionManager] = None,
+                 member_service: Optional[MemberService] = None,
+                 esp32_manager=None,
+                 sensor_map: Optional[SensorMap] = None):
         """LockerService 초기화
         
         Args:
             db_path: SQLite 데이터베이스 파일 경로
+            db_manager: 공유 DatabaseManager (서비스 컨테이너에서 주입)
+            tx_manager: 공유 TransactionManager (서비스 컨테이너에서 주입)
+            member_service: 공유 MemberService (서비스 컨테이너에서 주입)
+            esp32_manager: 앱의 ESP32 매니저 (서비스 컨테이너에서 주입)
+            sensor_map: 공유 SensorMap (없으면 DB 파일별 공유 인스턴스 사용)
         """
-        self.db = DatabaseManager(db_path)
-        self.db.connect()
+        injected = db_manager is not None
+        
+        if injected:
+            self.db = db_manager
+        else:
+            self.db = DatabaseManager(db_path)
+            self.db.connect()
         
         # 트랜잭션 매니저 초기화
-        self.tx_manager = TransactionManager(self.db)
+        self.tx_manager = tx_manager or get_transaction_manager(self.db)
+        
+        # 센서 번호 → 락카 ID 매핑 인덱스
+        self.sensor_map = sensor_map or get_sensor_map(self.db)
         
         # 회원 서비스 초기화
-        self.member_service = MemberService(db_path)
+        self.member_service = member_service or MemberService(db_path, db_manager=db_manager)
         
-        # ESP32 매니저 (기존 코드 유지)
-        self.esp32_manager = None
-        self._initialize_dependencies()  # ESP32 매니저 활성화
+        # ESP32 매니저 (컨테이너 주입 시 app.esp32_manager를 그대로 사용)
+        self.esp32_manager = esp32_manager
+        if not injected:
+            self._initialize_dependencies()  # ESP32 매니저 활성화
         
         logger.info("LockerService 초기화 완료 (SQLite + 트랜잭션 기반)")
     
@@ -110,66 +129,18 @@ class LockerService:
             return []
     
     def get_locker_id_by_sensor(self, sensor_num: int) -> Optional[str]:
-        """센서 번호로 락커 ID 조회
+        """센서 번호로 락커 ID 조회 (메모리 센서 매핑 인덱스)
         
         Args:
-            sensor_num: 센서 번호 (1~10)
+            sensor_num: 센서 번호 (1~60)
             
         Returns:
             락커 ID (예: "M01", "M10") 또는 None
         """
-        try:
-            # DB에서 센서 번호와 매핑된 락커 조회
-            cursor = self.db.execute_query("""
-                SELECT locker_number FROM locker_status 
-                WHERE sensor_id = ?
-            """, (sensor_num,))
-            
-            if cursor:
-                row = cursor.fetchone()
-                if row:
-                    return row['locker_number']
-            
-            # DB에 없으면 센서 매핑 파일에서 로드
-            try:
-                import json
-                from pathlib import Path
-                
-                config_file = Path(__file__).parent.parent.parent / "config" / "sensor_mapping.json"
-                
-                if config_file.exists():
-                    with open(config_file, 'r', encoding='utf-8') as f:
-                        config = json.load(f)
-                        mapping = config.get("mapping", {})
-                        locker_id = mapping.get(str(sensor_num))
-                        
-                        if locker_id:
-                            logger.info(f"센서 {sensor_num} → 락커 {locker_id} (설정 파일 매핑)")
-                            return locker_id
-            except Exception as e:
-                logger.error(f"센서 매핑 파일 로드 실패: {e}")
-            
-            # 센서 매핑 파일도 없으면 기본 순차 매핑 (60개 락커)
-            # 센서 1-10: S01~S10, 11-50: M01~M40, 51-60: F01~F10
-            if 1 <= sensor_num <= 10:
-                locker_id = f"S{sensor_num:02d}"
-            elif 11 <= sensor_num <= 50:
-                locker_id = f"M{(sensor_num-10):02d}"
-            elif 51 <= sensor_num <= 60:
-                locker_id = f"F{(sensor_num-50):02d}"
-            else:
-                locker_id = None
-            
-            if locker_id:
-                logger.info(f"센서 {sensor_num} → 락커 {locker_id} (기본 순차 매핑)")
-                return locker_id
-            
+        locker_id = self.sensor_map.get_locker_id(sensor_num)
+        if not locker_id:
             logger.warning(f"센서 {sensor_num}에 매핑된 락커가 없습니다")
-            return None
-            
-        except Exception as e:
-            logger.error(f"센서-락커 매핑 조회 오류: {e}")
-            return None
+        return locker_id
     
     def get_occupied_lockers(self, zone: str = 'MALE') -> List[Locker]:
         """SQLite에서 사용중인 락카 목록 조회
@@ -294,8 +265,10 @@ class LockerService:
                     'step': 'zone_access_denied'
                 }
             
-            # 4. 트랜잭션 시작
-            tx_result = await self.tx_manager.start_transaction(member_id, TransactionType.RENTAL)
+            # 4. 트랜잭션 시작 (선택한 락카만 잠금)
+            tx_result = await self.tx_manager.start_transaction(
+                member_id, TransactionType.RENTAL, locker_number=locker_id
+            )
             if not tx_result['success']:
                 return {
                     'success': False,
@@ -747,8 +720,10 @@ class LockerService:
             member = validation_result['member']
             logger.info(f"회원 검증 완료: {member.name} ({member.member_category})")
             
-            # 2. 트랜잭션 시작
-            tx_result = await self.tx_manager.start_transaction(member_id, TransactionType.RENTAL)
+            # 2. 트랜잭션 시작 (회원이 접근 가능한 구역만 잠금)
+            tx_result = await self.tx_manager.start_transaction(
+                member_id, TransactionType.RENTAL, zones=member.allowed_zones
+            )
             if not tx_result['success']:
                 return {
                     'success': False,
@@ -842,8 +817,8 @@ class LockerService:
             
             # ESP32Manager를 통한 모터 제어 (비동기 실행)
             try:
-                # 모터 제어 명령 전송 (응답 무시)
-                asyncio.create_task(esp32_manager.send_command("esp32_auto_0", "MOTOR_MOVE", revs=0.917, rpm=30))
+                # 모터 제어 명령을 ESP32 통신 루프로 전달 (응답 무시)
+                esp32_manager.client.send_command("esp32_auto_0", "MOTOR_MOVE", revs=0.917, rpm=30)
                 
                 # 모터가 실제로 움직이는 것을 확인했으므로 무조건 성공 처리
                 logger.info("ESP32Manager 모터 명령 전송 완료 - 성공으로 처리")
@@ -877,8 +852,10 @@ class LockerService:
             rented_locker_id = validation_result['rented_locker_id']
             logger.info(f"반납 대상: {member.name} → 락카키 {rented_locker_id}")
             
-            # 2. 트랜잭션 시작
-            tx_result = await self.tx_manager.start_transaction(member_id, TransactionType.RETURN)
+            # 2. 트랜잭션 시작 (반납할 락카만 잠금)
+            tx_result = await self.tx_manager.start_transaction(
+                member_id, TransactionType.RETURN, locker_number=rented_locker_id
+            )
             if not tx_result['success']:
                 return {
                     'success': False,
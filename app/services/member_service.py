@@ -14,14 +14,18 @@ logger = logging.getLogger(__name__)
 class MemberService:
     """회원 관리 비즈니스 로직 (SQLite 연동)"""
     
-    def __init__(self, db_path: str = 'instance/gym_system.db'):
+    def __init__(self, db_path: str = 'instance/gym_system.db', db_manager: Optional[DatabaseManager] = None):
         """MemberService 초기화
         
         Args:
             db_path: SQLite 데이터베이스 파일 경로
+            db_manager: 공유 DatabaseManager (서비스 컨테이너에서 주입, 없으면 새로 연결)
         """
-        self.db = DatabaseManager(db_path)
-        self.db.connect()
+        if db_manager is not None:
+            self.db = db_manager
+        else:
+            self.db = DatabaseManager(db_path)
+            self.db.connect()
         logger.info("MemberService 초기화 완료 (SQLite 연동)")
     
     def get_member(self, member_id: str) -> Optional[Member]:
@@ -15,7 +15,15 @@ logger = logging.getLogger(__name__)
 class NFCService:
     """NFC UID-락커 매핑 서비스"""
     
-    def __init__(self):
+    def __init__(self, db_manager: Optional[DatabaseManager] = None):
+        """
+        Args:
+            db_manager: 공유 DatabaseManager (서비스 컨테이너에서 주입, 없으면 새로 연결)
+        """
+        if db_manager is not None:
+            self.db_manager = db_manager
+            return
+        
         # 항상 명시적으로 DB 경로 지정
         from pathlib import Path
         db_path = Path(__file__).parent.parent.parent / "instance" / "gym_system.db"
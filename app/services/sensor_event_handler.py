@@ -5,7 +5,7 @@
 import asyncio
 from datetime import datetime
 from typing import Dict, Optional
-from database import DatabaseManager, TransactionManager
+from database import DatabaseManager, TransactionManager, get_transaction_manager, SensorMap, get_sensor_map
 from database.transaction_manager import TransactionStep, TransactionStatus
 import logging
 
@@ -15,78 +15,32 @@ logger = logging.getLogger(__name__)
 class SensorEventHandler:
     """ESP32 센서 이벤트를 트랜잭션 시스템과 연동하는 핸들러"""
     
-    def __init__(self, db_path: str = 'instance/gym_system.db', esp32_manager=None):
+    def __init__(self, db_path: str = 'instance/gym_system.db', esp32_manager=None,
+                 db_manager: Optional[DatabaseManager] = None,
+                 tx_manager: Optional[TransactionManager] = None,
+                 sensor_map: Optional[SensorMap] = None):
         """SensorEventHandler 초기화
         
         Args:
             db_path: SQLite 데이터베이스 파일 경로
             esp32_manager: ESP32 매니저 인스턴스 (문 열기/닫기용)
+            db_manager: 공유 DatabaseManager (서비스 컨테이너에서 주입)
+            tx_manager: 공유 TransactionManager (LockerService와 같은 인스턴스)
+            sensor_map: 공유 SensorMap (없으면 DB 파일별 공유 인스턴스 사용)
         """
-        self.db = DatabaseManager(db_path)
-        self.db.connect()
-        self.tx_manager = TransactionManager(self.db)
+        if db_manager is not None:
+            self.db = db_manager
+        else:
+            self.db = DatabaseManager(db_path)
+            self.db.connect()
+        self.tx_manager = tx_manager or get_transaction_manager(self.db)
         self.esp32_manager = esp32_manager
         
-        # 센서 번호 → 락카 ID 매핑
-        self.sensor_to_locker_map = self._build_sensor_locker_map()
+        # 센서 번호 → 락카 ID 매핑 (프로세스 공유 인덱스, 등록/해제 시 리로드됨)
+        self.sensor_map = sensor_map or get_sensor_map(self.db)
         
         logger.info("SensorEventHandler 초기화 완료")
     
-    def _build_sensor_locker_map(self) -> Dict[int, str]:
-        """센서 번호와 락카 ID 매핑 테이블 생성
-        
-        설정 파일(config/sensor_mapping.json)에서 매핑을 로드합니다.
-        파일이 없으면 기본 순차 매핑을 사용합니다.
-        
-        Returns:
-            센서 번호 → 락카 ID 매핑 딕셔너리
-        """
-        try:
-            import json
-            from pathlib import Path
-            
-            # 설정 파일 경로
-            config_file = Path(__file__).parent.parent.parent / "config" / "sensor_mapping.json"
-            
-            if config_file.exists():
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                    mapping_config = config.get("mapping", {})
-                    
-                    # 문자열 키를 정수로 변환
-                    mapping = {int(k): v for k, v in mapping_config.items()}
-                    
-                    logger.info(f"✅ 센서 매핑 설정 로드 완료: {len(mapping)}개 센서")
-                    logger.info(f"   교직원: S01~S10, 남성: M01~M40, 여성: F01~F10")
-                    return mapping
-            else:
-                logger.warning(f"⚠️ 센서 매핑 파일 없음: {config_file}, 기본 매핑 사용")
-                
-        except Exception as e:
-            logger.error(f"❌ 센서 매핑 로드 실패: {e}, 기본 매핑 사용")
-        
-        # 기본 매핑 (순차)
-        # 10개 x 6줄 = 60개 락커
-        # 센서 1-10: S01~S10 (교직원)
-        # 센서 11-50: M01~M40 (남성)
-        # 센서 51-60: F01~F10 (여성)
-        mapping = {}
-        
-        # 교직원 (센서 1-10)
-        for i in range(1, 11):
-            mapping[i] = f"S{i:02d}"
-        
-        # 남성 (센서 11-50)
-        for i in range(1, 41):
-            mapping[i + 10] = f"M{i:02d}"
-        
-        # 여성 (센서 51-60)
-        for i in range(1, 11):
-            mapping[i + 50] = f"F{i:02d}"
-        
-        logger.info(f"센서-락카 기본 매핑 생성: {len(mapping)}개 (교직원 10개, 남성 40개, 여성 10개)")
-        return mapping
-    
     async def handle_sensor_event(self, sensor_num: int, state: str, timestamp: Optional[float] = None) -> Dict:
         """센서 이벤트 처리 및 트랜잭션 연동
         
@@ -103,7 +57,7 @@ class SensorEventHandler:
                 timestamp = datetime.now().timestamp()
             
             # 센서 번호 → 락카 ID 변환
-            locker_id = self.sensor_to_locker_map.get(sensor_num)
+            locker_id = self.sensor_map.get_locker_id(sensor_num)
             if not locker_id:
                 logger.warning(f"알 수 없는 센서 번호: {sensor_num}")
                 return {
@@ -117,6 +71,7 @@ class SensorEventHandler:
             active_transactions = await self.tx_manager.get_active_transactions()
             
             # 활성 트랜잭션 찾기 (더 유연한 매칭)
+            locker_zone = self.tx_manager.locks.zone_of(locker_id)
             relevant_transaction = None
             for tx in active_transactions:
                 # 1. 특정 락카키에 대한 트랜잭션 (반납 시)
@@ -124,10 +79,11 @@ class SensorEventHandler:
                     relevant_transaction = tx
                     logger.info(f"반납 트랜잭션 발견: {locker_id}")
                     break
-                # 2. 대여 시작 트랜잭션 (locker_number가 null이고 rental 타입)
+                # 2. 대여 시작 트랜잭션 (locker_number가 null이고 rental 타입, 해당 구역을 잠근 트랜잭션)
                 elif (tx.get('locker_number') is None and 
                       tx.get('transaction_type') == 'rental' and
-                      tx.get('status') == 'active'):
+                      tx.get('status') == 'active' and
+                      (not tx.get('zones') or locker_zone in tx['zones'])):
                     relevant_transaction = tx
                     logger.info(f"대여 트랜잭션 발견: 회원 {tx.get('member_id')} → 락카키 {locker_id} 선택")
                     break
@@ -380,7 +336,7 @@ class SensorEventHandler:
     
     def get_sensor_locker_mapping(self) -> Dict[int, str]:
         """센서-락카 매핑 정보 반환"""
-        return self.sensor_to_locker_map.copy()
+        return self.sensor_map.get_locker_mapping()
     
     # [DEPRECATED 함수 제거됨 - 2025-12-09]
     # _complete_rental_process 함수는 사용되지 않아 삭제됨
@@ -0,0 +1,187 @@
+"""
+센서 이벤트 처리 워커
+
+센서 엣지마다 스레드와 이벤트 루프를 새로 만들지 않도록, 앱 수명 동안 도는 스레드 하나가
+자기 이벤트 루프에서 입력 큐의 센서 이벤트를 받은 순서대로 SensorEventHandler로 처리한다.
+ESP32 핸들러, /api/test/inject-sensor, /api/hardware/simulate_sensor 모두 submit으로 넣는다.
+
+- submit은 어느 스레드에서든 호출 가능하고 기다리지 않음 (처음 호출 시 워커 시작)
+- 대기 이벤트 수 상한: 넘으면 새 이벤트를 버리고 집계
+- 하나씩 순서대로 처리하므로 같은 센서의 LOW/HIGH 순서가 바뀌지 않음
+- 대기시간(submit → 처리 시작)과 처리시간 히스토그램, 큐 깊이/최대 깊이
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from core.command_tracker import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PENDING = 500
+
+_SensorItem = Tuple[int, str, Optional[float], float]   # (센서 번호, 상태, 발생 시각, 접수 시각)
+
+
+class SensorEventWorker:
+    """센서 이벤트 전용 처리 스레드 (자체 이벤트 루프 + 입력 큐)"""
+
+    def __init__(self, sensor_handler, max_pending: int = DEFAULT_MAX_PENDING):
+        """
+        Args:
+            sensor_handler: SensorEventHandler (handle_sensor_event 코루틴 제공)
+            max_pending: 대기 이벤트 수 상한
+        """
+        self.sensor_handler = sensor_handler
+        self.max_pending = max_pending
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending = 0
+        self._stopping = False
+        self._lag = LatencyHistogram()
+        self._runtime = LatencyHistogram()
+        self._stats = {
+            "submitted": 0,
+            "processed": 0,
+            "completed_transactions": 0,
+            "errors": 0,
+            "dropped": 0,
+            "max_pending": 0,
+        }
+
+    def start(self) -> bool:
+        """워커 스레드 시작 (이미 돌고 있으면 그대로)
+
+        Returns:
+            워커가 돌고 있는지
+        """
+        with self._lock:
+            if self._stopping:
+                return False
+            if self._thread is not None and self._thread.is_alive():
+                return True
+            ready = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(ready,), name="sensor-worker", daemon=True)
+            self._thread.start()
+        ready.wait()
+        return True
+
+    def _run(self, ready: threading.Event):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        ready.set()
+        logger.info("센서 이벤트 워커 시작")
+        try:
+            loop.run_until_complete(self._consume())
+        finally:
+            self._loop = None
+            loop.close()
+            logger.info("센서 이벤트 워커 종료")
+
+    def submit(self, sensor_num: int, state: str, timestamp: Optional[float] = None) -> bool:
+        """센서 이벤트 추가 (기다리지 않음)
+
+        Returns:
+            접수 여부 (대기 이벤트가 상한을 넘었거나 워커가 종료 중이면 False)
+        """
+        if not self.start():
+            return False
+
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._stats["dropped"] += 1
+                if self._stats["dropped"] == 1 or self._stats["dropped"] % 100 == 0:
+                    logger.warning(f"센서 처리 대기열 가득 참 ({self._pending}개), 이벤트 버림: "
+                                   f"센서{sensor_num} {state} (누적 {self._stats['dropped']}개)")
+                return False
+            self._pending += 1
+            self._stats["submitted"] += 1
+            self._stats["max_pending"] = max(self._stats["max_pending"], self._pending)
+
+        item: _SensorItem = (sensor_num, state, timestamp, time.perf_counter())
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, item)
+        except (AttributeError, RuntimeError):
+            # 워커 루프가 그 사이 종료됨
+            self._done()
+            return False
+        return True
+
+    async def _consume(self):
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            sensor_num, state, timestamp, queued_at = item
+            started = time.perf_counter()
+            outcome = "errors"
+            try:
+                result = await self.sensor_handler.handle_sensor_event(sensor_num, state, timestamp)
+                outcome = "completed_transactions" if result.get('completed') else None
+                if outcome:
+                    logger.info(f"🎉 트랜잭션 완료: {result.get('event_type')} (센서{sensor_num})")
+            except Exception as e:
+                logger.error(f"센서 이벤트 처리 오류: 센서{sensor_num} {state}, {e}")
+            finally:
+                finished = time.perf_counter()
+                with self._lock:
+                    self._lag.record((started - queued_at) * 1000)
+                    self._runtime.record((finished - started) * 1000)
+                    self._stats["processed"] += 1
+                    if outcome:
+                        self._stats[outcome] += 1
+                self._done()
+
+    def _done(self):
+        with self._lock:
+            self._pending -= 1
+            if self._pending == 0:
+                self._idle.notify_all()
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """대기 중인 이벤트가 모두 처리될 때까지 대기 (워커 스레드에서 호출 금지)
+
+        Returns:
+            시간 내에 모두 처리되었는지
+        """
+        with self._lock:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def stop(self, timeout: float = 2.0):
+        """남은 이벤트를 처리한 뒤 워커 종료"""
+        with self._lock:
+            self._stopping = True
+            thread = self._thread
+        if thread is None:
+            return
+        if not self.drain(timeout):
+            logger.warning(f"센서 이벤트 워커 종료: 처리하지 못한 이벤트 {self._pending}개")
+        loop = self._loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._queue.put_nowait, None)
+            except RuntimeError:
+                pass
+        thread.join(timeout)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def get_stats(self) -> Dict[str, Any]:
+        """처리/버림/오류 수, 큐 깊이, 대기시간/처리시간 분포"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["pending"] = self._pending
+            stats["queue_lag"] = self._lag.snapshot()
+            stats["processing"] = self._runtime.snapshot()
+        stats["running"] = self._thread is not None and self._thread.is_alive()
+        return stats
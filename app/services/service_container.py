@@ -0,0 +1,130 @@
+"""
+앱 전역 서비스 컨테이너
+
+LockerService/MemberService/NFCService 등을 앱 시작 시 한 번만 생성하고,
+공유 DatabaseManager와 app.esp32_manager를 주입해 모든 블루프린트에 같은 인스턴스를 제공
+"""
+
+import logging
+from typing import Optional
+
+from database import DatabaseManager, get_transaction_manager, get_sensor_map
+from app.services.member_service import MemberService
+from app.services.locker_service import LockerService
+from app.services.nfc_service import NFCService
+from app.services.barcode_service import BarcodeService
+from app.services.sensor_event_handler import SensorEventHandler
+from app.services.sensor_event_worker import SensorEventWorker
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceContainer:
+    """앱 스코프 서비스 레지스트리"""
+
+    def __init__(self, db_path: str = 'instance/gym_system.db', esp32_manager=None):
+        """
+        Args:
+            db_path: SQLite 데이터베이스 파일 경로
+            esp32_manager: ESP32 매니저 (연결 완료 후 attach_esp32_manager로 설정 가능)
+        """
+        self.db_path = db_path
+
+        self.db = DatabaseManager(db_path)
+        if not self.db.connect():
+            raise Exception("데이터베이스 연결 실패")
+
+        self.tx_manager = get_transaction_manager(self.db)
+        self.sensor_map = get_sensor_map(self.db)
+        self.member_service = MemberService(db_path, db_manager=self.db)
+        self.nfc_service = NFCService(db_manager=self.db)
+        self.locker_service = LockerService(
+            db_path,
+            db_manager=self.db,
+            tx_manager=self.tx_manager,
+            member_service=self.member_service,
+            esp32_manager=esp32_manager,
+            sensor_map=self.sensor_map
+        )
+        self.barcode_service = BarcodeService(
+            member_service=self.member_service,
+            locker_service=self.locker_service,
+            nfc_service=self.nfc_service
+        )
+        self.sensor_handler = SensorEventHandler(
+            db_path,
+            esp32_manager=esp32_manager,
+            db_manager=self.db,
+            tx_manager=self.tx_manager,
+            sensor_map=self.sensor_map
+        )
+        # 센서 이벤트는 이 워커 하나가 자기 루프에서 순서대로 처리 (첫 submit 때 시작)
+        self.sensor_worker = SensorEventWorker(self.sensor_handler)
+
+        self.esp32_manager = esp32_manager
+
+        logger.info("서비스 컨테이너 초기화 완료")
+
+    def attach_esp32_manager(self, esp32_manager):
+        """ESP32 연결 완료 후 실제 매니저를 서비스들에 주입
+
+        Args:
+            esp32_manager: 연결된 ESP32Manager 인스턴스
+        """
+        self.esp32_manager = esp32_manager
+        self.locker_service.esp32_manager = esp32_manager
+        self.sensor_handler.esp32_manager = esp32_manager
+        logger.info("서비스 컨테이너에 ESP32 매니저 연결")
+
+    def release_thread_resources(self):
+        """요청 처리 스레드가 사용한 DB 커넥션 반환"""
+        self.db.release_thread_connection()
+
+    def close(self):
+        """컨테이너 종료 (남은 센서 이벤트 처리 후 공유 DB 연결 반환)"""
+        self.sensor_worker.stop()
+        self.db.close()
+        logger.info("서비스 컨테이너 종료")
+
+
+def init_services(app, db_path: str = 'instance/gym_system.db') -> Optional[ServiceContainer]:
+    """서비스 컨테이너를 생성해 app.services에 등록
+
+    Args:
+        app: Flask 앱
+        db_path: SQLite 데이터베이스 파일 경로
+
+    Returns:
+        ServiceContainer 인스턴스 또는 None (실패 시)
+    """
+    try:
+        container = ServiceContainer(db_path, esp32_manager=getattr(app, 'esp32_manager', None))
+    except Exception as e:
+        app.logger.error(f"❌ 서비스 컨테이너 초기화 실패: {e}")
+        app.services = None
+        return None
+
+    app.services = container
+
+    @app.teardown_appcontext
+    def release_service_resources(exception=None):
+        """요청 종료 시 스레드 커넥션을 풀에 반환"""
+        container.release_thread_resources()
+
+    app.logger.info("🧩 서비스 컨테이너 등록 완료")
+    return container
+
+
+def get_services() -> ServiceContainer:
+    """현재 앱의 서비스 컨테이너 반환
+
+    컨테이너가 없으면(초기화 실패 등) 즉석에서 생성해 등록한다.
+    """
+    from flask import current_app
+
+    container = getattr(current_app, 'services', None)
+    if container is None:
+        app = current_app._get_current_object()
+        container = ServiceContainer(esp32_manager=getattr(app, 'esp32_manager', None))
+        app.services = container
+    return container
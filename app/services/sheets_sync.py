@@ -222,6 +222,9 @@ class SheetsSync:
                 except Exception as e:
                     logger.error(f"[SheetsSync] 설정 저장 실패: {setting_key}, {e}")
             
+            if count:
+                db_manager.invalidate_settings_cache()
+            
             logger.info(f"[SheetsSync] 설정 다운로드 완료: {count}개")
             return count
             
@@ -573,11 +576,11 @@ class SheetsSync:
             logger.error(f"[SheetsSync] 센서 이벤트 업로드 오류: {e}")
             return 0
     
-    def upload_system_logs(self, db_manager, limit: int = 5000) -> int:
+    def upload_system_logs(self, log_store=None, limit: int = 5000) -> int:
         """시스템 로그 업로드 (분석용)
         
         Args:
-            db_manager: DatabaseManager
+            log_store: LogStore (None이면 기본 로그 DB 사용)
             limit: 최대 업로드 건수
             
         Returns:
@@ -594,27 +597,18 @@ class SheetsSync:
                     logger.warning(f"[SheetsSync] 시스템로그 시트 생성 실패: {create_err}")
                     return 0
             
-            # 동기화되지 않은 로그 조회
-            cursor = db_manager.execute_query("""
-                SELECT log_id, log_level, logger_name, message, member_id, 
-                       rental_id, locker_number, extra_data, created_at
-                FROM system_logs
-                WHERE sync_status = 0
-                ORDER BY log_id ASC
-                LIMIT ?
-            """, (limit,))
-            
-            if not cursor:
-                return 0
+            if log_store is None:
+                from database.log_store import get_log_store
+                log_store = get_log_store()
             
-            rows_data = cursor.fetchall()
+            # 동기화되지 않은 로그 조회 (로그 전용 DB)
+            rows_data = log_store.get_unsynced(limit)
             if not rows_data:
                 return 0
             
             log_ids = []
             rows = []
-            for row in rows_data:
-                record = self._row_to_dict(row)
+            for record in rows_data:
                 log_ids.append(record.get('log_id'))
                 rows.append([
                     record.get('log_id', ''),
@@ -651,12 +645,7 @@ class SheetsSync:
             
             # 동기화 상태 업데이트
             if log_ids:
-                placeholders = ','.join(['?' for _ in log_ids])
-                db_manager.execute_query(f"""
-                    UPDATE system_logs SET sync_status = 1
-                    WHERE log_id IN ({placeholders})
-                """, tuple(log_ids))
-                db_manager.conn.commit()
+                log_store.mark_synced(log_ids)
             
             logger.info(f"[SheetsSync] 시스템 로그 업로드 완료: {len(rows)}건")
             return len(rows)
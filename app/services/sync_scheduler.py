@@ -193,7 +193,7 @@ class SyncScheduler:
         # 대여 기록 + 센서 이벤트 + 시스템 로그 업로드
         rentals = self.sheets_sync.upload_rentals(self.db_manager)
         sensor_events = self.sheets_sync.upload_sensor_events(self.db_manager)
-        system_logs = self.sheets_sync.upload_system_logs(self.db_manager)
+        system_logs = self.sheets_sync.upload_system_logs()
         
         if rentals > 0 or sensor_events > 0 or system_logs > 0:
             self.stats['last_upload'] = datetime.now().isoformat()
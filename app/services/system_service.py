@@ -11,8 +11,8 @@ from typing import Dict, List
 class SystemService:
     """시스템 상태 및 관리 비즈니스 로직"""
     
-    def __init__(self):
-        self.esp32_manager = None
+    def __init__(self, esp32_manager=None):
+        self.esp32_manager = esp32_manager
         self.google_sheets = None
         # TODO: 의존성 주입
     
@@ -108,8 +108,8 @@ class SystemService:
     def _get_locker_status(self) -> Dict:
         """락카 현황"""
         try:
-            from app.services.locker_service import LockerService
-            locker_service = LockerService()
+            from app.services.service_container import get_services
+            locker_service = get_services().locker_service
             
             # A, B 구역 락카 현황
             a_lockers = locker_service.get_all_lockers('A')
@@ -162,18 +162,31 @@ class SystemService:
             return "알 수 없음"
     
     def reconnect_esp32(self) -> Dict:
-        """ESP32 재연결"""
+        """ESP32 재연결 (링크 감시 태스크가 바로 다시 열고, 재시도 대기 중이면 대기 없이 시도)"""
         try:
-            # TODO: 실제 ESP32 재연결 로직
+            manager = self.esp32_manager
+            if manager is None or not manager.client.is_available:
+                return {
+                    'success': False,
+                    'message': 'ESP32 통신 루프가 실행 중이 아닙니다.',
+                    'error': 'ESP32 통신 루프가 실행 중이 아닙니다.'
+                }
+            
+            async def request_reconnect():
+                return manager.request_reconnect()
+            
+            device_ids = manager.client.submit(request_reconnect()).result(timeout=2.0)
             return {
                 'success': True,
-                'message': 'ESP32 재연결을 시도했습니다.'
+                'message': f"ESP32 재연결을 시작했습니다: {', '.join(device_ids) or '대상 없음'}",
+                'devices': device_ids
             }
             
         except Exception as e:
             return {
                 'success': False,
-                'message': f'ESP32 재연결 실패: {e}'
+                'message': f'ESP32 재연결 실패: {e}',
+                'error': f'ESP32 재연결 실패: {e}'
             }
     
     def sync_google_sheets(self) -> Dict:
@@ -0,0 +1,264 @@
+"""
+ESP32 디바이스별 송신 명령 큐
+
+여러 스레드/루프에서 들어오는 명령을 디바이스마다 하나의 우선순위 큐에 모으고,
+ESP32 통신 루프의 writer 태스크 하나만 시리얼 포트에 쓴다.
+
+- 우선순위: 안전(reset 등) < 문/모터 < 일반 제어 < 상태 조회 (작을수록 먼저)
+- 병합: 아직 보내지 않은 같은 명령(같은 파라미터)이 있으면 새로 넣지 않고 그 결과를 같이 받음
+- 대체: 아직 보내지 않은 SET_AUTO_MODE/상태 조회가 다른 값으로 다시 들어오면 마지막 요청만 보냄
+  (멱등 명령만 해당)
+- 합산: MOTOR_MOVE는 상대 이동(rotateMotor(revs))이라 대체하면 위치가 틀어지므로
+  대기 중인 이동에 revs를 더해 한 번에 보내고, 합이 0이면(열기 대기 중 닫기) 둘 다 "cancelled"로 끝냄
+- 대기시간/깊이 통계 제공
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.command_tracker import CommandAck, LatencyHistogram
+
+PRIORITY_SAFETY = 0
+PRIORITY_DOOR = 1
+PRIORITY_CONTROL = 2
+PRIORITY_POLL = 3
+
+COMMAND_PRIORITY: Dict[str, int] = {
+    "reset": PRIORITY_SAFETY,
+    "RESET": PRIORITY_SAFETY,
+    "EMERGENCY_STOP": PRIORITY_SAFETY,
+    "OPEN_LOCKER": PRIORITY_DOOR,
+    "MOTOR_MOVE": PRIORITY_DOOR,
+    "SET_AUTO_MODE": PRIORITY_CONTROL,
+    "GET_STATUS": PRIORITY_POLL,
+    "GET_SENSORS": PRIORITY_POLL,
+}
+
+# 같은 키로 대기 중인 명령이 있으면 파라미터가 같을 때 병합, 다를 때 대체 (멱등 명령만)
+# OPEN_LOCKER는 락커별로 따로 취급
+_LATEST_WINS = ("GET_STATUS", "GET_SENSORS", "SET_AUTO_MODE")
+
+# 대기 중인 명령에 revs를 더하는 상대 이동 명령 (같은 값이어도 병합하지 않고 합산)
+_ADDITIVE = ("MOTOR_MOVE",)
+DEFAULT_MOTOR_REVS = 1.0   # _build_motor_command의 revs 기본값과 같게
+_REVS_EPSILON = 1e-6
+
+# 펌웨어가 처리를 끝낼 때까지(응답 또는 타임아웃) 다음 명령을 보내지 않는 명령
+PACED_COMMANDS = ("OPEN_LOCKER", "MOTOR_MOVE")
+
+# 연속 쓰기 사이 최소 간격 (펌웨어 RX 버퍼 보호)
+DEFAULT_MIN_INTERVAL = 0.05
+
+
+def coalesce_key(command: str, kwargs: Dict[str, Any]) -> Optional[Tuple]:
+    """병합/대체 판단용 키 (None이면 병합하지 않음)"""
+    if command in _LATEST_WINS or command in _ADDITIVE:
+        return (command,)
+    if command == "OPEN_LOCKER":
+        return (command, kwargs.get("locker_id"))
+    return None
+
+
+def _set_result(future: asyncio.Future, ack: CommandAck):
+    if not future.done():
+        future.set_result(ack)
+
+
+class QueuedCommand:
+    """큐에 들어간 명령 (같은 명령을 기다리는 Future 여러 개를 가질 수 있음)"""
+
+    __slots__ = ('command', 'kwargs', 'priority', 'timeout', 'key', 'enqueued_at', 'waiters', 'cancelled')
+
+    def __init__(self, command: str, kwargs: Dict[str, Any], priority: int, timeout: float,
+                 key: Optional[Tuple]):
+        self.command = command
+        self.kwargs = kwargs
+        self.priority = priority
+        self.timeout = timeout
+        self.key = key
+        self.enqueued_at = time.perf_counter()
+        self.waiters: List[Tuple[asyncio.Future, asyncio.AbstractEventLoop]] = []
+        self.cancelled = False
+
+    def resolve(self, ack: CommandAck):
+        """모든 대기자에게 결과 전달 (각 Future의 루프에서)"""
+        for future, loop in self.waiters:
+            try:
+                if loop.is_closed():
+                    continue
+                loop.call_soon_threadsafe(_set_result, future, ack)
+            except RuntimeError:
+                # 호출한 쪽 루프가 이미 닫힘 (결과를 기다리지 않는 호출)
+                pass
+        self.waiters = []
+
+
+class DeviceCommandQueue:
+    """디바이스 하나의 송신 큐 (put은 아무 스레드, get은 writer 태스크에서)"""
+
+    def __init__(self, device_id: str, min_interval: float = DEFAULT_MIN_INTERVAL):
+        self.device_id = device_id
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._heap: List[Tuple[int, int, QueuedCommand]] = []
+        self._by_key: Dict[Tuple, QueuedCommand] = {}
+        self._seq = itertools.count()
+        self._depth = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._wait_histogram = LatencyHistogram()
+        self._stats = {
+            "enqueued": 0,
+            "dequeued": 0,
+            "coalesced": 0,
+            "superseded": 0,
+            "merged": 0,
+            "cancelled": 0,
+            "failed": 0,
+            "max_depth": 0,
+        }
+
+    @property
+    def is_running(self) -> bool:
+        """writer 태스크가 붙어 있는지"""
+        return self._loop is not None
+
+    def attach(self):
+        """writer 태스크 시작 시 호출 (현재 루프가 큐를 소비)"""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+
+    def close(self, error: str = "queue_closed") -> int:
+        """writer 종료: 남은 명령을 모두 실패 처리
+
+        Returns:
+            실패 처리한 명령 수
+        """
+        with self._lock:
+            remaining = [item for _, _, item in self._heap if not item.cancelled]
+            self._heap.clear()
+            self._by_key.clear()
+            self._depth = 0
+            self._stats["failed"] += len(remaining)
+            loop, wakeup = self._loop, self._wakeup
+            self._loop = None
+            self._wakeup = None
+
+        for item in remaining:
+            item.resolve(CommandAck("", self.device_id, item.command, "failed", error=error))
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(wakeup.set)
+        return len(remaining)
+
+    def put(self, command: str, kwargs: Dict[str, Any], timeout: float,
+            priority: Optional[int] = None) -> asyncio.Future:
+        """명령 추가 (실행 중인 이벤트 루프에서 호출)
+
+        Returns:
+            CommandAck로 완료되는 Future (호출한 루프 소속)
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if priority is None:
+            priority = COMMAND_PRIORITY.get(command, PRIORITY_CONTROL)
+        key = coalesce_key(command, kwargs)
+        superseded = cancelled = None
+
+        with self._lock:
+            if self._loop is None:
+                self._stats["failed"] += 1
+                future.set_result(CommandAck("", self.device_id, command, "failed", error="queue_closed"))
+                return future
+
+            existing = self._by_key.get(key) if key is not None else None
+            if existing is not None and command in _ADDITIVE:
+                net = existing.kwargs.get("revs", DEFAULT_MOTOR_REVS) + kwargs.get("revs", DEFAULT_MOTOR_REVS)
+                if abs(net) >= _REVS_EPSILON:
+                    # 대기 중인 이동에 더해 한 번에 보냄 (rpm 등 나머지는 마지막 요청 값)
+                    existing.kwargs = {**kwargs, "revs": round(net, 6)}
+                    existing.waiters.append((future, loop))
+                    self._stats["merged"] += 1
+                    return future
+                # 반대 방향 이동끼리 상쇄: 둘 다 보내지 않음
+                existing.cancelled = True
+                existing.waiters.append((future, loop))
+                del self._by_key[key]
+                self._depth -= 1
+                self._stats["cancelled"] += 1
+                cancelled = existing
+            elif existing is not None and existing.kwargs == kwargs:
+                # 같은 명령이 아직 대기 중: 그 결과를 같이 받음
+                existing.waiters.append((future, loop))
+                self._stats["coalesced"] += 1
+                return future
+            elif existing is not None:
+                # 다른 값의 같은 명령: 마지막 요청만 보냄
+                existing.cancelled = True
+                self._depth -= 1
+                self._stats["superseded"] += 1
+                superseded = existing
+
+            if cancelled is None:
+                item = QueuedCommand(command, kwargs, priority, timeout, key)
+                item.waiters.append((future, loop))
+                heapq.heappush(self._heap, (priority, next(self._seq), item))
+                if key is not None:
+                    self._by_key[key] = item
+                self._depth += 1
+                self._stats["enqueued"] += 1
+                self._stats["max_depth"] = max(self._stats["max_depth"], self._depth)
+                owner, wakeup = self._loop, self._wakeup
+
+        if cancelled is not None:
+            cancelled.resolve(CommandAck("", self.device_id, command, "cancelled",
+                                         error=f"opposite {command} queued (net 0 revs)"))
+            return future
+        if superseded is not None:
+            superseded.resolve(CommandAck("", self.device_id, command, "superseded",
+                                          error=f"newer {command} queued"))
+        owner.call_soon_threadsafe(wakeup.set)
+        return future
+
+    async def get(self) -> Optional[QueuedCommand]:
+        """다음 명령 (우선순위 → 들어온 순서). 큐가 닫히면 None"""
+        while True:
+            with self._lock:
+                wakeup = self._wakeup
+                if wakeup is None:
+                    return None
+                while self._heap:
+                    _, _, item = heapq.heappop(self._heap)
+                    if item.cancelled:
+                        continue
+                    if item.key is not None and self._by_key.get(item.key) is item:
+                        del self._by_key[item.key]
+                    self._depth -= 1
+                    self._stats["dequeued"] += 1
+                    self._wait_histogram.record((time.perf_counter() - item.enqueued_at) * 1000)
+                    return item
+                wakeup.clear()
+            await wakeup.wait()
+
+    @property
+    def depth(self) -> int:
+        """아직 보내지 않은 명령 수"""
+        return self._depth
+
+    def get_stats(self) -> Dict[str, Any]:
+        """큐 깊이/병합/대기시간 통계"""
+        with self._lock:
+            by_priority: Dict[int, int] = {}
+            for priority, _, item in self._heap:
+                if not item.cancelled:
+                    by_priority[priority] = by_priority.get(priority, 0) + 1
+            return {
+                **self._stats,
+                "running": self._loop is not None,
+                "depth": self._depth,
+                "depth_by_priority": by_priority,
+                "wait": self._wait_histogram.snapshot(),
+            }
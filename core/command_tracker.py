@@ -0,0 +1,295 @@
+"""
+ESP32 명령/응답 상관관계 추적
+
+보내는 명령마다 cmd_id를 붙이고 Future를 만들어 둔 뒤, 같은 디바이스에서 오는 응답
+(motor_completed / motor_moved / locker_opened / 상태 응답 / 센서 스냅샷)으로 완료시킨다.
+
+- 펌웨어가 cmd_id를 되돌려 주면 그 id로만 매칭 (이미 타임아웃된 명령의 늦은 응답은 매칭하지 않음)
+- 되돌려 주지 않는 펌웨어는 응답 종류가 맞는 가장 오래된 대기 명령과 매칭 (FIFO)
+- 응답이 없으면 timeout 후 status="timeout"으로 완료
+- 디바이스별 왕복 지연시간(RTT)은 고정 버킷 히스토그램으로 집계
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_ACK_TIMEOUT = 5.0
+
+# 명령별로 기다릴 응답 종류 (ParsedMessage.data["response_type"])
+# 여기에 없는 명령은 응답을 기다리지 않고 전송 즉시 완료
+ACK_RESPONSES: Dict[str, Tuple[str, ...]] = {
+    "OPEN_LOCKER": ("locker_opened", "motor_event"),
+    "MOTOR_MOVE": ("motor_moved", "motor_event"),
+    "GET_STATUS": ("status_response",),
+    "GET_SENSORS": ("sensor_snapshot",),
+}
+
+# RTT 히스토그램 버킷 상한 (ms), 마지막 버킷은 그 이상 전부
+RTT_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+@dataclass
+class CommandAck:
+    """명령 완료 결과 (Future의 결과값)"""
+    cmd_id: str
+    device_id: str
+    command: str
+    status: str                     # "acked", "sent"(응답 불필요), "timeout", "failed", "superseded"(큐에서 대체됨), "cancelled"(반대 이동과 상쇄됨)
+    response: Optional[Dict[str, Any]] = None
+    rtt_ms: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ("acked", "sent")
+
+
+class LatencyHistogram:
+    """고정 버킷 지연시간 히스토그램 (ms)"""
+
+    __slots__ = ('bounds', 'counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self, bounds: Iterable[float] = RTT_BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, value_ms: float):
+        idx = 0
+        for bound in self.bounds:
+            if value_ms <= bound:
+                break
+            idx += 1
+        self.counts[idx] += 1
+        self.count += 1
+        self.total += value_ms
+        self.min = value_ms if self.min is None else min(self.min, value_ms)
+        self.max = value_ms if self.max is None else max(self.max, value_ms)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """버킷 상한 기준 근사 백분위수 (마지막 버킷이면 최댓값)"""
+        if not self.count:
+            return None
+        target = self.count * p
+        seen = 0
+        for idx, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target and bucket_count:
+                return float(self.bounds[idx]) if idx < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"le_{bound}" for bound in self.bounds] + ["inf"]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count, 3) if self.count else None,
+            "min_ms": round(self.min, 3) if self.min is not None else None,
+            "max_ms": round(self.max, 3) if self.max is not None else None,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class _PendingCommand:
+    """응답을 기다리는 명령 (Future는 등록한 루프 소속)"""
+
+    __slots__ = ('cmd_id', 'device_id', 'command', 'expects', 'future', 'loop', 'sent_at', 'timer')
+
+    def __init__(self, cmd_id: str, device_id: str, command: str, expects: Tuple[str, ...],
+                 future: asyncio.Future, loop: asyncio.AbstractEventLoop):
+        self.cmd_id = cmd_id
+        self.device_id = device_id
+        self.command = command
+        self.expects = expects
+        self.future = future
+        self.loop = loop
+        self.sent_at = time.perf_counter()
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+    def finish(self, ack: CommandAck):
+        """Future 완료 (소유 루프 스레드에서 실행)"""
+        if self.timer is not None:
+            self.timer.cancel()
+        if not self.future.done():
+            self.future.set_result(ack)
+
+
+class CommandTracker:
+    """디바이스별 대기 명령/RTT 추적 (ESP32Manager당 하나)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._pending: Dict[str, "OrderedDict[str, _PendingCommand]"] = {}
+        self._unacked: Dict[str, _PendingCommand] = {}   # 응답 불필요, 전송 결과 대기
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def _device_counters(self, device_id: str) -> Dict[str, int]:
+        counters = self._counters.get(device_id)
+        if counters is None:
+            counters = self._counters[device_id] = {
+                "sent": 0, "acked": 0, "timeouts": 0, "failed": 0, "unmatched_responses": 0,
+            }
+        return counters
+
+    def register(self, device_id: str, command: str,
+                 timeout: float = DEFAULT_ACK_TIMEOUT) -> Tuple[str, asyncio.Future]:
+        """명령 등록 후 (cmd_id, Future) 반환 (실행 중인 이벤트 루프에서 호출)
+
+        응답이 필요 없는 명령도 id와 Future를 받고, 전송 결과(complete_sent)로 완료된다.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        expects = ACK_RESPONSES.get(command, ())
+
+        with self._lock:
+            self._next_id += 1
+            cmd_id = f"CMD_{self._next_id:04d}"
+            self._device_counters(device_id)["sent"] += 1
+            entry = _PendingCommand(cmd_id, device_id, command, expects, future, loop)
+            if expects:
+                self._pending.setdefault(device_id, OrderedDict())[cmd_id] = entry
+            else:
+                self._unacked[cmd_id] = entry
+
+        if expects:
+            entry.timer = loop.call_later(timeout, self._expire, device_id, cmd_id)
+        return cmd_id, future
+
+    def complete_sent(self, device_id: str, cmd_id: str, sent: bool, error: Optional[str] = None):
+        """전송 결과 반영
+
+        응답이 필요 없는 명령은 전송 성공 시 "sent"로 완료한다.
+        전송에 실패하면 응답 대기 여부와 관계없이 "failed"로 완료한다.
+        """
+        with self._lock:
+            entry = self._unacked.pop(cmd_id, None)
+            if entry is None and not sent:
+                pending = self._pending.get(device_id)
+                entry = pending.pop(cmd_id, None) if pending else None
+            if entry is None:
+                return
+            if not sent:
+                self._device_counters(device_id)["failed"] += 1
+
+        if sent:
+            entry.finish(CommandAck(cmd_id, device_id, entry.command, "sent"))
+        else:
+            entry.finish(CommandAck(cmd_id, device_id, entry.command, "failed",
+                                    error=error or "send_failed"))
+
+    def resolve(self, device_id: str, data: Dict[str, Any]) -> bool:
+        """수신 응답으로 대기 명령 완료
+
+        Args:
+            device_id: 응답을 보낸 디바이스
+            data: ParsedMessage.data (response_type, 선택적으로 cmd_id)
+
+        Returns:
+            대기 명령과 매칭되었는지
+        """
+        kind = data.get("response_type")
+        if kind is None:
+            return False
+
+        with self._lock:
+            pending = self._pending.get(device_id)
+            entry = None
+            if pending:
+                cmd_id = data.get("cmd_id")
+                if cmd_id is not None:
+                    # 대기 중이 아닌 cmd_id(타임아웃 후 늦게 온 응답 등)를 다른 명령의 응답으로 쓰지 않음
+                    entry = pending.pop(cmd_id, None)
+                else:
+                    for candidate_id, candidate in pending.items():
+                        if kind in candidate.expects:
+                            entry = pending.pop(candidate_id)
+                            break
+
+            counters = self._device_counters(device_id)
+            if entry is None:
+                counters["unmatched_responses"] += 1
+                return False
+
+            rtt_ms = (time.perf_counter() - entry.sent_at) * 1000
+            counters["acked"] += 1
+            histogram = self._histograms.get(device_id)
+            if histogram is None:
+                histogram = self._histograms[device_id] = LatencyHistogram()
+            histogram.record(rtt_ms)
+
+        ack = CommandAck(entry.cmd_id, device_id, entry.command, "acked",
+                         response=dict(data), rtt_ms=round(rtt_ms, 3))
+        self._finish_on_owner_loop(entry, ack)
+        return True
+
+    def _expire(self, device_id: str, cmd_id: str):
+        """타임아웃 (등록한 루프의 타이머에서 호출)"""
+        with self._lock:
+            pending = self._pending.get(device_id)
+            entry = pending.pop(cmd_id, None) if pending else None
+            if entry is None:
+                return
+            self._device_counters(device_id)["timeouts"] += 1
+        entry.timer = None
+        entry.finish(CommandAck(cmd_id, device_id, entry.command, "timeout", error="no response"))
+
+    def fail_device(self, device_id: str, error: str) -> int:
+        """디바이스 연결이 끊기면 대기 명령을 모두 실패 처리
+
+        Returns:
+            실패 처리한 명령 수
+        """
+        with self._lock:
+            pending = self._pending.pop(device_id, None)
+            if not pending:
+                return 0
+            self._device_counters(device_id)["failed"] += len(pending)
+
+        for entry in pending.values():
+            self._finish_on_owner_loop(
+                entry, CommandAck(entry.cmd_id, device_id, entry.command, "failed", error=error))
+        return len(pending)
+
+    @staticmethod
+    def _finish_on_owner_loop(entry: _PendingCommand, ack: CommandAck):
+        """Future를 만든 루프에서 완료 (다른 스레드의 루프면 call_soon_threadsafe)"""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is entry.loop:
+            entry.finish(ack)
+        elif not entry.loop.is_closed():
+            entry.loop.call_soon_threadsafe(entry.finish, ack)
+
+    def pending_count(self, device_id: Optional[str] = None) -> int:
+        with self._lock:
+            if device_id is not None:
+                return len(self._pending.get(device_id, ()))
+            return sum(len(pending) for pending in self._pending.values())
+
+    def get_device_stats(self, device_id: str) -> Dict[str, Any]:
+        """디바이스별 명령 통계 (카운터 + RTT 히스토그램)"""
+        with self._lock:
+            counters = dict(self._counters.get(device_id, {}))
+            histogram = self._histograms.get(device_id)
+            rtt = histogram.snapshot() if histogram else LatencyHistogram().snapshot()
+            pending = len(self._pending.get(device_id, ()))
+        return {**counters, "pending": pending, "rtt": rtt}
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """전체 디바이스 명령 통계"""
+        with self._lock:
+            device_ids: List[str] = list(self._counters)
+        return {device_id: self.get_device_stats(device_id) for device_id in device_ids}
@@ -0,0 +1,136 @@
+"""
+ESP32 통신 루프 클라이언트
+
+시리얼 연결은 ESP32 스레드의 이벤트 루프(setup_esp32_connection의 run_forever)가 소유한다.
+Flask 요청 스레드 등 다른 스레드는 새 이벤트 루프를 만들지 않고, 이 클라이언트로
+코루틴을 소유 루프에 넘긴다 (run_coroutine_threadsafe → concurrent.futures.Future).
+
+    future = esp32_manager.client.send_command("esp32_staff", "MOTOR_MOVE", revs=0.917, rpm=30)
+    ack = future.result(timeout=7)          # 필요할 때만 대기 (요청 스레드에서)
+
+    ack = esp32_manager.client.send_command_sync("esp32_staff", "SET_AUTO_MODE", enabled=True)
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+from typing import Any, Awaitable, Optional
+
+from core.command_tracker import CommandAck, DEFAULT_ACK_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+# 응답 대기 시간 외에 큐 대기/전송에 허용하는 여유 (초)
+BRIDGE_MARGIN = 2.0
+
+
+class ESP32Client:
+    """다른 스레드에서 ESP32Manager 소유 루프로 명령을 넘기는 스레드 안전 클라이언트"""
+
+    def __init__(self, manager, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """
+        Args:
+            manager: ESP32Manager
+            loop: 소유 루프 (None이면 manager.loop, start_communication에서 설정됨)
+        """
+        self.manager = manager
+        self._loop = loop
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        return self._loop or self.manager.loop
+
+    @property
+    def is_available(self) -> bool:
+        """소유 루프가 살아 있어 명령을 넘길 수 있는지"""
+        loop = self.loop
+        return loop is not None and loop.is_running() and not loop.is_closed()
+
+    def in_owner_thread(self) -> bool:
+        """현재 스레드가 소유 루프 스레드인지 (이 경우 future.result()로 기다리면 안 됨)"""
+        loop = self.loop
+        if loop is None:
+            return False
+        try:
+            return asyncio.get_running_loop() is loop
+        except RuntimeError:
+            return False
+
+    def submit(self, coro: Awaitable[Any]) -> concurrent.futures.Future:
+        """코루틴을 소유 루프에서 실행
+
+        Returns:
+            concurrent.futures.Future (루프가 없으면 RuntimeError로 완료)
+        """
+        if not self.is_available:
+            if asyncio.iscoroutine(coro):
+                coro.close()
+            future = concurrent.futures.Future()
+            future.set_exception(RuntimeError("ESP32 통신 루프가 실행 중이 아닙니다"))
+            return future
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def send_command(self, device_id: str, command: str, timeout: float = DEFAULT_ACK_TIMEOUT,
+                     delay: float = 0.0, **kwargs) -> concurrent.futures.Future:
+        """명령 전송 (응답 또는 타임아웃까지 기다리는 Future 반환, 호출 스레드는 막지 않음)
+
+        Args:
+            device_id: 대상 디바이스 ID
+            command: 명령어
+            timeout: 응답 대기 시간 (초)
+            delay: 보내기 전 대기 시간 (초, 소유 루프에서 기다림)
+            **kwargs: 명령 파라미터
+
+        Returns:
+            CommandAck로 완료되는 concurrent.futures.Future
+        """
+        if not self.is_available:
+            future = concurrent.futures.Future()
+            future.set_result(CommandAck("", device_id, command, "failed", error="esp32_loop_unavailable"))
+            return future
+        return self.submit(self._send(device_id, command, timeout, delay, kwargs))
+
+    async def _send(self, device_id: str, command: str, timeout: float, delay: float, kwargs) -> CommandAck:
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return await self.manager.send_command_and_wait(device_id, command, timeout=timeout, **kwargs)
+
+    def send_command_sync(self, device_id: str, command: str, timeout: float = DEFAULT_ACK_TIMEOUT,
+                          **kwargs) -> CommandAck:
+        """명령 전송 후 결과까지 대기 (요청 스레드용, 소유 루프 스레드에서는 호출 금지)
+
+        Returns:
+            CommandAck (대기 초과 시 status="timeout", 오류 시 "failed")
+        """
+        if self.in_owner_thread():
+            raise RuntimeError("ESP32 통신 루프 스레드에서는 send_command_sync를 사용할 수 없습니다")
+
+        future = self.send_command(device_id, command, timeout=timeout, **kwargs)
+        try:
+            return future.result(timeout + BRIDGE_MARGIN)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            return CommandAck("", device_id, command, "timeout", error="bridge_timeout")
+        except Exception as e:
+            logger.error(f"ESP32 명령 브리지 오류: {device_id} {command}, {e}")
+            return CommandAck("", device_id, command, "failed", error=str(e))
+
+    def log_result(self, future: concurrent.futures.Future, label: str,
+                   log: Optional[logging.Logger] = None):
+        """결과를 기다리지 않는 호출용: 완료되면 로그만 남김"""
+        log = log or logger
+
+        def _done(done: concurrent.futures.Future):
+            try:
+                ack = done.result()
+            except Exception as e:
+                log.error(f"{label} 오류: {e}")
+                return
+            if ack.ok:
+                log.info(f"{label} 완료: {ack.device_id} {ack.status} rtt={ack.rtt_ms}ms")
+            else:
+                log.warning(f"{label} 실패: {ack.device_id} {ack.status} ({ack.error})")
+
+        future.add_done_callback(_done)
+        return future
+
@@ -10,7 +10,9 @@ ESP32 디바이스 매니저
 import asyncio
 import json
 import logging
+import time
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Dict, List, Optional, Callable, Any
 
 try:
@@ -27,9 +29,41 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'hardware'))
 
 from hardware.protocol_handler import ProtocolHandler, ParsedMessage, MessageType
+from core.serial_reader import SerialReader
+from core.serial_framer import SerialFramer
+from core.command_tracker import CommandTracker, CommandAck, DEFAULT_ACK_TIMEOUT
+from core.command_queue import DeviceCommandQueue, PACED_COMMANDS
+from core.esp32_client import ESP32Client
+from core.sensor_state import SensorStateTable
+from core.sensor_debounce import SensorDebouncer
+from core.event_dispatcher import EventDispatcher
+from core.link_supervisor import LinkSupervisor
+from core.serial_capture import SerialCapture, DIRECTION_RX, DIRECTION_TX, DEFAULT_MAX_BYTES, DEFAULT_BACKUPS
 
 logger = logging.getLogger(__name__)
 
+# ESP32 관련 키워드 및 USB ID (자동 감지용)
+ESP32_KEYWORDS = [
+    "esp32", "arduino", "cp210", "ch340", "ft232",
+    "usb serial", "silicon labs", "wch"
+]
+
+ESP32_USB_IDS = [
+    "10c4:ea60",  # CP2102 (ESP32 개발보드)
+    "1a86:7523",  # CH340G (ESP32 클론)
+    "0403:6001",  # FT232 (일부 ESP32)
+    "2341:0043",  # Arduino 호환
+    "1a86:55d4",  # CH9102 (새로운 ESP32)
+]
+
+# 마지막으로 검증된 포트→device_id 할당 캐시
+LAST_KNOWN_PORTS_PATH = Path(__file__).parent.parent / "instance" / "esp32_ports.json"
+
+# 연결 검증: 응답 대기 시간, 상태 요청 재전송 간격, 수신 확인 간격 (초)
+PROBE_TIMEOUT = 3.0
+PROBE_RESEND_INTERVAL = 1.0
+PROBE_POLL_INTERVAL = 0.02
+
 
 class ESP32Device:
     """ESP32 디바이스 정보"""
@@ -44,7 +78,15 @@ class ESP32Device:
         self.serial_connection: Optional[serial.Serial] = None
         self.is_online = False
         self.last_seen: Optional[datetime] = None
-        self.read_buffer = ""
+        self.last_rx_at: Optional[float] = None   # 마지막 수신 (monotonic, 링크 감시용)
+        self.framer = SerialFramer()
+        self.reader: Optional[SerialReader] = None
+        self.command_queue = DeviceCommandQueue(device_id)
+        self.sensor_state = SensorStateTable(device_id)
+        
+        # 연결 검증 결과 (자동 스캔)
+        self.verified = False
+        self.probe_reply_ms: Optional[float] = None
         
         # 통계
         self.stats = {
@@ -61,6 +103,7 @@ class ESP32Manager:
     def __init__(self):
         self.devices: Dict[str, ESP32Device] = {}
         self.protocol_handler = ProtocolHandler()
+        self.command_tracker = CommandTracker()
         
         # 이벤트 핸들러들
         self._event_handlers: Dict[str, List[Callable]] = {
@@ -69,18 +112,39 @@ class ESP32Manager:
             "nfc_scanned": [],
             "motor_completed": [],
             "sensor_triggered": [],
+            "sensor_snapshot": [],
             "device_error": [],
             "device_status": []
         }
         
+        # 센서 엣지 디바운스 (sensor_triggered 핸들러 앞 단계, window는 configure로 변경)
+        self.sensor_debouncer = SensorDebouncer(self._emit_sensor_event)
+        
+        # 핸들러 실행 단계 (읽기 루프는 넘기기만 하고 기다리지 않음)
+        self.event_dispatcher = EventDispatcher()
+        
         # 통신 루프 제어
         self._running = False
         self._read_tasks: List[asyncio.Task] = []
+        self._device_tasks: Dict[str, List[asyncio.Task]] = {}   # device_id → [읽기, 쓰기]
+        
+        # 링크 감시/자동 재연결 (start_communication에서 시작)
+        self.supervisor = LinkSupervisor(self, enabled=SERIAL_AVAILABLE)
+        
+        # 원시 송수신 바이트 캡처 (start_capture로 켬, 재생은 core.serial_capture.replay_capture)
+        self.capture: Optional[SerialCapture] = None
+        
+        # 시리얼 연결을 소유하는 이벤트 루프 (start_communication에서 설정)
+        # 다른 스레드는 client로 이 루프에 명령을 넘김
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.client = ESP32Client(self)
         
         # 자동 감지 설정
         self.auto_detect_enabled = True
         self._last_scan_time = 0
         self._scan_interval = 10.0  # 10초마다 재스캔
+        self.last_known_ports_path = LAST_KNOWN_PORTS_PATH
+        self.discovery_report: Dict[str, Any] = {}
         
         logger.info("ESP32Manager 초기화 완료")
     
@@ -137,7 +201,7 @@ class ESP32Manager:
             # 버퍼 초기화
             device.serial_connection.reset_input_buffer()
             device.serial_connection.reset_output_buffer()
-            device.read_buffer = ""
+            device.framer.reset()
             
             device.is_online = True
             device.last_seen = datetime.now(timezone.utc)
@@ -177,9 +241,112 @@ class ESP32Manager:
             logger.error(f"❌ ESP32 매핑 설정 로드 실패: {e}")
             return {"devices": {}, "fallback": {}}
     
+    def _load_last_known_ports(self) -> Dict[str, Dict[str, Any]]:
+        """마지막으로 검증된 포트→device_id 할당 로드 (없으면 빈 딕셔너리)"""
+        try:
+            if self.last_known_ports_path.exists():
+                with open(self.last_known_ports_path, 'r', encoding='utf-8') as f:
+                    return json.load(f).get("ports", {})
+        except Exception as e:
+            logger.warning(f"ESP32 포트 캐시 로드 실패: {e}")
+        return {}
+    
+    def _save_last_known_ports(self, ports: Dict[str, Dict[str, Any]]):
+        """검증된 포트→device_id 할당 저장 (다음 부팅 때 먼저 시도)"""
+        try:
+            self.last_known_ports_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.last_known_ports_path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"ports": ports}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.last_known_ports_path)
+        except Exception as e:
+            logger.warning(f"ESP32 포트 캐시 저장 실패: {e}")
+    
+    @staticmethod
+    def _filter_esp32_ports(ports, known_ports) -> List[Dict[str, Any]]:
+        """시리얼 포트 중 ESP32 후보 선별 (매핑/캐시에 있는 포트는 설명과 관계없이 포함, 먼저 정렬)"""
+        detected_ports = []
+        
+        for port in ports:
+            description = (port.description or "").lower()
+            hwid = (port.hwid or "").lower()
+            manufacturer = (port.manufacturer or "").lower()
+            
+            # ESP32 장치인지 확인
+            is_esp32 = port.device in known_ports
+            
+            # USB ID로 확인
+            if not is_esp32:
+                for usb_id in ESP32_USB_IDS:
+                    if usb_id in hwid:
+                        is_esp32 = True
+                        logger.info(f"📱 ESP32 USB ID 매칭: {port.device} ({usb_id})")
+                        break
+            
+            # 키워드로 확인
+            if not is_esp32:
+                for keyword in ESP32_KEYWORDS:
+                    if (keyword in description or 
+                        keyword in manufacturer or 
+                        keyword in hwid):
+                        is_esp32 = True
+                        logger.info(f"📱 ESP32 키워드 매칭: {port.device} ({keyword})")
+                        break
+            
+            if is_esp32:
+                detected_ports.append({
+                    "device": port.device,
+                    "description": port.description,
+                    "hwid": port.hwid,
+                    "manufacturer": port.manufacturer
+                })
+        
+        # 알려진 포트 먼저 (정렬은 안정적이므로 나머지는 원래 순서 유지)
+        detected_ports.sort(key=lambda info: info["device"] not in known_ports)
+        return detected_ports
+    
+    def _assign_device_ids(self, detected_ports: List[Dict[str, Any]], port_mapping: dict,
+                           fallback_mapping: dict, last_known: dict) -> List[Dict[str, Any]]:
+        """감지된 포트마다 device_id 결정
+        
+        우선순위: 이미 등록된 포트 → esp32_mapping.json → 마지막 검증 캐시 → fallback(auto_N)
+        
+        Returns:
+            [{"port", "device_id", "source", "zones"}]
+        """
+        registered = {dev.serial_port: dev_id for dev_id, dev in self.devices.items()}
+        used = set()
+        assignments = []
+        
+        for i, port_info in enumerate(detected_ports):
+            port_device = port_info["device"]
+            zones = []
+            
+            if port_device in registered:
+                device_id, source = registered[port_device], "registered"
+            elif port_device in port_mapping and port_mapping[port_device]["device_id"] not in used:
+                device_id, source = port_mapping[port_device]["device_id"], "mapping"
+                zones = port_mapping[port_device].get("zones", [])
+            elif port_device in last_known and last_known[port_device].get("device_id") not in used:
+                device_id, source = last_known[port_device]["device_id"], "last_known"
+            else:
+                # fallback: auto_0, auto_1 형식으로 매핑
+                device_id = fallback_mapping.get(f"auto_{i}", f"esp32_auto_{i}")
+                if device_id in used:
+                    device_id = f"esp32_auto_{i}"
+                source = "fallback"
+            
+            used.add(device_id)
+            assignments.append({"port": port_device, "device_id": device_id, "source": source, "zones": zones})
+            logger.info(f"🗺️ ESP32 포트 할당: {port_device} → {device_id} ({source})")
+        
+        return assignments
+    
     async def scan_and_connect_esp32_devices(self) -> int:
         """ESP32 디바이스 자동 스캔 및 연결
         
+        후보 포트를 모두 동시에 열고 검증한다. 부팅 시간은 포트 수가 아니라 가장 느린 포트 하나에 비례한다.
+        
         Returns:
             연결된 디바이스 수
         """
@@ -187,114 +354,37 @@ class ESP32Manager:
             logger.warning("pyserial 없음, ESP32 자동 감지 불가")
             return 0
         
-        # ESP32 매핑 설정 로드
+        # ESP32 매핑 설정 및 마지막 검증 캐시 로드
         mapping_config = self._load_esp32_mapping()
         port_mapping = mapping_config.get("devices", {})
         fallback_mapping = mapping_config.get("fallback", {})
+        last_known = self._load_last_known_ports()
         
         logger.info("🔍 ESP32 디바이스 자동 스캔 시작...")
-        connected_count = 0
         
         try:
-            # 사용 가능한 시리얼 포트 스캔
-            ports = serial.tools.list_ports.comports()
-            
-            # ESP32 관련 키워드 및 USB ID
-            esp32_keywords = [
-                "esp32", "arduino", "cp210", "ch340", "ft232",
-                "usb serial", "silicon labs", "wch"
-            ]
-            
-            esp32_usb_ids = [
-                "10c4:ea60",  # CP2102 (ESP32 개발보드)
-                "1a86:7523",  # CH340G (ESP32 클론)
-                "0403:6001",  # FT232 (일부 ESP32)
-                "2341:0043",  # Arduino 호환
-                "1a86:55d4",  # CH9102 (새로운 ESP32)
-            ]
-            
-            detected_ports = []
-            
-            for port in ports:
-                description = (port.description or "").lower()
-                hwid = (port.hwid or "").lower()
-                manufacturer = (port.manufacturer or "").lower()
-                
-                # ESP32 장치인지 확인
-                is_esp32 = False
-                
-                # USB ID로 확인
-                for usb_id in esp32_usb_ids:
-                    if usb_id in hwid:
-                        is_esp32 = True
-                        logger.info(f"📱 ESP32 USB ID 매칭: {port.device} ({usb_id})")
-                        break
-                
-                # 키워드로 확인
-                if not is_esp32:
-                    for keyword in esp32_keywords:
-                        if (keyword in description or 
-                            keyword in manufacturer or 
-                            keyword in hwid):
-                            is_esp32 = True
-                            logger.info(f"📱 ESP32 키워드 매칭: {port.device} ({keyword})")
-                            break
-                
-                if is_esp32:
-                    detected_ports.append({
-                        "device": port.device,
-                        "description": port.description,
-                        "hwid": port.hwid,
-                        "manufacturer": port.manufacturer
-                    })
+            # 사용 가능한 시리얼 포트 스캔 (sysfs 조회는 스레드에서)
+            loop = asyncio.get_running_loop()
+            ports = await loop.run_in_executor(None, serial.tools.list_ports.comports)
             
+            detected_ports = self._filter_esp32_ports(ports, set(port_mapping) | set(last_known))
             logger.info(f"🔍 감지된 ESP32 후보: {len(detected_ports)}개")
             
-            # 감지된 포트들에 연결 시도
-            for i, port_info in enumerate(detected_ports):
-                port_device = port_info["device"]
-                
-                # 포트 매핑에서 device_id 찾기
-                if port_device in port_mapping:
-                    device_id = port_mapping[port_device]["device_id"]
-                    zones = port_mapping[port_device].get("zones", [])
-                    logger.info(f"🗺️ 매핑 발견: {port_device} → {device_id} (구역: {zones})")
-                else:
-                    # fallback: auto_0, auto_1 형식으로 매핑
-                    auto_key = f"auto_{i}"
-                    device_id = fallback_mapping.get(auto_key, f"esp32_auto_{i}")
-                    logger.info(f"🔄 Fallback 매핑: {port_device} → {device_id}")
-                
-                # 이미 등록된 포트인지 확인
-                existing_device = None
-                for dev_id, dev in self.devices.items():
-                    if dev.serial_port == port_device:
-                        existing_device = dev
-                        device_id = dev_id
-                        break
-                
-                if not existing_device:
-                    # 새 디바이스 추가
-                    self.add_device(
-                        device_id=device_id,
-                        serial_port=port_device,
-                        device_type="gym_controller"
-                    )
-                    logger.info(f"➕ 새 ESP32 디바이스 추가: {device_id} @ {port_device}")
-                
-                # 연결 시도
-                device = self.devices[device_id]
-                if await self._connect_and_verify_esp32(device):
-                    connected_count += 1
-                    logger.info(f"✅ ESP32 연결 성공: {device_id} @ {port_device}")
-                else:
-                    logger.warning(f"❌ ESP32 연결 실패: {device_id} @ {port_device}")
-                    # 연결 실패한 자동 감지 디바이스는 제거
-                    if device_id.startswith("esp32_auto_"):
-                        del self.devices[device_id]
+            assignments = self._assign_device_ids(detected_ports, port_mapping, fallback_mapping, last_known)
+            connected_count = await self._probe_ports(assignments)
+            
+            # 검증된 할당은 다음 부팅 때 먼저 시도
+            verified = {
+                port: {"device_id": result["device_id"], "verified_at": self.discovery_report["started_at"]}
+                for port, result in self.discovery_report["ports"].items()
+                if result["verified"]
+            }
+            if verified:
+                self._save_last_known_ports({**last_known, **verified})
             
-            logger.info(f"🎯 ESP32 자동 연결 완료: {connected_count}/{len(detected_ports)}")
-            self._last_scan_time = asyncio.get_event_loop().time()
+            logger.info(f"🎯 ESP32 자동 연결 완료: {connected_count}/{len(detected_ports)} "
+                        f"({self.discovery_report['total_ms']:.0f}ms)")
+            self._last_scan_time = loop.time()
             
             return connected_count
             
@@ -302,42 +392,162 @@ class ESP32Manager:
             logger.error(f"ESP32 자동 스캔 오류: {e}")
             return 0
     
-    async def _connect_and_verify_esp32(self, device: ESP32Device) -> bool:
+    async def _probe_ports(self, assignments: List[Dict[str, Any]]) -> int:
+        """할당된 포트들을 동시에 연결/검증하고 포트별 소요시간 기록
+        
+        Returns:
+            연결된 디바이스 수
+        """
+        for assignment in assignments:
+            if assignment["device_id"] not in self.devices:
+                self.add_device(
+                    device_id=assignment["device_id"],
+                    serial_port=assignment["port"],
+                    device_type="gym_controller"
+                )
+                logger.info(f"➕ 새 ESP32 디바이스 추가: {assignment['device_id']} @ {assignment['port']}")
+        
+        started_at = datetime.now(timezone.utc).isoformat()
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(self._probe_port(assignment, started) for assignment in assignments),
+            return_exceptions=True
+        )
+        
+        ports_report = {}
+        connected_count = 0
+        for assignment, result in zip(assignments, results):
+            if isinstance(result, Exception):
+                logger.error(f"ESP32 포트 검사 오류: {assignment['port']}, {result}")
+                result = {"connected": False, "verified": False, "elapsed_ms": None, "error": str(result)}
+            ports_report[assignment["port"]] = {
+                "device_id": assignment["device_id"],
+                "source": assignment["source"],
+                **result
+            }
+            if result["connected"]:
+                connected_count += 1
+            elif assignment["device_id"].startswith("esp32_auto_"):
+                # 연결 실패한 자동 감지 디바이스는 제거
+                self.devices.pop(assignment["device_id"], None)
+        
+        self.discovery_report = {
+            "started_at": started_at,
+            "total_ms": round((time.perf_counter() - started) * 1000, 1),
+            "ports": ports_report
+        }
+        return connected_count
+    
+    async def _probe_port(self, assignment: Dict[str, Any], started: float) -> Dict[str, Any]:
+        """포트 하나 연결/검증 (포트별 소요시간 포함)"""
+        device = self.devices[assignment["device_id"]]
+        connected = await self._connect_and_verify_esp32(device)
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        
+        if connected:
+            logger.info(f"✅ ESP32 연결 성공: {device.device_id} @ {device.serial_port} ({elapsed_ms:.0f}ms)")
+        else:
+            logger.warning(f"❌ ESP32 연결 실패: {device.device_id} @ {device.serial_port} ({elapsed_ms:.0f}ms)")
+        
+        return {
+            "connected": connected,
+            "verified": device.verified,
+            "elapsed_ms": elapsed_ms,
+            "reply_ms": device.probe_reply_ms
+        }
+    
+    def get_discovery_report(self) -> Dict[str, Any]:
+        """마지막 자동 스캔의 포트별 검사 결과/소요시간"""
+        return dict(self.discovery_report)
+    
+    def start_capture(self, path, max_bytes: int = DEFAULT_MAX_BYTES, backups: int = DEFAULT_BACKUPS) -> bool:
+        """원시 송수신 바이트 캡처 시작 (이미 기록 중이면 새 파일로 교체)
+        
+        Args:
+            path: 캡처 파일 경로
+            max_bytes: 파일 하나의 최대 크기 (넘으면 회전)
+            backups: 남길 회전본 수
+            
+        Returns:
+            시작 성공 여부
+        """
+        self.stop_capture()
+        try:
+            self.capture = SerialCapture(path, max_bytes=max_bytes, backups=backups)
+        except OSError as e:
+            logger.error(f"시리얼 캡처 시작 실패: {path}, {e}")
+            return False
+        logger.info(f"📼 시리얼 캡처 시작: {path} (최대 {max_bytes // 1024}KB x {backups + 1})")
+        return True
+    
+    def stop_capture(self):
+        """캡처 중지 (파일 닫기)"""
+        capture, self.capture = self.capture, None
+        if capture is not None:
+            capture.close()
+            logger.info(f"📼 시리얼 캡처 중지: {capture.path} ({capture.stats['records']}개 레코드)")
+    
+    def get_capture_stats(self) -> Optional[Dict[str, Any]]:
+        """캡처 기록 상태 (기록 중이 아니면 None)"""
+        return self.capture.get_stats() if self.capture is not None else None
+    
+    def get_event_stats(self) -> Dict[str, Any]:
+        """이벤트 핸들러 대기열/대기시간/실행시간 통계"""
+        return self.event_dispatcher.get_stats()
+    
+    async def _connect_and_verify_esp32(self, device: ESP32Device, timeout: float = PROBE_TIMEOUT) -> bool:
         """ESP32 연결 및 검증
         
+        상태 요청을 보내고 ESP32 펌웨어 형식의 첫 JSON 응답이 오면 바로 검증 완료.
+        포트를 열 때 보드가 리셋되어 첫 요청을 놓칠 수 있으므로 응답이 없으면 주기적으로 다시 보낸다.
+        
         Args:
             device: ESP32 디바이스 객체
+            timeout: 응답 대기 시간 (초)
             
         Returns:
-            연결 및 검증 성공 여부
+            연결 및 검증 성공 여부 (응답이 없어도 연결되었으면 True)
         """
+        device.verified = False
+        device.probe_reply_ms = None
+        
         # 기본 연결 시도
         if not await self._connect_device(device):
             return False
         
+        connection = device.serial_connection
+        if connection is None:
+            return True  # 스텁 모드
+        
         try:
-            # ESP32인지 확인하기 위해 상태 요청
             status_cmd = self.protocol_handler.create_esp32_status_command()
-            await self._send_raw_message(device, status_cmd)
+            framer = SerialFramer()
+            started = time.perf_counter()
+            next_send = started
             
-            # 응답 대기 (3초)
-            for _ in range(30):  # 100ms * 30 = 3초
-                if device.serial_connection and device.serial_connection.in_waiting > 0:
-                    try:
-                        data = device.serial_connection.read(device.serial_connection.in_waiting)
-                        response = data.decode('utf-8', errors='ignore').strip()
-                        
-                        # ESP32 응답인지 확인
-                        if ('esp32' in response.lower() or 
-                            'device_id' in response or
-                            'message_type' in response):
-                            logger.info(f"✅ ESP32 검증 성공: {device.device_id}")
+            while True:
+                now = time.perf_counter()
+                if now - started >= timeout:
+                    break
+                
+                if now >= next_send:
+                    await self._send_raw_message(device, status_cmd)
+                    next_send = now + PROBE_RESEND_INTERVAL
+                
+                waiting = connection.in_waiting
+                if waiting:
+                    data = connection.read(waiting)
+                    if self.capture is not None:
+                        self.capture.record(device.device_id, DIRECTION_RX, data)
+                    for frame in framer.feed(data):
+                        if self._is_esp32_reply(frame):
+                            device.verified = True
+                            device.last_rx_at = time.monotonic()
+                            device.probe_reply_ms = round((time.perf_counter() - started) * 1000, 1)
+                            logger.info(f"✅ ESP32 검증 성공: {device.device_id} ({device.probe_reply_ms:.0f}ms)")
                             return True
-                            
-                    except Exception as e:
-                        logger.debug(f"ESP32 응답 읽기 오류: {e}")
                 
-                await asyncio.sleep(0.1)
+                await asyncio.sleep(PROBE_POLL_INTERVAL)
             
             logger.warning(f"⚠️ ESP32 응답 없음: {device.device_id}")
             return True  # 연결은 되었으니 일단 유지
@@ -345,6 +555,16 @@ class ESP32Manager:
         except Exception as e:
             logger.error(f"ESP32 검증 오류: {device.device_id}, {e}")
             return False
+    
+    def _is_esp32_reply(self, frame: str) -> bool:
+        """ESP32 펌웨어가 보낸 JSON 메시지인지 (device_id 또는 message_type 포함)"""
+        if not frame.startswith("{"):
+            return False
+        try:
+            message = json.loads(frame)
+        except ValueError:
+            return False
+        return isinstance(message, dict) and ("device_id" in message or "message_type" in message)
 
     async def disconnect_all_devices(self):
         """모든 ESP32 디바이스 연결 해제"""
@@ -358,7 +578,7 @@ class ESP32Manager:
                     logger.error(f"ESP32 연결 해제 오류: {device.device_id}, {e}")
     
     async def send_command(self, device_id: str, command: str, **kwargs) -> bool:
-        """ESP32에 명령 전송
+        """ESP32에 명령 전송 (응답은 기다리지 않음)
         
         Args:
             device_id: 대상 디바이스 ID
@@ -368,24 +588,88 @@ class ESP32Manager:
         Returns:
             전송 성공 여부
         """
+        if self._in_foreign_loop():
+            # 다른 루프(요청 스레드의 asyncio.run 등)에서 호출: 소유 루프에서 실행
+            return await asyncio.wrap_future(self.client.submit(self.send_command(device_id, command, **kwargs)))
+        
+        future = await self.submit_command(device_id, command, **kwargs)
+        return not future.done() or future.result().ok
+    
+    async def send_command_and_wait(self, device_id: str, command: str,
+                                    timeout: float = DEFAULT_ACK_TIMEOUT, **kwargs) -> CommandAck:
+        """ESP32에 명령 전송 후 응답(또는 타임아웃)까지 대기
+        
+        Returns:
+            CommandAck (status: acked/sent/timeout/failed, rtt_ms, response)
+        """
+        if self._in_foreign_loop():
+            return await asyncio.wrap_future(
+                self.client.send_command(device_id, command, timeout=timeout, **kwargs))
+        
+        future = await self.submit_command(device_id, command, timeout=timeout, **kwargs)
+        return await future
+    
+    def _in_foreign_loop(self) -> bool:
+        """소유 루프가 따로 돌고 있는데 다른 루프에서 호출되었는지"""
+        owner = self.loop
+        if owner is None or not owner.is_running():
+            return False
+        return asyncio.get_running_loop() is not owner
+    
+    async def submit_command(self, device_id: str, command: str,
+                             timeout: float = DEFAULT_ACK_TIMEOUT, priority: Optional[int] = None,
+                             **kwargs) -> asyncio.Future:
+        """ESP32에 명령 전송 후 완료 Future 반환
+        
+        명령마다 cmd_id를 붙여 보내고, 같은 디바이스의 응답(motor_completed, locker_opened 등)이
+        오거나 timeout이 지나면 Future가 CommandAck로 완료된다.
+        응답이 없는 명령(SET_AUTO_MODE 등)은 전송 결과로 바로 완료된다.
+        
+        통신 루프가 돌고 있으면 디바이스 송신 큐에 넣고(우선순위/병합 적용) writer 태스크가 보낸다.
+        
+        Args:
+            device_id: 대상 디바이스 ID
+            command: 명령어
+            timeout: 응답 대기 시간 (초)
+            priority: 큐 우선순위 (None이면 명령별 기본값, 작을수록 먼저)
+            **kwargs: 명령 파라미터
+            
+        Returns:
+            CommandAck로 완료되는 asyncio.Future (현재 이벤트 루프 소속)
+        """
+        device = self.devices.get(device_id)
+        if device and device.is_online and device.command_queue.is_running:
+            return device.command_queue.put(command, kwargs, timeout, priority)
+        
+        return await self._send_command_now(device_id, command, timeout, **kwargs)
+    
+    async def _send_command_now(self, device_id: str, command: str, timeout: float,
+                                **kwargs) -> asyncio.Future:
+        """큐를 거치지 않고 바로 전송 (writer 태스크 또는 통신 루프 시작 전)"""
+        cmd_id, future = self.command_tracker.register(device_id, command, timeout)
+        
         device = self.devices.get(device_id)
         if not device or not device.is_online:
             logger.error(f"ESP32 디바이스 오프라인: {device_id}")
-            return False
+            self.command_tracker.complete_sent(device_id, cmd_id, False, "device_offline")
+            return future
         
         # 기존 프로토콜에 맞는 명령 형식으로 변환
         if device.device_type == "barcode_scanner":
             message = self._build_barcode_command(command, **kwargs)
         elif device.device_type == "motor_controller":
-            message = self._build_motor_command(command, **kwargs)
+            message = self._build_motor_command(command, cmd_id=cmd_id, **kwargs)
         elif device.device_type == "gym_controller":
             # 통합 ESP32 디바이스 - 모터 명령 사용
-            message = self._build_motor_command(command, **kwargs)
+            message = self._build_motor_command(command, cmd_id=cmd_id, **kwargs)
         else:
             logger.error(f"알 수 없는 디바이스 타입: {device.device_type}")
-            return False
+            self.command_tracker.complete_sent(device_id, cmd_id, False, "unknown_device_type")
+            return future
         
-        return await self._send_raw_message(device, message)
+        sent = await self._send_raw_message(device, message)
+        self.command_tracker.complete_sent(device_id, cmd_id, sent)
+        return future
     
     def _build_barcode_command(self, command: str, **kwargs) -> str:
         """바코드 스캐너 명령 생성"""
@@ -398,25 +682,29 @@ class ESP32Manager:
         else:
             return f"CMD:{command}"
     
-    def _build_motor_command(self, command: str, **kwargs) -> str:
-        """모터 컨트롤러 명령 생성 - ESP32 JSON 호환"""
+    def _build_motor_command(self, command: str, cmd_id: Optional[str] = None, **kwargs) -> str:
+        """모터 컨트롤러 명령 생성 - ESP32 JSON 호환 (cmd_id는 응답 매칭용)"""
         # 새로운 ESP32는 JSON 명령을 받음
         if command == "OPEN_LOCKER":
             locker_id = kwargs.get("locker_id", "")
             duration = kwargs.get("duration_ms", 3000)
-            return self.protocol_handler.create_esp32_locker_open_command(locker_id, duration)
+            return self.protocol_handler.create_esp32_locker_open_command(locker_id, duration, cmd_id=cmd_id)
         elif command == "GET_STATUS":
-            return self.protocol_handler.create_esp32_status_command()
+            return self.protocol_handler.create_esp32_status_command(cmd_id=cmd_id)
+        elif command == "GET_SENSORS":
+            return self.protocol_handler.create_esp32_sensor_snapshot_command(cmd_id=cmd_id)
         elif command == "SET_AUTO_MODE":
             enabled = kwargs.get("enabled", True)
-            return self.protocol_handler.create_esp32_auto_mode_command(enabled)
+            return self.protocol_handler.create_esp32_auto_mode_command(enabled, cmd_id=cmd_id)
         elif command == "MOTOR_MOVE":
             revs = kwargs.get("revs", 1.0)
             rpm = kwargs.get("rpm", 60.0)
             accel = kwargs.get("accel", True)
-            return self.protocol_handler.create_esp32_motor_command(revs, rpm, accel)
+            return self.protocol_handler.create_esp32_motor_command(revs, rpm, accel, cmd_id=cmd_id)
         else:
             # 기본 JSON 명령
+            if cmd_id:
+                kwargs["cmd_id"] = cmd_id
             return self.protocol_handler.create_esp32_json_command(command, **kwargs)
     
     async def _send_raw_message(self, device: ESP32Device, message: str) -> bool:
@@ -426,9 +714,11 @@ class ESP32Manager:
         
         try:
             # 메시지 전송 (줄바꿈 추가)
-            full_message = message + "\n"
-            device.serial_connection.write(full_message.encode('utf-8'))
+            data = (message + "\n").encode('utf-8')
+            device.serial_connection.write(data)
             device.serial_connection.flush()
+            if self.capture is not None:
+                self.capture.record(device.device_id, DIRECTION_TX, data)
             
             device.stats["messages_sent"] += 1
             device.last_seen = datetime.now(timezone.utc)
@@ -441,6 +731,7 @@ class ESP32Manager:
             device.stats["errors"] += 1
             device.stats["last_error"] = str(e)
             device.is_online = False
+            self.supervisor.wake()
             return False
     
     async def start_communication(self):
@@ -450,20 +741,26 @@ class ESP32Manager:
             return
         
         self._running = True
+        self.loop = asyncio.get_running_loop()
         
-        # 각 디바이스별로 읽기 태스크 시작
+        # 각 디바이스별로 읽기/쓰기 태스크 시작
         for device in self.devices.values():
             if device.is_online:
-                task = asyncio.create_task(self._device_read_loop(device))
-                self._read_tasks.append(task)
+                self.start_link(device)
+        
+        # 끊긴 디바이스는 감시 태스크가 다시 연결
+        self.supervisor.start()
         
         logger.info("ESP32 통신 시작")
     
     async def stop_communication(self):
         """ESP32 통신 중지"""
         self._running = False
+        await self.supervisor.stop()
+        self.loop = None
+        self.sensor_debouncer.cancel_pending()
         
-        # 모든 읽기 태스크 취소
+        # 모든 읽기/쓰기 태스크 취소
         for task in self._read_tasks:
             task.cancel()
         
@@ -472,81 +769,189 @@ class ESP32Manager:
             await asyncio.gather(*self._read_tasks, return_exceptions=True)
         
         self._read_tasks.clear()
+        self._device_tasks.clear()
+        
+        # 이미 넘긴 이벤트는 잠시 처리하고 정리
+        await self.event_dispatcher.close()
+        self.stop_capture()
         logger.info("ESP32 통신 중지")
     
-    async def _device_read_loop(self, device: ESP32Device):
-        """개별 디바이스 읽기 루프"""
-        logger.info(f"ESP32 읽기 루프 시작: {device.device_id}")
+    def start_link(self, device: ESP32Device):
+        """디바이스 읽기/쓰기 태스크 시작 (통신 루프에서 호출)"""
+        read_task = asyncio.create_task(self._device_read_loop(device))
+        device.command_queue.attach()
+        write_task = asyncio.create_task(self._device_write_loop(device))
+        self._device_tasks[device.device_id] = [read_task, write_task]
+        self._read_tasks.extend((read_task, write_task))
+    
+    def is_link_running(self, device: ESP32Device) -> bool:
+        """디바이스 읽기 루프가 돌고 있는지"""
+        tasks = self._device_tasks.get(device.device_id)
+        return bool(tasks) and not tasks[0].done()
+    
+    async def close_link(self, device: ESP32Device):
+        """디바이스 읽기/쓰기 태스크를 멈추고 포트 닫기 (대기 명령은 실패 처리)"""
+        device.is_online = False
+        tasks = self._device_tasks.pop(device.device_id, [])
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._read_tasks = [task for task in self._read_tasks if task not in tasks]
         
-        while self._running and device.is_online:
+        self.sensor_debouncer.cancel_pending(device.device_id)
+        device.framer.reset()
+        device.last_rx_at = None
+        if device.serial_connection is not None:
             try:
-                await self._read_device_messages(device)
-                await asyncio.sleep(0.01)  # 10ms 간격
-                
-            except asyncio.CancelledError:
-                break
+                device.serial_connection.close()
             except Exception as e:
-                logger.error(f"ESP32 읽기 루프 오류: {device.device_id}, {e}")
-                device.stats["errors"] += 1
-                device.stats["last_error"] = str(e)
-                await asyncio.sleep(1)  # 오류 시 1초 대기
+                logger.debug(f"ESP32 포트 닫기 오류 (무시): {device.device_id}, {e}")
+    
+    async def reopen_link(self, device: ESP32Device, search_ports: bool = False) -> bool:
+        """디바이스 다시 연결/검증
         
-        logger.info(f"ESP32 읽기 루프 종료: {device.device_id}")
+        Args:
+            device: 대상 디바이스
+            search_ports: 원래 포트가 안 되면 다른 ESP32 후보 포트도 확인 (USB 재인식으로 이름이 바뀐 경우)
+            
+        Returns:
+            연결 성공 여부
+        """
+        if await self._connect_and_verify_esp32(device):
+            return True
+        if not search_ports:
+            return False
+        
+        original_port = device.serial_port
+        for port in await self._replug_candidates(device):
+            device.serial_port = port
+            # 다른 포트는 이 디바이스가 맞는지 응답으로 확인된 경우만 사용
+            if await self._connect_and_verify_esp32(device) and device.verified:
+                logger.info(f"🔀 ESP32 포트 변경: {device.device_id} {original_port} → {port}")
+                last_known = self._load_last_known_ports()
+                last_known.pop(original_port, None)
+                last_known[port] = {"device_id": device.device_id,
+                                    "verified_at": datetime.now(timezone.utc).isoformat()}
+                self._save_last_known_ports(last_known)
+                return True
+            if device.serial_connection is not None:
+                device.serial_connection.close()
+            device.is_online = False
+        
+        device.serial_port = original_port
+        return False
     
-    async def _read_device_messages(self, device: ESP32Device):
-        """디바이스에서 메시지 읽기"""
-        if not device.serial_connection or not device.is_online:
+    async def _replug_candidates(self, device: ESP32Device) -> List[str]:
+        """다른 디바이스가 쓰지 않는 ESP32 후보 포트 (이 디바이스의 마지막 검증 포트 먼저)"""
+        if not SERIAL_AVAILABLE:
+            return []
+        
+        ports = await asyncio.get_running_loop().run_in_executor(None, serial.tools.list_ports.comports)
+        known = {port for port, info in self._load_last_known_ports().items()
+                 if info.get("device_id") == device.device_id}
+        in_use = {other.serial_port for other in self.devices.values()
+                  if other is not device and other.is_online}
+        return [info["device"] for info in self._filter_esp32_ports(ports, known)
+                if info["device"] not in in_use and info["device"] != device.serial_port]
+    
+    def request_reconnect(self, device_id: Optional[str] = None) -> List[str]:
+        """수동 재연결 요청 (통신 루프에서 호출, 다른 스레드는 client.submit 사용)
+        
+        Returns:
+            재연결을 시작한 device_id 목록
+        """
+        return self.supervisor.request_reconnect(device_id)
+    
+    def get_link_stats(self) -> Dict[str, Any]:
+        """링크 감시 상태와 디바이스별 끊김/재연결/복구 시간"""
+        return self.supervisor.get_stats()
+    
+    async def _device_read_loop(self, device: ESP32Device):
+        """개별 디바이스 읽기 루프 (바이트가 도착할 때만 깨어남)"""
+        if not device.serial_connection:
+            logger.info(f"ESP32 시리얼 연결 없음, 읽기 루프 생략: {device.device_id}")
             return
         
+        logger.info(f"ESP32 읽기 루프 시작: {device.device_id}")
+        
+        reader = SerialReader(device.serial_connection, device.device_id)
+        device.reader = reader
+        reader.start()
+        
         try:
-            # 시리얼 데이터 읽기 (더 안정적인 방식)
-            if device.serial_connection.in_waiting > 0:
-                # 한 번에 읽을 바이트 수 제한 (버퍼 오버플로우 방지)
-                max_read = min(device.serial_connection.in_waiting, 1024)
-                data = device.serial_connection.read(max_read)
-                device.read_buffer += data.decode('utf-8', errors='ignore')
+            while self._running and device.is_online:
+                try:
+                    data = await reader.read()
+                    if not data:
+                        logger.warning(f"ESP32 시리얼 연결 끊김: {device.device_id}")
+                        device.is_online = False
+                        break
+                    
+                    await self._read_device_messages(device, data)
+                    
+                except asyncio.CancelledError:
+                    break
+                except Exception as e:
+                    logger.error(f"ESP32 읽기 루프 오류: {device.device_id}, {e}")
+                    device.stats["errors"] += 1
+                    device.stats["last_error"] = str(e)
+        finally:
+            reader.close()
+            failed = self.command_tracker.fail_device(device.device_id, "read_loop_stopped")
+            if failed:
+                logger.warning(f"ESP32 응답 대기 명령 {failed}개 실패 처리: {device.device_id}")
+            if self._running:
+                self.supervisor.wake()
+        
+        logger.info(f"ESP32 읽기 루프 종료: {device.device_id}")
+    
+    async def _device_write_loop(self, device: ESP32Device):
+        """개별 디바이스 쓰기 루프 (송신 큐를 우선순위 순으로 하나씩 전송)
+        
+        문/모터 명령은 펌웨어 응답(또는 타임아웃)까지 기다린 뒤 다음 명령을 보낸다.
+        펌웨어는 모터 회전 중 시리얼 명령을 처리하지 않기 때문이다.
+        """
+        queue = device.command_queue
+        
+        try:
+            while self._running:
+                item = await queue.get()
+                if item is None:
+                    break
                 
-                # 버퍼가 너무 커지면 일부 삭제 (메모리 보호)
-                if len(device.read_buffer) > 4096:
-                    device.read_buffer = device.read_buffer[-2048:]
-                    logger.warning(f"ESP32 버퍼 크기 제한: {device.device_id}")
+                if not device.is_online:
+                    item.resolve(CommandAck("", device.device_id, item.command, "failed", error="device_offline"))
+                    continue
                 
-                # 완성된 메시지 처리 (줄바꿈으로 구분)
-                while '\n' in device.read_buffer:
-                    line, device.read_buffer = device.read_buffer.split('\n', 1)
-                    line = line.strip()
-                    
-                    if line:
-                        await self._process_received_message(device, line)
+                try:
+                    future = await self._send_command_now(
+                        device.device_id, item.command, item.timeout, **item.kwargs)
+                except Exception as e:
+                    logger.error(f"ESP32 명령 전송 오류: {device.device_id}, {e}")
+                    item.resolve(CommandAck("", device.device_id, item.command, "failed", error=str(e)))
+                    continue
                 
-                # 줄바꿈 없이 JSON이 여러 개 붙어있는 경우 처리
-                # JSON 형식: {...}로 시작하고 끝남
-                while device.read_buffer.startswith('{'):
-                    try:
-                        # 완전한 JSON을 찾기
-                        brace_count = 0
-                        json_end = -1
-                        for i, char in enumerate(device.read_buffer):
-                            if char == '{':
-                                brace_count += 1
-                            elif char == '}':
-                                brace_count -= 1
-                                if brace_count == 0:
-                                    json_end = i + 1
-                                    break
-                        
-                        if json_end > 0:
-                            json_str = device.read_buffer[:json_end]
-                            device.read_buffer = device.read_buffer[json_end:].lstrip()
-                            await self._process_received_message(device, json_str)
-                        else:
-                            # 완전한 JSON이 아직 없음, 다음에 더 읽기
-                            break
-                    except Exception as e:
-                        logger.error(f"ESP32 JSON 추출 오류: {device.device_id}, {e}")
-                        # 버퍼 초기화
-                        device.read_buffer = ""
-                        break
+                future.add_done_callback(lambda done, item=item: item.resolve(done.result()))
+                
+                if item.command in PACED_COMMANDS and not future.done():
+                    await asyncio.wait({future})
+                await asyncio.sleep(queue.min_interval)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            failed = queue.close()
+            if failed:
+                logger.warning(f"ESP32 송신 대기 명령 {failed}개 실패 처리: {device.device_id}")
+    
+    async def _read_device_messages(self, device: ESP32Device, data: bytes):
+        """수신 바이트를 프레이머에 넣고 완성된 메시지 처리"""
+        device.last_rx_at = time.monotonic()
+        if self.capture is not None:
+            self.capture.record(device.device_id, DIRECTION_RX, data)
+        try:
+            for frame in device.framer.feed(data):
+                await self._process_received_message(device, frame)
                         
         except Exception as e:
             logger.error(f"ESP32 메시지 읽기 오류: {device.device_id}, {e}")
@@ -563,6 +968,18 @@ class ESP32Manager:
                 device.stats["messages_received"] += 1
                 device.last_seen = datetime.now(timezone.utc)
                 
+                # 명령 응답이면 대기 중인 명령 완료
+                if "response_type" in parsed.data:
+                    self.command_tracker.resolve(device.device_id, parsed.data)
+                
+                # 센서 상태 테이블 갱신 (스냅샷이면 놓친 엣지를 먼저 이벤트로 보냄)
+                if parsed.type == MessageType.SENSOR_SNAPSHOT:
+                    await self._reconcile_sensor_snapshot(device, parsed)
+                elif parsed.data.get("sensor_type") == "ir_sensor":
+                    data = parsed.data
+                    device.sensor_state.apply_edge(data.get("chip_idx"), data.get("addr"),
+                                                   data.get("pin"), data.get("state"))
+                
                 # 메시지 타입별 이벤트 발생
                 await self._dispatch_event(device, parsed)
                 
@@ -574,6 +991,29 @@ class ESP32Manager:
             logger.error(f"ESP32 메시지 처리 오류: {device.device_id}, {e}")
             device.stats["errors"] += 1
     
+    async def _reconcile_sensor_snapshot(self, device: ESP32Device, snapshot: ParsedMessage):
+        """스냅샷과 센서 상태 테이블 대조: 놓친 엣지는 reconciled 표시한 sensor_triggered로 발생"""
+        seq = snapshot.data["seq"]
+        missed = device.sensor_state.reconcile(seq, snapshot.data["chips"])
+        if not missed:
+            return
+        
+        logger.warning(f"⚠️ 놓친 센서 엣지 {len(missed)}개 복구: {device.device_id} (스냅샷 #{seq})")
+        for edge in missed:
+            edge_message = ParsedMessage(
+                MessageType.STATUS_REPORT,
+                {
+                    "sensor_type": "ir_sensor",
+                    "device_id": device.device_id,
+                    **edge,
+                    "reconciled": True,
+                    "snapshot_seq": seq,
+                },
+                snapshot.timestamp,
+                snapshot.raw_message,
+            )
+            await self._dispatch_event(device, edge_message)
+    
     async def _dispatch_event(self, device: ESP32Device, message: ParsedMessage):
         """이벤트 디스패치"""
         event_type = None
@@ -604,26 +1044,38 @@ class ESP32Manager:
                 event_type = "motor_completed"
             else:
                 event_type = "device_status"
+        elif message.type == MessageType.SENSOR_SNAPSHOT:
+            event_type = "sensor_snapshot"
         elif message.type == MessageType.ERROR:
             event_type = "device_error"
         
-        # 이벤트 핸들러 호출
-        if event_type and event_type in self._event_handlers:
-            for handler in self._event_handlers[event_type]:
-                try:
-                    if asyncio.iscoroutinefunction(handler):
-                        await handler(event_data)
-                    else:
-                        handler(event_data)
-                except Exception as e:
-                    logger.error(f"이벤트 핸들러 오류: {event_type}, {e}")
+        # 센서 엣지는 디바운스 단계를 거쳐 확정된 것만 핸들러로
+        if event_type == "sensor_triggered":
+            await self.sensor_debouncer.submit(device.device_id, event_data)
+        elif event_type:
+            self._call_handlers(event_type, event_data)
+    
+    async def _emit_sensor_event(self, event_data: Dict[str, Any]):
+        """디바운스로 확정된 센서 이벤트를 핸들러로 전달"""
+        self._call_handlers("sensor_triggered", event_data)
+    
+    def _call_handlers(self, event_type: str, event_data: Dict[str, Any]):
+        """이벤트 핸들러 실행 예약 (센서 이벤트는 센서별, 나머지는 디바이스/타입별 순서 유지)"""
+        handlers = self._event_handlers.get(event_type)
+        if not handlers:
+            return
+        if event_type == "sensor_triggered":
+            lane = (event_data.get("device_id"), event_data.get("chip_idx"), event_data.get("pin"))
+        else:
+            lane = (event_data.get("device_id"), event_type)
+        self.event_dispatcher.submit(lane, event_type, handlers, event_data)
     
     def register_event_handler(self, event_type: str, handler: Callable):
         """이벤트 핸들러 등록
         
         Args:
             event_type: 이벤트 타입 ("barcode_scanned", "qr_scanned", "motor_completed" 등)
-            handler: 이벤트 처리 함수 (동기/비동기 모두 지원)
+            handler: 이벤트 처리 함수 (동기 함수는 스레드 풀, 비동기 함수는 통신 루프에서 실행)
         """
         if event_type not in self._event_handlers:
             self._event_handlers[event_type] = []
@@ -643,7 +1095,14 @@ class ESP32Manager:
             "serial_port": device.serial_port,
             "is_online": device.is_online,
             "last_seen": device.last_seen.isoformat() if device.last_seen else None,
-            "stats": device.stats.copy()
+            "stats": device.stats.copy(),
+            "reader": device.reader.get_stats() if device.reader else None,
+            "framer": device.framer.get_stats(),
+            "commands": self.command_tracker.get_device_stats(device.device_id),
+            "command_queue": device.command_queue.get_stats(),
+            "sensors": device.sensor_state.get_stats(),
+            "debounce": self.sensor_debouncer.get_stats(device.device_id),
+            "link": self.supervisor.get_stats(device.device_id)
         }
     
     def get_all_devices_status(self) -> Dict[str, Dict[str, Any]]:
@@ -0,0 +1,162 @@
+"""
+ESP32 이벤트 핸들러 디스패처
+
+시리얼 읽기 루프는 이벤트를 submit만 하고 바로 다음 프레임을 읽는다.
+핸들러는 순서 키(lane)별 태스크에서 실행된다.
+
+- 같은 lane(센서 하나, 디바이스의 바코드 등)의 이벤트는 들어온 순서대로 하나씩 처리
+- 다른 lane은 동시에 진행
+- 동기 핸들러(DB, socketio 등 블로킹 작업)는 스레드 풀, 비동기 핸들러는 루프에서 실행
+- 대기 이벤트 수 상한: 넘으면 새 이벤트를 버리고 집계 (읽기 루프는 절대 기다리지 않음)
+- 대기시간(submit → 실행 시작)과 이벤트 타입별 핸들러 실행시간 히스토그램
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Set, Tuple
+
+from core.command_tracker import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PENDING = 1000
+DEFAULT_HANDLER_WORKERS = 4
+
+_QueuedEvent = Tuple[str, List[Callable], Dict[str, Any], float]
+
+
+class EventDispatcher:
+    """lane별 순서를 지키는 비차단 핸들러 실행기 (submit은 소유 루프에서만)"""
+
+    def __init__(self, max_pending: int = DEFAULT_MAX_PENDING, workers: int = DEFAULT_HANDLER_WORKERS):
+        self.max_pending = max_pending
+        self.workers = workers
+        self._lanes: Dict[Hashable, Deque[_QueuedEvent]] = {}
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._lag = LatencyHistogram()
+        self._runtime: Dict[str, LatencyHistogram] = {}
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "dropped": 0,
+            "handler_errors": 0,
+            "max_pending": 0,
+        }
+
+    def submit(self, lane: Hashable, event_type: str, handlers: List[Callable],
+               event_data: Dict[str, Any]) -> bool:
+        """이벤트 추가 (기다리지 않음)
+
+        Returns:
+            접수 여부 (대기 이벤트가 상한을 넘으면 False)
+        """
+        if not handlers:
+            return True
+        if self._pending >= self.max_pending:
+            self._stats["dropped"] += 1
+            logger.warning(f"이벤트 핸들러 대기열 가득 참, 버림: {event_type} ({self._pending}개 대기)")
+            return False
+
+        queue = self._lanes.get(lane)
+        if queue is None:
+            queue = self._lanes[lane] = deque()
+        queue.append((event_type, list(handlers), event_data, time.perf_counter()))
+        self._pending += 1
+        self._stats["submitted"] += 1
+        self._stats["max_pending"] = max(self._stats["max_pending"], self._pending)
+
+        if lane not in self._tasks:
+            self._tasks[lane] = asyncio.get_running_loop().create_task(self._drain_lane(lane))
+        return True
+
+    async def _drain_lane(self, lane: Hashable):
+        """lane 하나를 비울 때까지 순서대로 실행"""
+        queue = self._lanes[lane]
+        try:
+            while queue:
+                event_type, handlers, event_data, enqueued_at = queue.popleft()
+                self._pending -= 1
+                self._lag.record((time.perf_counter() - enqueued_at) * 1000)
+                for handler in handlers:
+                    await self._run_handler(event_type, handler, event_data)
+                self._stats["completed"] += 1
+        finally:
+            self._tasks.pop(lane, None)
+            if not queue:
+                self._lanes.pop(lane, None)
+
+    async def _run_handler(self, event_type: str, handler: Callable, event_data: Dict[str, Any]):
+        started = time.perf_counter()
+        try:
+            if asyncio.iscoroutinefunction(handler):
+                await handler(event_data)
+            else:
+                await asyncio.get_running_loop().run_in_executor(self._get_executor(), handler, event_data)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._stats["handler_errors"] += 1
+            logger.error(f"이벤트 핸들러 오류: {event_type}, {e}")
+        finally:
+            histogram = self._runtime.get(event_type)
+            if histogram is None:
+                histogram = self._runtime[event_type] = LatencyHistogram()
+            histogram.record((time.perf_counter() - started) * 1000)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="esp32-handler")
+        return self._executor
+
+    @property
+    def pending(self) -> int:
+        """아직 시작하지 않은 이벤트 수"""
+        return self._pending
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """대기/실행 중인 이벤트가 모두 끝날 때까지 대기
+
+        Returns:
+            시간 내에 모두 끝났는지
+        """
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while self._tasks:
+            tasks: Set[asyncio.Task] = set(self._tasks.values())
+            remaining = None if deadline is None else deadline - time.perf_counter()
+            if remaining is not None and remaining <= 0:
+                return False
+            await asyncio.wait(tasks, timeout=remaining)
+        return True
+
+    async def close(self, timeout: float = 1.0):
+        """남은 이벤트를 잠시 처리한 뒤 중단하고 스레드 풀 종료"""
+        if not await self.drain(timeout):
+            tasks = list(self._tasks.values())
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            dropped = sum(len(queue) for queue in self._lanes.values())
+            if dropped:
+                logger.warning(f"종료 시 처리하지 못한 이벤트 {dropped}개 버림")
+            self._stats["dropped"] += dropped
+            self._lanes.clear()
+            self._pending = 0
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """접수/완료/버림 수, 대기시간, 이벤트 타입별 실행시간"""
+        return {
+            **self._stats,
+            "pending": self._pending,
+            "active_lanes": len(self._tasks),
+            "queue_lag": self._lag.snapshot(),
+            "handler_runtime": {event_type: histogram.snapshot()
+                                for event_type, histogram in list(self._runtime.items())},
+        }
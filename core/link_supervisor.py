@@ -0,0 +1,261 @@
+"""
+ESP32 링크 감시/자동 재연결
+
+쓰기 실패나 USB 끊김으로 디바이스가 오프라인이 되면 읽기 루프가 끝나고, 예전에는
+누군가 /api/system/esp32/reconnect를 호출할 때까지 다시 열리지 않았다.
+LinkSupervisor는 통신 루프에서 돌면서 끊긴 링크를 몇 초 안에 복구한다.
+
+- 오프라인이 되었거나 읽기 루프가 끝난 디바이스를 정리하고 다시 연결/검증
+- 재시도 간격은 지수 백오프 + 지터 (여러 보드가 같이 끊겨도 동시에 포트를 두드리지 않음)
+- 원래 포트로 계속 실패하면 다른 ESP32 후보 포트도 확인 (USB 재인식으로 ttyUSB0 → ttyUSB1)
+- 재연결 후 GET_SENSORS 요청: 스냅샷 대조로 끊긴 동안의 센서 엣지 복구
+- 조용한 디바이스에는 하트비트(GET_STATUS)를 보내고, 응답하던 디바이스가 계속 조용하면 끊긴 것으로 처리
+- 디바이스별 끊김/재연결 횟수와 복구 시간(감지 → 재연결) 히스토그램
+"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from core.command_tracker import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+SUPERVISE_INTERVAL = 1.0     # 상태 점검 간격 (초)
+HEARTBEAT_INTERVAL = 5.0     # 이 시간 동안 수신이 없으면 GET_STATUS 전송 (초)
+STALE_TIMEOUT = 15.0         # 응답하던 디바이스가 이 시간 동안 조용하면 끊긴 것으로 처리 (초)
+BACKOFF_BASE = 0.5           # 첫 재시도 대기 (초)
+BACKOFF_MAX = 30.0           # 재시도 대기 상한 (초)
+REPLUG_AFTER_ATTEMPTS = 2    # 원래 포트로 이만큼 실패하면 다른 후보 포트도 확인
+
+RECOVERY_BUCKETS_MS = (500, 1000, 2000, 5000, 10000, 30000, 60000, 300000)
+
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_MAX,
+                  rng: Callable[[], float] = random.random) -> float:
+    """attempt번째 실패 후 대기 시간 (지수 증가 + 상한, 절반은 고정 절반은 무작위)"""
+    delay = min(cap, base * (2 ** attempt))
+    return delay / 2 + rng() * delay / 2
+
+
+class _LinkState:
+    """디바이스 하나의 링크 감시 상태"""
+
+    __slots__ = ('recovering', 'retry_now', 'down_since', 'last_heartbeat', 'recovery',
+                 'disconnects', 'reconnects', 'failed_attempts', 'heartbeats',
+                 'last_reason', 'last_recovery_ms')
+
+    def __init__(self):
+        self.recovering: Optional[asyncio.Task] = None
+        self.retry_now: Optional[asyncio.Event] = None
+        self.down_since: Optional[float] = None
+        self.last_heartbeat = 0.0
+        self.recovery = LatencyHistogram(RECOVERY_BUCKETS_MS)
+        self.disconnects = 0
+        self.reconnects = 0
+        self.failed_attempts = 0
+        self.heartbeats = 0
+        self.last_reason: Optional[str] = None
+        self.last_recovery_ms: Optional[float] = None
+
+
+class LinkSupervisor:
+    """ESP32Manager 디바이스 링크 감시 (통신 루프에서만 실행)"""
+
+    def __init__(self, manager, enabled: bool = True,
+                 interval: float = SUPERVISE_INTERVAL,
+                 heartbeat_interval: float = HEARTBEAT_INTERVAL,
+                 stale_timeout: float = STALE_TIMEOUT,
+                 backoff_base: float = BACKOFF_BASE,
+                 backoff_max: float = BACKOFF_MAX):
+        """
+        Args:
+            manager: ESP32Manager
+            enabled: False면 감시하지 않음 (pyserial 없는 스텁 모드)
+            interval: 상태 점검 간격 (초)
+            heartbeat_interval: 하트비트 간격 (초)
+            stale_timeout: 무응답 판정 시간 (초)
+            backoff_base: 첫 재시도 대기 (초)
+            backoff_max: 재시도 대기 상한 (초)
+        """
+        self.manager = manager
+        self.enabled = enabled
+        self.interval = interval
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_timeout = stale_timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._links: Dict[str, _LinkState] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def start(self):
+        """감시 태스크 시작 (start_communication에서 호출)"""
+        if not self.enabled or self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self):
+        """감시/재연결 태스크 중지"""
+        tasks = [link.recovering for link in self._links.values() if link.recovering is not None]
+        if self._task is not None:
+            tasks.append(self._task)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._loop = None
+        self._wakeup = None
+
+    def wake(self):
+        """바로 점검 (읽기 루프 종료, 쓰기 실패 시)"""
+        loop, wakeup = self._loop, self._wakeup
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(wakeup.set)
+
+    def request_reconnect(self, device_id: Optional[str] = None) -> List[str]:
+        """수동 재연결: 연결된 디바이스는 다시 열고, 재시도 대기 중이면 바로 시도
+
+        Returns:
+            재연결을 시작한 device_id 목록
+        """
+        if self._task is None:
+            return []
+        device_ids = [device_id] if device_id else list(self.manager.devices)
+        started = []
+        for target in device_ids:
+            device = self.manager.devices.get(target)
+            if device is None or not self._is_supervised(device):
+                continue
+            link = self._link(target)
+            if link.recovering is not None:
+                link.retry_now.set()
+            else:
+                self._begin_recovery(device, link, "manual")
+            started.append(target)
+        return started
+
+    def _link(self, device_id: str) -> _LinkState:
+        link = self._links.get(device_id)
+        if link is None:
+            link = self._links[device_id] = _LinkState()
+        return link
+
+    def _is_supervised(self, device) -> bool:
+        # 시리얼 연결 없이 온라인인 디바이스는 스텁
+        return bool(device.serial_port) and not (device.serial_connection is None and device.is_online)
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            for device in list(self.manager.devices.values()):
+                try:
+                    self._check(device)
+                except Exception as e:
+                    logger.error(f"ESP32 링크 점검 오류: {device.device_id}, {e}")
+
+    def _check(self, device):
+        """디바이스 하나 점검: 끊겼으면 복구 시작, 조용하면 하트비트"""
+        if not self._is_supervised(device):
+            return
+        link = self._link(device.device_id)
+        if link.recovering is not None:
+            return
+
+        if not device.is_online:
+            self._begin_recovery(device, link, "offline")
+            return
+        if not self.manager.is_link_running(device):
+            self._begin_recovery(device, link, "read_loop_stopped")
+            return
+
+        now = time.monotonic()
+        silent = None if device.last_rx_at is None else now - device.last_rx_at
+        if silent is not None and silent > self.stale_timeout:
+            self._begin_recovery(device, link, "no_data")
+        elif (silent is None or silent > self.heartbeat_interval) and \
+                now - link.last_heartbeat > self.heartbeat_interval:
+            link.last_heartbeat = now
+            link.heartbeats += 1
+            self._loop.create_task(self.manager.submit_command(
+                device.device_id, "GET_STATUS", timeout=self.heartbeat_interval))
+
+    def _begin_recovery(self, device, link: _LinkState, reason: str):
+        link.down_since = time.monotonic()
+        link.disconnects += 1
+        link.last_reason = reason
+        link.retry_now = asyncio.Event()
+        link.recovering = self._loop.create_task(self._recover(device, link))
+        logger.warning(f"🔌 ESP32 링크 끊김 감지: {device.device_id} ({reason}), 재연결 시작")
+
+    async def _recover(self, device, link: _LinkState):
+        """정리 → 백오프 재시도 → 태스크 재시작 → 센서 상태 재동기화"""
+        try:
+            await self.manager.close_link(device)
+
+            attempt = 0
+            while not await self._try_reopen(device, attempt):
+                link.failed_attempts += 1
+                delay = backoff_delay(attempt, self.backoff_base, self.backoff_max)
+                attempt += 1
+                logger.info(f"ESP32 재연결 실패: {device.device_id}, {delay:.1f}초 후 재시도 ({attempt}회)")
+                try:
+                    await asyncio.wait_for(link.retry_now.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                link.retry_now.clear()
+
+            self.manager.start_link(device)
+            recovered_ms = (time.monotonic() - link.down_since) * 1000
+            link.recovery.record(recovered_ms)
+            link.last_recovery_ms = round(recovered_ms, 1)
+            link.reconnects += 1
+            link.down_since = None
+            link.last_heartbeat = time.monotonic()
+            logger.info(f"✅ ESP32 재연결 완료: {device.device_id} @ {device.serial_port} "
+                        f"({recovered_ms:.0f}ms, {attempt + 1}회 시도)")
+
+            # 끊긴 동안 바뀐 센서 상태를 스냅샷으로 다시 맞춤
+            await self.manager.submit_command(device.device_id, "GET_SENSORS")
+        finally:
+            link.recovering = None
+
+    async def _try_reopen(self, device, attempt: int) -> bool:
+        try:
+            return await self.manager.reopen_link(device, search_ports=attempt >= REPLUG_AFTER_ATTEMPTS)
+        except Exception as e:
+            logger.error(f"ESP32 재연결 오류: {device.device_id}, {e}")
+            return False
+
+    def get_stats(self, device_id: Optional[str] = None) -> Dict[str, Any]:
+        """디바이스별 링크 상태/끊김/재연결/복구 시간"""
+        links = {}
+        now = time.monotonic()
+        for key, link in list(self._links.items()):
+            if device_id is not None and key != device_id:
+                continue
+            links[key] = {
+                "state": "recovering" if link.recovering is not None else "up",
+                "down_for_ms": round((now - link.down_since) * 1000, 1) if link.down_since else None,
+                "disconnects": link.disconnects,
+                "reconnects": link.reconnects,
+                "failed_attempts": link.failed_attempts,
+                "heartbeats": link.heartbeats,
+                "last_reason": link.last_reason,
+                "last_recovery_ms": link.last_recovery_ms,
+                "recovery": link.recovery.snapshot(),
+            }
+        if device_id is not None:
+            return links.get(device_id, {"state": "up" if self._task is not None else "unsupervised"})
+        return {"enabled": self.enabled, "running": self._task is not None, "devices": links}
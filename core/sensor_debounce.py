@@ -0,0 +1,201 @@
+"""
+IR 센서 엣지 디바운스 단계
+
+ESP32Manager가 sensor_triggered 이벤트를 핸들러에 넘기기 전에 센서(디바이스, 칩, 핀)별로
+엣지를 모았다가 상태가 window 동안 바뀌지 않을 때 한 번만 넘긴다.
+키가 반쯤 꽂혀 LOW/HIGH가 반복되는 동안에는 핸들러(DB 조회, 트랜잭션, 큐, socketio)가
+돌지 않고, 마지막으로 넘긴 상태로 돌아오면 아무것도 넘기지 않는다.
+
+- window: 마지막 엣지 후 이 시간 동안 조용하면 확정 (센서별로 window_for에서 결정)
+- max_hold: 계속 흔들려도 첫 엣지 후 이 시간이 지나면 현재 상태로 확정
+- window가 0이면 바로 넘김 (디바운스 끔)
+- 센서별 수신/전달/억제 엣지 수 집계
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+DEFAULT_DEBOUNCE_MS = 150
+DEFAULT_MAX_HOLD_MS = 1000
+
+SensorKey = Tuple[str, Any, Any]
+
+_UNKNOWN = object()   # 아직 넘긴 상태가 없음
+
+
+class _SensorDebounce:
+    """센서 하나의 디바운스 상태"""
+
+    __slots__ = ('stable', 'pending', 'first_edge_at', 'window', 'timer',
+                 'burst', 'edges', 'emitted', 'suppressed')
+
+    def __init__(self):
+        self.stable: Any = _UNKNOWN                  # 마지막으로 넘긴 상태
+        self.pending: Optional[Dict[str, Any]] = None
+        self.first_edge_at = 0.0
+        self.window = 0.0
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.burst = 0
+        self.edges = 0
+        self.emitted = 0
+        self.suppressed = 0
+
+
+def _edge_state(event_data: Dict[str, Any]) -> Any:
+    """엣지 상태 ("state", 구형 펌웨어는 "raw")"""
+    state = event_data.get("state")
+    return state if state is not None else event_data.get("raw")
+
+
+class SensorDebouncer:
+    """센서별 엣지 디바운스 (ESP32 통신 루프에서만 submit)"""
+
+    def __init__(self, emit: Callable[[Dict[str, Any]], Awaitable[None]],
+                 default_window_ms: float = DEFAULT_DEBOUNCE_MS,
+                 max_hold_ms: float = DEFAULT_MAX_HOLD_MS,
+                 window_for: Optional[Callable[[Dict[str, Any]], Optional[float]]] = None):
+        """
+        Args:
+            emit: 확정된 이벤트를 핸들러로 넘기는 코루틴 함수
+            default_window_ms: 기본 window (ms)
+            max_hold_ms: 최대 보류 시간 (ms)
+            window_for: 이벤트 → 센서별 window(ms), None이면 기본값
+        """
+        self._emit = emit
+        self._lock = threading.Lock()
+        self._sensors: Dict[SensorKey, _SensorDebounce] = {}
+        self.default_window_ms = default_window_ms
+        self.max_hold_ms = max_hold_ms
+        self.window_for = window_for
+
+    def configure(self, default_window_ms: Optional[float] = None, max_hold_ms: Optional[float] = None,
+                  window_for: Optional[Callable[[Dict[str, Any]], Optional[float]]] = None):
+        """설정 변경 (다음 버스트부터 적용)"""
+        if default_window_ms is not None:
+            self.default_window_ms = default_window_ms
+        if max_hold_ms is not None:
+            self.max_hold_ms = max_hold_ms
+        if window_for is not None:
+            self.window_for = window_for
+
+    def _window_seconds(self, event_data: Dict[str, Any]) -> float:
+        window_ms = None
+        if self.window_for is not None:
+            try:
+                window_ms = self.window_for(event_data)
+            except Exception:
+                window_ms = None
+        if window_ms is None:
+            window_ms = self.default_window_ms
+        return max(0.0, window_ms) / 1000
+
+    async def submit(self, device_id: str, event_data: Dict[str, Any]):
+        """sensor_triggered 이벤트 입력 (window가 0이면 바로 넘김)
+
+        Args:
+            device_id: 이벤트를 받은 디바이스 (펌웨어 device_id는 보드마다 같을 수 있어 쓰지 않음)
+            event_data: 핸들러에 넘길 이벤트
+        """
+        key = (device_id, event_data.get("chip_idx"), event_data.get("pin"))
+        state = _edge_state(event_data)
+        now = time.perf_counter()
+
+        with self._lock:
+            sensor = self._sensors.get(key)
+            if sensor is None:
+                sensor = self._sensors[key] = _SensorDebounce()
+            sensor.edges += 1
+
+            if sensor.pending is None:
+                sensor.window = self._window_seconds(event_data)
+                if sensor.window <= 0:
+                    sensor.stable = state
+                    sensor.emitted += 1
+                    immediate = True
+                else:
+                    sensor.first_edge_at = now
+                    sensor.burst = 1
+                    immediate = False
+            else:
+                # 버스트 진행 중: 앞선 엣지는 억제, 타이머 다시 시작
+                sensor.suppressed += 1
+                sensor.burst += 1
+                sensor.timer.cancel()
+                immediate = False
+
+            if not immediate:
+                sensor.pending = event_data
+                deadline = sensor.first_edge_at + self.max_hold_ms / 1000
+                delay = max(0.0, min(now + sensor.window, deadline) - now)
+                sensor.timer = asyncio.get_running_loop().call_later(delay, self._settle, key)
+
+        if immediate:
+            await self._emit(event_data)
+
+    def _settle(self, key: SensorKey):
+        """window 동안 조용함: 상태가 바뀌었으면 한 번만 넘김"""
+        with self._lock:
+            sensor = self._sensors.get(key)
+            if sensor is None or sensor.pending is None:
+                return
+            event_data, burst = sensor.pending, sensor.burst
+            sensor.pending = None
+            sensor.timer = None
+
+            state = _edge_state(event_data)
+            if state == sensor.stable:
+                # 원래 상태로 돌아옴: 마지막 엣지까지 억제
+                sensor.suppressed += 1
+                return
+            sensor.stable = state
+            sensor.emitted += 1
+
+        if burst > 1:
+            event_data = {**event_data, "debounced_edges": burst}
+        asyncio.get_running_loop().create_task(self._emit(event_data))
+
+    def cancel_pending(self, device_id: Optional[str] = None) -> int:
+        """보류 중인 엣지 버림 (통신 종료 시)
+
+        Returns:
+            버린 센서 수
+        """
+        cancelled = 0
+        with self._lock:
+            for key, sensor in self._sensors.items():
+                if sensor.pending is None or (device_id is not None and key[0] != device_id):
+                    continue
+                sensor.timer.cancel()
+                sensor.timer = None
+                sensor.pending = None
+                cancelled += 1
+        return cancelled
+
+    def get_stats(self, device_id: Optional[str] = None) -> Dict[str, Any]:
+        """수신/전달/억제 엣지 통계 (센서별 "chip_idx/pin" 키, 전체 조회면 "device_id/chip_idx/pin")"""
+        totals = {"edges": 0, "emitted": 0, "suppressed": 0, "pending": 0}
+        sensors = {}
+        with self._lock:
+            for (key_device, chip_idx, pin), sensor in self._sensors.items():
+                if device_id is not None and key_device != device_id:
+                    continue
+                label = f"{chip_idx}/{pin}" if device_id is not None else f"{key_device}/{chip_idx}/{pin}"
+                sensors[label] = {
+                    "edges": sensor.edges,
+                    "emitted": sensor.emitted,
+                    "suppressed": sensor.suppressed,
+                    "stable": None if sensor.stable is _UNKNOWN else sensor.stable,
+                    "window_ms": round(sensor.window * 1000, 1),
+                }
+                totals["edges"] += sensor.edges
+                totals["emitted"] += sensor.emitted
+                totals["suppressed"] += sensor.suppressed
+                totals["pending"] += sensor.pending is not None
+        return {
+            **totals,
+            "default_window_ms": self.default_window_ms,
+            "max_hold_ms": self.max_hold_ms,
+            "sensors": sensors,
+        }
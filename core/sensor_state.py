@@ -0,0 +1,129 @@
+"""
+ESP32 IR 센서 상태 테이블
+
+디바이스마다 MCP23017 칩별 16비트 마스크(1=HIGH)로 센서 상태를 들고 있는다.
+엣지 이벤트(sensor_triggered)로 갱신하고, 주기/요청 스냅샷(IR:...)이 오면 비교해서
+놓친 엣지를 찾아낸다.
+
+- 같은 시리얼 스트림에서 순서대로 처리하므로 스냅샷보다 먼저 보낸 엣지는 이미 반영되어 있다.
+  그래도 다르면 엣지 프레임이 깨졌거나 버려진 것
+- 한 번도 본 적 없는 핀(첫 스냅샷 전)은 기준값으로만 받아들이고 엣지를 만들지 않는다
+- 일련번호로 빠진 스냅샷 수와 펌웨어 재시작을 집계
+"""
+
+import threading
+from typing import Any, Dict, List, Optional
+
+from hardware.protocol_handler import SNAPSHOT_PINS
+
+_ALL_PINS = (1 << SNAPSHOT_PINS) - 1
+
+
+class SensorStateTable:
+    """디바이스 하나의 IR 센서 상태 (엣지 + 스냅샷 대조)"""
+
+    def __init__(self, device_id: str):
+        self.device_id = device_id
+        self._lock = threading.Lock()
+        self._masks: Dict[int, int] = {}      # chip_idx → 핀 상태 (1=HIGH)
+        self._known: Dict[int, int] = {}      # chip_idx → 상태를 아는 핀
+        self._addrs: Dict[int, str] = {}      # chip_idx → "0x26"
+        self.last_seq: Optional[int] = None
+        self._stats = {
+            "edges": 0,
+            "snapshots": 0,
+            "missed_edges": 0,
+            "missed_snapshots": 0,
+            "firmware_restarts": 0,
+        }
+
+    def apply_edge(self, chip_idx: Any, addr: Any, pin: Any, state: Any) -> bool:
+        """엣지 이벤트 반영
+
+        Returns:
+            반영 여부 (칩/핀 번호가 잘못되었으면 False)
+        """
+        try:
+            chip_idx, pin = int(chip_idx), int(pin)
+        except (TypeError, ValueError):
+            return False
+        if not 0 <= pin < SNAPSHOT_PINS:
+            return False
+
+        bit = 1 << pin
+        with self._lock:
+            mask = self._masks.get(chip_idx, _ALL_PINS)
+            self._masks[chip_idx] = mask | bit if state == "HIGH" else mask & ~bit
+            self._known[chip_idx] = self._known.get(chip_idx, 0) | bit
+            if addr is not None:
+                self._addrs.setdefault(chip_idx, str(addr))
+            self._stats["edges"] += 1
+        return True
+
+    def reconcile(self, seq: int, chips: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """스냅샷과 대조 후 상태를 스냅샷 값으로 교체
+
+        Args:
+            seq: 스냅샷 일련번호
+            chips: [{"chip_idx", "addr", "mask"}]
+
+        Returns:
+            놓친 엣지 목록 [{"chip_idx", "addr", "pin", "state", "active"}] (칩/핀 순)
+        """
+        missed = []
+        with self._lock:
+            self._stats["snapshots"] += 1
+            if self.last_seq is not None:
+                if seq <= self.last_seq:
+                    self._stats["firmware_restarts"] += 1
+                else:
+                    self._stats["missed_snapshots"] += seq - self.last_seq - 1
+            self.last_seq = seq
+
+            for chip in chips:
+                chip_idx, mask = chip["chip_idx"], chip["mask"] & _ALL_PINS
+                changed = (self._masks.get(chip_idx, mask) ^ mask) & self._known.get(chip_idx, 0)
+                pin = 0
+                while changed:
+                    if changed & 1:
+                        high = bool(mask >> pin & 1)
+                        missed.append({
+                            "chip_idx": chip_idx,
+                            "addr": chip["addr"],
+                            "pin": pin,
+                            "state": "HIGH" if high else "LOW",
+                            "active": not high,
+                        })
+                    changed >>= 1
+                    pin += 1
+                self._masks[chip_idx] = mask
+                self._known[chip_idx] = _ALL_PINS
+                self._addrs[chip_idx] = chip["addr"]
+
+            self._stats["missed_edges"] += len(missed)
+        return missed
+
+    def get_pin_state(self, chip_idx: int, pin: int) -> Optional[str]:
+        """핀 상태 ("HIGH"/"LOW", 모르면 None)"""
+        with self._lock:
+            if not self._known.get(chip_idx, 0) >> pin & 1:
+                return None
+            return "HIGH" if self._masks[chip_idx] >> pin & 1 else "LOW"
+
+    def get_states(self) -> List[Dict[str, Any]]:
+        """칩별 현재 상태 [{"chip_idx", "addr", "mask", "known"}]"""
+        with self._lock:
+            return [
+                {
+                    "chip_idx": chip_idx,
+                    "addr": self._addrs.get(chip_idx),
+                    "mask": self._masks[chip_idx],
+                    "known": self._known.get(chip_idx, 0),
+                }
+                for chip_idx in sorted(self._masks)
+            ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """엣지/스냅샷/놓친 엣지 통계"""
+        with self._lock:
+            return {**self._stats, "last_seq": self.last_seq, "chips": len(self._masks)}
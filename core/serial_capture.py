@@ -0,0 +1,271 @@
+"""
+시리얼 캡처 기록/재생
+
+현장에서 센서 엣지 누락이나 깨진 JSON 같은 문제를 사무실에서 다시 보기 위해
+ESP32Manager가 주고받은 원시 바이트를 단조 시각과 함께 파일에 남기고,
+나중에 같은 바이트를 같은 단위로 프레이머 → ProtocolHandler → 디스패치에 다시 넣는다.
+
+파일 형식 (리틀 엔디언):
+    헤더   MAGIC(8) + 기록 시작 시각 (epoch 초, double)
+    레코드 시각(us, 기록 시작 기준, uint64) + 방향(0=수신, 1=송신) + device_id 길이(uint8)
+           + 데이터 길이(uint32) + device_id + 데이터
+
+- 파일이 max_bytes를 넘으면 path → path.1 → ... → path.N으로 밀고 새 파일 (RotatingFileHandler와 같음)
+- 시각은 회전해도 이어지므로 path.N ... path.1, path 순서로 읽으면 하나의 캡처
+- 기록 중 전원이 꺼져 마지막 레코드가 잘려도 그 앞까지는 읽힘
+- 재생은 1배속(speed=1.0) 또는 최대 속도(speed=0)
+"""
+
+import asyncio
+import logging
+import os
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"ESPCAP1\n"
+_HEADER = struct.Struct("<d")
+_RECORD = struct.Struct("<QBBI")
+
+DIRECTION_RX = "rx"
+DIRECTION_TX = "tx"
+_DIRECTION_CODES = {DIRECTION_RX: 0, DIRECTION_TX: 1}
+_DIRECTION_NAMES = {code: name for name, code in _DIRECTION_CODES.items()}
+
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUPS = 5
+DEFAULT_FLUSH_INTERVAL = 1.0   # 버퍼를 디스크로 내리는 간격 (초)
+
+PathLike = Union[str, Path]
+
+
+@dataclass
+class CaptureRecord:
+    """캡처 레코드 하나"""
+    t: float            # 기록 시작 기준 시각 (초)
+    direction: str      # "rx" / "tx"
+    device_id: str
+    data: bytes
+
+
+class SerialCapture:
+    """회전하는 캡처 파일 기록기 (스레드 안전)"""
+
+    def __init__(self, path: PathLike, max_bytes: int = DEFAULT_MAX_BYTES, backups: int = DEFAULT_BACKUPS,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        """
+        Args:
+            path: 캡처 파일 경로 (회전본은 path.1, path.2, ...)
+            max_bytes: 파일 하나의 최대 크기 (0이면 회전 안 함)
+            backups: 남길 회전본 수
+            flush_interval: 버퍼를 디스크로 내리는 간격 (초)
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.started_at = time.time()
+        self._base = time.monotonic()
+        self._lock = threading.Lock()
+        self._file = None
+        self._size = 0
+        self._last_flush = self._base
+        self.stats = {"records": 0, "rx_bytes": 0, "tx_bytes": 0, "rotations": 0, "write_errors": 0}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._open()
+
+    def _open(self):
+        self._file = open(self.path, "wb")
+        self._file.write(MAGIC + _HEADER.pack(self.started_at))
+        self._size = len(MAGIC) + _HEADER.size
+
+    def _rotate(self):
+        self._file.close()
+        if self.backups > 0:
+            for index in range(self.backups - 1, 0, -1):
+                source = self.path.with_name(f"{self.path.name}.{index}")
+                if source.exists():
+                    os.replace(source, self.path.with_name(f"{self.path.name}.{index + 1}"))
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        self._open()
+        self.stats["rotations"] += 1
+
+    def record(self, device_id: str, direction: str, data: bytes):
+        """레코드 추가 (쓰기 실패는 집계만 하고 통신은 계속)"""
+        now = time.monotonic()
+        name = device_id.encode("utf-8")[:255]
+        entry = _RECORD.pack(int((now - self._base) * 1_000_000), _DIRECTION_CODES[direction],
+                             len(name), len(data)) + name + data
+
+        with self._lock:
+            if self._file is None:
+                return
+            try:
+                if self.max_bytes and self._size + len(entry) > self.max_bytes \
+                        and self._size > len(MAGIC) + _HEADER.size:
+                    self._rotate()
+                self._file.write(entry)
+                self._size += len(entry)
+                if now - self._last_flush >= self.flush_interval:
+                    self._file.flush()
+                    self._last_flush = now
+            except OSError as e:
+                self.stats["write_errors"] += 1
+                if self.stats["write_errors"] == 1:
+                    logger.error(f"시리얼 캡처 쓰기 실패: {self.path}, {e}")
+                return
+            self.stats["records"] += 1
+            self.stats[f"{direction}_bytes"] += len(data)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    @property
+    def closed(self) -> bool:
+        return self._file is None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "path": str(self.path),
+                "file_bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "backups": self.backups,
+                "recording": self._file is not None,
+            }
+
+
+def capture_files(path: PathLike) -> List[Path]:
+    """회전본을 포함한 캡처 파일 목록 (오래된 것부터)"""
+    path = Path(path)
+    rotated = []
+    for candidate in path.parent.glob(f"{path.name}.*"):
+        suffix = candidate.name[len(path.name) + 1:]
+        if suffix.isdigit():
+            rotated.append((int(suffix), candidate))
+    files = [candidate for _, candidate in sorted(rotated, reverse=True)]
+    if path.exists():
+        files.append(path)
+    return files
+
+
+def is_capture_file(path: PathLike) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def read_capture(path: PathLike, rotated: bool = True) -> Iterator[CaptureRecord]:
+    """캡처 레코드를 기록 순서대로 읽기
+
+    Args:
+        path: 캡처 파일 경로
+        rotated: 회전본(path.N ... path.1)도 앞에 이어서 읽음
+
+    Raises:
+        ValueError: 캡처 파일 형식이 아님
+    """
+    for file_path in (capture_files(path) if rotated else [Path(path)]):
+        data = Path(file_path).read_bytes()
+        if not data.startswith(MAGIC):
+            raise ValueError(f"캡처 파일 형식이 아님: {file_path}")
+        offset = len(MAGIC) + _HEADER.size
+        while offset + _RECORD.size <= len(data):
+            t_us, direction, name_len, size = _RECORD.unpack_from(data, offset)
+            start = offset + _RECORD.size
+            end = start + name_len + size
+            if end > len(data):
+                logger.warning(f"캡처 끝 레코드 잘림 (무시): {file_path}")
+                break
+            yield CaptureRecord(t_us / 1_000_000, _DIRECTION_NAMES.get(direction, DIRECTION_RX),
+                                data[start:start + name_len].decode("utf-8", errors="replace"),
+                                data[start + name_len:end])
+            offset = end
+
+
+def capture_started_at(path: PathLike) -> Optional[float]:
+    """기록 시작 시각 (epoch 초, 파일이 없으면 None)"""
+    files = capture_files(path)
+    if not files:
+        return None
+    with open(files[0], "rb") as f:
+        header = f.read(len(MAGIC) + _HEADER.size)
+    if not header.startswith(MAGIC) or len(header) < len(MAGIC) + _HEADER.size:
+        return None
+    return _HEADER.unpack_from(header, len(MAGIC))[0]
+
+
+async def replay_capture(manager, records: Iterable[CaptureRecord], speed: float = 1.0,
+                         device_type: str = "gym_controller", settle_timeout: float = 5.0) -> Dict[str, Any]:
+    """캡처의 수신 바이트를 ESP32Manager 수신 경로에 다시 넣기
+
+    기록된 read 단위 그대로 프레이머에 넣으므로 프레임 경계/파싱/센서 상태/디바운스/핸들러 디스패치가
+    현장과 같은 입력으로 다시 돈다. 캡처에 있는 device_id가 매니저에 없으면 포트 없이 추가한다.
+    송신 레코드는 세기만 한다 (보드가 없으므로).
+
+    Args:
+        manager: 대상 ESP32Manager (통신을 시작하지 않은 상태여도 됨)
+        records: read_capture() 결과
+        speed: 재생 배속 (1.0이면 기록 간격 그대로, 0이면 최대 속도)
+        device_type: 없는 디바이스를 추가할 때의 타입
+        settle_timeout: 끝난 뒤 디바운스/핸들러 처리를 기다리는 최대 시간 (초)
+
+    Returns:
+        재생 통계 (레코드/바이트 수, 소요 시간, 처리량)
+    """
+    stats = {"rx_records": 0, "tx_records": 0, "rx_bytes": 0, "span": 0.0}
+    first_t = None
+    started = time.perf_counter()
+
+    for record in records:
+        if first_t is None:
+            first_t = record.t
+        stats["span"] = record.t - first_t
+        if record.direction != DIRECTION_RX:
+            stats["tx_records"] += 1
+            continue
+
+        if speed > 0:
+            delay = started + (record.t - first_t) / speed - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        device = manager.devices.get(record.device_id)
+        if device is None:
+            manager.add_device(record.device_id, "", device_type)
+            device = manager.devices[record.device_id]
+        await manager._read_device_messages(device, record.data)
+        stats["rx_records"] += 1
+        stats["rx_bytes"] += len(record.data)
+        # 실제 읽기 루프처럼 read 사이에 루프를 양보해 핸들러 lane이 돌게 함
+        await asyncio.sleep(0)
+
+    feed_elapsed = time.perf_counter() - started
+
+    # 디바운스 대기 중인 엣지와 핸들러 처리가 끝날 때까지
+    deadline = time.perf_counter() + settle_timeout
+    while manager.sensor_debouncer.get_stats()["pending"] and time.perf_counter() < deadline:
+        await asyncio.sleep(0.01)
+    await manager.event_dispatcher.drain(max(0.0, deadline - time.perf_counter()))
+
+    elapsed = time.perf_counter() - started
+    stats.update({
+        "feed_elapsed": round(feed_elapsed, 6),
+        "elapsed": round(elapsed, 6),
+        "span": round(stats["span"], 6),
+        "messages": sum(device.stats["messages_received"] for device in manager.devices.values()),
+        "errors": sum(device.stats["errors"] for device in manager.devices.values()),
+    })
+    if feed_elapsed > 0:
+        stats["bytes_per_sec"] = round(stats["rx_bytes"] / feed_elapsed, 1)
+        stats["messages_per_sec"] = round(stats["messages"] / feed_elapsed, 1)
+    return stats
@@ -0,0 +1,201 @@
+"""
+ESP32 시리얼 스트림 프레이머
+
+수신 바이트를 bytearray에 이어 붙이고, 이전 호출에서 검사한 위치부터만 이어서 스캔해
+줄바꿈 구분 메시지와 줄바꿈 없이 붙어 오는 JSON 객체를 한 번의 패스로 잘라낸다.
+
+- 텍스트 프레임: 줄바꿈까지 (예: "BARCODE:123")
+- JSON 프레임: '{'로 시작해 중괄호 깊이가 0이 되는 '}'까지 (문자열/이스케이프 내부 무시)
+- JSON 도중 줄바꿈이 나오면 깨진 프레임으로 보고 버림 (garbled)
+- 끝나지 않은 채 max_frame을 넘는 프레임은 다음 줄바꿈까지 버림 (dropped)
+"""
+
+import re
+from typing import Any, Dict, List
+
+_STRING = rb'"(?:[^"\\\n]|\\[^\n])*"'
+
+# 중괄호/줄바꿈이 아닌 바이트와 완결된 문자열 토큰을 C 레벨에서 한 번에 건너뛰기
+# (문자열 안의 중괄호는 무시, 끝나지 않은 문자열은 여는 따옴표에서 멈춤)
+_JSON_SKIP = re.compile(rb'(?:[^{}"\n]+|' + _STRING + rb')*')
+
+_WHITESPACE = re.compile(rb'[ \t\r\n\x00]*')
+
+_BRACE_OPEN = ord('{')
+_BRACE_CLOSE = ord('}')
+_NEWLINE = ord('\n')
+
+DEFAULT_MAX_FRAME = 4096
+
+
+class SerialFramer:
+    """증분 프레이머 (디바이스 연결마다 하나)"""
+
+    __slots__ = ('max_frame', '_buf', '_start', '_pos', '_mode', '_depth', '_skipping', '_stats')
+
+    # 현재 프레임 종류
+    _IDLE, _TEXT, _JSON = range(3)
+
+    def __init__(self, max_frame: int = DEFAULT_MAX_FRAME):
+        """
+        Args:
+            max_frame: 프레임 최대 바이트 수 (넘으면 버림)
+        """
+        self.max_frame = max_frame
+        self._buf = bytearray()
+        self._start = 0      # 현재 프레임 시작 위치
+        self._pos = 0        # 다음에 스캔할 위치
+        self._mode = self._IDLE
+        self._depth = 0
+        self._skipping = False
+        self._stats = {
+            "bytes": 0,
+            "frames": 0,
+            "json_frames": 0,
+            "dropped": 0,
+            "garbled": 0,
+            "decode_errors": 0,
+            "discarded_bytes": 0,
+        }
+
+    def reset(self):
+        """버퍼와 파서 상태 초기화 (재연결 시)"""
+        self._stats["discarded_bytes"] += len(self._buf) - self._start
+        self._buf = bytearray()
+        self._start = self._pos = 0
+        self._mode = self._IDLE
+        self._depth = 0
+        self._skipping = False
+
+    def _emit(self, frames: List[str], end: int, is_json: bool):
+        """[start, end) 구간을 프레임으로 내보내기"""
+        raw = self._buf[self._start:end].strip()
+        if raw:
+            try:
+                frame = raw.decode('utf-8')
+            except UnicodeDecodeError:
+                self._stats["decode_errors"] += 1
+                frame = raw.decode('utf-8', errors='ignore')
+            frames.append(frame)
+            self._stats["frames"] += 1
+            if is_json:
+                self._stats["json_frames"] += 1
+        self._start = end
+        self._mode = self._IDLE
+
+    def _discard(self, end: int):
+        """[start, end) 구간 버림"""
+        self._stats["discarded_bytes"] += end - self._start
+        self._start = end
+        self._mode = self._IDLE
+        self._depth = 0
+
+    def feed(self, data: bytes) -> List[str]:
+        """수신 바이트 추가 후 완성된 프레임 반환
+
+        Args:
+            data: 시리얼에서 읽은 바이트
+
+        Returns:
+            완성된 프레임 문자열 목록 (앞뒤 공백 제거)
+        """
+        frames: List[str] = []
+        if not data:
+            return frames
+
+        buf = self._buf
+        buf += data
+        self._stats["bytes"] += len(data)
+        end = len(buf)
+        pos = self._pos
+
+        while pos < end:
+            mode = self._mode
+
+            if self._skipping:
+                # 너무 긴 프레임: 다음 줄바꿈까지 버림
+                nl = buf.find(b'\n', pos)
+                if nl < 0:
+                    self._stats["discarded_bytes"] += end - pos
+                    self._start = pos = end
+                    break
+                self._stats["discarded_bytes"] += nl + 1 - self._start
+                self._start = pos = nl + 1
+                self._skipping = False
+                self._mode = self._IDLE
+                continue
+
+            if mode == self._IDLE:
+                # 프레임 사이 공백 건너뛰기
+                pos = self._start = _WHITESPACE.match(buf, pos).end()
+                if pos >= end:
+                    break
+                if buf[pos] == _BRACE_OPEN:
+                    self._mode = self._JSON
+                    self._depth = 1
+                    pos += 1
+                else:
+                    self._mode = self._TEXT
+                continue
+
+            if mode == self._TEXT:
+                nl = buf.find(b'\n', pos)
+                if nl < 0:
+                    pos = end
+                    break
+                self._emit(frames, nl, is_json=False)
+                pos = self._start = nl + 1
+                continue
+
+            # _JSON: 다음 중괄호/줄바꿈까지 건너뛰기
+            i = _JSON_SKIP.match(buf, pos).end()
+            if i >= end:
+                pos = end
+                break
+            byte = buf[i]
+            if byte == _BRACE_OPEN:
+                self._depth += 1
+                pos = i + 1
+            elif byte == _BRACE_CLOSE:
+                self._depth -= 1
+                pos = i + 1
+                if self._depth == 0:
+                    self._emit(frames, pos, is_json=True)
+            elif byte == _NEWLINE:
+                self._stats["garbled"] += 1
+                pos = i + 1
+                self._discard(pos)
+            else:
+                # 끝나지 않은 문자열: 같은 줄에서 끝나지 않으면 깨진 프레임
+                nl = buf.find(b'\n', i)
+                if nl < 0:
+                    # 나머지가 도착하면 이 문자열부터 다시 확인
+                    pos = i
+                    break
+                self._stats["garbled"] += 1
+                pos = nl + 1
+                self._discard(pos)
+
+        # 최대 길이 초과 확인 (미완성 프레임)
+        if self._mode != self._IDLE and end - self._start > self.max_frame:
+            self._stats["dropped"] += 1
+            self._discard(end)
+            pos = end
+            self._skipping = True
+
+        # 소비한 앞부분 제거 (호출당 한 번)
+        if self._start:
+            del buf[:self._start]
+            pos -= self._start
+            self._start = 0
+        self._pos = pos
+        return frames
+
+    @property
+    def pending(self) -> int:
+        """아직 프레임이 되지 않은 바이트 수"""
+        return len(self._buf) - self._start
+
+    def get_stats(self) -> Dict[str, Any]:
+        """프레이밍 통계"""
+        return {**self._stats, "pending_bytes": self.pending}
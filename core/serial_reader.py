@@ -0,0 +1,206 @@
+"""
+이벤트 기반 시리얼 리더
+
+ESP32 시리얼 포트를 주기적으로 폴링하지 않고, 바이트가 도착했을 때만 깨어나
+읽은 청크를 asyncio 큐로 넘긴다.
+
+- add_reader 모드: 이벤트 루프가 fd 읽기 가능 여부를 감시 (POSIX, 기본)
+- thread 모드: fd를 쓸 수 없는 환경에서 전용 스레드가 블로킹 read 후 루프로 전달
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 한 번 깨어날 때 읽을 최대 바이트 수
+DEFAULT_MAX_READ = 4096
+
+
+class SerialReader:
+    """시리얼 연결 하나에 대한 이벤트 기반 읽기"""
+
+    def __init__(self, connection, name: str = "serial",
+                 loop: Optional[asyncio.AbstractEventLoop] = None,
+                 max_read: int = DEFAULT_MAX_READ):
+        """
+        Args:
+            connection: 시리얼 연결 (pyserial Serial 또는 fileno()/read()를 가진 객체)
+            name: 로그/스레드 이름에 쓸 디바이스 이름
+            loop: 이벤트 루프 (없으면 start() 시점의 실행 중인 루프)
+            max_read: 한 번에 읽을 최대 바이트 수
+        """
+        self.connection = connection
+        self.name = name
+        self.max_read = max_read
+        self._loop = loop
+        self._queue: Optional[asyncio.Queue] = None
+        self._fd: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.mode: Optional[str] = None
+
+        self._stats = {
+            "wakeups": 0,
+            "empty_wakeups": 0,
+            "chunks": 0,
+            "bytes": 0,
+            "read_errors": 0,
+            "latency_samples": 0,
+            "latency_ms_total": 0.0,
+            "latency_ms_max": 0.0,
+        }
+
+    def _fileno(self) -> Optional[int]:
+        """감시할 fd (없으면 None)"""
+        try:
+            fd = self.connection.fileno()
+        except (AttributeError, OSError, ValueError):
+            return None
+        return fd if isinstance(fd, int) and fd >= 0 else None
+
+    def start(self):
+        """읽기 시작 (이벤트 루프 스레드에서 호출)"""
+        if self._running:
+            return
+
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._running = True
+
+        fd = self._fileno()
+        if fd is not None:
+            try:
+                self._loop.add_reader(fd, self._on_readable)
+                self._fd = fd
+                self.mode = "add_reader"
+                logger.debug(f"시리얼 리더 시작 (add_reader): {self.name}, fd={fd}")
+                return
+            except (NotImplementedError, ValueError, OSError) as e:
+                logger.debug(f"add_reader 사용 불가, 스레드 모드로 전환: {self.name}, {e}")
+
+        self.mode = "thread"
+        self._thread = threading.Thread(target=self._thread_main, name=f"serial-reader-{self.name}", daemon=True)
+        self._thread.start()
+        logger.debug(f"시리얼 리더 시작 (thread): {self.name}")
+
+    def _deliver(self, data: Optional[bytes], arrived: float):
+        """읽은 청크를 큐에 넣기 (루프 스레드에서 호출, None은 연결 종료)"""
+        if data is not None:
+            self._stats["chunks"] += 1
+            self._stats["bytes"] += len(data)
+        self._queue.put_nowait((data, arrived))
+
+    def _on_readable(self):
+        """fd 읽기 가능 콜백 (add_reader 모드)"""
+        arrived = time.monotonic()
+        self._stats["wakeups"] += 1
+        try:
+            data = os.read(self._fd, self.max_read)
+        except BlockingIOError:
+            self._stats["empty_wakeups"] += 1
+            return
+        except OSError as e:
+            self._stats["read_errors"] += 1
+            logger.error(f"시리얼 읽기 오류: {self.name}, {e}")
+            data = b""
+
+        if not data:
+            # EOF: 포트가 사라짐 (USB 분리 등)
+            self._remove_reader()
+            self._deliver(None, arrived)
+            return
+
+        self._deliver(data, arrived)
+
+    def _thread_main(self):
+        """전용 스레드 블로킹 읽기 (thread 모드)"""
+        connection = self.connection
+        # 타임아웃 없이 블로킹 (종료 시 cancel_read/close로 깨움)
+        if hasattr(connection, "timeout"):
+            try:
+                connection.timeout = None
+            except Exception:
+                pass
+
+        while self._running:
+            try:
+                data = connection.read(1)
+                arrived = time.monotonic()
+                # 같은 청크에 이어서 도착한 바이트도 함께 읽기
+                waiting = getattr(connection, "in_waiting", 0) or 0
+                if data and waiting:
+                    data += connection.read(min(waiting, self.max_read))
+            except Exception as e:
+                if self._running:
+                    self._stats["read_errors"] += 1
+                    logger.error(f"시리얼 읽기 오류: {self.name}, {e}")
+                data, arrived = None, time.monotonic()
+
+            if not self._running:
+                break
+
+            self._stats["wakeups"] += 1
+            if data == b"":
+                self._stats["empty_wakeups"] += 1
+                continue
+
+            try:
+                self._loop.call_soon_threadsafe(self._deliver, data, arrived)
+            except RuntimeError:
+                break  # 루프 종료됨
+            if data is None:
+                break
+
+    async def read(self) -> bytes:
+        """다음 청크 대기
+
+        Returns:
+            수신 바이트 (연결 종료 시 b"")
+        """
+        data, arrived = await self._queue.get()
+        latency_ms = (time.monotonic() - arrived) * 1000
+        self._stats["latency_samples"] += 1
+        self._stats["latency_ms_total"] += latency_ms
+        if latency_ms > self._stats["latency_ms_max"]:
+            self._stats["latency_ms_max"] = latency_ms
+        return data if data is not None else b""
+
+    def _remove_reader(self):
+        if self._fd is not None and self._loop is not None:
+            try:
+                self._loop.remove_reader(self._fd)
+            except Exception:
+                pass
+            self._fd = None
+
+    def close(self):
+        """읽기 중지 (연결 자체는 닫지 않음)"""
+        if not self._running:
+            return
+        self._running = False
+        self._remove_reader()
+
+        if self._thread is not None:
+            cancel_read = getattr(self.connection, "cancel_read", None)
+            if cancel_read:
+                try:
+                    cancel_read()
+                except Exception:
+                    pass
+            self._thread.join(0.5)
+            self._thread = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """읽기 통계 (깨어난 횟수, 바이트 수, 도착→처리 지연)"""
+        stats = dict(self._stats)
+        samples = stats.pop("latency_samples")
+        stats["mode"] = self.mode
+        stats["latency_ms_avg"] = round(stats.pop("latency_ms_total") / samples, 3) if samples else 0.0
+        stats["latency_ms_max"] = round(stats["latency_ms_max"], 3)
+        return stats
@@ -4,8 +4,20 @@
 SQLite 기반 락카키 대여기 시스템의 데이터베이스 레이어
 """
 
+from .connection_pool import ConnectionPool, get_connection_pool, close_all_pools
+from .write_queue import WriteQueue, get_write_queue, close_all_write_queues
+from .log_store import LogStore, get_log_store, close_all_log_stores
+from .locker_locks import LockerLockTable
 from .database_manager import DatabaseManager
 from .sync_manager import SyncManager
-from .transaction_manager import TransactionManager
+from .transaction_manager import TransactionManager, get_transaction_manager
+from .sensor_map import SensorMap, get_sensor_map
 
-__all__ = ['DatabaseManager', 'SyncManager', 'TransactionManager']
+__all__ = [
+    'ConnectionPool', 'get_connection_pool', 'close_all_pools',
+    'WriteQueue', 'get_write_queue', 'close_all_write_queues',
+    'LogStore', 'get_log_store', 'close_all_log_stores',
+    'LockerLockTable',
+    'DatabaseManager', 'SyncManager', 'TransactionManager', 'get_transaction_manager',
+    'SensorMap', 'get_sensor_map'
+]
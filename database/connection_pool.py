@@ -0,0 +1,351 @@
+"""
+SQLite 커넥션 풀
+
+프로세스 전역에서 DB 파일별로 하나의 풀을 공유하며,
+PRAGMA 설정이 끝난 커넥션을 스레드 단위로 빌려주고 돌려받는다.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Any, Tuple
+
+
+DEFAULT_POOL_SIZE = 8
+DEFAULT_ACQUIRE_TIMEOUT = 30.0
+
+
+def create_connection(db_path: str) -> sqlite3.Connection:
+    """PRAGMA 설정이 완료된 새 SQLite 커넥션 생성
+
+    Args:
+        db_path: SQLite 데이터베이스 파일 경로
+
+    Returns:
+        sqlite3 커넥션
+    """
+    conn = sqlite3.connect(
+        db_path,
+        check_same_thread=False,
+        timeout=30.0,
+        isolation_level=None  # autocommit 모드
+    )
+
+    # Row 팩토리 설정 (딕셔너리 형태로 결과 반환)
+    conn.row_factory = sqlite3.Row
+
+    # 외래키 제약조건 활성화
+    conn.execute("PRAGMA foreign_keys = ON")
+
+    # WAL 모드 활성화 (동시성 향상)
+    conn.execute("PRAGMA journal_mode = WAL")
+
+    # WAL 자동 체크포인트 설정 (100페이지마다 = 약 400KB)
+    # DB 손상 방지를 위해 WAL 파일 크기 제한
+    conn.execute("PRAGMA wal_autocheckpoint = 100")
+
+    # 동기화 모드 설정 (FULL - 안전성 우선)
+    conn.execute("PRAGMA synchronous = FULL")
+
+    return conn
+
+
+def file_identity(db_path: str) -> Optional[Tuple[int, int]]:
+    """DB 파일 식별자 (st_dev, st_ino). 파일이 없으면 None
+
+    같은 경로의 파일을 지우고 다시 만들면 값이 바뀌므로, 열어 둔 커넥션이
+    아직 그 경로의 파일을 가리키는지 확인하는 데 쓴다.
+    """
+    try:
+        st = os.stat(db_path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino)
+
+
+class ConnectionPool:
+    """스레드 친화(thread-affine) SQLite 커넥션 풀
+
+    같은 스레드가 여러 번 acquire()하면 같은 커넥션을 참조 카운트로 공유하고,
+    마지막 release() 시 유휴 목록으로 돌아가 다른 스레드가 재사용한다.
+    DB 파일이 삭제/교체되면 예전 파일에 묶인 유휴 커넥션은 버리고 새로 연다.
+    """
+
+    def __init__(self, db_path: str, max_size: int = DEFAULT_POOL_SIZE,
+                 acquire_timeout: float = DEFAULT_ACQUIRE_TIMEOUT):
+        """
+        Args:
+            db_path: SQLite 데이터베이스 파일 경로
+            max_size: 최대 커넥션 수
+            acquire_timeout: 풀이 가득 찼을 때 대기할 최대 시간 (초)
+        """
+        self.db_path = db_path
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.logger = logging.getLogger(__name__)
+
+        self._cond = threading.Condition(threading.Lock())
+        self._idle: List[sqlite3.Connection] = []
+        # id(커넥션) -> 열 때의 파일 식별자
+        self._files: Dict[int, Optional[Tuple[int, int]]] = {}
+        # 스레드 ident -> [커넥션, 참조 카운트]
+        self._leases: Dict[int, List[Any]] = {}
+        self._size = 0
+        self._closed = False
+
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "health_check_failures": 0,
+            "stale_discarded": 0,
+            "reclaimed": 0,
+        }
+
+    def _create_connection(self) -> sqlite3.Connection:
+        """새 커넥션 생성 및 PRAGMA 설정"""
+        return create_connection(self.db_path)
+
+    def _is_current(self, conn: sqlite3.Connection, identity: Optional[Tuple[int, int]]) -> bool:
+        """커넥션이 지금 경로에 있는 파일을 가리키는지"""
+        return identity is not None and self._files.get(id(conn)) == identity
+
+    def _is_healthy(self, conn: sqlite3.Connection) -> bool:
+        """커넥션 헬스 체크"""
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, conn: sqlite3.Connection):
+        """커넥션 폐기 (락 보유 상태에서 호출)"""
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        self._files.pop(id(conn), None)
+        self._size -= 1
+
+    def _reclaim_dead_leases(self) -> int:
+        """종료된 스레드가 반환하지 않은 커넥션 회수 (락 보유 상태에서 호출)"""
+        alive = {t.ident for t in threading.enumerate()}
+        reclaimed = 0
+
+        for ident in [i for i in self._leases if i not in alive]:
+            conn = self._leases.pop(ident)[0]
+            if conn.in_transaction:
+                try:
+                    conn.rollback()
+                except sqlite3.Error:
+                    pass
+            self._idle.append(conn)
+            reclaimed += 1
+
+        if reclaimed:
+            self._stats["reclaimed"] += reclaimed
+            self.logger.warning(f"반환되지 않은 커넥션 회수: {reclaimed}개 ({self.db_path})")
+
+        return reclaimed
+
+    def _take_idle(self) -> Optional[sqlite3.Connection]:
+        """유휴 커넥션 중 정상인 것을 꺼냄 (락 보유 상태에서 호출)"""
+        if not self._idle:
+            return None
+        identity = file_identity(self.db_path)
+        while self._idle:
+            conn = self._idle.pop()
+            if not self._is_current(conn, identity):
+                # 파일이 지워졌거나 다른 파일로 바뀜: 예전 DB를 계속 보게 되므로 폐기
+                self._stats["stale_discarded"] += 1
+                self._discard(conn)
+                continue
+            if self._is_healthy(conn):
+                return conn
+            self._stats["health_check_failures"] += 1
+            self._discard(conn)
+        return None
+
+    def acquire(self) -> sqlite3.Connection:
+        """현재 스레드용 커넥션 대여
+
+        Returns:
+            설정이 완료된 sqlite3 커넥션
+
+        Raises:
+            sqlite3.OperationalError: 풀이 닫혔거나 대기 시간 초과
+        """
+        ident = threading.get_ident()
+        deadline = time.monotonic() + self.acquire_timeout
+
+        with self._cond:
+            if self._closed:
+                raise sqlite3.OperationalError(f"커넥션 풀이 닫혀 있습니다: {self.db_path}")
+
+            lease = self._leases.get(ident)
+            if lease:
+                lease[1] += 1
+                self._stats["hits"] += 1
+                return lease[0]
+
+            waited = False
+            while True:
+                conn = self._take_idle()
+                if conn is not None:
+                    self._stats["hits"] += 1
+                    break
+
+                if self._size < self.max_size:
+                    # 생성 중에는 다른 스레드를 막지 않도록 자리만 예약
+                    self._size += 1
+                    self._cond.release()
+                    try:
+                        conn = self._create_connection()
+                    except Exception:
+                        self._cond.acquire()
+                        self._size -= 1
+                        self._cond.notify()
+                        raise
+                    self._cond.acquire()
+                    self._files[id(conn)] = file_identity(self.db_path)
+                    self._stats["misses"] += 1
+                    break
+
+                if self._reclaim_dead_leases():
+                    continue
+
+                if not waited:
+                    self._stats["waits"] += 1
+                    waited = True
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise sqlite3.OperationalError(
+                        f"커넥션 풀 대기 시간 초과: {self.db_path} (max_size={self.max_size})"
+                    )
+                self._cond.wait(remaining)
+
+            self._leases[ident] = [conn, 1]
+            return conn
+
+    def release(self, conn: sqlite3.Connection):
+        """커넥션 반환
+
+        Args:
+            conn: acquire()로 받은 커넥션
+        """
+        with self._cond:
+            owner = None
+            for ident, lease in self._leases.items():
+                if lease[0] is conn:
+                    owner = ident
+                    break
+
+            if owner is None:
+                return
+
+            lease = self._leases[owner]
+            lease[1] -= 1
+            if lease[1] > 0:
+                return
+
+            del self._leases[owner]
+
+            # 미완료 트랜잭션이 다음 사용자에게 넘어가지 않도록 정리
+            if conn.in_transaction:
+                try:
+                    conn.rollback()
+                except sqlite3.Error:
+                    pass
+
+            if self._closed:
+                self._discard(conn)
+            else:
+                self._idle.append(conn)
+            self._cond.notify()
+
+    def close(self, checkpoint: bool = True):
+        """풀 종료 (유휴 커넥션 정리, 필요 시 WAL 체크포인트)
+
+        Args:
+            checkpoint: 종료 전 WAL 체크포인트 실행 여부
+        """
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+
+            if checkpoint and idle:
+                try:
+                    idle[0].execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                    self.logger.debug("WAL 체크포인트 완료")
+                except sqlite3.Error as wal_err:
+                    self.logger.warning(f"WAL 체크포인트 실패 (무시): {wal_err}")
+
+            for conn in idle:
+                self._discard(conn)
+
+            self._cond.notify_all()
+
+        self.logger.info(f"커넥션 풀 종료: {self.db_path}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """풀 통계 조회"""
+        with self._cond:
+            return {
+                "db_path": self.db_path,
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": len(self._leases),
+                **self._stats,
+            }
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_connection_pool(db_path: str, max_size: int = DEFAULT_POOL_SIZE) -> ConnectionPool:
+    """DB 파일별 프로세스 전역 커넥션 풀 조회 (없으면 생성)
+
+    Args:
+        db_path: SQLite 데이터베이스 파일 경로
+        max_size: 새로 생성할 때 사용할 최대 커넥션 수
+
+    Returns:
+        ConnectionPool 인스턴스
+
+    Raises:
+        ValueError: ':memory:' (커넥션마다 별도 DB라 풀로 공유할 수 없음)
+    """
+    if db_path == ':memory:':
+        raise ValueError("in-memory DB는 커넥션 풀을 사용할 수 없습니다")
+    key = os.path.abspath(db_path)
+
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool._closed:
+            pool = ConnectionPool(db_path, max_size=max_size)
+            _pools[key] = pool
+        return pool
+
+
+def close_all_pools(checkpoint: bool = True):
+    """모든 커넥션 풀 종료 (앱 종료 시 호출)"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+
+    for pool in pools:
+        pool.close(checkpoint=checkpoint)
+
+
+def get_all_pool_stats() -> List[Dict[str, Any]]:
+    """모든 커넥션 풀 통계"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return [pool.get_stats() for pool in pools]
@@ -10,63 +10,197 @@ import logging
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any, Union
 from pathlib import Path
+import os
 import threading
 
+from concurrent.futures import Future
+
+from .connection_pool import ConnectionPool, create_connection, get_connection_pool
+from .write_queue import WriteQueue, WriteResult, get_write_queue, is_write_query, DEFAULT_WRITE_TIMEOUT
+
+
+class _SettingsCache:
+    """system_settings 캐시 (DB 파일별 공유, 버전 카운터로 무효화)"""
+    
+    __slots__ = ('lock', 'version', 'loaded_version', 'values')
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = 0
+        self.loaded_version = -1
+        self.values: Dict[str, Any] = {}
+
+
+_settings_caches: Dict[str, _SettingsCache] = {}
+_settings_caches_lock = threading.Lock()
+
+
+def _get_settings_cache(db_path: str) -> _SettingsCache:
+    if db_path == ':memory:':
+        # in-memory DB는 매니저마다 다른 DB일 수 있으므로 공유하지 않음
+        return _SettingsCache()
+    key = os.path.abspath(db_path)
+    with _settings_caches_lock:
+        cache = _settings_caches.get(key)
+        if cache is None:
+            cache = _settings_caches[key] = _SettingsCache()
+        return cache
+
+
+def _convert_setting(value: Any, setting_type: str) -> Any:
+    """설정 타입에 따른 값 변환"""
+    if setting_type == 'integer':
+        return int(value)
+    elif setting_type == 'boolean':
+        return value.lower() in ('true', '1', 'yes')
+    elif setting_type == 'json':
+        return json.loads(value)
+    else:
+        return value
+
 
 class DatabaseManager:
     """SQLite 데이터베이스 연결 및 기본 CRUD 관리"""
     
-    def __init__(self, db_path: str = 'instance/gym_system.db'):
+    def __init__(self, db_path: str = 'instance/gym_system.db', use_write_queue: bool = True):
         """
         Args:
             db_path: SQLite 데이터베이스 파일 경로
+            use_write_queue: 쓰기 쿼리를 전용 writer 스레드(그룹 커밋)로 보낼지 여부
         """
         self.db_path = db_path
-        self.conn: Optional[sqlite3.Connection] = None
+        # in-memory DB는 커넥션마다 별도 DB이므로 writer 스레드를 거치지 않고 자기 커넥션에 씀
+        self.use_write_queue = use_write_queue and db_path != ':memory:'
         self.logger = logging.getLogger(__name__)
-        self._lock = threading.RLock()  # 스레드 안전성을 위한 락
+        # 연결 상태(connect/close)와 센서 매핑 확인-후-쓰기용 락
+        # (쿼리는 스레드별 커넥션에서 실행되므로 락 없이 동시에 읽음)
+        self._lock = threading.RLock()
+        self._pool: Optional[ConnectionPool] = None
+        self._connected = False
+        # 스레드별 커넥션 (앱 전역으로 공유되는 매니저도 스레드마다 별도 커넥션 사용)
+        self._local = threading.local()
+        # in-memory DB는 커넥션이 곧 DB이므로 풀을 쓰지 않고 매니저마다 하나를 모든 스레드가 공유
+        self._memory_conn: Optional[sqlite3.Connection] = None
+        # 시스템 설정 캐시 (같은 DB 파일을 쓰는 매니저끼리 공유, in-memory는 매니저별)
+        self._settings = _get_settings_cache(db_path)
+    
+    @property
+    def conn(self) -> Optional[sqlite3.Connection]:
+        """현재 스레드의 커넥션
+        
+        connect()된 매니저를 다른 스레드에서 사용하면 풀에서 해당 스레드용 커넥션을 지연 대여한다.
+        in-memory DB는 모든 스레드가 매니저의 커넥션 하나를 쓴다.
+        """
+        if self._memory_conn is not None:
+            return self._memory_conn
+        conn = getattr(self._local, 'conn', None)
+        if conn is None and self._connected:
+            try:
+                conn = self._pool.acquire()
+                self._local.conn = conn
+            except Exception as e:
+                self.logger.error(f"스레드 커넥션 대여 실패: {e}")
+                return None
+        return conn
         
     def connect(self) -> bool:
-        """데이터베이스 연결
+        """데이터베이스 연결 (프로세스 전역 커넥션 풀에서 대여)
         
         Returns:
             연결 성공 여부
         """
         try:
             with self._lock:
-                if self.conn:
-                    self.conn.close()
-                
-                self.conn = sqlite3.connect(
-                    self.db_path, 
-                    check_same_thread=False,
-                    timeout=30.0,
-                    isolation_level=None  # autocommit 모드
-                )
-                
-                # Row 팩토리 설정 (딕셔너리 형태로 결과 반환)
-                self.conn.row_factory = sqlite3.Row
-                
-                # 외래키 제약조건 활성화
-                self.conn.execute("PRAGMA foreign_keys = ON")
-                
-                # WAL 모드 활성화 (동시성 향상)
-                self.conn.execute("PRAGMA journal_mode = WAL")
+                if self.db_path == ':memory:':
+                    if self._memory_conn is None:
+                        self._memory_conn = create_connection(self.db_path)
+                    self._connected = True
+                    return True
                 
-                # WAL 자동 체크포인트 설정 (100페이지마다 = 약 400KB)
-                # DB 손상 방지를 위해 WAL 파일 크기 제한
-                self.conn.execute("PRAGMA wal_autocheckpoint = 100")
+                if self._connected:
+                    self._release_connection()
                 
-                # 동기화 모드 설정 (FULL로 변경 - 안전성 우선)
-                self.conn.execute("PRAGMA synchronous = FULL")
+                # PRAGMA(WAL, foreign_keys, synchronous) 설정은 풀이 커넥션 생성 시 1회 수행
+                self._pool = get_connection_pool(self.db_path)
+                self._local.conn = self._pool.acquire()
+                self._connected = True
                 
-                self.logger.info(f"데이터베이스 연결 성공: {self.db_path}")
+                self.logger.debug(f"데이터베이스 연결 성공: {self.db_path}")
                 return True
                 
         except Exception as e:
             self.logger.error(f"데이터베이스 연결 실패: {e}")
             return False
     
+    def _release_connection(self):
+        """현재 스레드의 커넥션을 풀에 반환 (락 보유 상태에서 호출)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self._pool.release(conn)
+            self._local.conn = None
+    
+    def release_thread_connection(self):
+        """현재 스레드의 커넥션만 풀에 반환 (매니저는 연결 상태 유지)
+        
+        앱 전역으로 공유되는 매니저에서 요청 처리 스레드가 끝날 때 호출한다.
+        """
+        with self._lock:
+            self._release_connection()
+    
+    def _get_write_queue(self) -> Optional[WriteQueue]:
+        """쓰기를 write queue로 보낼 수 있으면 큐 반환
+        
+        현재 스레드 커넥션에서 명시적 트랜잭션(begin_transaction)이 진행 중이면
+        같은 트랜잭션 안에서 실행해야 하므로 None을 반환한다.
+        """
+        if not self.use_write_queue or not self._connected:
+            return None
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and conn.in_transaction:
+            return None
+        return get_write_queue(self.db_path)
+    
+    def submit_write(self, query: str, params: Union[tuple, dict] = ()) -> Future:
+        """쓰기 쿼리를 writer 스레드에 제출 (커밋 완료를 기다리지 않음)
+        
+        Args:
+            query: SQL 쓰기 쿼리
+            params: 쿼리 파라미터
+            
+        Returns:
+            커밋 후 WriteResult로 완료되는 Future (write queue를 쓰지 않으면 실행 후 완료된 Future)
+        """
+        if self.use_write_queue:
+            return get_write_queue(self.db_path).submit(query, params)
+        
+        future: Future = Future()
+        cursor = self.execute_query(query, params)
+        if cursor is None:
+            future.set_exception(sqlite3.OperationalError(f"쿼리 실행 실패: {query[:100]}"))
+        else:
+            future.set_result(WriteResult(cursor.rowcount, cursor.lastrowid))
+        return future
+    
+    def get_write_queue_stats(self) -> Dict[str, Any]:
+        """write queue 통계 (배치 크기, 지연시간, BUSY 재시도 수)
+        
+        Returns:
+            통계 딕셔너리 (write queue를 쓰지 않으면 빈 딕셔너리)
+        """
+        if not self.use_write_queue:
+            return {}
+        return get_write_queue(self.db_path).get_stats()
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """커넥션 풀 통계 (hit/miss, 사용 중/유휴 커넥션 수)
+        
+        Returns:
+            풀 통계 딕셔너리 (in-memory DB는 풀을 쓰지 않으므로 빈 딕셔너리)
+        """
+        if self.db_path == ':memory:':
+            return {}
+        return get_connection_pool(self.db_path).get_stats()
+    
     def initialize_schema(self) -> bool:
         """스키마 초기화
         
@@ -74,50 +208,61 @@ class DatabaseManager:
             초기화 성공 여부
         """
         try:
-            with self._lock:
-                if not self.conn:
-                    self.logger.error("데이터베이스 연결이 필요합니다")
-                    return False
-                
-                # 스키마 파일 경로
-                schema_path = Path(__file__).parent / "schema.sql"
-                
-                if not schema_path.exists():
-                    self.logger.error(f"스키마 파일을 찾을 수 없습니다: {schema_path}")
-                    return False
-                
-                # 스키마 파일 읽기 및 실행
-                with open(schema_path, 'r', encoding='utf-8') as f:
-                    schema_sql = f.read()
-                
-                self.conn.executescript(schema_sql)
-                self.logger.info("데이터베이스 스키마 초기화 완료")
-                return True
-                
+            if not self.conn:
+                self.logger.error("데이터베이스 연결이 필요합니다")
+                return False
+            
+            # 스키마 파일 경로
+            schema_path = Path(__file__).parent / "schema.sql"
+            
+            if not schema_path.exists():
+                self.logger.error(f"스키마 파일을 찾을 수 없습니다: {schema_path}")
+                return False
+            
+            # 스키마 파일 읽기 및 실행
+            with open(schema_path, 'r', encoding='utf-8') as f:
+                schema_sql = f.read()
+            
+            self.conn.executescript(schema_sql)
+            # 기본 설정이 새로 들어갔을 수 있으므로 캐시 무효화
+            self.invalidate_settings_cache()
+            self.logger.info("데이터베이스 스키마 초기화 완료")
+            return True
+            
         except Exception as e:
             self.logger.error(f"스키마 초기화 실패: {e}")
             return False
     
-    def execute_query(self, query: str, params: Union[tuple, dict] = ()) -> Optional[sqlite3.Cursor]:
+    def execute_query(self, query: str, params: Union[tuple, dict] = ()) -> Optional[Union[sqlite3.Cursor, WriteResult]]:
         """쿼리 실행
         
+        쓰기 쿼리(INSERT/UPDATE/DELETE/REPLACE)는 writer 스레드에서 그룹 커밋되며,
+        커밋이 끝날 때까지 기다린 뒤 rowcount/lastrowid를 가진 WriteResult를 반환한다.
+        
         Args:
             query: SQL 쿼리
             params: 쿼리 파라미터
             
         Returns:
-            커서 객체 또는 None
+            커서 객체(쓰기는 WriteResult) 또는 None
         """
         try:
-            with self._lock:
-                if not self.conn:
-                    self.logger.error("데이터베이스 연결이 필요합니다")
-                    return None
-                
-                cursor = self.conn.execute(query, params)
-                self.logger.debug(f"쿼리 실행: {query[:100]}...")
-                return cursor
-                
+            if is_write_query(query):
+                write_queue = self._get_write_queue()
+                if write_queue is not None:
+                    # 락을 잡지 않고 대기해야 다른 스레드의 쓰기와 같은 배치로 묶인다
+                    result = write_queue.execute(query, params)
+                    self.logger.debug(f"쿼리 실행 (group commit): {query[:100]}...")
+                    return result
+            
+            if not self.conn:
+                self.logger.error("데이터베이스 연결이 필요합니다")
+                return None
+            
+            cursor = self.conn.execute(query, params)
+            self.logger.debug(f"쿼리 실행: {query[:100]}...")
+            return cursor
+            
         except Exception as e:
             self.logger.error(f"쿼리 실행 실패: {query[:100]}..., 오류: {e}")
             return None
@@ -133,15 +278,20 @@ class DatabaseManager:
             실행 성공 여부
         """
         try:
-            with self._lock:
-                if not self.conn:
-                    self.logger.error("데이터베이스 연결이 필요합니다")
-                    return False
-                
-                self.conn.executemany(query, params_list)
-                self.logger.debug(f"다중 쿼리 실행 완료: {len(params_list)}건")
+            write_queue = self._get_write_queue()
+            if write_queue is not None:
+                write_queue.execute_many(query, params_list, DEFAULT_WRITE_TIMEOUT)
+                self.logger.debug(f"다중 쿼리 실행 완료 (group commit): {len(params_list)}건")
                 return True
-                
+            
+            if not self.conn:
+                self.logger.error("데이터베이스 연결이 필요합니다")
+                return False
+            
+            self.conn.executemany(query, params_list)
+            self.logger.debug(f"다중 쿼리 실행 완료: {len(params_list)}건")
+            return True
+            
         except Exception as e:
             self.logger.error(f"다중 쿼리 실행 실패: {e}")
             return False
@@ -149,48 +299,44 @@ class DatabaseManager:
     def begin_transaction(self):
         """트랜잭션 시작"""
         try:
-            with self._lock:
-                if self.conn:
-                    self.conn.execute("BEGIN IMMEDIATE")
-                    self.logger.debug("트랜잭션 시작")
+            if self.conn:
+                self.conn.execute("BEGIN IMMEDIATE")
+                self.logger.debug("트랜잭션 시작")
         except Exception as e:
             self.logger.error(f"트랜잭션 시작 실패: {e}")
     
     def commit(self):
         """트랜잭션 커밋"""
         try:
-            with self._lock:
-                if self.conn:
-                    self.conn.commit()
-                    self.logger.debug("트랜잭션 커밋")
+            if self.conn:
+                self.conn.commit()
+                self.logger.debug("트랜잭션 커밋")
         except Exception as e:
             self.logger.error(f"트랜잭션 커밋 실패: {e}")
     
     def rollback(self):
         """트랜잭션 롤백"""
         try:
-            with self._lock:
-                if self.conn:
-                    self.conn.rollback()
-                    self.logger.debug("트랜잭션 롤백")
+            if self.conn:
+                self.conn.rollback()
+                self.logger.debug("트랜잭션 롤백")
         except Exception as e:
             self.logger.error(f"트랜잭션 롤백 실패: {e}")
     
     def close(self):
-        """연결 종료 (WAL 체크포인트 포함)"""
+        """연결 종료 (커넥션을 풀에 반환)
+        
+        WAL 체크포인트는 풀 종료 시(close_all_pools) 일괄 수행한다.
+        """
         try:
             with self._lock:
-                if self.conn:
-                    # 종료 전 WAL 체크포인트 실행 (데이터 손실 방지)
-                    try:
-                        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
-                        self.logger.debug("WAL 체크포인트 완료")
-                    except Exception as wal_err:
-                        self.logger.warning(f"WAL 체크포인트 실패 (무시): {wal_err}")
-                    
-                    self.conn.close()
-                    self.conn = None
-                    self.logger.info("데이터베이스 연결 종료")
+                if self._memory_conn is not None:
+                    self._memory_conn.close()
+                    self._memory_conn = None
+                if self._connected:
+                    self._release_connection()
+                    self._connected = False
+                    self.logger.debug("데이터베이스 연결 반환")
         except Exception as e:
             self.logger.error(f"연결 종료 실패: {e}")
     
@@ -291,6 +437,8 @@ class DatabaseManager:
     def get_system_setting(self, key: str, default_value: Any = None) -> Any:
         """시스템 설정 조회
         
+        캐시가 최신 버전이면 딕셔너리 조회만 하고, 무효화된 경우에만 전체 설정을 다시 읽는다.
+        
         Args:
             key: 설정 키
             default_value: 기본값
@@ -298,28 +446,47 @@ class DatabaseManager:
         Returns:
             설정 값
         """
-        cursor = self.execute_query(
-            "SELECT setting_value, setting_type FROM system_settings WHERE setting_key = ?", 
-            (key,)
-        )
+        cache = self._settings
+        if cache.loaded_version != cache.version:
+            self._reload_settings()
         
-        if cursor:
-            row = cursor.fetchone()
-            if row:
-                value = row['setting_value']
-                setting_type = row['setting_type']
-                
-                # 타입에 따른 변환
-                if setting_type == 'integer':
-                    return int(value)
-                elif setting_type == 'boolean':
-                    return value.lower() in ('true', '1', 'yes')
-                elif setting_type == 'json':
-                    return json.loads(value)
-                else:
-                    return value
-        
-        return default_value
+        return cache.values.get(key, default_value)
+    
+    def _reload_settings(self):
+        """system_settings 전체를 읽어 타입 변환 후 캐시에 저장"""
+        cache = self._settings
+        with cache.lock:
+            version = cache.version
+            if cache.loaded_version == version:
+                return
+            
+            cursor = self.execute_query("SELECT setting_key, setting_value, setting_type FROM system_settings")
+            if not cursor:
+                return
+            
+            values = {}
+            for row in cursor.fetchall():
+                try:
+                    values[row['setting_key']] = _convert_setting(row['setting_value'], row['setting_type'])
+                except (ValueError, TypeError, AttributeError) as e:
+                    self.logger.warning(f"시스템 설정 변환 실패: {row['setting_key']}, {e}")
+            
+            cache.values = values
+            cache.loaded_version = version
+    
+    def invalidate_settings_cache(self):
+        """설정 캐시 무효화 (다음 조회 시 DB에서 다시 읽음)
+        
+        system_settings를 직접 수정한 경우(구글시트 동기화 등) 호출해야 한다.
+        """
+        cache = self._settings
+        with cache.lock:
+            cache.version += 1
+    
+    @property
+    def settings_version(self) -> int:
+        """설정 캐시 버전 (변경될 때마다 증가)"""
+        return self._settings.version
     
     def set_system_setting(self, key: str, value: Any, setting_type: str = 'string') -> bool:
         """시스템 설정 저장
@@ -345,6 +512,7 @@ class DatabaseManager:
                 VALUES (?, ?, ?)
             """, (key, str_value, setting_type))
             
+            self.invalidate_settings_cache()
             return cursor is not None
             
         except Exception as e:
@@ -415,6 +583,9 @@ class DatabaseManager:
                 stats['db_size_bytes'] = db_path.stat().st_size
                 stats['db_size_mb'] = round(stats['db_size_bytes'] / (1024 * 1024), 2)
             
+            stats['connection_pool'] = self.get_pool_stats()
+            if self.use_write_queue:
+                stats['write_queue'] = self.get_write_queue_stats()
             stats['last_updated'] = datetime.now(timezone.utc).isoformat()
             
         except Exception as e:
@@ -438,18 +609,17 @@ class DatabaseManager:
             센서 매핑 정보 딕셔너리 또는 None
         """
         try:
-            with self._lock:
-                cursor = self.execute_query("""
-                    SELECT * FROM sensor_mapping
-                    WHERE addr = ? AND chip_idx = ? AND pin = ?
-                """, (addr, chip_idx, pin))
+            cursor = self.execute_query("""
+                SELECT * FROM sensor_mapping
+                WHERE addr = ? AND chip_idx = ? AND pin = ?
+            """, (addr, chip_idx, pin))
 
-                if cursor:
-                    row = cursor.fetchone()
-                    if row:
-                        return dict(row)
+            if cursor:
+                row = cursor.fetchone()
+                if row:
+                    return dict(row)
 
-                return None
+            return None
 
         except Exception as e:
             self.logger.error(f"센서 매핑 조회 실패: addr={addr}, chip={chip_idx}, pin={pin}, {e}")
@@ -465,18 +635,17 @@ class DatabaseManager:
             센서 매핑 정보 딕셔너리 또는 None
         """
         try:
-            with self._lock:
-                cursor = self.execute_query("""
-                    SELECT * FROM sensor_mapping
-                    WHERE sensor_num = ?
-                """, (sensor_num,))
+            cursor = self.execute_query("""
+                SELECT * FROM sensor_mapping
+                WHERE sensor_num = ?
+            """, (sensor_num,))
 
-                if cursor:
-                    row = cursor.fetchone()
-                    if row:
-                        return dict(row)
+            if cursor:
+                row = cursor.fetchone()
+                if row:
+                    return dict(row)
 
-                return None
+            return None
 
         except Exception as e:
             self.logger.error(f"센서 번호 매핑 조회 실패: sensor_num={sensor_num}, {e}")
@@ -492,18 +661,17 @@ class DatabaseManager:
             센서 매핑 정보 딕셔너리 또는 None
         """
         try:
-            with self._lock:
-                cursor = self.execute_query("""
-                    SELECT * FROM sensor_mapping
-                    WHERE locker_id = ?
-                """, (locker_id,))
+            cursor = self.execute_query("""
+                SELECT * FROM sensor_mapping
+                WHERE locker_id = ?
+            """, (locker_id,))
 
-                if cursor:
-                    row = cursor.fetchone()
-                    if row:
-                        return dict(row)
+            if cursor:
+                row = cursor.fetchone()
+                if row:
+                    return dict(row)
 
-                return None
+            return None
 
         except Exception as e:
             self.logger.error(f"락커 ID 매핑 조회 실패: locker_id={locker_id}, {e}")
@@ -516,16 +684,15 @@ class DatabaseManager:
             센서 매핑 리스트
         """
         try:
-            with self._lock:
-                cursor = self.execute_query("""
-                    SELECT * FROM sensor_mapping
-                    ORDER BY sensor_num
-                """)
+            cursor = self.execute_query("""
+                SELECT * FROM sensor_mapping
+                ORDER BY sensor_num
+            """)
 
-                if cursor:
-                    return [dict(row) for row in cursor.fetchall()]
+            if cursor:
+                return [dict(row) for row in cursor.fetchall()]
 
-                return []
+            return []
 
         except Exception as e:
             self.logger.error(f"전체 센서 매핑 조회 실패: {e}")
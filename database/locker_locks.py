@@ -0,0 +1,169 @@
+"""
+락카/구역 단위 잠금 테이블
+
+트랜잭션마다 필요한 범위(특정 락카 또는 구역 전체)만 잠가서
+MALE/FEMALE/STAFF 구역의 대여·반납이 동시에 진행될 수 있게 한다.
+
+- 구역 잠금: 해당 구역의 모든 락카를 배타적으로 점유 (락카를 아직 고르지 않은 대여)
+- 락카 잠금: 해당 락카 하나만 점유 (반납, 락카를 지정한 대여)
+"""
+
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Any, Set, Tuple
+
+
+DEFAULT_ZONES = ('MALE', 'FEMALE', 'STAFF')
+
+_ZONE_PREFIXES = {
+    'M': 'MALE',
+    'F': 'FEMALE',
+    'S': 'STAFF',
+}
+
+
+def zone_of_locker(locker_number: str) -> str:
+    """락카 번호 접두어로 구역 추정 (M01 → MALE)"""
+    if not locker_number:
+        return ''
+    return _ZONE_PREFIXES.get(locker_number[0].upper(), '')
+
+
+class LockerLockTable:
+    """락카/구역 잠금 테이블 (all-or-nothing, 비대기 방식)"""
+
+    def __init__(self, zones: Iterable[str] = DEFAULT_ZONES,
+                 locker_zones: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            zones: 전체 구역 목록 (범위 미지정 트랜잭션이 잠글 구역)
+            locker_zones: 락카 번호 → 구역 매핑 (없으면 번호 접두어로 추정)
+        """
+        self._lock = threading.Lock()
+        self._zones: Set[str] = set(zones)
+        self._locker_zones: Dict[str, str] = dict(locker_zones or {})
+
+        self._zone_owner: Dict[str, str] = {}
+        self._locker_owner: Dict[str, str] = {}
+        self._held: Dict[str, Tuple[Set[str], Set[str]]] = {}
+
+        self._stats = {
+            "acquired": 0,
+            "conflicts": 0,
+            "released": 0,
+            "max_concurrent": 0,
+        }
+        self._conflicts_by_scope: Counter = Counter()
+
+    @property
+    def zones(self) -> List[str]:
+        """전체 구역 목록"""
+        return sorted(self._zones)
+
+    def set_locker_zones(self, locker_zones: Dict[str, str]):
+        """락카 → 구역 매핑 갱신 (locker_status 기준)"""
+        with self._lock:
+            self._locker_zones = dict(locker_zones)
+            self._zones.update(zone for zone in locker_zones.values() if zone)
+
+    def zone_of(self, locker_number: str) -> str:
+        """락카가 속한 구역"""
+        return self._locker_zones.get(locker_number) or zone_of_locker(locker_number)
+
+    def _find_conflict(self, tx_id: str, lockers: Set[str], zones: Set[str]) -> Optional[str]:
+        """다른 트랜잭션과 충돌하는 범위 반환 (락 보유 상태에서 호출)"""
+        for zone in zones:
+            owner = self._zone_owner.get(zone)
+            if owner and owner != tx_id:
+                return f"zone:{zone}"
+            for locker, locker_owner in self._locker_owner.items():
+                if locker_owner != tx_id and self.zone_of(locker) == zone:
+                    return f"zone:{zone}"
+
+        for locker in lockers:
+            owner = self._locker_owner.get(locker)
+            if owner and owner != tx_id:
+                return f"locker:{locker}"
+            zone_owner = self._zone_owner.get(self.zone_of(locker))
+            if zone_owner and zone_owner != tx_id:
+                return f"zone:{self.zone_of(locker)}"
+
+        return None
+
+    def try_acquire(self, tx_id: str, lockers: Iterable[str] = (),
+                    zones: Iterable[str] = ()) -> Optional[str]:
+        """잠금 획득 시도 (전부 획득하거나 아무것도 획득하지 않음)
+
+        Args:
+            tx_id: 트랜잭션 ID
+            lockers: 잠글 락카 번호들
+            zones: 잠글 구역들 (락카와 구역 모두 비어 있으면 전체 구역)
+
+        Returns:
+            충돌한 범위 ("zone:MALE", "locker:M01") 또는 None (획득 성공)
+        """
+        lockers = set(lockers)
+        zones = set(zones)
+
+        with self._lock:
+            if not lockers and not zones:
+                zones = set(self._zones)
+
+            conflict = self._find_conflict(tx_id, lockers, zones)
+            if conflict:
+                self._stats["conflicts"] += 1
+                self._conflicts_by_scope[conflict] += 1
+                return conflict
+
+            held_lockers, held_zones = self._held.setdefault(tx_id, (set(), set()))
+            for zone in zones:
+                self._zone_owner[zone] = tx_id
+                held_zones.add(zone)
+            for locker in lockers:
+                self._locker_owner[locker] = tx_id
+                held_lockers.add(locker)
+
+            self._stats["acquired"] += 1
+            self._stats["max_concurrent"] = max(self._stats["max_concurrent"], len(self._held))
+            return None
+
+    def release(self, tx_id: str) -> bool:
+        """트랜잭션이 가진 모든 잠금 해제
+
+        Returns:
+            해제한 잠금이 있었는지 여부
+        """
+        with self._lock:
+            held = self._held.pop(tx_id, None)
+            if held is None:
+                return False
+
+            held_lockers, held_zones = held
+            for locker in held_lockers:
+                if self._locker_owner.get(locker) == tx_id:
+                    del self._locker_owner[locker]
+            for zone in held_zones:
+                if self._zone_owner.get(zone) == tx_id:
+                    del self._zone_owner[zone]
+
+            self._stats["released"] += 1
+            return True
+
+    def get_scope(self, tx_id: str) -> Dict[str, List[str]]:
+        """트랜잭션이 가진 잠금 범위"""
+        with self._lock:
+            held_lockers, held_zones = self._held.get(tx_id, (set(), set()))
+            return {'lockers': sorted(held_lockers), 'zones': sorted(held_zones)}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """잠금 경합 통계"""
+        with self._lock:
+            attempts = self._stats["acquired"] + self._stats["conflicts"]
+            return {
+                **self._stats,
+                "holders": len(self._held),
+                "held_zones": dict(self._zone_owner),
+                "held_lockers": dict(self._locker_owner),
+                "conflict_rate": round(self._stats["conflicts"] / attempts, 3) if attempts else 0.0,
+                "conflicts_by_scope": dict(self._conflicts_by_scope.most_common(10)),
+            }
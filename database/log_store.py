@@ -0,0 +1,250 @@
+"""
+시스템 로그 전용 저장소
+
+운영 DB(gym_system.db)와 분리된 별도 SQLite 파일에 로그를 저장한다.
+로그는 유실되어도 치명적이지 않으므로 synchronous=OFF로 fsync를 생략하고,
+대여/락커 쓰기가 로그 flush 때문에 쓰기 락을 기다리지 않도록 한다.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+
+DEFAULT_LOG_DB_PATH = 'instance/gym_logs.db'
+
+_LOG_COLUMNS = (
+    'log_level', 'logger_name', 'message', 'member_id',
+    'rental_id', 'locker_number', 'extra_data', 'created_at'
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS system_logs (
+    log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    log_level TEXT NOT NULL,
+    logger_name TEXT,
+    message TEXT NOT NULL,
+    member_id TEXT,
+    rental_id INTEGER,
+    locker_number TEXT,
+    extra_data TEXT,
+    sync_status INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_system_logs_level ON system_logs(log_level);
+CREATE INDEX IF NOT EXISTS idx_system_logs_sync ON system_logs(sync_status);
+CREATE INDEX IF NOT EXISTS idx_system_logs_created ON system_logs(created_at);
+"""
+
+
+class LogStore:
+    """system_logs 전용 SQLite 저장소"""
+
+    def __init__(self, db_path: str = DEFAULT_LOG_DB_PATH):
+        """
+        Args:
+            db_path: 로그 DB 파일 경로
+        """
+        self.db_path = db_path
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=5.0, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        # 로그는 전원 차단 시 마지막 몇 건이 유실되어도 무방
+        self._conn.execute("PRAGMA synchronous = OFF")
+        self._conn.execute("PRAGMA wal_autocheckpoint = 1000")
+        self._conn.executescript(_SCHEMA)
+
+    def append_many(self, entries: List[Dict[str, Any]]) -> int:
+        """로그 배치 저장
+
+        Args:
+            entries: DBLogHandler가 만든 로그 딕셔너리 목록
+
+        Returns:
+            저장된 건수
+        """
+        if not entries:
+            return 0
+
+        rows = [tuple(entry.get(col) for col in _LOG_COLUMNS) for entry in entries]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(f"""
+                    INSERT INTO system_logs ({', '.join(_LOG_COLUMNS)})
+                    VALUES ({', '.join('?' for _ in _LOG_COLUMNS)})
+                """, rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def get_unsynced(self, limit: int = 5000) -> List[Dict[str, Any]]:
+        """구글시트에 아직 올리지 않은 로그 조회
+
+        Args:
+            limit: 최대 조회 건수
+
+        Returns:
+            로그 딕셔너리 목록 (log_id 오름차순)
+        """
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT log_id, log_level, logger_name, message, member_id,
+                       rental_id, locker_number, extra_data, created_at
+                FROM system_logs
+                WHERE sync_status = 0
+                ORDER BY log_id ASC
+                LIMIT ?
+            """, (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def mark_synced(self, log_ids: List[int]) -> int:
+        """로그 동기화 완료 표시
+
+        Args:
+            log_ids: 동기화된 log_id 목록
+
+        Returns:
+            갱신된 건수
+        """
+        if not log_ids:
+            return 0
+
+        placeholders = ','.join('?' for _ in log_ids)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE system_logs SET sync_status = 1 WHERE log_id IN ({placeholders})",
+                tuple(log_ids)
+            )
+        return cursor.rowcount
+
+    def get_recent(self, limit: int = 200, level: Optional[str] = None) -> List[Dict[str, Any]]:
+        """최근 로그 조회 (관리자 도구용)
+
+        Args:
+            limit: 최대 조회 건수
+            level: 로그 레벨 필터 (예: 'ERROR')
+
+        Returns:
+            로그 딕셔너리 목록 (최신순)
+        """
+        query = "SELECT * FROM system_logs"
+        params: tuple = ()
+        if level:
+            query += " WHERE log_level = ?"
+            params = (level.upper(),)
+        query += " ORDER BY log_id DESC LIMIT ?"
+
+        with self._lock:
+            rows = self._conn.execute(query, params + (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def purge_synced(self, older_than_days: int = 30) -> int:
+        """동기화 완료된 오래된 로그 삭제
+
+        Args:
+            older_than_days: 보관 기간 (일)
+
+        Returns:
+            삭제된 건수
+        """
+        # created_at은 DBLogHandler가 datetime.now().isoformat()으로 넣으므로 같은 'T' 구분 형식으로 비교
+        with self._lock:
+            cursor = self._conn.execute("""
+                DELETE FROM system_logs
+                WHERE sync_status = 1
+                  AND created_at < strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime', ?)
+            """, (f'-{older_than_days} days',))
+        return cursor.rowcount
+
+    def migrate_legacy_logs(self, source_db_path: str) -> int:
+        """운영 DB에 남아 있는 미동기화 로그를 로그 DB로 옮기고 운영 DB에서 삭제
+
+        Args:
+            source_db_path: 기존 운영 DB 경로
+
+        Returns:
+            옮긴 건수
+        """
+        if not os.path.exists(source_db_path):
+            return 0
+
+        source = sqlite3.connect(source_db_path, timeout=30.0)
+        try:
+            exists = source.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'system_logs'"
+            ).fetchone()
+            if not exists:
+                return 0
+
+            columns = ', '.join(_LOG_COLUMNS)
+            rows = source.execute(
+                f"SELECT {columns} FROM system_logs WHERE sync_status = 0 ORDER BY log_id"
+            ).fetchall()
+            if rows:
+                self.append_many([dict(zip(_LOG_COLUMNS, row)) for row in rows])
+
+            source.execute("DELETE FROM system_logs")
+            source.commit()
+        finally:
+            source.close()
+
+        if rows:
+            self.logger.info(f"운영 DB 로그 이전 완료: {len(rows)}건 → {self.db_path}")
+        return len(rows)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """로그 저장소 통계"""
+        with self._lock:
+            row = self._conn.execute("""
+                SELECT COUNT(*) AS total,
+                       COALESCE(SUM(CASE WHEN sync_status = 0 THEN 1 ELSE 0 END), 0) AS unsynced
+                FROM system_logs
+            """).fetchone()
+        return {'db_path': self.db_path, 'total': row['total'], 'unsynced': row['unsynced']}
+
+    def close(self):
+        """저장소 종료"""
+        with self._lock:
+            try:
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except sqlite3.Error:
+                pass
+            self._conn.close()
+
+
+_stores: Dict[str, LogStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_log_store(db_path: str = DEFAULT_LOG_DB_PATH) -> LogStore:
+    """로그 DB 파일별 프로세스 전역 LogStore 조회 (없으면 생성)"""
+    key = os.path.abspath(db_path)
+
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = LogStore(db_path)
+            _stores[key] = store
+        return store
+
+
+def close_all_log_stores():
+    """모든 LogStore 종료 (앱 종료 시 호출)"""
+    with _stores_lock:
+        stores = list(_stores.values())
+        _stores.clear()
+
+    for store in stores:
+        store.close()
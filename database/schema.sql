@@ -106,7 +106,7 @@ CREATE TABLE IF NOT EXISTS active_transactions (
     start_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP, -- 시작 시각
     last_activity TIMESTAMP DEFAULT CURRENT_TIMESTAMP, -- 마지막 활동 시각
     timeout_at TIMESTAMP NOT NULL,       -- 타임아웃 예정 시각
-    sensor_events TEXT,                  -- 센서 이벤트 기록 (JSON)
+    sensor_events TEXT,                  -- 단계 데이터 (JSON, 센서 이벤트는 transaction_events)
     status TEXT DEFAULT 'active',        -- 상태 (active, completed, timeout, failed)
     
     -- 트랜잭션 메타 정보
@@ -120,6 +120,20 @@ CREATE TABLE IF NOT EXISTS active_transactions (
     FOREIGN KEY (member_id) REFERENCES members(member_id) ON DELETE CASCADE
 );
 
+-- =====================================================
+-- 트랜잭션 이벤트 테이블 (append-only)
+-- =====================================================
+CREATE TABLE IF NOT EXISTS transaction_events (
+    event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    transaction_id TEXT NOT NULL,        -- 트랜잭션 ID
+    ts TEXT NOT NULL,                    -- 이벤트 시각 (UTC ISO8601)
+    event_type TEXT NOT NULL DEFAULT 'sensor', -- 이벤트 종류
+    locker_number TEXT,                  -- 락카 번호
+    sensor_data TEXT,                    -- 센서 데이터 (JSON, 이벤트 1건)
+    
+    FOREIGN KEY (transaction_id) REFERENCES active_transactions(transaction_id) ON DELETE CASCADE
+);
+
 -- =====================================================
 -- 시스템 설정 테이블
 -- =====================================================
@@ -191,6 +205,7 @@ CREATE INDEX IF NOT EXISTS idx_transaction_member ON active_transactions(member_
 CREATE INDEX IF NOT EXISTS idx_transaction_status ON active_transactions(status);
 CREATE INDEX IF NOT EXISTS idx_transaction_timeout ON active_transactions(timeout_at);
 CREATE INDEX IF NOT EXISTS idx_transaction_type ON active_transactions(transaction_type);
+CREATE INDEX IF NOT EXISTS idx_transaction_events_tx_ts ON transaction_events(transaction_id, ts);
 
 -- 센서 이벤트 테이블 인덱스
 CREATE INDEX IF NOT EXISTS idx_sensor_locker ON sensor_events(locker_number);
@@ -217,6 +232,8 @@ INSERT OR IGNORE INTO system_settings (setting_key, setting_value, setting_type,
 ('transaction_timeout_seconds', '30', 'integer', '트랜잭션 타임아웃 시간 (초)'),
 ('max_daily_rentals', '3', 'integer', '일일 최대 대여 횟수'),
 ('sensor_verification_timeout', '30', 'integer', '센서 검증 타임아웃 시간 (초)'),
+('sensor_debounce_ms', '150', 'integer', 'IR 센서 디바운스 시간 (ms, 0이면 끔)'),
+('sensor_debounce_overrides', '{}', 'json', '센서별 디바운스 시간 (ms) {"센서번호" 또는 "락카ID": ms}'),
 ('sync_interval_minutes', '5', 'integer', '구글시트 동기화 간격 (분)'),
 ('download_interval_sec', '300', 'integer', '다운로드 동기화 간격 (초)'),
 ('upload_interval_sec', '300', 'integer', '업로드 동기화 간격 (초)'),
@@ -337,6 +354,8 @@ END;
 
 -- =====================================================
 -- 시스템 로그 테이블 (분석용)
+-- ※ 로그는 별도 로그 DB(instance/gym_logs.db, database/log_store.py)에 저장됨
+--   이 테이블은 이전 버전 로그 이전용으로만 유지
 -- =====================================================
 CREATE TABLE IF NOT EXISTS system_logs (
     log_id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -0,0 +1,277 @@
+"""
+센서 매핑 인덱스
+
+sensor_mapping 테이블을 한 번 읽어 (addr, chip_idx, pin) → sensor_num → locker_id
+조회 테이블을 메모리에 만들어 두고, 센서 이벤트 처리 경로에서는 파일/DB를 읽지 않는다.
+매핑이 바뀌면(센서 등록/해제) reload()로 새 스냅샷을 만들어 참조를 한 번에 교체한다.
+
+우선순위 (뒤가 앞을 덮어씀):
+1. 기본 하드웨어 매핑 / 기본 순차 락카 매핑 (S01~S10, M01~M40, F01~F10)
+2. 레거시 설정 파일 config/sensor_mapping.json (있을 때만)
+3. sensor_mapping 테이블
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# 하드웨어 기본 매핑 (DB에 등록되지 않은 핀의 폴백)
+# (addr, chip_idx, pin) → sensor_num
+DEFAULT_HARDWARE_MAPPING: Dict[Tuple[str, int, int], int] = {
+    # addr=0x26, Chip0 → 교직원 (S01-S10)
+    ("0x26", 0, 1): 1, ("0x26", 0, 0): 2, ("0x26", 0, 6): 3, ("0x26", 0, 5): 4,
+    ("0x26", 0, 4): 5, ("0x26", 0, 3): 6, ("0x26", 0, 2): 7, ("0x26", 0, 9): 8,
+    ("0x26", 0, 8): 9, ("0x26", 0, 7): 10,
+    # addr=0x23, Chip0 → 남성 (M01-M10)
+    ("0x23", 0, 1): 11, ("0x23", 0, 2): 12, ("0x23", 0, 0): 13, ("0x23", 0, 6): 14,
+    ("0x23", 0, 5): 15, ("0x23", 0, 3): 16, ("0x23", 0, 4): 17, ("0x23", 0, 9): 18,
+    ("0x23", 0, 7): 19, ("0x23", 0, 8): 20,
+    # addr=0x25, Chip1 → 남성 (M11-M20)
+    ("0x25", 1, 0): 21, ("0x25", 1, 3): 22, ("0x25", 1, 1): 23, ("0x25", 1, 2): 24,
+    ("0x25", 1, 5): 25, ("0x25", 1, 7): 26, ("0x25", 1, 4): 27, ("0x25", 1, 6): 28,
+    ("0x25", 1, 8): 29, ("0x25", 1, 9): 30,
+    # addr=0x26, Chip2 → 남성 (M21-M30, M34-M35, M38-M40)
+    ("0x26", 2, 5): 31, ("0x26", 2, 6): 32, ("0x26", 2, 7): 33, ("0x26", 2, 10): 34,
+    ("0x26", 2, 11): 35, ("0x26", 2, 9): 36, ("0x26", 2, 8): 37, ("0x26", 2, 14): 38,
+    ("0x26", 2, 13): 39, ("0x26", 2, 12): 40, ("0x26", 2, 0): 44, ("0x26", 2, 1): 45,
+    ("0x26", 2, 3): 48, ("0x26", 2, 2): 49, ("0x26", 2, 4): 50,
+    # addr=0x24, Chip1 → 남성 (M31-M33, M36-M37)
+    ("0x24", 1, 9): 41, ("0x24", 1, 7): 42, ("0x24", 1, 8): 43,
+    ("0x24", 1, 6): 46, ("0x24", 1, 5): 47,
+    # addr=0x27, Chip3 → 여성 (F01-F10)
+    ("0x27", 3, 0): 51, ("0x27", 3, 1): 52, ("0x27", 3, 3): 53, ("0x27", 3, 2): 54,
+    ("0x27", 3, 4): 55, ("0x27", 3, 5): 56, ("0x27", 3, 6): 57, ("0x27", 3, 8): 58,
+    ("0x27", 3, 7): 59, ("0x27", 3, 9): 60,
+}
+
+LEGACY_CONFIG_PATH = Path(__file__).parent.parent / "config" / "sensor_mapping.json"
+
+
+def default_locker_for_sensor(sensor_num: int) -> Optional[str]:
+    """기본 순차 매핑 (센서 1-10: S01~S10, 11-50: M01~M40, 51-60: F01~F10)"""
+    if 1 <= sensor_num <= 10:
+        return f"S{sensor_num:02d}"
+    if 11 <= sensor_num <= 50:
+        return f"M{sensor_num - 10:02d}"
+    if 51 <= sensor_num <= 60:
+        return f"F{sensor_num - 50:02d}"
+    return None
+
+
+def normalize_addr(addr: Any) -> str:
+    """I2C 주소 표기 통일 (0x26, "0X26", "26" → "0x26")"""
+    if isinstance(addr, int):
+        return f"0x{addr:02x}"
+    text = str(addr).strip().lower()
+    if not text.startswith('0x'):
+        try:
+            return f"0x{int(text, 16):02x}"
+        except ValueError:
+            return text
+    return text
+
+
+def _hardware_key(addr: Any, chip_idx: Any, pin: Any) -> Optional[Tuple[str, int, int]]:
+    try:
+        return normalize_addr(addr), int(chip_idx), int(pin)
+    except (TypeError, ValueError):
+        return None
+
+
+class _Snapshot:
+    """읽기 전용 매핑 스냅샷 (reload 시 통째로 교체)"""
+
+    __slots__ = ('hardware', 'chips', 'lockers', 'sensors', 'version', 'loaded_at', 'sources')
+
+    def __init__(self, hardware: Dict[Tuple[str, int, int], int], lockers: List[Optional[str]],
+                 version: int, sources: Dict[str, int]):
+        self.hardware = hardware
+        # (addr, chip_idx) → {pin: sensor_num} (칩 단위 스냅샷 처리용)
+        self.chips: Dict[Tuple[str, int], Dict[int, int]] = {}
+        for (addr, chip_idx, pin), sensor_num in hardware.items():
+            self.chips.setdefault((addr, chip_idx), {})[pin] = sensor_num
+        # sensor_num을 인덱스로 하는 락카 ID 배열
+        self.lockers = lockers
+        self.sensors = {locker_id: sensor_num for sensor_num, locker_id in enumerate(lockers) if locker_id}
+        self.version = version
+        self.loaded_at = datetime.now(timezone.utc).isoformat()
+        self.sources = sources
+
+
+class SensorMap:
+    """(addr, chip_idx, pin) → sensor_num → locker_id 메모리 인덱스"""
+
+    def __init__(self, db_manager=None, legacy_config_path: Optional[Path] = LEGACY_CONFIG_PATH):
+        """
+        Args:
+            db_manager: 데이터베이스 매니저 (없으면 기본 매핑만 사용)
+            legacy_config_path: 레거시 센서 매핑 JSON 경로 (None이면 사용 안 함)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.db = db_manager
+        self.legacy_config_path = legacy_config_path
+
+        self._reload_lock = threading.Lock()
+        self._snapshot = self._build(version=0)
+        self._stats = {"reloads": 0, "reload_errors": 0, "misses": 0}
+
+    def _load_legacy_config(self) -> Dict[int, str]:
+        """레거시 설정 파일의 센서 번호 → 락카 ID 매핑"""
+        path = self.legacy_config_path
+        if not path or not Path(path).exists():
+            return {}
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                mapping = json.load(f).get("mapping", {})
+            return {int(k): v for k, v in mapping.items() if v}
+        except Exception as e:
+            self.logger.warning(f"레거시 센서 매핑 파일 로드 실패: {path}, {e}")
+            return {}
+
+    def _load_db_rows(self) -> List[Dict[str, Any]]:
+        """sensor_mapping 테이블 전체 조회"""
+        if self.db is None:
+            return []
+        return self.db.get_all_sensor_mappings()
+
+    def _build(self, version: int) -> _Snapshot:
+        """기본값 → 레거시 파일 → DB 순으로 겹쳐 스냅샷 생성"""
+        hardware = dict(DEFAULT_HARDWARE_MAPPING)
+        locker_by_sensor: Dict[int, str] = {}
+        for sensor_num in range(1, 61):
+            locker_by_sensor[sensor_num] = default_locker_for_sensor(sensor_num)
+
+        legacy = self._load_legacy_config()
+        locker_by_sensor.update(legacy)
+
+        rows = self._load_db_rows()
+        for row in rows:
+            key = _hardware_key(row.get('addr'), row.get('chip_idx'), row.get('pin'))
+            sensor_num = row.get('sensor_num')
+            if key is None or sensor_num is None:
+                continue
+            hardware[key] = int(sensor_num)
+            if row.get('locker_id'):
+                locker_by_sensor[int(sensor_num)] = row['locker_id']
+
+        size = max(locker_by_sensor) + 1 if locker_by_sensor else 1
+        lockers: List[Optional[str]] = [None] * size
+        for sensor_num, locker_id in locker_by_sensor.items():
+            if sensor_num >= 0:
+                lockers[sensor_num] = locker_id
+
+        return _Snapshot(hardware, lockers, version,
+                         {'default': len(DEFAULT_HARDWARE_MAPPING), 'legacy_file': len(legacy), 'db': len(rows)})
+
+    def reload(self) -> bool:
+        """매핑 다시 로드 (새 스냅샷 생성 후 참조 교체)
+
+        Returns:
+            성공 여부 (실패 시 기존 스냅샷 유지)
+        """
+        with self._reload_lock:
+            try:
+                snapshot = self._build(version=self._snapshot.version + 1)
+            except Exception as e:
+                self._stats["reload_errors"] += 1
+                self.logger.error(f"센서 매핑 리로드 실패: {e}")
+                return False
+
+            self._snapshot = snapshot
+            self._stats["reloads"] += 1
+
+        self.logger.info(f"센서 매핑 리로드 완료: v{snapshot.version}, "
+                         f"하드웨어 {len(snapshot.hardware)}개, 락카 {len(snapshot.sensors)}개")
+        return True
+
+    @property
+    def version(self) -> int:
+        """현재 스냅샷 버전 (reload마다 증가)"""
+        return self._snapshot.version
+
+    def get_sensor_num(self, addr: Any, chip_idx: Any, pin: Any) -> Optional[int]:
+        """하드웨어 핀 → 센서 번호"""
+        key = _hardware_key(addr, chip_idx, pin)
+        sensor_num = self._snapshot.hardware.get(key) if key else None
+        if sensor_num is None:
+            self._stats["misses"] += 1
+        return sensor_num
+
+    def get_locker_id(self, sensor_num: Any) -> Optional[str]:
+        """센서 번호 → 락카 ID"""
+        lockers = self._snapshot.lockers
+        try:
+            index = int(sensor_num)
+        except (TypeError, ValueError):
+            return None
+        if 0 <= index < len(lockers):
+            return lockers[index]
+        return None
+
+    def get_sensor_num_by_locker(self, locker_id: str) -> Optional[int]:
+        """락카 ID → 센서 번호"""
+        return self._snapshot.sensors.get(locker_id)
+
+    def resolve(self, addr: Any, chip_idx: Any, pin: Any) -> Tuple[Optional[int], Optional[str]]:
+        """하드웨어 핀 → (센서 번호, 락카 ID) (한 스냅샷에서 일관되게 조회)"""
+        snapshot = self._snapshot
+        key = _hardware_key(addr, chip_idx, pin)
+        sensor_num = snapshot.hardware.get(key) if key else None
+        if sensor_num is None:
+            self._stats["misses"] += 1
+            return None, None
+        locker_id = snapshot.lockers[sensor_num] if 0 <= sensor_num < len(snapshot.lockers) else None
+        return sensor_num, locker_id
+
+    def pins_for_chip(self, addr: Any, chip_idx: Any) -> Dict[int, int]:
+        """칩 하나의 매핑된 핀 → 센서 번호 (매핑된 핀이 없으면 빈 딕셔너리)"""
+        try:
+            key = (normalize_addr(addr), int(chip_idx))
+        except (TypeError, ValueError):
+            return {}
+        return self._snapshot.chips.get(key, {})
+
+    def get_locker_mapping(self) -> Dict[int, str]:
+        """센서 번호 → 락카 ID 전체 매핑 (조회용 복사본)"""
+        return {sensor_num: locker_id for sensor_num, locker_id in enumerate(self._snapshot.lockers) if locker_id}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """매핑 통계"""
+        snapshot = self._snapshot
+        return {
+            **self._stats,
+            "version": snapshot.version,
+            "loaded_at": snapshot.loaded_at,
+            "hardware_pins": len(snapshot.hardware),
+            "lockers": len(snapshot.sensors),
+            "sources": dict(snapshot.sources),
+        }
+
+
+_sensor_maps: Dict[str, SensorMap] = {}
+_sensor_maps_lock = threading.Lock()
+
+
+def get_sensor_map(db_manager) -> SensorMap:
+    """DB 파일별 프로세스 전역 센서 매핑 조회 (없으면 생성)
+
+    Args:
+        db_manager: 데이터베이스 매니저 (새로 생성할 때 사용)
+
+    Returns:
+        SensorMap 인스턴스
+    """
+    key = os.path.abspath(db_manager.db_path)
+
+    with _sensor_maps_lock:
+        sensor_map = _sensor_maps.get(key)
+        if sensor_map is None:
+            sensor_map = SensorMap(db_manager)
+            _sensor_maps[key] = sensor_map
+        return sensor_map
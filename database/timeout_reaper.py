@@ -0,0 +1,143 @@
+"""
+트랜잭션 타임아웃 리퍼
+
+timeout_at 기준 최소 힙을 유지하는 백그라운드 스레드가
+가장 이른 마감 시각까지만 잠들었다가 만료된 트랜잭션을 정확히 그 시점에 처리한다.
+테이블을 주기적으로 스캔하지 않는다.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class TimeoutReaper:
+    """timeout_at 최소 힙 기반 만료 스케줄러"""
+
+    def __init__(self, on_expire: Callable[[str], Any], name: str = "tx-timeout-reaper"):
+        """
+        Args:
+            on_expire: 만료 시 호출할 함수 (tx_id를 인자로 리퍼 스레드에서 호출)
+            name: 스레드 이름
+        """
+        self.logger = logging.getLogger(__name__)
+        self._on_expire = on_expire
+        self._name = name
+
+        self._cond = threading.Condition(threading.Lock())
+        self._heap: List[Tuple[float, int, str]] = []
+        # tx_id -> 현재 유효한 마감 시각 (힙의 오래된 항목은 지연 삭제)
+        self._deadlines: Dict[str, float] = {}
+        self._seq = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+        self._running = True
+
+        self._stats = {
+            "scheduled": 0,
+            "cancelled": 0,
+            "expired": 0,
+            "callback_errors": 0,
+            "max_lateness_ms": 0.0,
+        }
+
+    def _ensure_thread(self):
+        """첫 예약 시 스레드 시작 (락 보유 상태에서 호출)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+            self._thread.start()
+
+    def schedule(self, tx_id: str, deadline: datetime):
+        """만료 예약 (이미 예약된 경우 마감 시각 갱신)
+
+        Args:
+            tx_id: 트랜잭션 ID
+            deadline: 만료 시각 (timezone-aware)
+        """
+        ts = deadline.timestamp()
+        with self._cond:
+            if not self._running:
+                return
+            self._deadlines[tx_id] = ts
+            heapq.heappush(self._heap, (ts, next(self._seq), tx_id))
+            self._stats["scheduled"] += 1
+            self._ensure_thread()
+            # 새 항목이 가장 이르면 대기 시간을 다시 계산하도록 깨움
+            if self._heap[0][2] == tx_id:
+                self._cond.notify()
+
+    def cancel(self, tx_id: str) -> bool:
+        """만료 예약 취소 (트랜잭션 정상 종료 시)
+
+        Returns:
+            취소된 예약이 있었는지 여부
+        """
+        with self._cond:
+            if self._deadlines.pop(tx_id, None) is None:
+                return False
+            self._stats["cancelled"] += 1
+            # 힙 항목은 지연 삭제하되, 취소된 항목이 너무 많이 쌓이면 정리
+            if len(self._heap) > 64 and len(self._heap) > 4 * len(self._deadlines):
+                self._heap = [entry for entry in self._heap if self._deadlines.get(entry[2]) == entry[0]]
+                heapq.heapify(self._heap)
+            return True
+
+    def _pop_due(self, now: float) -> List[Tuple[str, float]]:
+        """마감이 지난 유효 항목 꺼내기 (락 보유 상태에서 호출)"""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            ts, _, tx_id = heapq.heappop(self._heap)
+            if self._deadlines.get(tx_id) == ts:
+                del self._deadlines[tx_id]
+                due.append((tx_id, ts))
+        return due
+
+    def _run(self):
+        """리퍼 스레드 메인 루프"""
+        while True:
+            with self._cond:
+                while self._running:
+                    now = datetime.now(timezone.utc).timestamp()
+                    due = self._pop_due(now)
+                    if due:
+                        break
+                    timeout = self._heap[0][0] - now if self._heap else None
+                    self._cond.wait(timeout)
+                else:
+                    return
+
+            for tx_id, ts in due:
+                lateness_ms = (datetime.now(timezone.utc).timestamp() - ts) * 1000
+                try:
+                    self._on_expire(tx_id)
+                except Exception as e:
+                    self.logger.error(f"타임아웃 처리 실패: {tx_id}, {e}")
+                    with self._cond:
+                        self._stats["callback_errors"] += 1
+                with self._cond:
+                    self._stats["expired"] += 1
+                    self._stats["max_lateness_ms"] = max(self._stats["max_lateness_ms"], round(lateness_ms, 3))
+
+    def close(self, timeout: float = 2.0):
+        """리퍼 종료"""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """리퍼 통계 (예약/취소/만료 수, 최대 지연)"""
+        with self._cond:
+            next_deadline = None
+            if self._deadlines:
+                next_deadline = datetime.fromtimestamp(min(self._deadlines.values()), timezone.utc).isoformat()
+            return {
+                **self._stats,
+                "pending": len(self._deadlines),
+                "heap_size": len(self._heap),
+                "next_deadline": next_deadline,
+            }
@@ -8,11 +8,37 @@ import uuid
 import asyncio
 import json
 import logging
+import os
+import re
+import threading
+from collections import deque
+from concurrent.futures import Future
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Optional, Any, List
+from typing import Callable, Dict, Optional, Any, List
 from enum import Enum
+from pathlib import Path
 
 from .database_manager import DatabaseManager
+from .write_queue import DEFAULT_WRITE_TIMEOUT
+from .locker_locks import LockerLockTable
+from .timeout_reaper import TimeoutReaper
+
+
+SENSOR_VERIFY_WINDOW_SECONDS = 10  # 센서 검증에 사용하는 최근 이벤트 구간
+RECENT_EVENTS_PER_TRANSACTION = 32  # 메모리에 유지하는 트랜잭션별 최근 이벤트 수
+
+# transaction_events DDL은 schema.sql 한 곳에만 두고 기존 DB 업그레이드 시 거기서 읽어 옴
+_SCHEMA_PATH = Path(__file__).parent / "schema.sql"
+_EVENTS_DDL_PATTERN = re.compile(
+    r"CREATE TABLE IF NOT EXISTS transaction_events\s*\(.*?\n\);"
+    r"|CREATE INDEX IF NOT EXISTS \w+ ON transaction_events\s*\([^)]*\);",
+    re.DOTALL
+)
+
+
+def _load_events_schema() -> List[str]:
+    """schema.sql에서 transaction_events 테이블/인덱스 DDL만 추출"""
+    return _EVENTS_DDL_PATTERN.findall(_SCHEMA_PATH.read_text(encoding='utf-8'))
 
 
 class TransactionType(Enum):
@@ -41,6 +67,29 @@ class TransactionStep(Enum):
     COMPLETED = "completed"
 
 
+class _SensorWaiter:
+    """센서 검증 대기자 (대기 중인 이벤트 루프의 Future를 스레드 안전하게 완료)"""
+    
+    __slots__ = ('locker_number', 'expected_change', 'loop', 'future')
+    
+    def __init__(self, locker_number: str, expected_change: str):
+        self.locker_number = locker_number
+        self.expected_change = expected_change
+        self.loop = asyncio.get_running_loop()
+        self.future = self.loop.create_future()
+    
+    def notify(self, verified: bool):
+        """어느 스레드에서든 대기자 깨우기"""
+        def _set():
+            if not self.future.done():
+                self.future.set_result(verified)
+        try:
+            self.loop.call_soon_threadsafe(_set)
+        except RuntimeError:
+            # 대기 중이던 루프가 이미 종료됨
+            pass
+
+
 class TransactionManager:
     """대여/반납 트랜잭션 관리"""
     
@@ -55,19 +104,267 @@ class TransactionManager:
         # 트랜잭션 설정
         self.default_timeout_seconds = 30
         self.sensor_timeout_seconds = 30
-        self.max_concurrent_transactions = 1  # 동시 트랜잭션 제한
+        self.max_concurrent_transactions = 8  # 전체 동시 트랜잭션 상한 (실제 충돌은 락카/구역 잠금으로 판단)
+        
+        # 락카/구역 단위 잠금 (구역이 다르면 동시에 대여/반납 가능)
+        self.locks = LockerLockTable()
         
-        # 활성 트랜잭션 캐시 (메모리 성능 향상)
+        # 활성 트랜잭션 (메모리가 원본, DB는 write-behind로 크래시 복구용 기록)
+        self._state_lock = threading.Lock()
         self._active_transactions: Dict[str, Dict[str, Any]] = {}
+        self._last_persist: Optional[Future] = None
+        
+        # timeout_at 기준 만료 스케줄러 (마감 시각에 정확히 만료 처리)
+        self.reaper = TimeoutReaper(self._on_transaction_timeout)
+        self._expiry_listeners: List[Callable[[Dict[str, Any]], Any]] = []
+        
+        # 센서 이벤트 알림 (DB 폴링 없이 검증 대기자를 즉시 깨움)
+        self._sensor_lock = threading.Lock()
+        self._recent_sensor_events: Dict[str, deque] = {}
+        self._sensor_waiters: Dict[str, List[_SensorWaiter]] = {}
+        
+        self._ensure_events_table()
+        self._rebuild_from_db()
         
         self.logger.info("트랜잭션 매니저 초기화 완료")
     
-    async def start_transaction(self, member_id: str, transaction_type: TransactionType = TransactionType.RENTAL) -> Dict[str, Any]:
+    def _ensure_events_table(self):
+        """transaction_events 테이블/인덱스 생성 (기존 DB 업그레이드용, DDL은 schema.sql)"""
+        try:
+            statements = _load_events_schema()
+        except OSError as e:
+            self.logger.error(f"스키마 파일을 읽을 수 없습니다: {_SCHEMA_PATH}, {e}")
+            return
+        if not statements:
+            self.logger.error(f"schema.sql에 transaction_events 정의가 없습니다: {_SCHEMA_PATH}")
+            return
+        for statement in statements:
+            self.db.execute_query(statement)
+    
+    def _rebuild_from_db(self) -> int:
+        """시작 시 DB의 활성 트랜잭션으로 메모리 상태 복구
+        
+        이미 타임아웃이 지난 트랜잭션은 TIMEOUT 처리하고 락카 잠금을 해제한다.
+        
+        Returns:
+            복구된 활성 트랜잭션 수
+        """
+        try:
+            cursor = self.db.execute_query("SELECT locker_number, zone FROM locker_status")
+            if cursor:
+                self.locks.set_locker_zones({row['locker_number']: row['zone'] for row in cursor.fetchall()})
+            
+            cursor = self.db.execute_query("""
+                SELECT * FROM active_transactions WHERE status = ?
+            """, (TransactionStatus.ACTIVE.value,))
+            if not cursor:
+                return 0
+            
+            now = datetime.now(timezone.utc)
+            expired = []
+            restored = {}
+            for row in cursor.fetchall():
+                transaction = self._row_to_transaction(row)
+                if transaction['timeout_at'] <= now:
+                    expired.append(transaction['transaction_id'])
+                else:
+                    restored[transaction['transaction_id']] = transaction
+            
+            for tx_id, transaction in restored.items():
+                self._restore_locks(transaction)
+                self.reaper.schedule(tx_id, transaction['timeout_at'])
+            
+            with self._state_lock:
+                self._active_transactions.update(restored)
+            
+            for tx_id in expired:
+                self.db.execute_query("""
+                    UPDATE active_transactions 
+                    SET status = ?, last_activity = ?
+                    WHERE transaction_id = ?
+                """, (TransactionStatus.TIMEOUT.value, now.isoformat(), tx_id))
+                self.db.execute_query("""
+                    UPDATE locker_status 
+                    SET current_transaction = NULL, locked_until = NULL
+                    WHERE current_transaction = ?
+                """, (tx_id,))
+            
+            if restored or expired:
+                self.logger.info(f"활성 트랜잭션 복구: {len(restored)}개 (타임아웃 처리 {len(expired)}개)")
+            return len(restored)
+            
+        except Exception as e:
+            self.logger.error(f"활성 트랜잭션 복구 실패: {e}")
+            return 0
+    
+    def _restore_locks(self, transaction: Dict[str, Any]):
+        """복구된 트랜잭션의 락카/구역 잠금 재획득 (locker_status 기록 기준)"""
+        tx_id = transaction['transaction_id']
+        lockers = [transaction['locker_number']] if transaction.get('locker_number') else []
+        zones = []
+        if not lockers:
+            cursor = self.db.execute_query("""
+                SELECT DISTINCT zone FROM locker_status WHERE current_transaction = ?
+            """, (tx_id,))
+            if cursor:
+                zones = [row['zone'] for row in cursor.fetchall()]
+        
+        conflict = self.locks.try_acquire(tx_id, lockers, zones)
+        if conflict:
+            self.logger.warning(f"복구 트랜잭션 잠금 충돌: {tx_id} ({conflict})")
+        transaction['zones'] = self.locks.get_scope(tx_id)['zones']
+    
+    def _row_to_transaction(self, row) -> Dict[str, Any]:
+        """DB 행을 메모리 트랜잭션 형태로 변환"""
+        transaction = dict(row)
+        
+        timeout_at = transaction.get('timeout_at')
+        try:
+            timeout_at = datetime.fromisoformat(str(timeout_at).replace('Z', '+00:00'))
+            if timeout_at.tzinfo is None:
+                timeout_at = timeout_at.replace(tzinfo=timezone.utc)
+        except ValueError:
+            timeout_at = datetime.now(timezone.utc)
+        transaction['timeout_at'] = timeout_at
+        
+        # 센서 이벤트(단계 데이터) 파싱
+        if transaction.get('sensor_events'):
+            try:
+                transaction['sensor_events'] = json.loads(transaction['sensor_events'])
+            except json.JSONDecodeError:
+                transaction['sensor_events'] = None
+        
+        return transaction
+    
+    @staticmethod
+    def _snapshot(transaction: Dict[str, Any]) -> Dict[str, Any]:
+        """외부 반환용 복사본 (datetime은 ISO 문자열로)"""
+        return {
+            key: value.isoformat() if isinstance(value, datetime) else value
+            for key, value in transaction.items()
+        }
+    
+    def _persist(self, query: str, params: tuple):
+        """트랜잭션 상태를 writer 스레드에 맡기고 기다리지 않음 (write-behind)"""
+        try:
+            future = self.db.submit_write(query, params)
+        except Exception as e:
+            self.logger.error(f"트랜잭션 상태 저장 요청 실패: {e}")
+            return
+        future.add_done_callback(self._on_persist_done)
+        self._last_persist = future
+    
+    def _on_persist_done(self, future: Future):
+        if future.exception() is not None:
+            self.logger.error(f"트랜잭션 상태 저장 실패: {future.exception()}")
+    
+    def flush(self, timeout: float = DEFAULT_WRITE_TIMEOUT) -> bool:
+        """대기 중인 write-behind 저장이 DB에 커밋될 때까지 대기
+        
+        Args:
+            timeout: 최대 대기 시간 (초)
+            
+        Returns:
+            마지막 저장 성공 여부
+        """
+        future = self._last_persist
+        if future is None:
+            return True
+        try:
+            future.result(timeout)
+            return True
+        except Exception:
+            return False
+    
+    def _pop_expired(self, now: datetime) -> List[Dict[str, Any]]:
+        """타임아웃된 트랜잭션을 메모리에서 제거 (_state_lock 보유 상태에서 호출)"""
+        expired = [
+            tx for tx in self._active_transactions.values()
+            if tx['timeout_at'] <= now
+        ]
+        for tx in expired:
+            del self._active_transactions[tx['transaction_id']]
+            self.locks.release(tx['transaction_id'])
+            self.reaper.cancel(tx['transaction_id'])
+        return expired
+    
+    def _expire_transactions(self, transactions: List[Dict[str, Any]], now: datetime):
+        """메모리에서 제거된 타임아웃 트랜잭션의 DB 기록/락카 잠금/대기자 정리 및 만료 이벤트 발행"""
+        for transaction in transactions:
+            tx_id = transaction['transaction_id']
+            self._persist("""
+                UPDATE active_transactions 
+                SET status = ?, last_activity = ?
+                WHERE transaction_id = ?
+            """, (TransactionStatus.TIMEOUT.value, now.isoformat(), tx_id))
+            self._persist("""
+                UPDATE locker_status 
+                SET current_transaction = NULL, locked_until = NULL
+                WHERE current_transaction = ?
+            """, (tx_id,))
+            self._release_sensor_waiters(tx_id)
+            
+            transaction['status'] = TransactionStatus.TIMEOUT.value
+            self._publish_expiry(self._snapshot(transaction))
+        
+        if transactions:
+            self.logger.info(f"타임아웃된 트랜잭션 정리: {len(transactions)}개")
+    
+    def _on_transaction_timeout(self, tx_id: str):
+        """리퍼 스레드 콜백: 마감 시각이 된 트랜잭션 만료"""
+        now = datetime.now(timezone.utc)
+        with self._state_lock:
+            transaction = self._active_transactions.get(tx_id)
+            if transaction is None:
+                return
+            if transaction['timeout_at'] > now:
+                # 마감 시각이 연장된 경우 다시 예약
+                self.reaper.schedule(tx_id, transaction['timeout_at'])
+                return
+            del self._active_transactions[tx_id]
+            self.locks.release(tx_id)
+        
+        self._expire_transactions([transaction], now)
+    
+    def add_expiry_listener(self, listener: Callable[[Dict[str, Any]], Any]):
+        """트랜잭션 만료 이벤트 구독
+        
+        Args:
+            listener: 만료된 트랜잭션 정보(dict)를 받는 함수 (리퍼 스레드에서 호출)
+        """
+        self._expiry_listeners.append(listener)
+    
+    def _publish_expiry(self, transaction: Dict[str, Any]):
+        """만료 이벤트 발행"""
+        for listener in list(self._expiry_listeners):
+            try:
+                listener(transaction)
+            except Exception as e:
+                self.logger.error(f"만료 이벤트 처리 실패: {transaction.get('transaction_id')}, {e}")
+    
+    def get_reaper_stats(self) -> Dict[str, Any]:
+        """타임아웃 리퍼 통계"""
+        return self.reaper.get_stats()
+    
+    def close(self):
+        """리퍼 종료 및 대기 중인 저장 완료 대기"""
+        self.reaper.close()
+        self.flush()
+    
+    async def start_transaction(self, member_id: str, transaction_type: TransactionType = TransactionType.RENTAL,
+                                locker_number: Optional[str] = None,
+                                zones: Optional[List[str]] = None) -> Dict[str, Any]:
         """새 트랜잭션 시작
         
+        활성 트랜잭션 확인은 메모리에서만 수행하고, DB 기록은 write-behind로 처리한다.
+        잠금 범위가 겹치지 않는 트랜잭션(예: MALE 대여와 STAFF 반납)은 동시에 진행된다.
+        
         Args:
             member_id: 회원 ID
             transaction_type: 트랜잭션 타입
+            locker_number: 대상 락카 번호 (지정 시 해당 락카만 잠금)
+            zones: 잠글 구역 목록 (락카 미정 대여 시 회원 접근 구역)
+                   락카와 구역을 모두 생략하면 전체 구역을 잠근다
             
         Returns:
             트랜잭션 시작 결과
@@ -75,17 +372,58 @@ class TransactionManager:
         try:
             self.logger.info(f"트랜잭션 시작 요청: {member_id} ({transaction_type.value})")
             
-            # 1. 기존 활성 트랜잭션 체크
-            active_check = await self._check_active_transactions()
+            timeout_seconds = self.db.get_system_setting('transaction_timeout_seconds', self.default_timeout_seconds)
+            now = datetime.now(timezone.utc)
+            timeout_at = now + timedelta(seconds=timeout_seconds)
+            tx_id = str(uuid.uuid4())
+            
+            with self._state_lock:
+                # 1. 기존 활성 트랜잭션 체크 (만료는 리퍼가 마감 시각에 처리)
+                active_check = self._check_active_locked()
+                
+                # 2. 회원별 중복 트랜잭션 체크
+                member_check = self._check_member_locked(member_id) if active_check['can_start'] else None
+                
+                # 3. 락카/구역 잠금
+                conflict = None
+                if active_check['can_start'] and member_check['can_start']:
+                    conflict = self.locks.try_acquire(
+                        tx_id, [locker_number] if locker_number else [], zones or []
+                    )
+                    if conflict:
+                        active_check = {
+                            'can_start': False,
+                            'message': '다른 회원이 이용 중입니다. 잠시 후 다시 시도해주세요.'
+                        }
+                
+                # 4. 새 트랜잭션 등록 (확인과 등록을 같은 락 안에서 수행)
+                if active_check['can_start'] and member_check['can_start']:
+                    self._active_transactions[tx_id] = {
+                        'transaction_id': tx_id,
+                        'member_id': member_id,
+                        'transaction_type': transaction_type.value,
+                        'status': TransactionStatus.ACTIVE.value,
+                        'step': TransactionStep.STARTED.value,
+                        'locker_number': locker_number,
+                        'zones': self.locks.get_scope(tx_id)['zones'],
+                        'sensor_events': None,
+                        'error_message': None,
+                        'timeout_at': timeout_at,
+                        'start_time': now,
+                        'last_activity': now,
+                        'created_at': now
+                    }
+            
             if not active_check['can_start']:
+                if conflict:
+                    self.logger.info(f"트랜잭션 잠금 충돌: {member_id} ({conflict})")
                 return {
                     'success': False,
                     'error': 'TRANSACTION_ACTIVE',
-                    'message': active_check['message']
+                    'message': active_check['message'],
+                    'conflict': conflict
                 }
             
-            # 2. 회원별 중복 트랜잭션 체크
-            member_check = await self._check_member_transaction(member_id)
             if not member_check['can_start']:
                 return {
                     'success': False,
@@ -93,48 +431,26 @@ class TransactionManager:
                     'message': member_check['message']
                 }
             
-            # 3. 타임아웃된 트랜잭션 정리
-            await self._cleanup_timeout_transactions()
+            # 5. 마감 시각에 만료되도록 예약
+            self.reaper.schedule(tx_id, timeout_at)
             
-            # 4. 새 트랜잭션 생성
-            tx_id = str(uuid.uuid4())
-            timeout_seconds = self.db.get_system_setting('transaction_timeout_seconds', self.default_timeout_seconds)
-            timeout_at = datetime.now(timezone.utc) + timedelta(seconds=timeout_seconds)
-            
-            # 데이터베이스에 트랜잭션 기록
-            cursor = self.db.execute_query("""
+            # 6. DB에 트랜잭션 기록 (write-behind)
+            self._persist("""
                 INSERT INTO active_transactions 
-                (transaction_id, member_id, transaction_type, timeout_at, step, status)
-                VALUES (?, ?, ?, ?, ?, ?)
+                (transaction_id, member_id, transaction_type, timeout_at, step, status, locker_number)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
             """, (
                 tx_id,
                 member_id,
                 transaction_type.value,
                 timeout_at.isoformat(),
                 TransactionStep.STARTED.value,
-                TransactionStatus.ACTIVE.value
+                TransactionStatus.ACTIVE.value,
+                locker_number
             ))
             
-            if not cursor:
-                return {
-                    'success': False,
-                    'error': 'DATABASE_ERROR',
-                    'message': '트랜잭션 생성 실패'
-                }
-            
-            # 5. 모든 락카 잠금 (동시성 제어)
-            await self._lock_all_lockers(tx_id, timeout_at)
-            
-            # 6. 캐시에 추가
-            self._active_transactions[tx_id] = {
-                'transaction_id': tx_id,
-                'member_id': member_id,
-                'transaction_type': transaction_type.value,
-                'status': TransactionStatus.ACTIVE.value,
-                'step': TransactionStep.STARTED.value,
-                'timeout_at': timeout_at,
-                'created_at': datetime.now(timezone.utc)
-            }
+            # 7. 잠금 범위의 락카에 잠금 기록 (재시작 시 복구용)
+            await self._lock_lockers(tx_id, timeout_at)
             
             self.logger.info(f"트랜잭션 시작 성공: {tx_id}")
             
@@ -165,36 +481,33 @@ class TransactionManager:
             업데이트 성공 여부
         """
         try:
-            # 트랜잭션 존재 확인
-            if tx_id not in self._active_transactions:
-                transaction = await self._load_transaction(tx_id)
-                if not transaction:
+            now = datetime.now(timezone.utc)
+            
+            with self._state_lock:
+                transaction = self._active_transactions.get(tx_id)
+                if transaction is None:
                     self.logger.error(f"트랜잭션을 찾을 수 없음: {tx_id}")
                     return False
+                
+                transaction['step'] = step.value
+                transaction['last_activity'] = now
+                transaction['sensor_events'] = data
             
-            # 단계 업데이트
-            cursor = self.db.execute_query("""
+            # 단계 업데이트 (write-behind)
+            self._persist("""
                 UPDATE active_transactions 
                 SET step = ?, last_activity = ?, sensor_events = ?
                 WHERE transaction_id = ? AND status = ?
             """, (
                 step.value,
-                datetime.now(timezone.utc).isoformat(),
+                now.isoformat(),
                 json.dumps(data) if data else None,
                 tx_id,
                 TransactionStatus.ACTIVE.value
             ))
             
-            if cursor and cursor.rowcount > 0:
-                # 캐시 업데이트
-                if tx_id in self._active_transactions:
-                    self._active_transactions[tx_id]['step'] = step.value
-                    self._active_transactions[tx_id]['last_activity'] = datetime.now(timezone.utc)
-                
-                self.logger.debug(f"트랜잭션 단계 업데이트: {tx_id} -> {step.value}")
-                return True
-            
-            return False
+            self.logger.debug(f"트랜잭션 단계 업데이트: {tx_id} -> {step.value}")
+            return True
             
         except Exception as e:
             self.logger.error(f"트랜잭션 단계 업데이트 실패: {tx_id}, {e}")
@@ -214,8 +527,14 @@ class TransactionManager:
         try:
             self.logger.info(f"트랜잭션 종료: {tx_id} ({status.value})")
             
-            # 트랜잭션 상태 업데이트
-            cursor = self.db.execute_query("""
+            # 메모리에서 제거 및 락카/구역 잠금 해제
+            with self._state_lock:
+                self._active_transactions.pop(tx_id, None)
+                self.locks.release(tx_id)
+            self.reaper.cancel(tx_id)
+            
+            # 트랜잭션 상태 업데이트 (write-behind)
+            self._persist("""
                 UPDATE active_transactions 
                 SET status = ?, last_activity = ?, error_message = ?
                 WHERE transaction_id = ?
@@ -226,16 +545,9 @@ class TransactionManager:
                 tx_id
             ))
             
-            if not cursor:
-                self.logger.error(f"트랜잭션 상태 업데이트 실패: {tx_id}")
-                return False
-            
             # 락카 잠금 해제
             await self._unlock_all_lockers(tx_id)
-            
-            # 캐시에서 제거
-            if tx_id in self._active_transactions:
-                del self._active_transactions[tx_id]
+            self._release_sensor_waiters(tx_id)
             
             self.logger.info(f"트랜잭션 종료 완료: {tx_id}")
             return True
@@ -254,11 +566,13 @@ class TransactionManager:
             트랜잭션 상태 정보
         """
         try:
-            # 캐시에서 먼저 확인
-            if tx_id in self._active_transactions:
-                return self._active_transactions[tx_id].copy()
+            # 활성 트랜잭션은 메모리에서 확인
+            with self._state_lock:
+                transaction = self._active_transactions.get(tx_id)
+                if transaction is not None:
+                    return self._snapshot(transaction)
             
-            # 데이터베이스에서 조회
+            # 종료된 트랜잭션은 데이터베이스에서 조회
             return await self._load_transaction(tx_id)
             
         except Exception as e:
@@ -266,36 +580,20 @@ class TransactionManager:
             return None
     
     async def get_active_transactions(self) -> List[Dict[str, Any]]:
-        """활성 트랜잭션 목록 조회
+        """활성 트랜잭션 목록 조회 (메모리)
         
         Returns:
-            활성 트랜잭션 리스트
+            활성 트랜잭션 리스트 (최신순)
         """
         try:
-            current_time = datetime.now(timezone.utc).isoformat()
-            cursor = self.db.execute_query("""
-                SELECT * FROM active_transactions 
-                WHERE status = ? 
-                AND ? < timeout_at
-                ORDER BY created_at DESC
-            """, (TransactionStatus.ACTIVE.value, current_time))
-            
-            if cursor:
-                transactions = []
-                for row in cursor.fetchall():
-                    transaction = dict(row)
-                    # 센서 이벤트 파싱
-                    if transaction.get('sensor_events'):
-                        try:
-                            transaction['sensor_events'] = json.loads(transaction['sensor_events'])
-                        except json.JSONDecodeError:
-                            transaction['sensor_events'] = None
-                    
-                    transactions.append(transaction)
-                
-                return transactions
-            
-            return []
+            now = datetime.now(timezone.utc)
+            with self._state_lock:
+                transactions = [
+                    tx for tx in self._active_transactions.values()
+                    if now < tx['timeout_at']
+                ]
+                transactions.sort(key=lambda tx: str(tx.get('created_at')), reverse=True)
+                return [self._snapshot(tx) for tx in transactions]
             
         except Exception as e:
             self.logger.error(f"활성 트랜잭션 조회 실패: {e}")
@@ -304,6 +602,8 @@ class TransactionManager:
     async def record_sensor_event(self, tx_id: str, locker_number: str, sensor_data: Dict[str, Any]) -> bool:
         """센서 이벤트 기록
         
+        transaction_events에 한 행만 추가하므로 트랜잭션 길이와 무관하게 비용이 일정하다.
+        
         Args:
             tx_id: 트랜잭션 ID
             locker_number: 락카 번호
@@ -313,47 +613,33 @@ class TransactionManager:
             기록 성공 여부
         """
         try:
-            # 기존 센서 이벤트 조회
-            cursor = self.db.execute_query("""
-                SELECT sensor_events FROM active_transactions 
-                WHERE transaction_id = ?
-            """, (tx_id,))
-            
-            if not cursor:
-                return False
-            
-            row = cursor.fetchone()
-            if not row:
-                return False
-            
-            # 기존 이벤트 파싱
-            existing_events = []
-            if row['sensor_events']:
-                try:
-                    existing_events = json.loads(row['sensor_events'])
-                except json.JSONDecodeError:
-                    existing_events = []
-            
-            # 새 이벤트 추가
             new_event = {
-                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'timestamp': datetime.now(timezone.utc).isoformat(timespec='microseconds'),
                 'locker_number': locker_number,
                 'sensor_data': sensor_data
             }
-            existing_events.append(new_event)
             
-            # 업데이트
+            # 대기자에게 즉시 알림 (DB 기록보다 먼저)
+            with self._sensor_lock:
+                recent = self._recent_sensor_events.get(tx_id)
+                if recent is None:
+                    recent = self._recent_sensor_events[tx_id] = deque(maxlen=RECENT_EVENTS_PER_TRANSACTION)
+                recent.append(new_event)
+                self._notify_sensor_waiters(tx_id, new_event)
+            
             cursor = self.db.execute_query("""
-                UPDATE active_transactions 
-                SET sensor_events = ?, last_activity = ?
-                WHERE transaction_id = ?
+                INSERT INTO transaction_events 
+                (transaction_id, ts, event_type, locker_number, sensor_data)
+                VALUES (?, ?, ?, ?, ?)
             """, (
-                json.dumps(existing_events),
-                datetime.now(timezone.utc).isoformat(),
-                tx_id
+                tx_id,
+                new_event['timestamp'],
+                'sensor',
+                locker_number,
+                json.dumps(sensor_data)
             ))
             
-            success = cursor and cursor.rowcount > 0
+            success = bool(cursor and cursor.rowcount > 0)
             if success:
                 self.logger.debug(f"센서 이벤트 기록: {tx_id} -> {locker_number}")
             
@@ -363,9 +649,52 @@ class TransactionManager:
             self.logger.error(f"센서 이벤트 기록 실패: {tx_id}, {e}")
             return False
     
+    async def get_transaction_events(self, tx_id: str, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """트랜잭션 이벤트 조회
+        
+        Args:
+            tx_id: 트랜잭션 ID
+            since: 이 시각 이후 이벤트만 조회 (None이면 전체)
+            
+        Returns:
+            이벤트 리스트 (시간순)
+        """
+        try:
+            since_ts = since.isoformat(timespec='microseconds') if since else ''
+            cursor = self.db.execute_query("""
+                SELECT ts, event_type, locker_number, sensor_data 
+                FROM transaction_events 
+                WHERE transaction_id = ? AND ts >= ?
+                ORDER BY ts ASC
+            """, (tx_id, since_ts))
+            
+            if not cursor:
+                return []
+            
+            events = []
+            for row in cursor.fetchall():
+                try:
+                    sensor_data = json.loads(row['sensor_data']) if row['sensor_data'] else {}
+                except json.JSONDecodeError:
+                    sensor_data = {}
+                events.append({
+                    'timestamp': row['ts'],
+                    'event_type': row['event_type'],
+                    'locker_number': row['locker_number'],
+                    'sensor_data': sensor_data
+                })
+            return events
+            
+        except Exception as e:
+            self.logger.error(f"트랜잭션 이벤트 조회 실패: {tx_id}, {e}")
+            return []
+    
     async def wait_for_sensor_verification(self, tx_id: str, locker_number: str, expected_change: str = "key_removed") -> bool:
         """센서 검증 대기
         
+        record_sensor_event가 일치하는 이벤트를 기록하는 즉시 깨어나며,
+        대기 중에는 DB를 조회하지 않는다.
+        
         Args:
             tx_id: 트랜잭션 ID
             locker_number: 대상 락카 번호
@@ -376,197 +705,236 @@ class TransactionManager:
         """
         try:
             timeout_seconds = self.db.get_system_setting('sensor_verification_timeout', self.sensor_timeout_seconds)
-            start_time = datetime.now(timezone.utc)
-            timeout_time = start_time + timedelta(seconds=timeout_seconds)
             
-            self.logger.info(f"센서 검증 대기 시작: {tx_id} -> {locker_number} ({expected_change})")
+            # 트랜잭션 상태 확인 (대기 시작 시 한 번만)
+            transaction = await self.get_transaction_status(tx_id)
+            if not transaction or transaction['status'] != TransactionStatus.ACTIVE.value:
+                self.logger.warning(f"트랜잭션이 비활성 상태: {tx_id}")
+                return False
             
-            while datetime.now(timezone.utc) < timeout_time:
-                # 트랜잭션 상태 확인
-                transaction = await self.get_transaction_status(tx_id)
-                if not transaction or transaction['status'] != TransactionStatus.ACTIVE.value:
-                    self.logger.warning(f"트랜잭션이 비활성 상태: {tx_id}")
-                    return False
-                
-                # 센서 이벤트 확인
-                cursor = self.db.execute_query("""
-                    SELECT sensor_events FROM active_transactions 
-                    WHERE transaction_id = ?
-                """, (tx_id,))
-                
-                if cursor:
-                    row = cursor.fetchone()
-                    if row and row['sensor_events']:
-                        try:
-                            events = json.loads(row['sensor_events'])
-                            if self._verify_sensor_events(events, locker_number, expected_change):
-                                self.logger.info(f"센서 검증 성공: {tx_id}")
-                                return True
-                        except json.JSONDecodeError:
-                            pass
-                
-                # 500ms 간격으로 체크
-                await asyncio.sleep(0.5)
+            self.logger.info(f"센서 검증 대기 시작: {tx_id} -> {locker_number} ({expected_change})")
             
-            self.logger.warning(f"센서 검증 타임아웃: {tx_id}")
-            return False
+            waiter = _SensorWaiter(locker_number, expected_change)
+            with self._sensor_lock:
+                # 대기 등록 전에 이미 도착한 이벤트 확인
+                recent = self._recent_sensor_events.get(tx_id)
+                if recent is not None:
+                    verified = any(
+                        self._event_matches(event, locker_number, expected_change)
+                        for event in recent
+                    )
+                else:
+                    # 재시작 등으로 메모리에 없으면 DB의 최근 구간만 조회
+                    verified = self._verify_sensor_events(tx_id, locker_number, expected_change)
+                if verified:
+                    self.logger.info(f"센서 검증 성공: {tx_id}")
+                    return True
+                self._sensor_waiters.setdefault(tx_id, []).append(waiter)
+            
+            try:
+                verified = await asyncio.wait_for(waiter.future, timeout=float(timeout_seconds))
+            except asyncio.TimeoutError:
+                self.logger.warning(f"센서 검증 타임아웃: {tx_id}")
+                return False
+            finally:
+                with self._sensor_lock:
+                    waiters = self._sensor_waiters.get(tx_id)
+                    if waiters and waiter in waiters:
+                        waiters.remove(waiter)
+                        if not waiters:
+                            del self._sensor_waiters[tx_id]
+            
+            if verified:
+                self.logger.info(f"센서 검증 성공: {tx_id}")
+            else:
+                self.logger.warning(f"트랜잭션이 비활성 상태: {tx_id}")
+            return verified
             
         except Exception as e:
             self.logger.error(f"센서 검증 실패: {tx_id}, {e}")
             return False
     
-    def _verify_sensor_events(self, events: List[Dict[str, Any]], locker_number: str, expected_change: str) -> bool:
-        """센서 이벤트 검증
+    def _notify_sensor_waiters(self, tx_id: str, event: Dict[str, Any]):
+        """새 센서 이벤트와 일치하는 대기자 깨우기 (_sensor_lock 보유 상태에서 호출)"""
+        waiters = self._sensor_waiters.get(tx_id)
+        if not waiters:
+            return
+        
+        for waiter in list(waiters):
+            if self._event_matches(event, waiter.locker_number, waiter.expected_change):
+                waiters.remove(waiter)
+                waiter.notify(True)
+        
+        if not waiters:
+            del self._sensor_waiters[tx_id]
+    
+    def _release_sensor_waiters(self, tx_id: str):
+        """트랜잭션 종료 시 대기자를 실패로 깨우고 메모리 이벤트 정리"""
+        with self._sensor_lock:
+            self._recent_sensor_events.pop(tx_id, None)
+            waiters = self._sensor_waiters.pop(tx_id, [])
+        
+        for waiter in waiters:
+            waiter.notify(False)
+    
+    def _event_matches(self, event: Dict[str, Any], locker_number: str, expected_change: str) -> bool:
+        """이벤트 하나가 기대한 센서 변화인지 확인 (최근 검증 구간 내 이벤트만)
         
         Args:
-            events: 센서 이벤트 리스트
+            event: 센서 이벤트 (timestamp, locker_number, sensor_data)
             locker_number: 대상 락카 번호
             expected_change: 예상되는 변화
             
         Returns:
-            검증 성공 여부
+            일치 여부
         """
         try:
-            # 최근 10초 내의 이벤트만 확인
-            recent_time = datetime.now(timezone.utc) - timedelta(seconds=10)
+            if event['locker_number'] != locker_number:
+                return False
             
-            for event in reversed(events):  # 최신 이벤트부터 확인
-                try:
-                    event_time = datetime.fromisoformat(event['timestamp'].replace('Z', '+00:00'))
-                    if event_time < recent_time:
-                        continue
-                    
-                    if event['locker_number'] == locker_number:
-                        sensor_data = event['sensor_data']
-                        
-                        # 센서 변화 확인
-                        if expected_change == "key_removed":
-                            # 키가 제거되었는지 확인 (센서 값이 0 또는 False)
-                            if not sensor_data.get('active', True):
-                                return True
-                        elif expected_change == "key_inserted":
-                            # 키가 삽입되었는지 확인 (센서 값이 1 또는 True)
-                            if sensor_data.get('active', False):
-                                return True
-                
-                except (ValueError, KeyError):
-                    continue
+            event_time = datetime.fromisoformat(event['timestamp'].replace('Z', '+00:00'))
+            if event_time < datetime.now(timezone.utc) - timedelta(seconds=SENSOR_VERIFY_WINDOW_SECONDS):
+                return False
+            
+            sensor_data = event['sensor_data']
+            
+            # 센서 변화 확인
+            if expected_change == "key_removed":
+                # 키가 제거되었는지 확인 (센서 값이 0 또는 False)
+                return not sensor_data.get('active', True)
+            elif expected_change == "key_inserted":
+                # 키가 삽입되었는지 확인 (센서 값이 1 또는 True)
+                return bool(sensor_data.get('active', False))
             
             return False
             
-        except Exception as e:
-            self.logger.error(f"센서 이벤트 검증 오류: {e}")
+        except (ValueError, KeyError, AttributeError):
             return False
     
-    async def _check_active_transactions(self) -> Dict[str, Any]:
-        """활성 트랜잭션 체크"""
+    def _verify_sensor_events(self, tx_id: str, locker_number: str, expected_change: str) -> bool:
+        """센서 이벤트 검증 (transaction_events의 최근 구간만 조회)
+        
+        Args:
+            tx_id: 트랜잭션 ID
+            locker_number: 대상 락카 번호
+            expected_change: 예상되는 변화
+            
+        Returns:
+            검증 성공 여부
+        """
         try:
-            current_time = datetime.now(timezone.utc).isoformat()
+            # 최근 10초 내의 이벤트만 확인 ((transaction_id, ts) 인덱스 범위 조회)
+            recent_time = datetime.now(timezone.utc) - timedelta(seconds=SENSOR_VERIFY_WINDOW_SECONDS)
             cursor = self.db.execute_query("""
-                SELECT COUNT(*) as count FROM active_transactions 
-                WHERE status = ? 
-                AND ? < timeout_at
-            """, (TransactionStatus.ACTIVE.value, current_time))
+                SELECT ts, locker_number, sensor_data 
+                FROM transaction_events 
+                WHERE transaction_id = ? AND ts >= ? AND locker_number = ?
+                ORDER BY ts DESC
+            """, (tx_id, recent_time.isoformat(timespec='microseconds'), locker_number))
             
-            if cursor:
-                row = cursor.fetchone()
-                active_count = row['count'] if row else 0
-                
-                if active_count >= self.max_concurrent_transactions:
-                    return {
-                        'can_start': False,
-                        'message': '다른 회원이 이용 중입니다. 잠시 후 다시 시도해주세요.'
-                    }
+            if not cursor:
+                return False
             
-            return {'can_start': True}
+            for row in cursor.fetchall():  # 최신 이벤트부터 확인
+                try:
+                    sensor_data = json.loads(row['sensor_data']) if row['sensor_data'] else {}
+                except json.JSONDecodeError:
+                    continue
+                event = {
+                    'timestamp': row['ts'],
+                    'locker_number': row['locker_number'],
+                    'sensor_data': sensor_data
+                }
+                if self._event_matches(event, locker_number, expected_change):
+                    return True
+            
+            return False
             
         except Exception as e:
-            self.logger.error(f"활성 트랜잭션 체크 실패: {e}")
+            self.logger.error(f"센서 이벤트 검증 오류: {e}")
+            return False
+    
+    def _check_active_locked(self) -> Dict[str, Any]:
+        """활성 트랜잭션 체크 (_state_lock 보유 상태에서 호출)"""
+        now = datetime.now(timezone.utc)
+        active_count = sum(1 for tx in self._active_transactions.values() if now < tx['timeout_at'])
+        
+        if active_count >= self.max_concurrent_transactions:
             return {
                 'can_start': False,
-                'message': '시스템 오류가 발생했습니다.'
+                'message': '다른 회원이 이용 중입니다. 잠시 후 다시 시도해주세요.'
             }
+        
+        return {'can_start': True}
     
-    async def _check_member_transaction(self, member_id: str) -> Dict[str, Any]:
-        """회원별 트랜잭션 체크"""
-        try:
-            current_time = datetime.now(timezone.utc).isoformat()
-            cursor = self.db.execute_query("""
-                SELECT transaction_id FROM active_transactions 
-                WHERE member_id = ? 
-                AND status = ?
-                AND ? < timeout_at
-            """, (member_id, TransactionStatus.ACTIVE.value, current_time))
-            
-            if cursor and cursor.fetchone():
+    def _check_member_locked(self, member_id: str) -> Dict[str, Any]:
+        """회원별 트랜잭션 체크 (_state_lock 보유 상태에서 호출)"""
+        now = datetime.now(timezone.utc)
+        for tx in self._active_transactions.values():
+            if tx['member_id'] == member_id and now < tx['timeout_at']:
                 return {
                     'can_start': False,
                     'message': '이미 진행 중인 대여/반납이 있습니다.'
                 }
-            
-            return {'can_start': True}
-            
-        except Exception as e:
-            self.logger.error(f"회원 트랜잭션 체크 실패: {e}")
-            return {
-                'can_start': False,
-                'message': '시스템 오류가 발생했습니다.'
-            }
+        
+        return {'can_start': True}
+    
+    async def _check_active_transactions(self) -> Dict[str, Any]:
+        """활성 트랜잭션 체크"""
+        with self._state_lock:
+            return self._check_active_locked()
+    
+    async def _check_member_transaction(self, member_id: str) -> Dict[str, Any]:
+        """회원별 트랜잭션 체크"""
+        with self._state_lock:
+            return self._check_member_locked(member_id)
+    
+    def get_lock_stats(self) -> Dict[str, Any]:
+        """락카/구역 잠금 경합 통계"""
+        stats = self.locks.get_stats()
+        with self._state_lock:
+            stats['active_transactions'] = len(self._active_transactions)
+        return stats
     
     async def _cleanup_timeout_transactions(self) -> int:
-        """타임아웃된 트랜잭션 정리"""
+        """타임아웃된 트랜잭션 즉시 정리 (리퍼와 별도로 수동 실행용)"""
         try:
-            # 타임아웃된 트랜잭션 조회 (현재 시간과 비교)
-            current_time = datetime.now(timezone.utc).isoformat()
-            cursor = self.db.execute_query("""
-                SELECT transaction_id FROM active_transactions 
-                WHERE status = ? 
-                AND ? >= timeout_at
-            """, (TransactionStatus.ACTIVE.value, current_time))
-            
-            if not cursor:
-                return 0
-            
-            timeout_transactions = [row['transaction_id'] for row in cursor.fetchall()]
-            
-            if not timeout_transactions:
-                return 0
-            
-            # 상태 업데이트
-            placeholders = ','.join(['?' for _ in timeout_transactions])
-            cursor = self.db.execute_query(f"""
-                UPDATE active_transactions 
-                SET status = ?, last_activity = ?
-                WHERE transaction_id IN ({placeholders})
-            """, [TransactionStatus.TIMEOUT.value, datetime.now(timezone.utc).isoformat()] + timeout_transactions)
-            
-            # 락카 잠금 해제
-            for tx_id in timeout_transactions:
-                await self._unlock_all_lockers(tx_id)
-                # 캐시에서 제거
-                if tx_id in self._active_transactions:
-                    del self._active_transactions[tx_id]
-            
-            count = len(timeout_transactions)
-            if count > 0:
-                self.logger.info(f"타임아웃된 트랜잭션 정리: {count}개")
+            now = datetime.now(timezone.utc)
+            with self._state_lock:
+                expired = self._pop_expired(now)
             
-            return count
+            self._expire_transactions(expired, now)
+            return len(expired)
             
         except Exception as e:
             self.logger.error(f"타임아웃 트랜잭션 정리 실패: {e}")
             return 0
     
-    async def _lock_all_lockers(self, tx_id: str, timeout_at: datetime):
-        """모든 락카 잠금"""
+    async def _lock_lockers(self, tx_id: str, timeout_at: datetime):
+        """트랜잭션 잠금 범위(락카/구역)의 락카 잠금 기록"""
         try:
-            cursor = self.db.execute_query("""
+            scope = self.locks.get_scope(tx_id)
+            lockers, zones = scope['lockers'], scope['zones']
+            if not lockers and not zones:
+                return
+            
+            conditions = []
+            params: List[Any] = [tx_id, timeout_at.isoformat()]
+            if lockers:
+                conditions.append(f"locker_number IN ({','.join('?' for _ in lockers)})")
+                params.extend(lockers)
+            if zones:
+                conditions.append(f"zone IN ({','.join('?' for _ in zones)})")
+                params.extend(zones)
+            
+            cursor = self.db.execute_query(f"""
                 UPDATE locker_status 
                 SET current_transaction = ?, locked_until = ?
-            """, (tx_id, timeout_at.isoformat()))
+                WHERE {' OR '.join(conditions)}
+            """, tuple(params))
             
             if cursor:
-                self.logger.debug(f"모든 락카 잠금: {tx_id}")
+                self.logger.debug(f"락카 잠금: {tx_id} (락카 {lockers}, 구역 {zones})")
             
         except Exception as e:
             self.logger.error(f"락카 잠금 실패: {tx_id}, {e}")
@@ -587,8 +955,13 @@ class TransactionManager:
             self.logger.error(f"락카 잠금 해제 실패: {tx_id}, {e}")
     
     async def _load_transaction(self, tx_id: str) -> Optional[Dict[str, Any]]:
-        """데이터베이스에서 트랜잭션 로드"""
+        """트랜잭션 로드 (활성은 메모리, 종료된 트랜잭션은 데이터베이스)"""
         try:
+            with self._state_lock:
+                transaction = self._active_transactions.get(tx_id)
+                if transaction is not None:
+                    return self._snapshot(transaction)
+            
             cursor = self.db.execute_query("""
                 SELECT * FROM active_transactions 
                 WHERE transaction_id = ?
@@ -624,3 +997,29 @@ def create_transaction_manager(db_manager: DatabaseManager) -> TransactionManage
         초기화된 TransactionManager 인스턴스
     """
     return TransactionManager(db_manager)
+
+
+_managers: Dict[str, TransactionManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_transaction_manager(db_manager: DatabaseManager) -> TransactionManager:
+    """DB 파일별 프로세스 전역 트랜잭션 매니저 조회 (없으면 생성)
+    
+    활성 트랜잭션 상태가 메모리에 있으므로 같은 DB를 쓰는 서비스들은
+    반드시 같은 인스턴스를 공유해야 한다.
+    
+    Args:
+        db_manager: 데이터베이스 매니저 (새로 생성할 때 사용)
+        
+    Returns:
+        TransactionManager 인스턴스
+    """
+    key = os.path.abspath(db_manager.db_path)
+    
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = TransactionManager(db_manager)
+            _managers[key] = manager
+        return manager
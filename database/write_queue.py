@@ -0,0 +1,411 @@
+"""
+SQLite 단일 writer 스레드 (그룹 커밋)
+
+모든 호출자의 쓰기 요청을 큐로 받아 전용 스레드가 하나의 트랜잭션으로 모아 커밋한다.
+큐가 비어 있으면 바로 커밋하고, 요청이 계속 들어오는 동안만 batch_interval까지 더 모은다.
+호출자는 Future를 받아 커밋(fsync) 완료 시점을 기다린다.
+읽기는 기존처럼 각자의 커넥션(커넥션 풀)에서 수행한다.
+
+쓰기 락을 begin_timeout 안에 얻지 못하면 배치 전체를 실패시킨다.
+execute()가 시간 초과되면 아직 실행 전인 요청은 취소(커밋되지 않음 보장)하고,
+이미 실행 중인 요청은 실제 커밋 결과가 나올 때까지 기다려 그 결과를 돌려준다.
+"""
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from .connection_pool import create_connection, file_identity
+
+
+DEFAULT_BATCH_INTERVAL = 0.005  # 쓰기가 이어 들어오는 동안 최대 5ms까지 모아 한 트랜잭션으로 커밋
+DEFAULT_MAX_BATCH = 256
+DEFAULT_WRITE_TIMEOUT = 30.0
+DEFAULT_BEGIN_TIMEOUT = 10.0    # BEGIN IMMEDIATE가 SQLITE_BUSY로 계속 실패할 때 배치를 포기하는 시간
+_WRITER_BUSY_TIMEOUT_MS = 50    # writer 커넥션의 busy_timeout (대기는 _begin의 재시도/deadline이 맡음)
+
+_WRITE_PREFIXES = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+
+def is_write_query(query: str) -> bool:
+    """쓰기(DML) 쿼리인지 확인"""
+    return query.lstrip()[:7].upper().startswith(_WRITE_PREFIXES)
+
+
+class WriteResult:
+    """쓰기 결과 (execute_query 호출자를 위한 커서 호환 객체)"""
+
+    __slots__ = ('rowcount', 'lastrowid')
+
+    def __init__(self, rowcount: int = -1, lastrowid: Optional[int] = None):
+        self.rowcount = rowcount
+        self.lastrowid = lastrowid
+
+    def fetchone(self):
+        return None
+
+    def fetchall(self) -> list:
+        return []
+
+
+class _WriteRequest:
+    """큐에 들어가는 쓰기 요청"""
+
+    __slots__ = ('query', 'params', 'many', 'func', 'future', 'submitted_at')
+
+    def __init__(self, query: Optional[str], params: Any, many: bool = False,
+                 func: Optional[Callable[[sqlite3.Connection], Any]] = None):
+        self.query = query
+        self.params = params
+        self.many = many
+        self.func = func
+        self.future: Future = Future()
+        self.submitted_at = time.monotonic()
+
+
+class WriteQueue:
+    """전용 writer 스레드 + 그룹 커밋"""
+
+    def __init__(self, db_path: str, batch_interval: float = DEFAULT_BATCH_INTERVAL,
+                 max_batch: int = DEFAULT_MAX_BATCH, begin_timeout: float = DEFAULT_BEGIN_TIMEOUT,
+                 connection_factory: Callable[[str], sqlite3.Connection] = create_connection):
+        """
+        Args:
+            db_path: SQLite 데이터베이스 파일 경로
+            batch_interval: 요청이 이어 들어올 때 추가 요청을 모으는 최대 시간 (초)
+            max_batch: 한 트랜잭션에 담을 최대 요청 수
+            begin_timeout: 쓰기 락을 얻지 못하면 배치 전체를 실패시키는 시간 (초)
+            connection_factory: writer 커넥션 생성 함수 (PRAGMA 설정 포함)
+        """
+        self.db_path = db_path
+        self.batch_interval = batch_interval
+        self.max_batch = max_batch
+        self.begin_timeout = begin_timeout
+        self.logger = logging.getLogger(__name__)
+
+        self._connection_factory = connection_factory
+        self._queue: "queue.Queue[Optional[_WriteRequest]]" = queue.Queue()
+        self._running = True
+        self._conn: Optional[sqlite3.Connection] = None
+        self._file: Optional[Tuple[int, int]] = None
+
+        self._latencies: deque = deque(maxlen=1000)
+        self._stats = {
+            "writes": 0,
+            "failed_writes": 0,
+            "batches": 0,
+            "max_batch_size": 0,
+            "busy_retries": 0,
+            "begin_timeouts": 0,
+            "commit_failures": 0,
+        }
+        self._stats_lock = threading.Lock()
+
+        self._thread = threading.Thread(target=self._writer_loop, name="sqlite-writer", daemon=True)
+        self._thread.start()
+
+    # =====================================================
+    # 제출 API
+    # =====================================================
+
+    def _submit(self, request: _WriteRequest) -> Future:
+        if not self._running:
+            request.future.set_exception(sqlite3.OperationalError("write queue가 종료되었습니다"))
+            return request.future
+        self._queue.put(request)
+        return request.future
+
+    def submit(self, query: str, params: Union[tuple, dict] = ()) -> Future:
+        """단일 쓰기 제출
+
+        Returns:
+            커밋 후 WriteResult로 완료되는 Future
+        """
+        return self._submit(_WriteRequest(query, params))
+
+    def submit_many(self, query: str, params_list: List[Union[tuple, dict]]) -> Future:
+        """executemany 쓰기 제출"""
+        return self._submit(_WriteRequest(query, params_list, many=True))
+
+    def submit_callable(self, func: Callable[[sqlite3.Connection], Any]) -> Future:
+        """여러 문장을 원자적으로 실행할 함수 제출 (writer 커넥션을 인자로 호출)"""
+        return self._submit(_WriteRequest(None, None, func=func))
+
+    def execute(self, query: str, params: Union[tuple, dict] = (),
+                timeout: float = DEFAULT_WRITE_TIMEOUT) -> WriteResult:
+        """쓰기 제출 후 커밋까지 대기"""
+        return self.wait(self.submit(query, params), timeout)
+
+    def execute_many(self, query: str, params_list: List[Union[tuple, dict]],
+                     timeout: float = DEFAULT_WRITE_TIMEOUT) -> WriteResult:
+        """executemany 쓰기 제출 후 커밋까지 대기"""
+        return self.wait(self.submit_many(query, params_list), timeout)
+
+    @staticmethod
+    def wait(future: Future, timeout: float) -> Any:
+        """제출한 쓰기의 커밋 대기
+
+        시간 초과 시 아직 실행 전인 요청은 취소해 커밋되지 않게 하고 TimeoutError를 낸다.
+        writer가 이미 그 요청을 실행 중이면 취소할 수 없으므로(곧 커밋/롤백됨)
+        실패로 알리지 않고 배치가 끝날 때까지 기다려 실제 결과를 돌려준다.
+
+        Raises:
+            TimeoutError: timeout 안에 실행되지 않아 취소됨 (쓰기는 적용되지 않음)
+        """
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            if future.cancel():
+                raise
+            # 이미 트랜잭션 안에서 실행 중: BEGIN 이후라 남은 건 이 배치의 실행과 COMMIT뿐
+            return future.result()
+
+    # =====================================================
+    # writer 스레드
+    # =====================================================
+
+    def _collect_batch(self, first: _WriteRequest) -> List[_WriteRequest]:
+        """첫 요청과 함께 커밋할 요청을 모음
+
+        이미 큐에 있는 요청은 모두 가져오고, 큐가 비면 바로 커밋한다 (유휴 시 지연 없음).
+        첫 요청 뒤에 다른 요청이 이어 들어온 경우에만 batch_interval까지 더 기다린다.
+        """
+        batch = [first]
+        deadline = time.monotonic() + self.batch_interval
+
+        while len(batch) < self.max_batch:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                remaining = deadline - time.monotonic()
+                if len(batch) == 1 or remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if item is None:
+                self._running = False
+                break
+            batch.append(item)
+
+        return batch
+
+    def _open(self):
+        """writer 커넥션 열기"""
+        self._conn = self._connection_factory(self.db_path)
+        self._conn.execute(f"PRAGMA busy_timeout = {_WRITER_BUSY_TIMEOUT_MS}")
+        self._file = file_identity(self.db_path)
+
+    def _reopen_if_replaced(self):
+        """DB 파일이 삭제/교체되었으면 writer 커넥션을 새 파일로 다시 엶"""
+        if file_identity(self.db_path) == self._file:
+            return
+        self.logger.warning(f"DB 파일이 바뀌어 writer 커넥션을 다시 엽니다: {self.db_path}")
+        try:
+            self._conn.close()
+        except sqlite3.Error:
+            pass
+        self._open()
+
+    def _begin(self):
+        """BEGIN IMMEDIATE (SQLITE_BUSY 시 begin_timeout까지 백오프 재시도)
+
+        Raises:
+            sqlite3.OperationalError: begin_timeout 안에 쓰기 락을 얻지 못함
+        """
+        delay = 0.001
+        deadline = time.monotonic() + self.begin_timeout
+        while True:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                return
+            except sqlite3.OperationalError as e:
+                if 'locked' not in str(e) and 'busy' not in str(e):
+                    raise
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    with self._stats_lock:
+                        self._stats["begin_timeouts"] += 1
+                    raise sqlite3.OperationalError(f"쓰기 락 대기 시간 초과 ({self.begin_timeout}s): {e}")
+                with self._stats_lock:
+                    self._stats["busy_retries"] += 1
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, 0.1)
+
+    def _apply(self, request: _WriteRequest) -> Any:
+        """요청 하나를 savepoint 안에서 실행"""
+        conn = self._conn
+        conn.execute("SAVEPOINT write_item")
+        try:
+            if request.func is not None:
+                result = request.func(conn)
+            elif request.many:
+                cursor = conn.executemany(request.query, request.params)
+                result = WriteResult(cursor.rowcount, cursor.lastrowid)
+            else:
+                cursor = conn.execute(request.query, request.params)
+                result = WriteResult(cursor.rowcount, cursor.lastrowid)
+            conn.execute("RELEASE write_item")
+            return result
+        except Exception:
+            conn.execute("ROLLBACK TO write_item")
+            conn.execute("RELEASE write_item")
+            raise
+
+    def _commit_batch(self, batch: List[_WriteRequest]):
+        """배치를 하나의 트랜잭션으로 실행/커밋하고 Future 완료"""
+        outcomes: List[Tuple[_WriteRequest, bool, Any]] = []
+
+        try:
+            self._reopen_if_replaced()
+            self._begin()
+            for request in batch:
+                if not request.future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    outcomes.append((request, True, self._apply(request)))
+                except Exception as e:
+                    outcomes.append((request, False, e))
+            self._conn.execute("COMMIT")
+
+        except Exception as e:
+            self.logger.error(f"그룹 커밋 실패: {e}")
+            try:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+            except sqlite3.Error:
+                pass
+            with self._stats_lock:
+                self._stats["commit_failures"] += 1
+            for request in batch:
+                if not request.future.done():
+                    if request.future.running():
+                        request.future.set_exception(e)
+                    elif request.future.set_running_or_notify_cancel():
+                        request.future.set_exception(e)
+            return
+
+        now = time.monotonic()
+        failed = 0
+        for request, ok, value in outcomes:
+            if ok:
+                request.future.set_result(value)
+            else:
+                failed += 1
+                request.future.set_exception(value)
+            self._latencies.append(now - request.submitted_at)
+
+        with self._stats_lock:
+            self._stats["writes"] += len(outcomes) - failed
+            self._stats["failed_writes"] += failed
+            self._stats["batches"] += 1
+            self._stats["max_batch_size"] = max(self._stats["max_batch_size"], len(batch))
+
+    def _writer_loop(self):
+        """writer 스레드 메인 루프"""
+        try:
+            self._open()
+        except Exception as e:
+            self.logger.error(f"writer 커넥션 생성 실패: {e}")
+            self._running = False
+            self._fail_pending(e)
+            return
+
+        while self._running:
+            item = self._queue.get()
+            if item is None:
+                break
+            self._commit_batch(self._collect_batch(item))
+
+        # 종료 전 남은 요청 처리
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                self._commit_batch([item])
+
+        try:
+            self._conn.close()
+        except sqlite3.Error:
+            pass
+
+    def _fail_pending(self, error: Exception):
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None and item.future.set_running_or_notify_cancel():
+                item.future.set_exception(error)
+
+    def close(self, timeout: float = 5.0):
+        """writer 스레드 종료 (대기 중인 쓰기는 모두 커밋)"""
+        if not self._running:
+            return
+        self._running = False
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self.logger.info(f"write queue 종료: {self.db_path}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """writer 통계 (배치 크기, 지연시간 p50/p99, BUSY 재시도 수)"""
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            idx = min(len(latencies) - 1, int(len(latencies) * p))
+            return round(latencies[idx] * 1000, 3)
+
+        with self._stats_lock:
+            stats = dict(self._stats)
+
+        stats.update({
+            "db_path": self.db_path,
+            "pending": self._queue.qsize(),
+            "avg_batch_size": round(stats["writes"] / stats["batches"], 2) if stats["batches"] else 0,
+            "latency_p50_ms": percentile(0.50),
+            "latency_p99_ms": percentile(0.99),
+        })
+        return stats
+
+
+_queues: Dict[str, WriteQueue] = {}
+_queues_lock = threading.Lock()
+
+
+def get_write_queue(db_path: str) -> WriteQueue:
+    """DB 파일별 프로세스 전역 write queue 조회 (없으면 생성)
+
+    Raises:
+        ValueError: ':memory:' (커넥션마다 별도 DB라 writer 스레드에 쓰면 호출자에게 보이지 않음)
+    """
+    if db_path == ':memory:':
+        raise ValueError("in-memory DB는 write queue를 사용할 수 없습니다")
+    key = os.path.abspath(db_path)
+
+    with _queues_lock:
+        wq = _queues.get(key)
+        if wq is None or not wq._running:
+            wq = WriteQueue(db_path)
+            _queues[key] = wq
+        return wq
+
+
+def close_all_write_queues():
+    """모든 write queue 종료 (앱 종료 시 호출)"""
+    with _queues_lock:
+        queues = list(_queues.values())
+        _queues.clear()
+
+    for wq in queues:
+        wq.close()
@@ -32,6 +32,7 @@ const String VERSION = "v7.4-simple";
 // ==================== MCP23017 설정 ====================
 #define MAX_MCP 8
 #define DEBOUNCE_MS 15
+#define SNAPSHOT_INTERVAL_MS 5000  // 센서 스냅샷 주기 (놓친 엣지 복구용)
 
 // ==================== 전역 변수 ====================
 struct MCPUnit {
@@ -43,6 +44,8 @@ struct MCPUnit {
 } mcpUnits[MAX_MCP];
 
 int mcpCount = 0;
+uint32_t snapshotSeq = 0;
+unsigned long lastSnapshotTime = 0;
 String scanBuffer = "";
 unsigned long lastScanTime = 0;
 bool motorBusy = false;
@@ -188,6 +191,30 @@ void processMCP() {
   }
 }
 
+// 센서 스냅샷: "IR:<trigger>:<seq>:<addr>=<mask>,...*<checksum>"
+// trigger P=주기, R=get_sensors 요청, B=부팅 / mask 비트 n = 핀 n 디바운스 상태 (1=HIGH)
+// checksum = "IR:" 다음부터 '*' 앞까지 XOR
+void sendSensorSnapshot(char trigger) {
+  char buf[24 + MAX_MCP * 8];
+  int len = snprintf(buf, sizeof(buf), "IR:%c:%lu:", trigger, (unsigned long)++snapshotSeq);
+  
+  for (int i = 0; i < mcpCount; i++) {
+    MCPUnit& mcp = mcpUnits[i];
+    uint16_t mask = 0;
+    for (int pin = 0; pin < 16; pin++) {
+      if (mcp.lastState[pin]) mask |= (1 << pin);
+    }
+    len += snprintf(buf + len, sizeof(buf) - len, "%s%02X=%04X", i ? "," : "", mcp.addr, mask);
+  }
+  
+  uint8_t checksum = 0;
+  for (int k = 3; k < len; k++) checksum ^= (uint8_t)buf[k];
+  snprintf(buf + len, sizeof(buf) - len, "*%02X", checksum);
+  
+  Serial.println(buf);
+  lastSnapshotTime = millis();
+}
+
 // ==================== 바코드 ====================
 void processBarcode() {
   while (Serial2.available()) {
@@ -250,6 +277,9 @@ void processCommand() {
             if (command == "get_status") {
               sendStatus();
             }
+            else if (command == "get_sensors") {
+              sendSensorSnapshot('R');
+            }
             else if (command == "motor_move") {
               if (!motorBusy) {
                 double revs = doc["revs"] | 0.0;
@@ -330,12 +360,14 @@ void setup() {
   beep(100);
   
   sendStatus();
+  if (mcpCount > 0) sendSensorSnapshot('B');
   Serial.println("[시스템] ✓ 준비\n");
 }
 
 void loop() {
   processBarcode();
   if (mcpCount > 0) processMCP();
+  if (mcpCount > 0 && millis() - lastSnapshotTime >= SNAPSHOT_INTERVAL_MS) sendSensorSnapshot('P');
   processCommand();
   
   delay(5);
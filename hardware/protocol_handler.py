@@ -3,12 +3,17 @@
 
 기존 ESP32 프로토콜을 라즈베리파이 환경에 맞게 포팅
 바코드/QR 스캔 데이터 파싱 및 명령어 생성
+
+parse_message는 첫 글자 → (접두사, 파서) 표로 바로 분기하고, JSON은 프레임당 한 번만 디코딩한다.
+이벤트 로그는 logging 레벨로 켜고 끈다 (hardware.protocol_handler 로거, 이벤트별 로그는 DEBUG).
 """
 
+import json
+import logging
 import time
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 
 class MessageType(Enum):
@@ -19,6 +24,7 @@ class MessageType(Enum):
     STATUS_REPORT = "status_report"
     HEARTBEAT = "heartbeat"
     COMMAND_RESPONSE = "command_response"
+    SENSOR_SNAPSHOT = "sensor_snapshot"
     ERROR = "error"
     UNKNOWN = "unknown"
 
@@ -34,13 +40,31 @@ class CommandType(Enum):
     PING = "PING"
 
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+_json_loads = json.loads
+
+
 class ParsedMessage:
-    """파싱된 메시지 데이터 구조"""
-    type: MessageType
-    data: Dict[str, Any]
-    timestamp: float
-    raw_message: str
+    """파싱된 메시지 데이터 구조 (프레임마다 만들어지므로 __slots__ 사용)"""
+
+    __slots__ = ('type', 'data', 'timestamp', 'raw_message')
+
+    def __init__(self, type: MessageType, data: Dict[str, Any], timestamp: float, raw_message: str):
+        self.type = type
+        self.data = data
+        self.timestamp = timestamp
+        self.raw_message = raw_message
+
+    def __repr__(self) -> str:
+        return (f"ParsedMessage(type={self.type!r}, data={self.data!r}, "
+                f"timestamp={self.timestamp!r}, raw_message={self.raw_message!r})")
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.type, self.data, self.timestamp, self.raw_message) == \
+            (other.type, other.data, other.timestamp, other.raw_message)
 
 
 @dataclass
@@ -93,6 +117,8 @@ class ProtocolHandler:
 
     def parse_message(self, raw_message: str) -> Optional[ParsedMessage]:
         """라즈베리파이에서 수신한 메시지 파싱
+
+        첫 글자로 파서를 고른 뒤 접두사를 한 번만 확인한다.
         
         Args:
             raw_message: 원시 메시지 문자열
@@ -109,107 +135,96 @@ class ProtocolHandler:
             return None
 
         try:
-            timestamp = time.time()
-
-            # QR 스캔: "QR:QRS:MEMBER123:timestamp:nonce:signature"
-            if raw_message.startswith("QR:"):
-                qr_data = self._parse_qr_scan(raw_message)
-                if qr_data:
-                    return ParsedMessage(
-                        type=MessageType.QR_SCAN,
-                        data=qr_data.__dict__,
-                        timestamp=timestamp,
-                        raw_message=raw_message,
-                    )
-
-            # ESP32 JSON 이벤트들 (모든 JSON 메시지)
-            elif raw_message.startswith("{") and ("device_id" in raw_message and "esp32" in raw_message):
-                parsed_event = self._parse_esp32_json_event(raw_message)
-                if parsed_event:
-                    return parsed_event
-            
-            # 기존 바코드 형식: "BARCODE:123456789"
-            elif raw_message.startswith("BARCODE:"):
-                barcode_data = self._parse_barcode_scan(raw_message)
-                if barcode_data:
-                    return ParsedMessage(
-                        type=MessageType.BARCODE_SCAN,
-                        data=barcode_data.__dict__,
-                        timestamp=timestamp,
-                        raw_message=raw_message,
-                    )
-
-            # 상태 보고: "STATUS:door=closed,scanner=ready"
-            elif raw_message.startswith("STATUS:"):
-                status_data = self._parse_status_report(raw_message)
-                if status_data:
-                    return ParsedMessage(
-                        type=MessageType.STATUS_REPORT,
-                        data=status_data.__dict__,
-                        timestamp=timestamp,
-                        raw_message=raw_message,
-                    )
-
-            # 하트비트: "HEARTBEAT"
-            elif raw_message == "HEARTBEAT":
-                return ParsedMessage(
-                    type=MessageType.HEARTBEAT,
-                    data={},
-                    timestamp=timestamp,
-                    raw_message=raw_message,
-                )
+            route = _PREFIX_ROUTES.get(raw_message[0])
+            if route is not None and raw_message.startswith(route[0]):
+                message = route[1](self, raw_message, time.time())
+            else:
+                message = self._parse_untagged(raw_message, time.time())
+        except Exception as e:
+            logger.error("파싱 오류: %s", e)
+            self._stats["parse_errors"] += 1
+            return None
 
-            # 명령 응답: "RESP:CMD_ID:OK"
-            elif raw_message.startswith("RESP:"):
-                response_data = self._parse_command_response(raw_message)
-                if response_data:
-                    return ParsedMessage(
-                        type=MessageType.COMMAND_RESPONSE,
-                        data=response_data,
-                        timestamp=timestamp,
-                        raw_message=raw_message,
-                    )
-
-            # 에러 메시지: "ERROR:description"
-            elif raw_message.startswith("ERROR:"):
-                error_msg = raw_message[6:]
-                return ParsedMessage(
-                    type=MessageType.ERROR,
-                    data={"error_message": error_msg},
-                    timestamp=timestamp,
-                    raw_message=raw_message,
-                )
+        if message is None:
+            self._stats["invalid_messages"] += 1
+        else:
+            self._stats["messages_parsed"] += 1
+        return message
 
-            # 순수 바코드 데이터 (접두사 없음)
-            elif self._is_raw_barcode(raw_message):
-                print(f"[ProtocolHandler] 순수 바코드 감지: {raw_message}")
-                barcode_data = BarcodeScanData(barcode=raw_message)
-                return ParsedMessage(
-                    type=MessageType.BARCODE_SCAN,
-                    data=barcode_data.__dict__,
-                    timestamp=timestamp,
-                    raw_message=raw_message,
-                )
+    # ----- 접두사별 파서 (parse_message 디스패치 대상) -----
 
-            # 알 수 없는 메시지
-            else:
-                print(f"[ProtocolHandler] 알 수 없는 메시지 형식: {raw_message}")
-                self._stats["invalid_messages"] += 1
-                return ParsedMessage(
-                    type=MessageType.UNKNOWN,
-                    data={"content": raw_message},
-                    timestamp=timestamp,
-                    raw_message=raw_message,
-                )
+    def _route_qr(self, raw_message: str, timestamp: float) -> Optional[ParsedMessage]:
+        """QR 스캔: "QR:QRS:MEMBER123:timestamp:nonce:signature" """
+        qr_data = self._parse_qr_scan(raw_message)
+        if qr_data is None:
+            return None
+        return ParsedMessage(MessageType.QR_SCAN, qr_data.__dict__, timestamp, raw_message)
 
-            self._stats["messages_parsed"] += 1
+    def _route_barcode(self, raw_message: str, timestamp: float) -> Optional[ParsedMessage]:
+        """기존 바코드 형식: "BARCODE:123456789" """
+        barcode_data = self._parse_barcode_scan(raw_message)
+        if barcode_data is None:
             return None
+        return ParsedMessage(MessageType.BARCODE_SCAN, barcode_data.__dict__, timestamp, raw_message)
 
-        except Exception as e:
-            print(f"[ProtocolHandler] 파싱 오류: {e}")
+    def _route_status(self, raw_message: str, timestamp: float) -> Optional[ParsedMessage]:
+        """상태 보고: "STATUS:door=closed,scanner=ready" """
+        status_data = self._parse_status_report(raw_message)
+        if status_data is None:
+            return None
+        return ParsedMessage(MessageType.STATUS_REPORT, status_data.__dict__, timestamp, raw_message)
+
+    def _route_heartbeat(self, raw_message: str, timestamp: float) -> Optional[ParsedMessage]:
+        """하트비트: "HEARTBEAT" (뒤에 다른 글자가 붙으면 접두사 없는 메시지로 처리)"""
+        if len(raw_message) != 9:
+            return self._parse_untagged(raw_message, timestamp)
+        return ParsedMessage(MessageType.HEARTBEAT, {}, timestamp, raw_message)
+
+    def _route_response(self, raw_message: str, timestamp: float) -> Optional[ParsedMessage]:
+        """명령 응답: "RESP:CMD_ID:OK" """
+        response_data = self._parse_command_response(raw_message)
+        if response_data is None:
+            return None
+        return ParsedMessage(MessageType.COMMAND_RESPONSE, response_data, timestamp, raw_message)
+
+    def _route_sensor_snapshot(self, raw_message: str, timestamp: float) -> Optional[ParsedMessage]:
+        """IR 센서 스냅샷: "IR:P:1234:26=FC00,23=FFFF*5A" (칩별 16비트 마스크, 1=HIGH)"""
+        snapshot = parse_sensor_snapshot(raw_message)
+        if snapshot is None:
+            logger.warning("센서 스냅샷 형식/체크섬 오류: %s", raw_message)
+            return None
+        return ParsedMessage(MessageType.SENSOR_SNAPSHOT, snapshot, timestamp, raw_message)
+
+    def _route_error(self, raw_message: str, timestamp: float) -> Optional[ParsedMessage]:
+        """에러 메시지: "ERROR:description" """
+        return ParsedMessage(MessageType.ERROR, {"error_message": raw_message[6:]}, timestamp, raw_message)
+
+    def _route_json(self, raw_message: str, timestamp: float) -> Optional[ParsedMessage]:
+        """JSON 메시지 (프레임당 한 번만 디코딩)"""
+        try:
+            msg_data = _json_loads(raw_message)
+        except ValueError as e:
+            logger.warning("JSON 파싱 오류: %s", e)
             self._stats["parse_errors"] += 1
             return None
 
+        if not isinstance(msg_data, dict) or "device_id" not in msg_data:
+            return self._unknown(raw_message, timestamp)
+        return self._parse_esp32_event(msg_data, raw_message, timestamp)
+
+    def _parse_untagged(self, raw_message: str, timestamp: float) -> ParsedMessage:
+        """접두사 없는 메시지: 순수 바코드 또는 알 수 없는 메시지"""
+        if self._is_raw_barcode(raw_message):
+            logger.debug("순수 바코드 감지: %s", raw_message)
+            return ParsedMessage(MessageType.BARCODE_SCAN, {"barcode": raw_message}, timestamp, raw_message)
+        return self._unknown(raw_message, timestamp)
+
+    def _unknown(self, raw_message: str, timestamp: float) -> ParsedMessage:
+        """알 수 없는 메시지 (UNKNOWN으로 돌려주되 invalid로 집계)"""
+        logger.debug("알 수 없는 메시지 형식: %s", raw_message)
+        self._stats["invalid_messages"] += 1
+        return ParsedMessage(MessageType.UNKNOWN, {"content": raw_message}, timestamp, raw_message)
+
     def _parse_qr_scan(self, raw_message: str) -> Optional[QRScanData]:
         """QR 스캔 메시지 파싱"""
         try:
@@ -234,7 +249,7 @@ class ProtocolHandler:
                 return QRScanData(qr_content=qr_content)
 
         except Exception as e:
-            print(f"[ProtocolHandler] QR 파싱 오류: {e}")
+            logger.error("QR 파싱 오류: %s", e)
             return None
 
     def _parse_barcode_scan(self, raw_message: str) -> Optional[BarcodeScanData]:
@@ -242,9 +257,8 @@ class ProtocolHandler:
         try:
             # ESP32 JSON 형태: {"device_id":"esp32_gym","message_type":"event","event_type":"barcode_scanned","data":{"barcode":"123456"}}
             if raw_message.startswith("{") and ("barcode_scanned" in raw_message or "BARCODE_SCAN" in raw_message):
-                import json
                 try:
-                    msg_data = json.loads(raw_message)
+                    msg_data = _json_loads(raw_message)
                     
                     # ESP32 새 형식
                     if (msg_data.get("message_type") == "event" and 
@@ -252,195 +266,98 @@ class ProtocolHandler:
                         "data" in msg_data):
                         barcode = str(msg_data["data"].get("barcode", "")).strip()
                         if barcode:
-                            print(f"[ProtocolHandler] ESP32 바코드 파싱: {barcode}")
+                            logger.debug("ESP32 바코드 파싱: %s", barcode)
                             return BarcodeScanData(barcode=barcode)
                     
                     # 기존 형식 호환
                     elif msg_data.get("type") == "BARCODE_SCAN" and "data" in msg_data:
                         barcode = str(msg_data["data"]).strip()
                         if barcode:
-                            print(f"[ProtocolHandler] 레거시 바코드 파싱: {barcode}")
+                            logger.debug("레거시 바코드 파싱: %s", barcode)
                             return BarcodeScanData(barcode=barcode)
                             
-                except json.JSONDecodeError as json_err:
-                    print(f"[ProtocolHandler] JSON 파싱 오류: {json_err}")
+                except ValueError as json_err:
+                    logger.warning("JSON 파싱 오류: %s", json_err)
 
             # 기본 형태: "BARCODE:123456789"
             elif raw_message.startswith("BARCODE:") and len(raw_message) > 8:
                 barcode = raw_message[8:]  # "BARCODE:" 제거
-                print(f"[ProtocolHandler] 기본 바코드 파싱: {barcode}")
+                logger.debug("기본 바코드 파싱: %s", barcode)
                 return BarcodeScanData(barcode=barcode)
 
             return None
         except Exception as e:
-            print(f"[ProtocolHandler] 바코드 파싱 오류: {e}")
+            logger.error("바코드 파싱 오류: %s", e)
             return None
 
     def _parse_esp32_json_event(self, raw_message: str) -> Optional[ParsedMessage]:
-        """ESP32 JSON 이벤트 통합 파싱"""
+        """ESP32 JSON 이벤트 통합 파싱 (문자열 입력용, parse_message는 _route_json 사용)"""
         try:
-            import json
-            msg_data = json.loads(raw_message)
-            timestamp = time.time()
-            
-            device_id = msg_data.get("device_id", "unknown")
-            message_type = msg_data.get("message_type", "")
-            event_type = msg_data.get("event_type", "")
-            data = msg_data.get("data", {})
-            
-            # 바코드 스캔 이벤트
-            if event_type == "barcode_scanned":
-                barcode = str(data.get("barcode", "")).strip()
-                if barcode:
-                    print(f"[ProtocolHandler] ESP32 바코드: {barcode}")
-                    return ParsedMessage(
-                        type=MessageType.BARCODE_SCAN,
-                        data={
-                            "barcode": barcode,
-                            "device_id": device_id,
-                            "scan_type": data.get("scan_type", "barcode"),
-                            "format": data.get("format", "unknown"),
-                            "quality": data.get("quality", 95)
-                        },
-                        timestamp=timestamp,
-                        raw_message=raw_message
-                    )
-            
-            # NFC 스캔 이벤트
-            elif event_type == "nfc_scanned":
-                nfc_uid = str(data.get("nfc_uid", "")).strip()
-                if nfc_uid:
-                    print(f"[ProtocolHandler] ESP32 NFC: {nfc_uid}")
-                    return ParsedMessage(
-                        type=MessageType.NFC_SCAN,
-                        data={
-                            "nfc_uid": nfc_uid,
-                            "device_id": device_id,
-                            "uid_length": data.get("uid_length"),
-                            "scan_count": data.get("scan_count")
-                        },
-                        timestamp=timestamp,
-                        raw_message=raw_message
-                    )
-            
-            # IR 센서 이벤트
-            elif event_type == "sensor_triggered":
-                print(f"[ProtocolHandler] ESP32 센서: chip={data.get('chip_idx')}, pin={data.get('pin')}, state={data.get('state')}, active={data.get('active')}")
-                return ParsedMessage(
-                    type=MessageType.STATUS_REPORT,
-                    data={
-                        "sensor_type": "ir_sensor",
-                        "device_id": device_id,
-                        "chip_idx": data.get("chip_idx"),
-                        "addr": data.get("addr"),
-                        "pin": data.get("pin"),
-                        "state": data.get("state"),
-                        "raw": data.get("raw"),
-                        "active": data.get("active")
-                    },
-                    timestamp=timestamp,
-                    raw_message=raw_message
-                )
-            
-            # 모터 완료 이벤트
-            elif event_type == "motor_completed":
-                print(f"[ProtocolHandler] ESP32 모터: {data.get('action')} {data.get('status')}")
-                return ParsedMessage(
-                    type=MessageType.COMMAND_RESPONSE,
-                    data={
-                        "response_type": "motor_event",
-                        "device_id": device_id,
-                        "action": data.get("action"),
-                        "status": data.get("status"),
-                        "enabled": data.get("enabled"),
-                        "direction": data.get("direction"),
-                        "busy": data.get("busy"),
-                        "details": data.get("details", {})
-                    },
-                    timestamp=timestamp,
-                    raw_message=raw_message
-                )
-            
-            # 상태 응답
-            elif message_type == "response":
-                # 특정 이벤트 타입이 있는 응답 처리
-                if event_type == "locker_opened":
-                    print(f"[ProtocolHandler] ESP32 락커 열기 완료: {data.get('locker_id')}")
-                    return ParsedMessage(
-                        type=MessageType.COMMAND_RESPONSE,
-                        data={
-                            "response_type": "locker_opened",
-                            "device_id": device_id,
-                            "locker_id": data.get("locker_id"),
-                            "status": data.get("status"),
-                            "steps": data.get("steps")
-                        },
-                        timestamp=timestamp,
-                        raw_message=raw_message
-                    )
-                elif event_type == "motor_moved":
-                    print(f"[ProtocolHandler] ESP32 모터 이동 완료: {data.get('revs')}회전")
-                    return ParsedMessage(
-                        type=MessageType.COMMAND_RESPONSE,
-                        data={
-                            "response_type": "motor_moved",
-                            "device_id": device_id,
-                            "revs": data.get("revs"),
-                            "rpm": data.get("rpm"),
-                            "steps": data.get("steps")
-                        },
-                        timestamp=timestamp,
-                        raw_message=raw_message
-                    )
-                else:
-                    # 일반 상태 응답
-                    print(f"[ProtocolHandler] ESP32 상태 응답: {data.get('status', 'unknown')}")
-                    return ParsedMessage(
-                        type=MessageType.STATUS_REPORT,
-                        data={
-                            "response_type": "status_response",
-                            "device_id": device_id,
-                            **data
-                        },
-                        timestamp=timestamp,
-                        raw_message=raw_message
-                    )
-            
-            # 에러 응답
-            elif message_type == "error":
-                print(f"[ProtocolHandler] ESP32 에러: {data.get('error_code')}")
-                return ParsedMessage(
-                    type=MessageType.ERROR,
-                    data={
-                        "device_id": device_id,
-                        "error_code": data.get("error_code"),
-                        "error_message": data.get("error_message")
-                    },
-                    timestamp=timestamp,
-                    raw_message=raw_message
-                )
-            
-            # 알 수 없는 이벤트
-            else:
-                print(f"[ProtocolHandler] 알 수 없는 ESP32 이벤트: {event_type}")
-                return ParsedMessage(
-                    type=MessageType.UNKNOWN,
-                    data={
-                        "device_id": device_id,
-                        "message_type": message_type,
-                        "event_type": event_type,
-                        **data
-                    },
-                    timestamp=timestamp,
-                    raw_message=raw_message
-                )
-                
-        except json.JSONDecodeError as e:
-            print(f"[ProtocolHandler] ESP32 JSON 파싱 오류: {e}")
+            msg_data = _json_loads(raw_message)
+        except ValueError as e:
+            logger.warning("ESP32 JSON 파싱 오류: %s", e)
             return None
-        except Exception as e:
-            print(f"[ProtocolHandler] ESP32 이벤트 파싱 오류: {e}")
+        if not isinstance(msg_data, dict):
             return None
+        return self._parse_esp32_event(msg_data, raw_message, time.time())
+
+    def _parse_esp32_event(self, msg_data: Dict[str, Any], raw_message: str,
+                           timestamp: float) -> Optional[ParsedMessage]:
+        """디코딩된 ESP32 JSON 이벤트를 ParsedMessage로 변환
+
+        event_type은 _EVENT_ROUTES 표로, 그 외에는 message_type으로 분기한다.
+        """
+        message = self._build_esp32_event(msg_data, raw_message, timestamp)
+
+        # 펌웨어가 되돌려 준 명령 id (명령/응답 매칭용)
+        cmd_id = msg_data.get("cmd_id")
+        if cmd_id is not None and message is not None:
+            message.data["cmd_id"] = cmd_id
+        return message
+
+    def _build_esp32_event(self, msg_data: Dict[str, Any], raw_message: str,
+                           timestamp: float) -> Optional[ParsedMessage]:
+        device_id = msg_data.get("device_id", "unknown")
+        event_type = msg_data.get("event_type", "")
+        data = msg_data.get("data") or {}
+
+        route = _EVENT_ROUTES.get(event_type)
+        if route is not None:
+            return route(device_id, data, timestamp, raw_message)
+
+        message_type = msg_data.get("message_type", "")
+
+        # 상태 응답
+        if message_type == "response":
+            return _response_event(device_id, event_type, data, timestamp, raw_message)
+
+        # 에러 응답
+        if message_type == "error":
+            logger.warning("ESP32 에러: %s", data.get("error_code"))
+            return ParsedMessage(
+                MessageType.ERROR,
+                {
+                    "device_id": device_id,
+                    "error_code": data.get("error_code"),
+                    "error_message": data.get("error_message"),
+                },
+                timestamp,
+                raw_message,
+            )
+
+        # 알 수 없는 이벤트
+        logger.debug("알 수 없는 ESP32 이벤트: %s", event_type)
+        return ParsedMessage(
+            MessageType.UNKNOWN,
+            {
+                "device_id": device_id,
+                "message_type": message_type,
+                "event_type": event_type,
+                **data,
+            },
+            timestamp,
+            raw_message,
+        )
 
     def _parse_status_report(self, raw_message: str) -> Optional[StatusData]:
         """상태 보고 메시지 파싱"""
@@ -483,7 +400,7 @@ class ProtocolHandler:
             return status_data
 
         except Exception as e:
-            print(f"[ProtocolHandler] 상태 파싱 오류: {e}")
+            logger.error("상태 파싱 오류: %s", e)
             return None
 
     def _parse_command_response(self, raw_message: str) -> Optional[Dict[str, Any]]:
@@ -504,7 +421,7 @@ class ProtocolHandler:
                 }
             return None
         except Exception as e:
-            print(f"[ProtocolHandler] 명령 응답 파싱 오류: {e}")
+            logger.error("명령 응답 파싱 오류: %s", e)
             return None
 
     def create_command(self, command_type: CommandType, **kwargs) -> str:
@@ -558,7 +475,7 @@ class ProtocolHandler:
             return cmd
 
         except Exception as e:
-            print(f"[ProtocolHandler] 명령어 생성 오류: {e}")
+            logger.error("명령어 생성 오류: %s", e)
             return ""
 
     def create_door_open_command(self, duration_ms: int = 3000) -> str:
@@ -593,8 +510,6 @@ class ProtocolHandler:
         Returns:
             ESP32용 JSON 명령어 문자열
         """
-        import json
-        
         cmd_data = {
             "command": command,
             **kwargs
@@ -602,32 +517,41 @@ class ProtocolHandler:
         
         return json.dumps(cmd_data, ensure_ascii=False)
     
-    def create_esp32_locker_open_command(self, locker_id: str, duration_ms: int = 3000) -> str:
+    def create_esp32_locker_open_command(self, locker_id: str, duration_ms: int = 3000,
+                                         cmd_id: Optional[str] = None) -> str:
         """ESP32용 락카 열기 명령 (330도 회전)"""
         return self.create_esp32_json_command(
             "open_locker",
             locker_id=locker_id,
-            duration_ms=duration_ms
+            duration_ms=duration_ms,
+            **_cmd_id_field(cmd_id)
         )
     
-    def create_esp32_status_command(self) -> str:
+    def create_esp32_status_command(self, cmd_id: Optional[str] = None) -> str:
         """ESP32용 상태 요청 명령"""
-        return self.create_esp32_json_command("get_status")
+        return self.create_esp32_json_command("get_status", **_cmd_id_field(cmd_id))
     
-    def create_esp32_motor_command(self, revs: float, rpm: float = 60.0, accel: bool = True) -> str:
+    def create_esp32_motor_command(self, revs: float, rpm: float = 60.0, accel: bool = True,
+                                   cmd_id: Optional[str] = None) -> str:
         """ESP32용 모터 제어 명령"""
         return self.create_esp32_json_command(
             "motor_move",
             revs=revs,
             rpm=rpm,
-            accel=accel
+            accel=accel,
+            **_cmd_id_field(cmd_id)
         )
     
-    def create_esp32_auto_mode_command(self, enabled: bool) -> str:
+    def create_esp32_sensor_snapshot_command(self, cmd_id: Optional[str] = None) -> str:
+        """ESP32용 센서 스냅샷 요청 명령 (응답은 "IR:R:..." 프레임)"""
+        return self.create_esp32_json_command("get_sensors", **_cmd_id_field(cmd_id))
+    
+    def create_esp32_auto_mode_command(self, enabled: bool, cmd_id: Optional[str] = None) -> str:
         """ESP32용 자동 모드 설정 명령"""
         return self.create_esp32_json_command(
             "set_auto_mode",
-            enabled=enabled
+            enabled=enabled,
+            **_cmd_id_field(cmd_id)
         )
 
     def mark_command_completed(self, command_id: str) -> bool:
@@ -665,7 +589,7 @@ class ProtocolHandler:
             del self._pending_commands[cmd_id]
 
         if expired_commands:
-            print(f"[ProtocolHandler] {len(expired_commands)}개 만료된 명령어 정리")
+            logger.info("%d개 만료된 명령어 정리", len(expired_commands))
 
         return len(expired_commands)
 
@@ -706,17 +630,7 @@ class ProtocolHandler:
             return False
 
         # 알려진 메시지 접두사 확인
-        valid_prefixes = [
-            "QR:",
-            "BARCODE:",
-            "STATUS:",
-            "HEARTBEAT",
-            "RESP:",
-            "ERROR:",
-            "CMD:",
-        ]
-
-        return any(message.startswith(prefix) for prefix in valid_prefixes)
+        return message.startswith(_VALID_PREFIXES)
 
     def _is_raw_barcode(self, message: str) -> bool:
         """순수 바코드인지 확인 (바코드 리더기에서 직접 온 숫자)
@@ -735,3 +649,238 @@ class ProtocolHandler:
         )
 
 
+
+
+# ----- ESP32 JSON 이벤트 변환 (event_type별) -----
+
+def _barcode_event(device_id: str, data: Dict[str, Any], timestamp: float,
+                   raw_message: str) -> Optional[ParsedMessage]:
+    """바코드 스캔 이벤트"""
+    barcode = str(data.get("barcode", "")).strip()
+    if not barcode:
+        return None
+    logger.debug("ESP32 바코드: %s", barcode)
+    return ParsedMessage(
+        MessageType.BARCODE_SCAN,
+        {
+            "barcode": barcode,
+            "device_id": device_id,
+            "scan_type": data.get("scan_type", "barcode"),
+            "format": data.get("format", "unknown"),
+            "quality": data.get("quality", 95),
+        },
+        timestamp,
+        raw_message,
+    )
+
+
+def _nfc_event(device_id: str, data: Dict[str, Any], timestamp: float,
+               raw_message: str) -> Optional[ParsedMessage]:
+    """NFC 스캔 이벤트"""
+    nfc_uid = str(data.get("nfc_uid", "")).strip()
+    if not nfc_uid:
+        return None
+    logger.debug("ESP32 NFC: %s", nfc_uid)
+    return ParsedMessage(
+        MessageType.NFC_SCAN,
+        {
+            "nfc_uid": nfc_uid,
+            "device_id": device_id,
+            "uid_length": data.get("uid_length"),
+            "scan_count": data.get("scan_count"),
+        },
+        timestamp,
+        raw_message,
+    )
+
+
+def _sensor_event(device_id: str, data: Dict[str, Any], timestamp: float,
+                  raw_message: str) -> ParsedMessage:
+    """IR 센서 이벤트 (가장 빈번한 프레임)"""
+    get = data.get
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("ESP32 센서: chip=%s, pin=%s, state=%s, active=%s",
+                     get("chip_idx"), get("pin"), get("state"), get("active"))
+    return ParsedMessage(
+        MessageType.STATUS_REPORT,
+        {
+            "sensor_type": "ir_sensor",
+            "device_id": device_id,
+            "chip_idx": get("chip_idx"),
+            "addr": get("addr"),
+            "pin": get("pin"),
+            "state": get("state"),
+            "raw": get("raw"),
+            "active": get("active"),
+        },
+        timestamp,
+        raw_message,
+    )
+
+
+def _motor_event(device_id: str, data: Dict[str, Any], timestamp: float,
+                 raw_message: str) -> ParsedMessage:
+    """모터 완료 이벤트"""
+    logger.debug("ESP32 모터: %s %s", data.get("action"), data.get("status"))
+    return ParsedMessage(
+        MessageType.COMMAND_RESPONSE,
+        {
+            "response_type": "motor_event",
+            "device_id": device_id,
+            "action": data.get("action"),
+            "status": data.get("status"),
+            "enabled": data.get("enabled"),
+            "direction": data.get("direction"),
+            "busy": data.get("busy"),
+            "details": data.get("details", {}),
+        },
+        timestamp,
+        raw_message,
+    )
+
+
+def _response_event(device_id: str, event_type: str, data: Dict[str, Any], timestamp: float,
+                    raw_message: str) -> ParsedMessage:
+    """명령 응답 (message_type == "response")"""
+    if event_type == "locker_opened":
+        logger.debug("ESP32 락커 열기 완료: %s", data.get("locker_id"))
+        return ParsedMessage(
+            MessageType.COMMAND_RESPONSE,
+            {
+                "response_type": "locker_opened",
+                "device_id": device_id,
+                "locker_id": data.get("locker_id"),
+                "status": data.get("status"),
+                "steps": data.get("steps"),
+            },
+            timestamp,
+            raw_message,
+        )
+
+    if event_type == "motor_moved":
+        logger.debug("ESP32 모터 이동 완료: %s회전", data.get("revs"))
+        return ParsedMessage(
+            MessageType.COMMAND_RESPONSE,
+            {
+                "response_type": "motor_moved",
+                "device_id": device_id,
+                "revs": data.get("revs"),
+                "rpm": data.get("rpm"),
+                "steps": data.get("steps"),
+            },
+            timestamp,
+            raw_message,
+        )
+
+    # 일반 상태 응답
+    logger.debug("ESP32 상태 응답: %s", data.get("status", "unknown"))
+    return ParsedMessage(
+        MessageType.STATUS_REPORT,
+        {
+            "response_type": "status_response",
+            "device_id": device_id,
+            **data,
+        },
+        timestamp,
+        raw_message,
+    )
+
+
+_EVENT_ROUTES = {
+    "barcode_scanned": _barcode_event,
+    "nfc_scanned": _nfc_event,
+    "sensor_triggered": _sensor_event,
+    "motor_completed": _motor_event,
+}
+
+# 첫 글자 → (접두사, 파서). 표에 없거나 접두사가 맞지 않으면 순수 바코드/알 수 없는 메시지
+_PREFIX_ROUTES = {
+    "{": ("{", ProtocolHandler._route_json),
+    "Q": ("QR:", ProtocolHandler._route_qr),
+    "B": ("BARCODE:", ProtocolHandler._route_barcode),
+    "S": ("STATUS:", ProtocolHandler._route_status),
+    "H": ("HEARTBEAT", ProtocolHandler._route_heartbeat),
+    "R": ("RESP:", ProtocolHandler._route_response),
+    "E": ("ERROR:", ProtocolHandler._route_error),
+    "I": ("IR:", ProtocolHandler._route_sensor_snapshot),
+}
+
+def _cmd_id_field(cmd_id: Optional[str]) -> Dict[str, str]:
+    """명령 JSON에 넣을 cmd_id 필드 (없으면 생략해 기존 명령 형식 유지)"""
+    return {"cmd_id": cmd_id} if cmd_id else {}
+
+
+_VALID_PREFIXES = ("QR:", "BARCODE:", "STATUS:", "HEARTBEAT", "RESP:", "ERROR:", "CMD:", "IR:")
+
+
+# ----- IR 센서 스냅샷 프레임 -----
+#
+# "IR:<trigger>:<seq>:<addr>=<mask>,<addr>=<mask>...*<checksum>"
+#   trigger : P(주기), R(get_sensors 요청), B(부팅)
+#   seq     : 스냅샷 일련번호 (펌웨어 재시작 시 1부터)
+#   addr    : MCP23017 I2C 주소 (16진수 2자리), 나열 순서가 chip_idx
+#   mask    : 디바운스된 16핀 상태 (16진수 4자리, 비트 n = 핀 n, 1=HIGH/비활성)
+#   checksum: "IR:" 다음부터 '*' 앞까지 문자 XOR (16진수 2자리)
+# 센서 60개 전체 상태가 약 50바이트 한 줄로 온다 (엣지 이벤트 JSON 하나가 약 200바이트).
+
+SNAPSHOT_PINS = 16
+
+_SNAPSHOT_TRIGGERS = {"P": "periodic", "R": "request", "B": "boot"}
+
+
+def snapshot_checksum(body: str) -> int:
+    """스냅샷 본문 XOR 체크섬"""
+    checksum = 0
+    for char in body.encode("ascii", errors="replace"):
+        checksum ^= char
+    return checksum
+
+
+def format_sensor_snapshot(seq: int, chips: List[Tuple[Any, int]], trigger: str = "P") -> str:
+    """스냅샷 프레임 생성 (펌웨어와 같은 형식, 시뮬레이터/테스트용)
+
+    Args:
+        seq: 일련번호
+        chips: [(addr, mask)] (chip_idx 순서)
+        trigger: "P", "R", "B"
+    """
+    chip_text = ",".join(
+        f"{int(str(addr), 16) if isinstance(addr, str) else addr:02X}={mask & 0xFFFF:04X}"
+        for addr, mask in chips
+    )
+    body = f"{trigger}:{seq}:{chip_text}"
+    return f"IR:{body}*{snapshot_checksum(body):02X}"
+
+
+def parse_sensor_snapshot(raw_message: str) -> Optional[Dict[str, Any]]:
+    """스냅샷 프레임 파싱 (형식이나 체크섬이 틀리면 None)
+
+    Returns:
+        {"seq", "trigger", "chips": [{"chip_idx", "addr", "mask"}]}
+        get_sensors 요청에 대한 응답이면 "response_type": "sensor_snapshot" 포함
+    """
+    body, sep, checksum = raw_message[3:].rpartition("*")
+    if not sep or len(checksum) != 2:
+        return None
+    try:
+        if int(checksum, 16) != snapshot_checksum(body):
+            return None
+        trigger, seq_text, chip_text = body.split(":")
+        chips = []
+        if chip_text:
+            for chip_idx, item in enumerate(chip_text.split(",")):
+                addr, eq, mask = item.partition("=")
+                if not eq:
+                    return None
+                chips.append({"chip_idx": chip_idx, "addr": f"0x{int(addr, 16):02x}", "mask": int(mask, 16)})
+        data: Dict[str, Any] = {
+            "seq": int(seq_text),
+            "trigger": _SNAPSHOT_TRIGGERS.get(trigger, trigger),
+            "chips": chips,
+        }
+    except ValueError:
+        return None
+
+    if trigger == "R":
+        data["response_type"] = "sensor_snapshot"
+    return data
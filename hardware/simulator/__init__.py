@@ -0,0 +1,20 @@
+"""
+ESP32 펌웨어 시뮬레이터
+
+실제 보드 없이 ESP32Manager/ProtocolHandler를 돌려 보기 위한 pty 기반 가상 보드.
+센서 엣지, 바코드/NFC 스캔, 모터 응답(지연 설정 가능), 버스트 트래픽을 v7.5 펌웨어 형식으로 보낸다.
+
+    python -m hardware.simulator --boards 2 --rate 20     # 포트 경로 출력 후 트래픽 생성
+"""
+
+from hardware.simulator.firmware import FirmwareModel, DEFAULT_CHIPS, DEFAULT_MOTOR_DELAY
+from hardware.simulator.board import SimulatedBoard, PtyPort, attach_boards
+
+__all__ = [
+    'FirmwareModel',
+    'SimulatedBoard',
+    'PtyPort',
+    'attach_boards',
+    'DEFAULT_CHIPS',
+    'DEFAULT_MOTOR_DELAY',
+]
@@ -0,0 +1,85 @@
+"""
+가상 ESP32 보드 실행
+
+포트 경로를 출력한 뒤 무작위 센서 엣지/바코드/NFC 트래픽을 보낸다 (Ctrl+C로 종료).
+출력된 /dev/pts/N 경로를 ESP32Manager.add_device()에 넘기면 실제 보드처럼 연결된다
+(자동 스캔의 comports()는 pts 포트를 나열하지 않음).
+
+사용법:
+    python -m hardware.simulator                          # 보드 1개, 초당 엣지 5개
+    python -m hardware.simulator --boards 3 --rate 50     # 보드 3개, 보드마다 초당 50개
+    python -m hardware.simulator --motor-delay 0.2 --barcode-every 10 --burst 500
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from hardware.simulator.board import SimulatedBoard
+from hardware.simulator.firmware import DEFAULT_MOTOR_DELAY, FirmwareModel
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pty 기반 가상 ESP32 보드")
+    parser.add_argument("--boards", type=int, default=1, help="보드 수")
+    parser.add_argument("--rate", type=float, default=5.0, help="보드마다 초당 센서 엣지 수 (0이면 없음)")
+    parser.add_argument("--motor-delay", type=float, default=DEFAULT_MOTOR_DELAY, help="모터 응답 지연 (초)")
+    parser.add_argument("--motor-events", action="store_true", help="motor_completed 이벤트도 보냄 (구형 펌웨어)")
+    parser.add_argument("--snapshot-interval", type=float, default=5.0, help="주기 스냅샷 간격 (초, 0이면 없음)")
+    parser.add_argument("--barcode-every", type=float, default=0.0, help="바코드 스캔 간격 (초, 0이면 없음)")
+    parser.add_argument("--nfc-every", type=float, default=0.0, help="NFC 스캔 간격 (초, 0이면 없음)")
+    parser.add_argument("--burst", type=int, default=0, help="시작 직후 보낼 엣지 버스트 크기")
+    parser.add_argument("--duration", type=float, default=0.0, help="실행 시간 (초, 0이면 Ctrl+C까지)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    boards = [
+        SimulatedBoard(FirmwareModel(motor_delay=args.motor_delay, motor_events=args.motor_events),
+                       snapshot_interval=args.snapshot_interval or None).start()
+        for _ in range(args.boards)
+    ]
+    for index, board in enumerate(boards):
+        print(f"🔌 가상 ESP32 #{index}: {board.port}")
+    sys.stdout.flush()
+
+    for board in boards:
+        if args.burst:
+            board.burst(args.burst)
+
+    started = time.monotonic()
+    next_edge = next_barcode = next_nfc = started
+    tick = min(1 / args.rate, 0.5) if args.rate else 0.5
+    try:
+        while not args.duration or time.monotonic() - started < args.duration:
+            now = time.monotonic()
+            for board in boards:
+                if args.rate and now >= next_edge:
+                    chip_idx = rng.randrange(len(board.firmware.chips))
+                    board.sensor_edge(chip_idx, rng.randrange(16))
+                if args.barcode_every and now >= next_barcode:
+                    board.barcode(f"{rng.randrange(10 ** 10):010d}")
+                if args.nfc_every and now >= next_nfc:
+                    board.nfc(f"{rng.getrandbits(32):08X}")
+            if args.rate and now >= next_edge:
+                next_edge = now + 1 / args.rate
+            if args.barcode_every and now >= next_barcode:
+                next_barcode = now + args.barcode_every
+            if args.nfc_every and now >= next_nfc:
+                next_nfc = now + args.nfc_every
+            time.sleep(tick / 4)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for index, board in enumerate(boards):
+            print(f"📊 #{index}: {board.get_stats()}")
+            board.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+pty에 붙은 가상 ESP32 보드
+
+보드마다 의사 터미널을 하나 만들고 마스터 쪽에서 FirmwareModel로 펌웨어처럼 말한다.
+슬레이브 경로(/dev/pts/N)는 실제 USB 포트처럼 serial.Serial로 열 수 있으므로
+ESP32Manager는 수정 없이 포트 경로만 받아 연결한다.
+
+    board = SimulatedBoard(FirmwareModel(motor_delay=0.2)).start()
+    manager.add_device("esp32_sim_0", board.port, "gym_controller")
+    await manager.connect_all_devices()
+    board.sensor_edge(0, 3, "LOW")
+    board.burst(1000)
+
+- 명령은 받은 순서대로 처리하고 모터 명령은 회전 시간 동안 다음 명령을 처리하지 않음 (펌웨어와 같음)
+- snapshot_interval을 주면 주기 스냅샷(IR:P)을 보냄
+- unplug()는 마스터를 닫아 USB 분리를 흉내 냄 (상대 쪽 읽기가 EOF/EIO)
+"""
+
+import fcntl
+import os
+import select
+import struct
+import termios
+import threading
+import time
+import tty
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from hardware.simulator.firmware import FirmwareModel
+
+try:
+    import serial  # noqa: F401
+    SERIAL_AVAILABLE = True
+except ImportError:
+    SERIAL_AVAILABLE = False
+
+_POLL_INTERVAL = 0.02   # 마스터 읽기 대기 단위 (종료 확인 주기)
+
+
+class SimulatedBoard:
+    """pty 하나에 붙은 가상 ESP32"""
+
+    def __init__(self, firmware: Optional[FirmwareModel] = None, snapshot_interval: Optional[float] = None,
+                 boot: bool = True):
+        """
+        Args:
+            firmware: 펌웨어 모델 (None이면 기본값)
+            snapshot_interval: 주기 스냅샷 간격 (초, None이면 보내지 않음)
+            boot: start() 때 부팅 출력(배너, 상태, 부팅 스냅샷)을 보냄
+        """
+        self.firmware = firmware or FirmwareModel()
+        self.snapshot_interval = snapshot_interval
+        self.boot = boot
+
+        self.master_fd, self._slave_fd = os.openpty()
+        tty.setraw(self._slave_fd)
+        self.port = os.ttyname(self._slave_fd)
+
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._closed = False
+        self.commands = deque(maxlen=1000)   # 최근 받은 명령 줄
+        self.stats = {"lines_sent": 0, "bytes_sent": 0, "commands": 0, "write_errors": 0}
+
+    def __enter__(self) -> "SimulatedBoard":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start(self) -> "SimulatedBoard":
+        """명령 처리 스레드(와 주기 스냅샷 스레드) 시작"""
+        self._spawn(self._serve, "sim-serve")
+        if self.snapshot_interval:
+            self._spawn(self._snapshot_loop, "sim-snapshot")
+        if self.boot:
+            for line in self.firmware.boot_lines():
+                self.send_line(line)
+        return self
+
+    def _spawn(self, target, name: str):
+        thread = threading.Thread(target=target, name=f"{name}-{self.port}", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def send_line(self, line: str) -> float:
+        """한 줄 전송 (println과 같이 CRLF)
+
+        Returns:
+            전송 시각 (time.perf_counter, 지연시간 측정용)
+        """
+        data = (line + "\r\n").encode("utf-8")
+        with self._write_lock:
+            sent_at = time.perf_counter()
+            try:
+                os.write(self.master_fd, data)
+            except OSError:
+                self.stats["write_errors"] += 1
+                return sent_at
+            self.stats["lines_sent"] += 1
+            self.stats["bytes_sent"] += len(data)
+        return sent_at
+
+    # ==================== 트래픽 ====================
+
+    def sensor_edge(self, chip_idx: int, pin: int, state: Optional[str] = None, send: bool = True) -> float:
+        """센서 엣지 (state None이면 현재 상태 반전, send=False면 프레임 유실처럼 상태만 바꿈)"""
+        if state is None:
+            state = "LOW" if self.firmware.pin_state(chip_idx, pin) == "HIGH" else "HIGH"
+        line = self.firmware.sensor_edge(chip_idx, pin, state)
+        return self.send_line(line) if send else time.perf_counter()
+
+    def barcode(self, code: str) -> float:
+        return self.send_line(self.firmware.barcode(code))
+
+    def nfc(self, uid: str) -> float:
+        return self.send_line(self.firmware.nfc(uid))
+
+    def snapshot(self, trigger: str = "P") -> float:
+        return self.send_line(self.firmware.snapshot(trigger))
+
+    def burst(self, count: int, interval: float = 0.0,
+              pins: Optional[Sequence[Tuple[int, int]]] = None) -> List[Tuple[int, int, float]]:
+        """센서 엣지 여러 개를 연달아 전송 (핀을 돌아가며 반전)
+
+        pty 버퍼(수 KB)가 차면 상대가 읽을 때까지 쓰기가 막히므로
+        같은 프로세스의 이벤트 루프에서 읽는다면 다른 스레드에서 호출해야 한다.
+
+        Args:
+            count: 엣지 수
+            interval: 엣지 사이 간격 (초, 0이면 쉬지 않음)
+            pins: 대상 (chip_idx, pin) 목록 (None이면 모든 칩/핀)
+
+        Returns:
+            [(chip_idx, pin, 전송 시각)]
+        """
+        if pins is None:
+            pins = [(chip_idx, pin) for chip_idx in range(len(self.firmware.chips)) for pin in range(16)]
+        sent = []
+        for i in range(count):
+            chip_idx, pin = pins[i % len(pins)]
+            sent.append((chip_idx, pin, self.sensor_edge(chip_idx, pin)))
+            if interval:
+                time.sleep(interval)
+        return sent
+
+    def flap(self, chip_idx: int, pin: int, edges: int, interval: float = 0.005) -> List[float]:
+        """같은 핀을 빠르게 반복 반전 (반쯤 꽂힌 키, 디바운스 확인용)"""
+        return [t for _, _, t in self.burst(edges, interval, [(chip_idx, pin)])]
+
+    # ==================== 명령 처리 ====================
+
+    def _serve(self):
+        buffer = b""
+        while not self._stop.is_set():
+            try:
+                # 닫힌 fd 번호가 재사용될 수 있어 블로킹 read 대신 짧게 대기
+                if not select.select([self.master_fd], [], [], _POLL_INTERVAL)[0]:
+                    continue
+                data = os.read(self.master_fd, 1024)
+            except (OSError, ValueError):
+                return
+            if not data:
+                return
+            buffer += data
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                self._handle(line.decode("utf-8", errors="replace"))
+
+    def _handle(self, line: str):
+        line = line.strip()
+        if not line:
+            return
+        self.commands.append(line)
+        self.stats["commands"] += 1
+        for delay, reply in self.firmware.handle_command(line):
+            # 모터 회전 중에는 다음 명령을 읽지 않음
+            if delay and self._stop.wait(delay):
+                return
+            self.send_line(reply)
+
+    def _snapshot_loop(self):
+        while not self._stop.wait(self.snapshot_interval):
+            self.snapshot("P")
+
+    # ==================== 연결 ====================
+
+    def open_port(self) -> "PtyPort":
+        """pyserial 없이 슬레이브를 여는 포트 (테스트/벤치마크용, 앱은 serial.Serial(board.port))"""
+        return PtyPort(self.port)
+
+    def unplug(self):
+        """USB 분리 흉내: 마스터를 닫아 상대 쪽 읽기가 EOF/EIO가 되게 함"""
+        self._shutdown()
+
+    def close(self):
+        """스레드 종료 후 pty 닫기"""
+        self._shutdown()
+        if self._slave_fd is not None:
+            os.close(self._slave_fd)
+            self._slave_fd = None
+
+    def _shutdown(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._stop.set()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=1.0)
+        os.close(self.master_fd)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "port": self.port, **self.firmware.counters}
+
+
+class PtyPort:
+    """pty 슬레이브를 pyserial Serial 대신 쓰는 최소 포트 (ESP32Manager가 쓰는 메서드만)"""
+
+    def __init__(self, path: str):
+        self.port = path
+        self.fd = os.open(path, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+        tty.setraw(self.fd)
+        self.is_open = True
+
+    def fileno(self) -> int:
+        return self.fd
+
+    @property
+    def in_waiting(self) -> int:
+        return struct.unpack("i", fcntl.ioctl(self.fd, termios.FIONREAD, b"\0\0\0\0"))[0]
+
+    def read(self, size: int = 1) -> bytes:
+        try:
+            return os.read(self.fd, size)
+        except BlockingIOError:
+            return b""
+
+    def write(self, data: bytes) -> int:
+        return os.write(self.fd, data)
+
+    def flush(self):
+        pass
+
+    def reset_input_buffer(self):
+        termios.tcflush(self.fd, termios.TCIFLUSH)
+
+    def reset_output_buffer(self):
+        termios.tcflush(self.fd, termios.TCOFLUSH)
+
+    def close(self):
+        if self.is_open:
+            self.is_open = False
+            os.close(self.fd)
+
+
+async def attach_boards(manager, boards: Iterable[SimulatedBoard], prefix: str = "esp32_sim") -> List[str]:
+    """가상 보드들을 ESP32Manager 디바이스로 추가하고 연결
+
+    pyserial이 있으면 실제 포트처럼 connect_all_devices()로 열고, 없으면 PtyPort를 붙인다.
+
+    Returns:
+        추가한 device_id 목록
+    """
+    added = []
+    for index, board in enumerate(boards):
+        device_id = f"{prefix}_{index}"
+        manager.add_device(device_id, board.port, "gym_controller")
+        if not SERIAL_AVAILABLE:
+            device = manager.devices[device_id]
+            device.serial_connection = board.open_port()
+            device.is_online = True
+        added.append(device_id)
+
+    if SERIAL_AVAILABLE:
+        await manager.connect_all_devices()
+    return added
@@ -0,0 +1,177 @@
+"""
+ESP32 헬스장 컨트롤러 펌웨어 프로토콜 모델 (v7.5 기준)
+
+전송과 무관하게 펌웨어가 시리얼로 내보내는 줄을 만들고, 받은 명령에 대한 응답을 정한다.
+형식은 esp32_gym_controller_v7.5_nfc.ino의 sendMessage/sendStatus/sendSensorSnapshot과 같다.
+
+- 이벤트: sensor_triggered, barcode_scanned, nfc_scanned (message_type "event")
+- 응답: get_status → 상태, get_sensors → IR 스냅샷(R), motor_move → motor_moved,
+  open_locker → locker_opened (모터 회전 시간 후, cmd_id 되돌려 줌)
+- motor_events=True면 구형 펌웨어(esp32_gym_controller_updated.ino)처럼 motor_completed 이벤트도 보냄
+"""
+
+import json
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from hardware.protocol_handler import SNAPSHOT_PINS, format_sensor_snapshot
+
+DEFAULT_DEVICE_ID = "esp32_gym"
+DEFAULT_VERSION = "v7.5"
+DEFAULT_CHIPS = ((0x26, 0xFFFF), (0x25, 0xFFFF), (0x23, 0xFFFF))
+DEFAULT_MOTOR_DELAY = 1.5     # open_locker(0.917회전, 30RPM) 실제 소요 시간과 비슷하게 (초)
+
+Reply = Tuple[float, str]     # (보내기 전 대기 시간, 줄)
+
+
+class FirmwareModel:
+    """펌웨어 출력/명령 처리 모델 (스레드 안전)"""
+
+    def __init__(self, device_id: str = DEFAULT_DEVICE_ID, version: str = DEFAULT_VERSION,
+                 chips: Iterable[Tuple[int, int]] = DEFAULT_CHIPS,
+                 motor_delay: float = DEFAULT_MOTOR_DELAY, motor_events: bool = False):
+        """
+        Args:
+            device_id: 메시지의 device_id (실제 펌웨어는 보드마다 같음)
+            version: 펌웨어 버전 문자열
+            chips: MCP23017 (I2C 주소, 초기 핀 마스크) 목록, 1=HIGH(비어 있음)
+            motor_delay: 모터 명령 응답까지 걸리는 시간 (초)
+            motor_events: 모터 완료 시 motor_completed 이벤트도 보냄
+        """
+        self.device_id = device_id
+        self.version = version
+        self.chips: List[List[int]] = [[addr, mask & 0xFFFF] for addr, mask in chips]
+        self.motor_delay = motor_delay
+        self.motor_events = motor_events
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self.snapshot_seq = 0
+        self.counters = {"scans": 0, "nfc_scans": 0, "motor_moves": 0, "ir_events": 0}
+
+    def _millis(self) -> int:
+        return int((time.monotonic() - self._started) * 1000)
+
+    def message(self, message_type: str, event_type: str, data: Dict[str, Any],
+                cmd_id: Optional[str] = None) -> str:
+        """sendMessage와 같은 JSON 한 줄"""
+        doc = {
+            "device_id": self.device_id,
+            "message_type": message_type,
+            "timestamp": self._millis(),
+            "version": self.version,
+        }
+        if event_type:
+            doc["event_type"] = event_type
+        if cmd_id:
+            doc["cmd_id"] = cmd_id
+        doc["data"] = data
+        return json.dumps(doc, separators=(",", ":"))
+
+    def status(self, cmd_id: Optional[str] = None) -> str:
+        """상태 응답 (sendStatus)"""
+        data = {
+            "status": "ready",
+            "version": self.version,
+            "uptime": self._millis(),
+            "motor_busy": False,
+            "mcp_count": len(self.chips),
+            "nfc_available": True,
+            "total_scans": self.counters["scans"],
+            "total_nfc_scans": self.counters["nfc_scans"],
+            "total_moves": self.counters["motor_moves"],
+        }
+        return self.message("response", "", data, cmd_id)
+
+    def sensor_edge(self, chip_idx: int, pin: int, state: str) -> str:
+        """센서 엣지 이벤트 (핀 상태도 바꿔 다음 스냅샷에 반영)"""
+        if not 0 <= pin < SNAPSHOT_PINS:
+            raise ValueError(f"핀 번호 범위 밖: {pin}")
+        with self._lock:
+            addr, mask = self.chips[chip_idx]
+            self.chips[chip_idx][1] = mask | (1 << pin) if state == "HIGH" else mask & ~(1 << pin)
+            self.counters["ir_events"] += 1
+        return self.message("event", "sensor_triggered", {
+            "chip_idx": chip_idx,
+            "addr": f"0x{addr:x}",
+            "pin": pin,
+            "state": state,
+            "active": state == "LOW",
+        })
+
+    def pin_state(self, chip_idx: int, pin: int) -> str:
+        with self._lock:
+            return "HIGH" if self.chips[chip_idx][1] >> pin & 1 else "LOW"
+
+    def barcode(self, code: str) -> str:
+        with self._lock:
+            self.counters["scans"] += 1
+            count = self.counters["scans"]
+        return self.message("event", "barcode_scanned", {"barcode": code, "scan_count": count})
+
+    def nfc(self, uid: str) -> str:
+        with self._lock:
+            self.counters["nfc_scans"] += 1
+            count = self.counters["nfc_scans"]
+        return self.message("event", "nfc_scanned", {
+            "nfc_uid": uid.upper(),
+            "uid_length": len(uid) // 2,
+            "scan_count": count,
+        })
+
+    def snapshot(self, trigger: str = "P") -> str:
+        """IR 스냅샷 (sendSensorSnapshot)"""
+        with self._lock:
+            self.snapshot_seq += 1
+            return format_sensor_snapshot(self.snapshot_seq, [tuple(chip) for chip in self.chips], trigger)
+
+    def boot_lines(self) -> List[str]:
+        """부팅 시 출력 (배너 + 상태 + 부팅 스냅샷)"""
+        return [
+            "========================================",
+            f"ESP32 헬스장 컨트롤러 {self.version}",
+            "========================================",
+            self.status(),
+            self.snapshot("B"),
+        ]
+
+    def handle_command(self, line: str) -> List[Reply]:
+        """받은 명령 한 줄에 대한 응답 목록 (processCommand)"""
+        line = line.strip()
+        if not line:
+            return []
+        if not line.startswith("{"):
+            return [(0.0, self.status())] if line.lower() == "status" else []
+
+        try:
+            doc = json.loads(line)
+        except ValueError:
+            return []
+        command = doc.get("command", "")
+        cmd_id = doc.get("cmd_id") or None
+
+        if command in ("get_status", "test"):
+            return [(0.0, self.status(cmd_id))]
+        if command == "get_sensors":
+            return [(0.0, self.snapshot("R"))]
+        if command == "motor_move":
+            revs, rpm = doc.get("revs", 0.0), doc.get("rpm", 30)
+            if not revs:
+                return []
+            return self._motor_replies("motor_move", cmd_id,
+                                       self.message("response", "motor_moved", {"revs": revs, "rpm": rpm}, cmd_id))
+        if command == "open_locker":
+            return self._motor_replies("open_locker", cmd_id,
+                                       self.message("response", "locker_opened", {"status": "opened"}, cmd_id))
+        return []
+
+    def _motor_replies(self, action: str, cmd_id: Optional[str], response: str) -> List[Reply]:
+        with self._lock:
+            self.counters["motor_moves"] += 1
+            total = self.counters["motor_moves"]
+        replies = [(self.motor_delay, response)]
+        if self.motor_events:
+            replies.append((0.0, self.message("event", "motor_completed", {
+                "action": action, "status": "completed", "busy": False, "total_moves": total,
+            }, cmd_id)))
+        return replies
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+가상 ESP32 보드 종단 간 처리량/지연시간 벤치마크
+
+pty 가상 보드(hardware.simulator)에 수정 없는 ESP32Manager를 붙이고
+센서 엣지 버스트를 보내 전송 → 핸들러 호출까지의 지연시간(p50/p95/p99)과 초당 이벤트 수,
+명령 왕복 시간(GET_STATUS, OPEN_LOCKER)을 측정한다.
+
+사용법:
+    python scripts/testing/benchmark_esp32_simulator.py                       # 보드 1개, 엣지 5000개
+    python scripts/testing/benchmark_esp32_simulator.py --boards 3 --edges 20000
+    python scripts/testing/benchmark_esp32_simulator.py --interval 0.001 --handler-ms 5
+
+디바운스는 끈 상태(window 0)로 측정한다. 켜면 엣지마다 window만큼 늦게 확정된다.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.esp32_manager import ESP32Manager
+from hardware.simulator import FirmwareModel, SimulatedBoard, attach_boards
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def describe(name, values_ms):
+    print(f"  {name:<14} n={len(values_ms):>6}  p50={percentile(values_ms, 50):8.3f}ms  "
+          f"p95={percentile(values_ms, 95):8.3f}ms  p99={percentile(values_ms, 99):8.3f}ms  "
+          f"max={max(values_ms, default=0):8.3f}ms")
+
+
+async def run(args):
+    # 메시지의 device_id로 보드를 구분하도록 attach_boards가 붙일 id와 같게
+    boards = [SimulatedBoard(FirmwareModel(f"esp32_sim_{index}", motor_delay=args.motor_delay)).start()
+              for index in range(args.boards)]
+    manager = ESP32Manager()
+    manager.sensor_debouncer.configure(default_window_ms=0)
+
+    # 보드/핀별로 보낸 시각을 쌓아 두고 핸들러에서 순서대로 꺼냄 (센서별 순서는 보장됨)
+    sent_at = defaultdict(deque)
+    latencies = []
+    lock = threading.Lock()
+    done = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    expected = args.edges * len(boards)
+
+    def on_sensor(event):
+        received = time.perf_counter()
+        key = (event["device_id"], event["chip_idx"], event["pin"])
+        with lock:
+            queue = sent_at.get(key)
+            if not queue:
+                return
+            latencies.append((received - queue.popleft()) * 1000)
+            if len(latencies) >= expected:
+                loop.call_soon_threadsafe(done.set)
+        if args.handler_ms:
+            time.sleep(args.handler_ms / 1000)
+
+    try:
+        device_ids = await attach_boards(manager, boards)
+        manager.register_event_handler("sensor_triggered", on_sensor)
+        await manager.start_communication()
+        print(f"🔌 가상 보드 {len(boards)}개: {', '.join(board.port for board in boards)}")
+
+        def send(device_id, board):
+            pins = [(chip_idx, pin) for chip_idx in range(len(board.firmware.chips)) for pin in range(16)]
+            for i in range(args.edges):
+                chip_idx, pin = pins[i % len(pins)]
+                with lock:
+                    sent_at[(device_id, chip_idx, pin)].append(time.perf_counter())
+                board.sensor_edge(chip_idx, pin)
+                if args.interval:
+                    time.sleep(args.interval)
+
+        started = time.perf_counter()
+        senders = [asyncio.to_thread(send, device_id, board) for device_id, board in zip(device_ids, boards)]
+        await asyncio.gather(*senders)
+        try:
+            await asyncio.wait_for(done.wait(), timeout=args.timeout)
+        except asyncio.TimeoutError:
+            print(f"⚠️ 시간 초과: {len(latencies)}/{expected}개만 도착")
+        elapsed = time.perf_counter() - started
+
+        rtts = defaultdict(list)
+        for _ in range(args.commands):
+            for command, kwargs in (("GET_STATUS", {}), ("OPEN_LOCKER", {"locker_id": "M01"})):
+                ack = await manager.send_command_and_wait(device_ids[0], command, timeout=args.motor_delay + 2.0,
+                                                          **kwargs)
+                if ack.status == "acked":
+                    rtts[command].append(ack.rtt_ms)
+
+        print(f"\n📈 센서 엣지 {len(latencies)}/{expected}개, {elapsed:.3f}s → {len(latencies) / elapsed:,.0f} 이벤트/s")
+        describe("전송→핸들러", latencies)
+        if latencies:
+            print(f"  평균 {statistics.mean(latencies):.3f}ms")
+        print("\n⏱️ 명령 왕복")
+        for command, values in rtts.items():
+            describe(command, values)
+
+        event_stats = manager.get_event_stats()
+        print(f"\n📊 핸들러 대기열: 제출 {event_stats['submitted']}, 완료 {event_stats['completed']}, "
+              f"버림 {event_stats['dropped']}, 오류 {event_stats['handler_errors']}")
+        for device_id in device_ids:
+            print(f"  {device_id}: {manager.get_device_status(device_id)['stats']}")
+    finally:
+        await manager.stop_communication()
+        for device in manager.devices.values():
+            if device.serial_connection is not None:
+                device.serial_connection.close()
+        for board in boards:
+            board.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가상 ESP32 종단 간 벤치마크")
+    parser.add_argument("--boards", type=int, default=1, help="보드 수")
+    parser.add_argument("--edges", type=int, default=5000, help="보드마다 보낼 센서 엣지 수")
+    parser.add_argument("--interval", type=float, default=0.0, help="엣지 사이 간격 (초, 0이면 최대 속도)")
+    parser.add_argument("--handler-ms", type=float, default=0.0, help="핸들러 한 번당 흉내 낼 작업 시간 (ms)")
+    parser.add_argument("--motor-delay", type=float, default=0.05, help="모터 응답 지연 (초)")
+    parser.add_argument("--commands", type=int, default=20, help="명령 종류마다 왕복 측정 횟수")
+    parser.add_argument("--timeout", type=float, default=30.0, help="모든 엣지 도착 대기 시간 (초)")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
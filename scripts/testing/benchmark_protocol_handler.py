@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+프로토콜 핸들러 파싱 처리량 벤치마크
+
+SerialFramer가 잘라낸 프레임을 ProtocolHandler.parse_message에 넣어 초당 메시지 수를 측정한다.
+메시지 구성은 실제 ESP32 출력과 비슷하게 센서 이벤트 위주로 섞는다.
+
+사용법:
+    python scripts/testing/benchmark_protocol_handler.py                 # 합성 메시지
+    python scripts/testing/benchmark_protocol_handler.py capture.bin ... # 녹화 캡처
+    python scripts/testing/benchmark_protocol_handler.py --min-rate 50000
+
+--min-rate 미만이면 종료 코드 1 (기본 50,000 msgs/s)
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.serial_framer import SerialFramer
+from hardware.protocol_handler import ProtocolHandler
+from scripts.testing.benchmark_serial_framer import synthesize_capture
+
+EXTRA_FRAMES = [
+    "HEARTBEAT",
+    "BARCODE:1234567890",
+    "RESP:CMD_0001:OK",
+    "QR:QRS:MEMBER123:1700000000:nonce:signature",
+    "ERROR:motor jam",
+    "1234567890",
+]
+
+
+def load_frames(capture: bytes):
+    """캡처를 SerialFramer로 프레임 목록으로 변환"""
+    return SerialFramer().feed(capture)
+
+
+def run(name: str, frames, repeat: int) -> float:
+    """최고 기록 기준 초당 메시지 수 반환"""
+    best = None
+    for _ in range(repeat):
+        handler = ProtocolHandler()
+        parse = handler.parse_message
+        started = time.perf_counter()
+        for frame in frames:
+            parse(frame)
+        elapsed = time.perf_counter() - started
+        if best is None or elapsed < best:
+            best, stats = elapsed, handler.stats
+
+    kinds = Counter(message.type.value for message in map(ProtocolHandler().parse_message, frames)
+                    if message is not None)
+    rate = len(frames) / best
+    print(f"\n[{name}] {len(frames):,} 프레임 ({best * 1000:.1f} ms)")
+    print(f"  parse_message: {rate:12,.0f} msgs/s, {best / len(frames) * 1e6:.2f} us/msg")
+    print(f"  parsed={stats['messages_parsed']:,} invalid={stats['invalid_messages']} "
+          f"errors={stats['parse_errors']}")
+    print("  " + ", ".join(f"{kind}={count:,}" for kind, count in kinds.most_common()))
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ProtocolHandler 파싱 처리량 벤치마크")
+    parser.add_argument("captures", nargs="*", help="원시 시리얼 캡처 파일 (없으면 합성 메시지)")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 횟수 (최고 기록 사용)")
+    parser.add_argument("--messages", type=int, default=50000, help="합성 메시지 수")
+    parser.add_argument("--min-rate", type=float, default=50000, help="최소 요구 처리량 (msgs/s)")
+    parser.add_argument("--debug-log", action="store_true", help="DEBUG 로그를 켠 상태로 측정")
+    args = parser.parse_args()
+
+    # 기본은 운영과 같게 INFO 이상만, --debug-log는 포맷 비용까지 포함해 devnull로 출력
+    if args.debug_log:
+        logging.basicConfig(level=logging.DEBUG, stream=open(os.devnull, "w"))
+    else:
+        logging.basicConfig(level=logging.INFO)
+
+    if args.captures:
+        sources = [(Path(path).name, Path(path).read_bytes()) for path in args.captures]
+    else:
+        sources = [("synthetic", synthesize_capture(args.messages))]
+
+    worst = None
+    for name, capture in sources:
+        frames = load_frames(capture)
+        if not args.captures:
+            frames += EXTRA_FRAMES * max(1, len(frames) // 200)
+        rate = run(name, frames, args.repeat)
+        worst = rate if worst is None else min(worst, rate)
+
+    if worst is not None and worst < args.min_rate:
+        print(f"\n처리량 부족: {worst:,.0f} < {args.min_rate:,.0f} msgs/s")
+        sys.exit(1)
+    print(f"\n통과: 최저 {worst:,.0f} msgs/s (기준 {args.min_rate:,.0f})")
+
+
+if __name__ == "__main__":
+    main()
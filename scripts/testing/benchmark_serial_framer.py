@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+시리얼 프레이머 처리량 벤치마크
+
+녹화한 시리얼 캡처(원시 바이트 파일)를 실제 읽기 크기 단위로 잘라 SerialFramer에 넣고
+초당 바이트/프레임 수를 측정한다. 비교용으로 기존 str 버퍼 방식도 함께 측정한다.
+
+사용법:
+    python scripts/testing/benchmark_serial_framer.py                 # 합성 캡처
+    python scripts/testing/benchmark_serial_framer.py capture.bin ... # 녹화 캡처
+    python scripts/testing/benchmark_serial_framer.py --chunk 64 --chunk 4096
+
+읽기 단위는 이벤트 기반 리더가 실제로 받는 청크 크기를 흉내 낸다.
+115200bps에서는 깨어날 때마다 보통 수십 바이트가 들어오고, 루프가 밀렸을 때만 수 KB가 쌓인다.
+
+캡처 만들기 (Pi에서):
+    timeout 60 cat /dev/ttyUSB0 > capture.bin
+또는 앱의 시리얼 캡처(ESP32_CAPTURE_PATH) 파일을 그대로 넘겨도 된다 (디바이스별 수신 바이트만 사용).
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.serial_capture import is_capture_file, read_capture
+from core.serial_framer import SerialFramer
+
+SENSOR_EVENT = ('{"device_id":"esp32_gym","message_type":"event","timestamp":"2025-09-23T0:7:%02dZ",'
+                '"event_type":"sensor_triggered","data":{"chip_idx":%d,"addr":"0x2%d","pin":%d,'
+                '"raw":"%s","active":%s}}')
+BARCODE_EVENT = ('{"device_id":"esp32_gym","message_type":"event","event_type":"barcode_scanned",'
+                 '"data":{"barcode":"%010d","scan_type":"barcode"}}')
+STATUS_LINE = 'STATUS:OK uptime=%d'
+
+
+def synthesize_capture(messages: int = 20000, seed: int = 7) -> bytes:
+    """실제 ESP32 출력과 비슷한 합성 캡처 (줄바꿈 구분 + 줄바꿈 없는 연속 JSON 혼합)"""
+    rng = random.Random(seed)
+    parts = []
+    for i in range(messages):
+        kind = rng.random()
+        if kind < 0.8:
+            active = rng.random() < 0.5
+            msg = SENSOR_EVENT % (i % 60, rng.randrange(4), rng.randrange(3, 8), rng.randrange(16),
+                                  "LOW" if active else "HIGH", "true" if active else "false")
+        elif kind < 0.95:
+            msg = BARCODE_EVENT % rng.randrange(10 ** 10)
+        else:
+            msg = STATUS_LINE % i
+        # 약 30%는 줄바꿈 없이 다음 JSON이 바로 붙어 옴
+        sep = '' if msg.startswith('{') and rng.random() < 0.3 else '\r\n'
+        parts.append(msg + sep)
+    parts.append('\n')
+    return ''.join(parts).encode('utf-8')
+
+
+def legacy_frames(chunks):
+    """기존 ESP32Manager 방식 (str +=, split, 중괄호 재스캔) - 비교용"""
+    buffer = ""
+    count = 0
+    for data in chunks:
+        buffer += data.decode('utf-8', errors='ignore')
+        if len(buffer) > 4096:
+            buffer = buffer[-2048:]
+        while '\n' in buffer:
+            line, buffer = buffer.split('\n', 1)
+            if line.strip():
+                count += 1
+        while buffer.startswith('{'):
+            depth, end = 0, -1
+            for i, char in enumerate(buffer):
+                if char == '{':
+                    depth += 1
+                elif char == '}':
+                    depth -= 1
+                    if depth == 0:
+                        end = i + 1
+                        break
+            if end < 0:
+                break
+            buffer = buffer[end:].lstrip()
+            count += 1
+    return count
+
+
+def load_capture(path: Path):
+    """원시 바이트 파일은 그대로, 앱 캡처 파일은 디바이스별 수신 스트림으로"""
+    if not is_capture_file(path):
+        return [(path.name, path.read_bytes())]
+    streams = {}
+    for record in read_capture(path, rotated=False):
+        if record.direction == "rx":
+            streams.setdefault(record.device_id, bytearray()).extend(record.data)
+    return [(f"{path.name}:{device_id}", bytes(data)) for device_id, data in streams.items()]
+
+
+def split_chunks(capture: bytes, chunk: int):
+    return [capture[i:i + chunk] for i in range(0, len(capture), chunk)]
+
+
+def run(name: str, capture: bytes, chunk: int, repeat: int, compare: bool):
+    chunks = split_chunks(capture, chunk)
+
+    best = None
+    stats = None
+    for _ in range(repeat):
+        framer = SerialFramer()
+        started = time.perf_counter()
+        frames = 0
+        for data in chunks:
+            frames += len(framer.feed(data))
+        elapsed = time.perf_counter() - started
+        if best is None or elapsed < best:
+            best, stats = elapsed, framer.get_stats()
+            stats["frames_out"] = frames
+
+    print(f"\n[{name}] {len(capture):,} bytes, 읽기 단위 {chunk} bytes, {len(chunks):,}회 feed")
+    print(f"  SerialFramer : {len(capture) / best / 1e6:8.2f} MB/s, "
+          f"{stats['frames_out'] / best:12,.0f} frames/s  ({best * 1000:.1f} ms)")
+    print(f"  frames={stats['frames']:,} json={stats['json_frames']:,} "
+          f"garbled={stats['garbled']} dropped={stats['dropped']} decode_errors={stats['decode_errors']}")
+
+    if compare:
+        started = time.perf_counter()
+        legacy_count = legacy_frames(chunks)
+        elapsed = time.perf_counter() - started
+        print(f"  기존 방식     : {len(capture) / elapsed / 1e6:8.2f} MB/s, "
+              f"{legacy_count / elapsed:12,.0f} frames/s  ({elapsed * 1000:.1f} ms, frames={legacy_count:,})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SerialFramer 처리량 벤치마크")
+    parser.add_argument("captures", nargs="*", help="원시 시리얼 캡처 파일 (없으면 합성 캡처)")
+    parser.add_argument("--chunk", type=int, action="append",
+                        help="한 번에 feed할 바이트 수 (여러 번 지정 가능, 기본 16/64/256/4096)")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (최고 기록 사용)")
+    parser.add_argument("--messages", type=int, default=20000, help="합성 캡처 메시지 수")
+    parser.add_argument("--no-compare", action="store_true", help="기존 방식 비교 생략")
+    args = parser.parse_args()
+
+    chunk_sizes = args.chunk or [16, 64, 256, 4096]
+
+    if args.captures:
+        captures = [capture for path in args.captures for capture in load_capture(Path(path))]
+    else:
+        captures = [("synthetic", synthesize_capture(args.messages))]
+
+    for name, capture in captures:
+        for chunk in chunk_sizes:
+            run(name, capture, chunk, args.repeat, not args.no_compare)
+
+
+if __name__ == "__main__":
+    main()
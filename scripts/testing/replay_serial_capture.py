@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+시리얼 캡처 재생
+
+ESP32Manager가 기록한 캡처(ESP32_CAPTURE_PATH)를 새 매니저의 수신 경로
+(프레이머 → ProtocolHandler → 센서 상태/디바운스 → 핸들러 디스패치)에 다시 넣고
+이벤트 타입별 개수, 파싱 실패, 센서 스냅샷 대조로 복구된 엣지 수를 출력한다.
+최대 속도 재생은 실제 현장 트래픽으로 돌리는 파서/파이프라인 처리량 벤치마크다.
+
+사용법:
+    python scripts/testing/replay_serial_capture.py logs/esp32_capture.bin             # 1배속
+    python scripts/testing/replay_serial_capture.py logs/esp32_capture.bin --speed 0   # 최대 속도
+    python scripts/testing/replay_serial_capture.py capture.bin --speed 0 --repeat 5 --no-rotated
+    python scripts/testing/replay_serial_capture.py capture.bin --dump | less          # 레코드 목록
+
+최대 속도에서는 기록 간격이 사라지므로 디바운스를 끈다 (--debounce-ms로 지정 가능).
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.esp32_manager import ESP32Manager
+from core.serial_capture import capture_files, capture_started_at, read_capture, replay_capture
+
+
+def dump(path, rotated):
+    for record in read_capture(path, rotated):
+        arrow = "→" if record.direction == "rx" else "←"
+        print(f"{record.t:12.6f} {record.device_id:<16} {arrow} {record.data!r}")
+
+
+async def replay_once(records, args):
+    manager = ESP32Manager()
+    if args.debounce_ms is not None:
+        manager.sensor_debouncer.configure(default_window_ms=args.debounce_ms)
+    elif args.speed == 0:
+        manager.sensor_debouncer.configure(default_window_ms=0)
+
+    events = Counter()
+    reconciled = Counter()
+
+    def counter(event_type):
+        def handler(event):
+            events[event_type] += 1
+            if event.get("reconciled"):
+                reconciled[event.get("device_id")] += 1
+        return handler
+
+    for event_type in list(manager._event_handlers):
+        manager.register_event_handler(event_type, counter(event_type))
+
+    try:
+        stats = await replay_capture(manager, records, speed=args.speed)
+    finally:
+        await manager.event_dispatcher.close()
+    return manager, stats, events, reconciled
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ESP32 시리얼 캡처 재생")
+    parser.add_argument("capture", help="캡처 파일 경로 (회전본 path.N도 함께 읽음)")
+    parser.add_argument("--speed", type=float, default=1.0, help="재생 배속 (0이면 최대 속도)")
+    parser.add_argument("--repeat", type=int, default=1, help="반복 횟수 (처리량 측정용)")
+    parser.add_argument("--debounce-ms", type=float, default=None, help="디바운스 window (ms)")
+    parser.add_argument("--no-rotated", action="store_true", help="회전본은 읽지 않음")
+    parser.add_argument("--dump", action="store_true", help="재생하지 않고 레코드만 출력")
+    parser.add_argument("-v", "--verbose", action="store_true", help="매니저 로그 출력")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR)
+    rotated = not args.no_rotated
+
+    if args.dump:
+        dump(args.capture, rotated)
+        return
+
+    files = capture_files(args.capture) if rotated else [Path(args.capture)]
+    started_at = capture_started_at(args.capture)
+    loaded = time.perf_counter()
+    records = list(read_capture(args.capture, rotated))
+    load_elapsed = time.perf_counter() - loaded
+    print(f"📼 {len(files)}개 파일, 레코드 {len(records):,}개 (읽기 {load_elapsed * 1000:.1f}ms)")
+    if started_at:
+        print(f"   기록 시작 {datetime.fromtimestamp(started_at).isoformat(timespec='seconds')}")
+
+    for run in range(args.repeat):
+        manager, stats, events, reconciled = asyncio.run(replay_once(records, args))
+        label = "최대 속도" if args.speed == 0 else f"{args.speed}배속"
+        print(f"\n▶ 재생 #{run + 1} ({label}): 수신 {stats['rx_records']:,}회 {stats['rx_bytes']:,} bytes, "
+              f"송신 {stats['tx_records']:,}회, 기록 길이 {stats['span']:.3f}s → 재생 {stats['feed_elapsed']:.3f}s")
+        if stats["feed_elapsed"] > 0:
+            print(f"  처리량 {stats['bytes_per_sec'] / 1e6:.2f} MB/s, {stats['messages_per_sec']:,.0f} 메시지/s")
+        print(f"  이벤트 {dict(events)}")
+        if reconciled:
+            print(f"  스냅샷 대조로 복구된 엣지 {dict(reconciled)}")
+
+        for device_id, device in manager.devices.items():
+            framer = device.framer.get_stats()
+            debounce = manager.sensor_debouncer.get_stats(device_id)
+            print(f"  {device_id}: 메시지 {device.stats['messages_received']:,}, 오류 {device.stats['errors']}, "
+                  f"프레이머 {framer}, 디바운스 억제 {debounce['suppressed']}")
+        dispatch = manager.get_event_stats()
+        if dispatch["dropped"] or dispatch["handler_errors"]:
+            print(f"  ⚠️ 핸들러 대기열 버림 {dispatch['dropped']}, 오류 {dispatch['handler_errors']}")
+
+
+if __name__ == "__main__":
+    main()
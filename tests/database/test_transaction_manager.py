@@ -214,22 +214,26 @@ class TestTransactionManager(unittest.TestCase):
             status = await self.tx_manager.get_transaction_status(tx_id)
             self.assertIsNotNone(status)
             
-            # 데이터베이스에서 직접 확인
+            # 데이터베이스에서 직접 확인 (이벤트당 한 행)
             cursor = self.db_manager.execute_query("""
-                SELECT sensor_events FROM active_transactions 
+                SELECT locker_number FROM transaction_events 
                 WHERE transaction_id = ?
+                ORDER BY ts
             """, (tx_id,))
             
             self.assertIsNotNone(cursor)
-            row = cursor.fetchone()
-            self.assertIsNotNone(row)
-            self.assertIsNotNone(row['sensor_events'])
+            rows = cursor.fetchall()
+            self.assertEqual([row['locker_number'] for row in rows], ['A01', 'A02'])
             
-            import json
-            events = json.loads(row['sensor_events'])
+            events = await self.tx_manager.get_transaction_events(tx_id)
             self.assertEqual(len(events), 2)
             self.assertEqual(events[0]['locker_number'], 'A01')
-            self.assertEqual(events[1]['locker_number'], 'A02')
+            self.assertEqual(events[1]['sensor_data'], sensor_data2)
+            
+            # 메모리에 없어도 DB의 최근 구간으로 검증
+            self.tx_manager._recent_sensor_events.clear()
+            self.assertTrue(self.tx_manager._verify_sensor_events(tx_id, 'A01', 'key_removed'))
+            self.assertFalse(self.tx_manager._verify_sensor_events(tx_id, 'A01', 'key_inserted'))
             
             # 트랜잭션 종료
             await self.tx_manager.end_transaction(tx_id)
@@ -247,19 +251,14 @@ class TestTransactionManager(unittest.TestCase):
             self.assertTrue(result['success'])
             tx_id = result['transaction_id']
             
-            # 수동으로 타임아웃 시간을 과거로 설정
+            # 수동으로 타임아웃 시간을 과거로 설정 (메모리 상태가 원본)
             past_time = datetime.now(timezone.utc) - timedelta(seconds=10)
-            cursor = self.db_manager.execute_query("""
-                UPDATE active_transactions 
-                SET timeout_at = ?
-                WHERE transaction_id = ?
-            """, (past_time.isoformat(), tx_id))
-            
-            self.assertIsNotNone(cursor)
+            self.tx_manager._active_transactions[tx_id]['timeout_at'] = past_time
             
             # 타임아웃 정리 실행
             cleanup_count = await self.tx_manager._cleanup_timeout_transactions()
             self.assertGreaterEqual(cleanup_count, 1)
+            self.assertTrue(self.tx_manager.flush())
             
             # 트랜잭션 상태 확인 (타임아웃 상태여야 함)
             cursor = self.db_manager.execute_query("""
@@ -0,0 +1,247 @@
+"""
+ESP32 송신 명령 큐 테스트
+
+우선순위, 병합/대체/모터 이동 합산, 다른 스레드에서의 추가, 매니저 writer 태스크 동작 확인
+"""
+
+import asyncio
+import json
+import os
+import threading
+import unittest
+from pathlib import Path
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.command_queue import DeviceCommandQueue, PRIORITY_SAFETY
+from core.command_tracker import CommandAck
+from core.esp32_manager import ESP32Manager, ESP32Device
+
+
+class DuplexPipeConnection:
+    """읽기는 파이프 fd, 쓰기는 기록하는 시리얼 연결 대역"""
+
+    def __init__(self, fd: int):
+        self.fd = fd
+        os.set_blocking(fd, False)
+        self.lines = []
+        self.written = asyncio.Event()
+
+    def fileno(self):
+        return self.fd
+
+    def write(self, data: bytes):
+        self.lines.append(json.loads(data.decode('utf-8')))
+        self.written.set()
+
+    def flush(self):
+        pass
+
+
+class TestDeviceCommandQueue(unittest.TestCase):
+    """DeviceCommandQueue 테스트"""
+
+    def test_priority_order(self):
+        """안전 → 문/모터 → 제어 → 상태 조회 순, 같은 우선순위는 들어온 순서"""
+        async def scenario():
+            queue = DeviceCommandQueue("esp32_a")
+            queue.attach()
+            queue.put("GET_STATUS", {}, 1.0)
+            queue.put("SET_AUTO_MODE", {"enabled": True}, 1.0)
+            queue.put("OPEN_LOCKER", {"locker_id": "M01"}, 1.0)
+            queue.put("OPEN_LOCKER", {"locker_id": "M02"}, 1.0)
+            queue.put("reset", {}, 1.0)
+            order = []
+            while queue.depth:
+                item = await queue.get()
+                order.append((item.command, item.kwargs.get("locker_id")))
+            return order, queue.get_stats()
+
+        order, stats = asyncio.run(scenario())
+        self.assertEqual(order, [("reset", None), ("OPEN_LOCKER", "M01"), ("OPEN_LOCKER", "M02"),
+                                 ("SET_AUTO_MODE", None), ("GET_STATUS", None)])
+        self.assertEqual(stats["max_depth"], 5)
+        self.assertEqual(stats["wait"]["count"], 5)
+
+    def test_coalesce_identical(self):
+        """대기 중인 같은 명령은 하나로 병합, 결과는 모두에게 전달"""
+        async def scenario():
+            queue = DeviceCommandQueue("esp32_a")
+            queue.attach()
+            first = queue.put("GET_STATUS", {}, 1.0)
+            second = queue.put("GET_STATUS", {}, 1.0)
+            self.assertEqual(queue.depth, 1)
+            item = await queue.get()
+            item.resolve(CommandAck("CMD_0001", "esp32_a", "GET_STATUS", "acked"))
+            return await first, await second, queue.get_stats()
+
+        first, second, stats = asyncio.run(scenario())
+        self.assertIs(first, second)
+        self.assertEqual(stats["coalesced"], 1)
+
+    def test_open_then_close_cancel_out(self):
+        """보내기 전의 열기 명령에 닫기 요청이 오면 상쇄되어 둘 다 보내지 않음 (상대 이동이므로 대체 금지)"""
+        async def scenario():
+            queue = DeviceCommandQueue("esp32_a")
+            queue.attach()
+            opening = queue.put("MOTOR_MOVE", {"revs": 0.917, "rpm": 30}, 1.0)
+            closing = queue.put("MOTOR_MOVE", {"revs": -0.917, "rpm": 30}, 1.0)
+            return await opening, await closing, queue.depth, queue.get_stats()
+
+        opening, closing, depth, stats = asyncio.run(scenario())
+        self.assertEqual((opening.status, closing.status), ("cancelled", "cancelled"))
+        self.assertFalse(opening.ok)
+        self.assertEqual(depth, 0)
+        self.assertEqual((stats["cancelled"], stats["superseded"], stats["enqueued"]), (1, 0, 1))
+
+    def test_motor_moves_are_summed(self):
+        """대기 중인 모터 이동은 revs를 더해 한 번에 보냄 (같은 값이어도 병합하지 않음)"""
+        async def scenario():
+            queue = DeviceCommandQueue("esp32_a")
+            queue.attach()
+            queue.put("MOTOR_MOVE", {"revs": 0.917, "rpm": 30}, 1.0)
+            queue.put("MOTOR_MOVE", {"revs": 0.917, "rpm": 30}, 1.0)
+            queue.put("MOTOR_MOVE", {"revs": -0.5, "rpm": 60}, 1.0)
+            item = await queue.get()
+            return item, queue.depth, queue.get_stats()
+
+        item, depth, stats = asyncio.run(scenario())
+        self.assertEqual(item.kwargs, {"revs": 1.334, "rpm": 60})
+        self.assertEqual(len(item.waiters), 3)
+        self.assertEqual(depth, 0)
+        self.assertEqual((stats["merged"], stats["coalesced"]), (2, 0))
+
+    def test_open_close_close_leaves_one_close(self):
+        """열기/닫기가 상쇄된 뒤 들어온 닫기는 새로 대기"""
+        async def scenario():
+            queue = DeviceCommandQueue("esp32_a")
+            queue.attach()
+            opening = queue.put("MOTOR_MOVE", {"revs": 0.917, "rpm": 30}, 1.0)
+            queue.put("MOTOR_MOVE", {"revs": -0.917, "rpm": 30}, 1.0)
+            queue.put("MOTOR_MOVE", {"revs": -0.917, "rpm": 30}, 1.0)
+            item = await queue.get()
+            return await opening, item, queue.depth
+
+        opening, item, depth = asyncio.run(scenario())
+        self.assertEqual(opening.status, "cancelled")
+        self.assertEqual(item.kwargs["revs"], -0.917)
+        self.assertEqual(len(item.waiters), 1)
+        self.assertEqual(depth, 0)
+
+    def test_supersede_auto_mode(self):
+        """멱등 명령은 보내기 전에 다른 값이 오면 마지막 요청만 보냄"""
+        async def scenario():
+            queue = DeviceCommandQueue("esp32_a")
+            queue.attach()
+            first = queue.put("SET_AUTO_MODE", {"enabled": True}, 1.0)
+            queue.put("SET_AUTO_MODE", {"enabled": False}, 1.0)
+            item = await queue.get()
+            return await first, item, queue.get_stats()
+
+        first, item, stats = asyncio.run(scenario())
+        self.assertEqual(first.status, "superseded")
+        self.assertEqual(item.kwargs, {"enabled": False})
+        self.assertEqual(stats["superseded"], 1)
+
+    def test_put_from_other_thread(self):
+        """다른 스레드의 루프에서 넣어도 writer가 깨어남"""
+        async def scenario():
+            queue = DeviceCommandQueue("esp32_a")
+            queue.attach()
+            getter = asyncio.create_task(queue.get())
+            await asyncio.sleep(0.01)
+
+            def producer():
+                async def put():
+                    return queue.put("reset", {}, 1.0, priority=PRIORITY_SAFETY)
+                asyncio.run(put())
+
+            thread = threading.Thread(target=producer)
+            thread.start()
+            thread.join()
+            return await asyncio.wait_for(getter, 1.0)
+
+        self.assertEqual(asyncio.run(scenario()).command, "reset")
+
+    def test_close_fails_pending(self):
+        """큐를 닫으면 남은 명령은 failed, 이후 put도 failed"""
+        async def scenario():
+            queue = DeviceCommandQueue("esp32_a")
+            queue.attach()
+            pending = queue.put("GET_STATUS", {}, 1.0)
+            self.assertEqual(queue.close(), 1)
+            late = queue.put("GET_STATUS", {}, 1.0)
+            return await pending, await late
+
+        pending, late = asyncio.run(scenario())
+        self.assertEqual(pending.status, "failed")
+        self.assertEqual(late.error, "queue_closed")
+
+
+class TestManagerWriteLoop(unittest.TestCase):
+    """ESP32Manager writer 태스크 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.read_fd, self.write_fd = os.pipe()
+
+    def tearDown(self):
+        """테스트 정리"""
+        for fd in (self.read_fd, self.write_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def test_motor_first_then_single_status(self):
+        """모터 명령을 먼저 보내고 응답 후 병합된 상태 요청 한 번만 전송"""
+        async def scenario():
+            manager = ESP32Manager()
+            device = ESP32Device("esp32_test", "/dev/null", "gym_controller")
+            connection = DuplexPipeConnection(self.read_fd)
+            device.serial_connection = connection
+            device.is_online = True
+            manager.devices[device.device_id] = device
+            await manager.start_communication()
+
+            status_a = await manager.submit_command("esp32_test", "GET_STATUS")
+            status_b = await manager.submit_command("esp32_test", "GET_STATUS")
+            motor = await manager.submit_command("esp32_test", "MOTOR_MOVE", revs=0.917, rpm=30)
+
+            await asyncio.wait_for(connection.written.wait(), 1.0)
+            connection.written.clear()
+            await asyncio.sleep(0.1)
+            self.assertEqual(len(connection.lines), 1)  # 모터 응답 전까지 다음 명령 보류
+
+            first = connection.lines[0]
+            os.write(self.write_fd, json.dumps({
+                "device_id": "esp32_test", "message_type": "response", "event_type": "motor_moved",
+                "cmd_id": first["cmd_id"], "data": {"revs": 0.917},
+            }).encode() + b"\n")
+            motor_ack = await asyncio.wait_for(motor, 1.0)
+
+            await asyncio.wait_for(connection.written.wait(), 1.0)
+            os.write(self.write_fd, json.dumps({
+                "device_id": "esp32_test", "message_type": "response",
+                "data": {"status": "ready"},
+            }).encode() + b"\n")
+            acks = await asyncio.wait_for(asyncio.gather(status_a, status_b), 1.0)
+
+            status = manager.get_device_status("esp32_test")
+            await manager.stop_communication()
+            return connection.lines, motor_ack, acks, status
+
+        lines, motor_ack, acks, status = asyncio.run(scenario())
+        self.assertEqual([line["command"] for line in lines], ["motor_move", "get_status"])
+        self.assertEqual(motor_ack.status, "acked")
+        self.assertEqual([ack.status for ack in acks], ["acked", "acked"])
+        self.assertEqual(acks[0].cmd_id, acks[1].cmd_id)
+        self.assertEqual(status["command_queue"]["coalesced"], 1)
+        self.assertEqual(status["command_queue"]["dequeued"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,195 @@
+"""
+ESP32 명령/응답 상관관계 테스트
+
+cmd_id/FIFO 매칭, 타임아웃, 다른 스레드 응답, RTT 히스토그램 확인
+"""
+
+import asyncio
+import json
+import threading
+import unittest
+from pathlib import Path
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.command_tracker import CommandTracker, LatencyHistogram
+from core.esp32_manager import ESP32Manager, ESP32Device
+
+
+class RecordingConnection:
+    """write된 줄을 기록하는 시리얼 연결 대역"""
+
+    def __init__(self):
+        self.lines = []
+
+    def write(self, data: bytes):
+        self.lines.append(data.decode('utf-8').strip())
+
+    def flush(self):
+        pass
+
+
+class TestCommandTracker(unittest.TestCase):
+    """CommandTracker 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.tracker = CommandTracker()
+
+    def test_fifo_match_records_rtt(self):
+        """cmd_id 없는 응답은 종류가 맞는 가장 오래된 명령과 매칭"""
+        async def scenario():
+            first_id, first = self.tracker.register("esp32_a", "MOTOR_MOVE")
+            second_id, second = self.tracker.register("esp32_a", "MOTOR_MOVE")
+            self.tracker.complete_sent("esp32_a", first_id, True)
+            self.tracker.complete_sent("esp32_a", second_id, True)
+            self.assertFalse(first.done())
+
+            self.assertTrue(self.tracker.resolve("esp32_a", {"response_type": "motor_moved"}))
+            return await first, second.done()
+
+        ack, second_done = asyncio.run(scenario())
+        self.assertEqual(ack.status, "acked")
+        self.assertTrue(ack.ok)
+        self.assertEqual(ack.cmd_id, "CMD_0001")
+        self.assertFalse(second_done)
+
+        stats = self.tracker.get_device_stats("esp32_a")
+        self.assertEqual(stats["acked"], 1)
+        self.assertEqual(stats["rtt"]["count"], 1)
+
+    def test_cmd_id_match(self):
+        """되돌려 받은 cmd_id가 있으면 순서와 관계없이 그 명령과 매칭"""
+        async def scenario():
+            _, first = self.tracker.register("esp32_a", "OPEN_LOCKER")
+            second_id, second = self.tracker.register("esp32_a", "OPEN_LOCKER")
+            self.tracker.resolve("esp32_a", {"response_type": "locker_opened", "cmd_id": second_id})
+            return first.done(), await second
+
+        first_done, ack = asyncio.run(scenario())
+        self.assertFalse(first_done)
+        self.assertEqual(ack.cmd_id, "CMD_0002")
+
+    def test_late_ack_does_not_resolve_newer_command(self):
+        """타임아웃된 명령의 늦은 응답은 같은 종류의 새 명령을 완료시키지 않음"""
+        async def scenario():
+            first_id, first = self.tracker.register("esp32_a", "OPEN_LOCKER", timeout=0.01)
+            self.assertEqual((await first).status, "timeout")
+            _, second = self.tracker.register("esp32_a", "OPEN_LOCKER")
+            matched = self.tracker.resolve("esp32_a", {"response_type": "locker_opened", "cmd_id": first_id})
+            return matched, second.done()
+
+        matched, second_done = asyncio.run(scenario())
+        self.assertFalse(matched)
+        self.assertFalse(second_done)
+        self.assertEqual(self.tracker.get_device_stats("esp32_a")["unmatched_responses"], 1)
+        self.assertEqual(self.tracker.pending_count("esp32_a"), 1)
+
+    def test_unrelated_response_not_matched(self):
+        """다른 디바이스/종류의 응답은 매칭하지 않음"""
+        async def scenario():
+            self.tracker.register("esp32_a", "OPEN_LOCKER")
+            self.assertFalse(self.tracker.resolve("esp32_b", {"response_type": "locker_opened"}))
+            self.assertFalse(self.tracker.resolve("esp32_a", {"response_type": "status_response"}))
+
+        asyncio.run(scenario())
+        self.assertEqual(self.tracker.get_device_stats("esp32_a")["unmatched_responses"], 1)
+        self.assertEqual(self.tracker.pending_count("esp32_a"), 1)
+
+    def test_timeout(self):
+        """응답이 없으면 timeout으로 완료"""
+        async def scenario():
+            _, future = self.tracker.register("esp32_a", "MOTOR_MOVE", timeout=0.05)
+            return await asyncio.wait_for(future, 1.0)
+
+        ack = asyncio.run(scenario())
+        self.assertEqual(ack.status, "timeout")
+        self.assertFalse(ack.ok)
+        self.assertEqual(self.tracker.get_device_stats("esp32_a")["timeouts"], 1)
+        self.assertEqual(self.tracker.pending_count(), 0)
+
+    def test_no_ack_command_completes_on_send(self):
+        """응답 없는 명령은 전송 결과로 바로 완료"""
+        async def scenario():
+            cmd_id, future = self.tracker.register("esp32_a", "SET_AUTO_MODE")
+            self.tracker.complete_sent("esp32_a", cmd_id, True)
+            return await future
+
+        self.assertEqual(asyncio.run(scenario()).status, "sent")
+
+    def test_resolve_from_other_thread(self):
+        """다른 스레드(다른 루프)에서 온 응답도 Future 소유 루프에서 완료"""
+        async def scenario():
+            _, future = self.tracker.register("esp32_a", "GET_STATUS")
+            thread = threading.Thread(
+                target=self.tracker.resolve, args=("esp32_a", {"response_type": "status_response"}))
+            thread.start()
+            thread.join()
+            return await asyncio.wait_for(future, 1.0)
+
+        self.assertEqual(asyncio.run(scenario()).status, "acked")
+
+    def test_histogram_percentiles(self):
+        """버킷 상한 기준 백분위수"""
+        histogram = LatencyHistogram()
+        for value in [3, 4, 20, 20, 30, 80, 90, 120, 400, 20000]:
+            histogram.record(value)
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot["count"], 10)
+        self.assertEqual(snapshot["p50_ms"], 50.0)
+        self.assertEqual(snapshot["p99_ms"], 20000)
+        self.assertEqual(snapshot["buckets"]["le_5"], 2)
+        self.assertEqual(snapshot["buckets"]["inf"], 1)
+
+
+class TestManagerCommandAck(unittest.TestCase):
+    """ESP32Manager 명령 응답 대기 테스트"""
+
+    def test_send_command_and_wait(self):
+        """보낸 명령에 cmd_id가 붙고, 되돌아온 응답으로 완료"""
+        async def scenario():
+            manager = ESP32Manager()
+            device = ESP32Device("esp32_test", "/dev/null", "gym_controller")
+            device.serial_connection = RecordingConnection()
+            device.is_online = True
+            manager.devices[device.device_id] = device
+
+            task = asyncio.create_task(
+                manager.send_command_and_wait("esp32_test", "MOTOR_MOVE", timeout=1.0, revs=0.917, rpm=30))
+            await asyncio.sleep(0)
+            sent = json.loads(device.serial_connection.lines[0])
+
+            response = json.dumps({
+                "device_id": "esp32_test", "message_type": "response", "event_type": "motor_moved",
+                "cmd_id": sent["cmd_id"], "data": {"revs": 0.917, "rpm": 30},
+            })
+            await manager._process_received_message(device, response)
+            return sent, await task, manager.get_device_status("esp32_test")
+
+        sent, ack, status = asyncio.run(scenario())
+        self.assertEqual(sent["command"], "motor_move")
+        self.assertEqual(ack.cmd_id, sent["cmd_id"])
+        self.assertEqual(ack.status, "acked")
+        self.assertEqual(ack.response["revs"], 0.917)
+        self.assertEqual(status["commands"]["acked"], 1)
+        self.assertEqual(status["commands"]["rtt"]["count"], 1)
+
+    def test_offline_device_fails(self):
+        """오프라인 디바이스 명령은 즉시 failed"""
+        async def scenario():
+            manager = ESP32Manager()
+            sent = await manager.send_command("missing", "MOTOR_MOVE")
+            ack = await manager.send_command_and_wait("missing", "MOTOR_MOVE")
+            return sent, ack
+
+        sent, ack = asyncio.run(scenario())
+        self.assertFalse(sent)
+        self.assertEqual(ack.status, "failed")
+        self.assertEqual(ack.error, "device_offline")
+
+
+if __name__ == '__main__':
+    unittest.main()
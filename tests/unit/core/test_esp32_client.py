@@ -0,0 +1,114 @@
+"""
+ESP32 통신 루프 클라이언트 테스트
+
+다른 스레드에서 소유 루프로 명령을 넘기는 동작 확인
+"""
+
+import asyncio
+import concurrent.futures
+import json
+import os
+import threading
+import unittest
+from pathlib import Path
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.esp32_manager import ESP32Manager, ESP32Device
+
+
+class LoopThreadConnection:
+    """쓰기 스레드를 기록하고 바로 응답을 만들어 주는 시리얼 연결 대역 (읽기는 빈 파이프)"""
+
+    def __init__(self, manager: ESP32Manager, device: ESP32Device, fd: int):
+        self.fd = fd
+        os.set_blocking(fd, False)
+        self.manager = manager
+        self.device = device
+        self.lines = []
+        self.write_threads = set()
+
+    def fileno(self):
+        return self.fd
+
+    def write(self, data: bytes):
+        self.write_threads.add(threading.get_ident())
+        message = json.loads(data.decode('utf-8'))
+        self.lines.append(message)
+        if message["command"] == "motor_move":
+            response = json.dumps({
+                "device_id": self.device.device_id, "message_type": "response",
+                "event_type": "motor_moved", "cmd_id": message["cmd_id"], "data": {"revs": message["revs"]},
+            })
+            asyncio.get_running_loop().create_task(
+                self.manager._process_received_message(self.device, response))
+
+    def flush(self):
+        pass
+
+
+class TestESP32Client(unittest.TestCase):
+    """ESP32Client 테스트"""
+
+    def setUp(self):
+        """ESP32 스레드처럼 루프를 띄우고 통신 시작"""
+        self.manager = ESP32Manager()
+        self.device = ESP32Device("esp32_test", "/dev/null", "gym_controller")
+        self.read_fd, self.write_fd = os.pipe()
+        self.connection = LoopThreadConnection(self.manager, self.device, self.read_fd)
+        self.device.serial_connection = self.connection
+        self.device.is_online = True
+        self.manager.devices[self.device.device_id] = self.device
+
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self.manager.start_communication(), self.loop).result(1.0)
+
+    def tearDown(self):
+        """루프 정리"""
+        asyncio.run_coroutine_threadsafe(self.manager.stop_communication(), self.loop).result(1.0)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(1.0)
+        self.loop.close()
+        os.close(self.read_fd)
+        os.close(self.write_fd)
+
+    def test_send_command_runs_on_owner_loop(self):
+        """요청 스레드에서 보낸 명령이 소유 루프 스레드에서 쓰이고 응답까지 대기"""
+        future = self.manager.client.send_command("esp32_test", "MOTOR_MOVE", timeout=1.0, revs=0.917, rpm=30)
+        self.assertIsInstance(future, concurrent.futures.Future)
+        ack = future.result(2.0)
+        self.assertEqual(ack.status, "acked")
+        self.assertEqual(self.connection.write_threads, {self.thread.ident})
+
+    def test_send_command_sync_and_delay(self):
+        """동기 호출과 지연 전송"""
+        ack = self.manager.client.send_command_sync("esp32_test", "SET_AUTO_MODE", timeout=1.0, enabled=True)
+        self.assertEqual(ack.status, "sent")
+
+        delayed = self.manager.client.send_command("esp32_test", "MOTOR_MOVE", delay=0.1, revs=-0.917, rpm=30)
+        self.assertFalse(delayed.done())
+        self.assertEqual(delayed.result(2.0).status, "acked")
+
+    def test_foreign_loop_call_is_bridged(self):
+        """다른 루프에서 manager.send_command를 불러도 소유 루프에서 실행"""
+        self.assertTrue(asyncio.run(self.manager.send_command("esp32_test", "GET_STATUS")))
+        ack = asyncio.run(self.manager.send_command_and_wait("esp32_test", "MOTOR_MOVE", timeout=1.0, revs=1.0))
+        self.assertEqual(ack.status, "acked")
+        self.assertEqual(self.connection.write_threads, {self.thread.ident})
+
+    def test_unavailable_loop(self):
+        """통신 루프가 없으면 failed로 바로 완료"""
+        manager = ESP32Manager()
+        self.assertFalse(manager.client.is_available)
+        ack = manager.client.send_command("esp32_test", "GET_STATUS").result(0)
+        self.assertEqual(ack.status, "failed")
+        self.assertEqual(ack.error, "esp32_loop_unavailable")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,200 @@
+"""
+ESP32 자동 감지 테스트
+
+포트 후보 선별, device_id 할당(매핑 → 마지막 검증 캐시 → fallback), 동시 검사, 응답 검증 확인
+"""
+
+import asyncio
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.esp32_manager import ESP32Manager, ESP32Device
+
+
+def make_port(device, description="", hwid="", manufacturer=""):
+    """serial.tools.list_ports의 ListPortInfo 대역"""
+    return SimpleNamespace(device=device, description=description, hwid=hwid, manufacturer=manufacturer)
+
+
+class ReplyingConnection:
+    """상태 요청을 받으면 정해진 지연 후 응답 바이트를 돌려주는 시리얼 연결 대역"""
+
+    def __init__(self, reply: bytes, delay: float = 0.0, ignore_first: int = 0):
+        self.reply = reply
+        self.delay = delay
+        self.ignore_first = ignore_first
+        self.writes = []
+        self._ready_at = None
+        self._buffer = b""
+
+    @property
+    def in_waiting(self):
+        if self._ready_at is not None and time.perf_counter() >= self._ready_at:
+            self._buffer += self.reply
+            self._ready_at = None
+        return len(self._buffer)
+
+    def read(self, size):
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def write(self, data):
+        self.writes.append(data)
+        if len(self.writes) > self.ignore_first and self._ready_at is None:
+            self._ready_at = time.perf_counter() + self.delay
+
+    def flush(self):
+        pass
+
+
+class TestPortAssignment(unittest.TestCase):
+    """포트 선별/할당 테스트"""
+
+    def setUp(self):
+        self.manager = ESP32Manager()
+
+    def test_filter_matches_usb_id_keyword_and_known_ports(self):
+        """USB ID/키워드 매칭 포트와 캐시에 있는 포트를 고르고, 캐시 포트를 먼저 둠"""
+        ports = [
+            make_port("/dev/ttyUSB0", "CP2102 USB to UART", "USB VID:PID=10c4:ea60"),
+            make_port("/dev/ttyAMA0", "ttyAMA0", "3f201000.serial"),
+            make_port("/dev/ttyUSB1", "USB Serial", "USB VID:PID=1a86:7523"),
+            make_port("/dev/ttyACM0", "unknown", "USB VID:PID=dead:beef"),
+        ]
+        detected = ESP32Manager._filter_esp32_ports(ports, {"/dev/ttyACM0"})
+        self.assertEqual([p["device"] for p in detected], ["/dev/ttyACM0", "/dev/ttyUSB0", "/dev/ttyUSB1"])
+
+    def test_assign_prefers_mapping_then_last_known_then_fallback(self):
+        """esp32_mapping.json → 마지막 검증 캐시 → fallback 순서로 할당"""
+        detected = [{"device": "/dev/ttyUSB0"}, {"device": "/dev/ttyUSB1"}, {"device": "/dev/ttyUSB2"}]
+        assignments = self.manager._assign_device_ids(
+            detected,
+            port_mapping={"/dev/ttyUSB0": {"device_id": "esp32_male_female", "zones": ["MALE", "FEMALE"]}},
+            fallback_mapping={"auto_0": "esp32_auto_0", "auto_1": "esp32_auto_1", "auto_2": "esp32_auto_2"},
+            last_known={"/dev/ttyUSB1": {"device_id": "esp32_staff"}},
+        )
+        self.assertEqual(
+            [(a["port"], a["device_id"], a["source"]) for a in assignments],
+            [("/dev/ttyUSB0", "esp32_male_female", "mapping"),
+             ("/dev/ttyUSB1", "esp32_staff", "last_known"),
+             ("/dev/ttyUSB2", "esp32_auto_2", "fallback")])
+        self.assertEqual(assignments[0]["zones"], ["MALE", "FEMALE"])
+
+    def test_assign_reuses_registered_device_and_avoids_duplicates(self):
+        """이미 등록된 포트는 기존 id 유지, 같은 id가 두 포트에 할당되지 않음"""
+        self.manager.add_device("esp32_staff", "/dev/ttyUSB3", "gym_controller")
+        detected = [{"device": "/dev/ttyUSB3"}, {"device": "/dev/ttyUSB4"}]
+        assignments = self.manager._assign_device_ids(
+            detected, port_mapping={}, fallback_mapping={},
+            last_known={"/dev/ttyUSB4": {"device_id": "esp32_staff"}})
+        self.assertEqual(assignments[0]["device_id"], "esp32_staff")
+        self.assertEqual(assignments[0]["source"], "registered")
+        self.assertEqual(assignments[1]["device_id"], "esp32_auto_1")
+
+    def test_last_known_ports_roundtrip(self):
+        """검증된 할당 저장 후 다시 로드"""
+        with tempfile.TemporaryDirectory() as tmp:
+            self.manager.last_known_ports_path = Path(tmp) / "instance" / "esp32_ports.json"
+            self.assertEqual(self.manager._load_last_known_ports(), {})
+            self.manager._save_last_known_ports({"/dev/ttyUSB0": {"device_id": "esp32_staff"}})
+            self.assertEqual(self.manager._load_last_known_ports(),
+                             {"/dev/ttyUSB0": {"device_id": "esp32_staff"}})
+
+
+class TestConcurrentProbe(unittest.TestCase):
+    """동시 검사 테스트"""
+
+    def test_probes_run_concurrently_and_report_timings(self):
+        """포트별 검사가 동시에 진행되어 전체 시간이 가장 느린 포트 정도"""
+        manager = ESP32Manager()
+        delays = {"/dev/ttyUSB0": 0.2, "/dev/ttyUSB1": 0.2, "/dev/ttyUSB2": 0.2}
+
+        async def fake_verify(device, timeout=3.0):
+            await asyncio.sleep(delays[device.serial_port])
+            device.verified = device.serial_port != "/dev/ttyUSB2"
+            return device.serial_port != "/dev/ttyUSB2"
+
+        manager._connect_and_verify_esp32 = fake_verify
+        assignments = [
+            {"port": "/dev/ttyUSB0", "device_id": "esp32_staff", "source": "mapping", "zones": []},
+            {"port": "/dev/ttyUSB1", "device_id": "esp32_male_female", "source": "last_known", "zones": []},
+            {"port": "/dev/ttyUSB2", "device_id": "esp32_auto_2", "source": "fallback", "zones": []},
+        ]
+
+        started = time.perf_counter()
+        connected = asyncio.run(manager._probe_ports(assignments))
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(connected, 2)
+        self.assertLess(elapsed, 0.5)
+
+        report = manager.get_discovery_report()
+        self.assertEqual(set(report["ports"]), set(delays))
+        self.assertTrue(report["ports"]["/dev/ttyUSB0"]["verified"])
+        self.assertEqual(report["ports"]["/dev/ttyUSB1"]["source"], "last_known")
+        self.assertGreaterEqual(report["ports"]["/dev/ttyUSB0"]["elapsed_ms"], 150)
+
+        # 실패한 자동 감지 디바이스는 제거
+        self.assertNotIn("esp32_auto_2", manager.devices)
+        self.assertIn("esp32_staff", manager.devices)
+
+
+class TestVerification(unittest.TestCase):
+    """응답 검증 테스트"""
+
+    def _verify(self, connection, timeout=1.0):
+        manager = ESP32Manager()
+        device = ESP32Device("esp32_staff", "/dev/ttyUSB0", "gym_controller")
+
+        async def fake_connect(dev):
+            dev.serial_connection = connection
+            dev.is_online = True
+            return True
+
+        manager._connect_device = fake_connect
+        result = asyncio.run(manager._connect_and_verify_esp32(device, timeout=timeout))
+        return result, device
+
+    def test_first_json_reply_verifies_without_waiting_full_timeout(self):
+        """ESP32 JSON 응답이 오면 타임아웃을 기다리지 않고 바로 검증"""
+        reply = json.dumps({"device_id": "esp32_gym", "message_type": "response",
+                            "event_type": "status_response"}).encode() + b"\n"
+        connection = ReplyingConnection(b"boot noise\r\n" + reply, delay=0.05)
+
+        started = time.perf_counter()
+        result, device = self._verify(connection)
+        self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertTrue(result)
+        self.assertTrue(device.verified)
+        self.assertIsNotNone(device.probe_reply_ms)
+
+    def test_resends_status_request_when_first_is_missed(self):
+        """리셋 중 첫 요청을 놓쳐도 재전송으로 검증"""
+        reply = b'{"device_id":"esp32_gym","message_type":"heartbeat"}\n'
+        connection = ReplyingConnection(reply, ignore_first=1)
+
+        result, device = self._verify(connection, timeout=1.5)
+        self.assertTrue(result)
+        self.assertTrue(device.verified)
+        self.assertEqual(len(connection.writes), 2)
+
+    def test_no_reply_keeps_connection_unverified(self):
+        """응답이 없으면 연결은 유지하되 미검증"""
+        connection = ReplyingConnection(b"garbage without json\n", ignore_first=100)
+
+        result, device = self._verify(connection, timeout=0.2)
+        self.assertTrue(result)
+        self.assertFalse(device.verified)
+
+
+if __name__ == '__main__':
+    unittest.main()
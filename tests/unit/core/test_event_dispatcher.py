@@ -0,0 +1,142 @@
+"""
+ESP32 이벤트 핸들러 디스패처 테스트
+
+lane별 순서 유지, lane 간 동시 실행, 동기 핸들러의 스레드 풀 실행,
+대기열 상한, 읽기 루프가 느린 핸들러를 기다리지 않는지 확인
+"""
+
+import asyncio
+import json
+import threading
+import time
+import unittest
+from pathlib import Path
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.esp32_manager import ESP32Manager, ESP32Device
+from core.event_dispatcher import EventDispatcher
+
+
+class TestEventDispatcher(unittest.TestCase):
+    """EventDispatcher 테스트"""
+
+    def test_lane_order_preserved_with_sync_handler(self):
+        """같은 lane의 이벤트는 들어온 순서대로, 동기 핸들러는 루프 밖 스레드에서"""
+        seen = []
+        threads = set()
+
+        def handler(event_data):
+            time.sleep(0.002 * (5 - event_data["n"]))   # 앞 이벤트가 더 느려도 순서 유지
+            threads.add(threading.current_thread().name)
+            seen.append(event_data["n"])
+
+        async def main():
+            dispatcher = EventDispatcher()
+            for n in range(5):
+                self.assertTrue(dispatcher.submit(("esp32_a", 0, 1), "sensor_triggered", [handler], {"n": n}))
+            self.assertTrue(await dispatcher.drain(2.0))
+            stats = dispatcher.get_stats()
+            await dispatcher.close()
+            return stats
+
+        stats = asyncio.run(main())
+        self.assertEqual(seen, [0, 1, 2, 3, 4])
+        self.assertTrue(all(name.startswith("esp32-handler") for name in threads))
+        self.assertEqual((stats["submitted"], stats["completed"], stats["pending"]), (5, 5, 0))
+        self.assertEqual(stats["handler_runtime"]["sensor_triggered"]["count"], 5)
+        self.assertEqual(stats["queue_lag"]["count"], 5)
+
+    def test_lanes_run_concurrently(self):
+        """느린 lane이 다른 lane을 막지 않음"""
+        finished = []
+
+        async def slow(event_data):
+            await asyncio.sleep(0.2)
+            finished.append("slow")
+
+        async def fast(event_data):
+            finished.append("fast")
+
+        async def main():
+            dispatcher = EventDispatcher()
+            dispatcher.submit(("esp32_a", 0, 1), "sensor_triggered", [slow], {})
+            dispatcher.submit(("esp32_a", "barcode_scanned"), "barcode_scanned", [fast], {})
+            await asyncio.sleep(0.05)
+            self.assertEqual(finished, ["fast"])
+            await dispatcher.close()
+
+        asyncio.run(main())
+        self.assertEqual(finished, ["fast", "slow"])
+
+    def test_bounded_backlog_drops_and_counts(self):
+        """대기 이벤트가 상한을 넘으면 버리고 집계"""
+        async def handler(event_data):
+            await asyncio.sleep(0.01)
+
+        async def main():
+            dispatcher = EventDispatcher(max_pending=3)
+            accepted = [dispatcher.submit(("lane",), "device_status", [handler], {"n": n}) for n in range(5)]
+            await dispatcher.close()
+            return accepted, dispatcher.get_stats()
+
+        accepted, stats = asyncio.run(main())
+        self.assertEqual(accepted, [True, True, True, False, False])
+        self.assertEqual((stats["dropped"], stats["max_pending"]), (2, 3))
+
+    def test_handler_error_does_not_stop_lane(self):
+        """핸들러 오류는 집계만 하고 다음 핸들러/이벤트 계속 실행"""
+        seen = []
+
+        def broken(event_data):
+            raise ValueError("boom")
+
+        async def main():
+            dispatcher = EventDispatcher()
+            for n in range(2):
+                dispatcher.submit(("lane",), "device_status", [broken, lambda e: seen.append(e["n"])], {"n": n})
+            await dispatcher.close()
+            return dispatcher.get_stats()
+
+        stats = asyncio.run(main())
+        self.assertEqual(seen, [0, 1])
+        self.assertEqual(stats["handler_errors"], 2)
+
+
+class TestManagerDispatch(unittest.TestCase):
+    """ESP32Manager 읽기 경로가 핸들러를 기다리지 않는지 확인"""
+
+    def test_slow_handler_does_not_block_message_processing(self):
+        """느린 바코드 핸들러가 있어도 메시지 처리는 바로 반환, 핸들러는 순서대로 실행"""
+        manager = ESP32Manager()
+        device = ESP32Device("esp32_staff", "/dev/null", "gym_controller")
+        manager.devices[device.device_id] = device
+        barcodes = []
+
+        def slow_handler(event_data):
+            time.sleep(0.05)
+            barcodes.append(event_data["barcode"])
+
+        manager.register_event_handler("barcode_scanned", slow_handler)
+
+        async def scenario():
+            started = time.perf_counter()
+            for code in ("A1", "B2", "C3"):
+                frame = json.dumps({"device_id": "esp32_gym", "message_type": "event",
+                                    "event_type": "barcode_scanned", "data": {"barcode": code}})
+                await manager._process_received_message(device, frame)
+            elapsed = time.perf_counter() - started
+            await manager.event_dispatcher.close(timeout=2.0)
+            return elapsed
+
+        elapsed = asyncio.run(scenario())
+        self.assertLess(elapsed, 0.05)
+        self.assertEqual(barcodes, ["A1", "B2", "C3"])
+        self.assertEqual(manager.get_event_stats()["handler_runtime"]["barcode_scanned"]["count"], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,224 @@
+"""
+ESP32 링크 감시/자동 재연결 테스트
+
+백오프 간격, pty로 흉내 낸 보드를 뽑았다 다시 꽂았을 때 읽기 루프 재시작/센서 재동기화,
+응답하던 보드가 조용해졌을 때 재연결 확인
+"""
+
+import asyncio
+import fcntl
+import json
+import os
+import select
+import struct
+import termios
+import threading
+import tty
+import unittest
+from pathlib import Path
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.esp32_manager import ESP32Manager, ESP32Device
+from core.link_supervisor import backoff_delay
+from hardware.protocol_handler import format_sensor_snapshot
+
+
+class PtyBoard:
+    """pty 마스터 쪽 보드: 상태 요청에 응답, get_sensors에는 요청 스냅샷 (silent=True면 무응답)"""
+
+    def __init__(self, silent: bool = False):
+        self.master_fd, self.slave_fd = os.openpty()
+        tty.setraw(self.slave_fd)
+        self.silent = silent
+        self.commands = []
+        self._closed = False
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        buffer = b""
+        while not self._closed:
+            # 닫힌 fd 번호가 다음 pty에 재사용되므로 블로킹 read 대신 짧게 대기
+            if not select.select([self.master_fd], [], [], 0.02)[0]:
+                continue
+            try:
+                data = os.read(self.master_fd, 1024)
+            except OSError:
+                return
+            buffer += data
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                message = json.loads(line)
+                self.commands.append(message.get("command"))
+                if self.silent:
+                    continue
+                if message.get("command") == "get_sensors":
+                    reply = format_sensor_snapshot(1, [(0x26, 0xFFFF)], "R")
+                else:
+                    reply = json.dumps({"device_id": "esp32_gym", "message_type": "response",
+                                        "event_type": "status",
+                                        "data": {"status": "ok", "cmd_id": message.get("cmd_id")}})
+                os.write(self.master_fd, (reply + "\r\n").encode())
+
+    def unplug(self):
+        """USB 분리: 마스터를 닫으면 슬레이브 읽기가 EOF/EIO"""
+        if not self._closed:
+            self._closed = True
+            self._thread.join()
+            os.close(self.master_fd)
+
+
+class PtyPort:
+    """pty 슬레이브를 pyserial 대신 쓰는 포트"""
+
+    def __init__(self, fd: int):
+        self.fd = fd
+        self.is_open = True
+        os.set_blocking(fd, False)
+
+    def fileno(self):
+        return self.fd
+
+    @property
+    def in_waiting(self) -> int:
+        return struct.unpack("i", fcntl.ioctl(self.fd, termios.FIONREAD, b"\0\0\0\0"))[0]
+
+    def read(self, size: int = 1) -> bytes:
+        try:
+            return os.read(self.fd, size)
+        except BlockingIOError:
+            return b""
+
+    def write(self, data: bytes):
+        os.write(self.fd, data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        if self.is_open:
+            self.is_open = False
+            os.close(self.fd)
+
+
+class TestBackoff(unittest.TestCase):
+    """백오프 간격"""
+
+    def test_exponential_with_cap_and_jitter(self):
+        self.assertEqual(backoff_delay(0, 0.5, 30.0, rng=lambda: 0.0), 0.25)
+        self.assertEqual(backoff_delay(0, 0.5, 30.0, rng=lambda: 1.0), 0.5)
+        self.assertEqual(backoff_delay(3, 0.5, 30.0, rng=lambda: 1.0), 4.0)
+        self.assertEqual(backoff_delay(20, 0.5, 30.0, rng=lambda: 1.0), 30.0)
+        self.assertEqual(backoff_delay(20, 0.5, 30.0, rng=lambda: 0.0), 15.0)
+
+
+class TestLinkRecovery(unittest.TestCase):
+    """pty 보드로 끊김 → 재연결 흐름 테스트"""
+
+    def setUp(self):
+        self.boards = []
+        self.replug_failures = 0
+        self.manager = ESP32Manager()
+        supervisor = self.manager.supervisor
+        supervisor.enabled = True
+        supervisor.interval = 0.05
+        supervisor.backoff_base = 0.05
+        self.manager.last_known_ports_path = Path("/nonexistent/esp32_ports.json")
+
+        self.device = ESP32Device("esp32_pty", "/dev/pts/x", "gym_controller")
+        self.manager.devices[self.device.device_id] = self.device
+        self.manager._connect_device = self._plug
+
+    def tearDown(self):
+        for board in self.boards:
+            board.unplug()
+        if self.device.serial_connection is not None:
+            self.device.serial_connection.close()
+
+    async def _plug(self, device):
+        """새 보드를 꽂고 연결 (replug_failures만큼은 포트가 아직 없는 것처럼 실패)"""
+        if self.replug_failures:
+            self.replug_failures -= 1
+            return False
+        board = PtyBoard()
+        self.boards.append(board)
+        device.serial_connection = PtyPort(board.slave_fd)
+        device.framer.reset()
+        device.is_online = True
+        return True
+
+    async def _wait_for(self, predicate, timeout=3.0):
+        deadline = asyncio.get_running_loop().time() + timeout
+        while not predicate():
+            if asyncio.get_running_loop().time() > deadline:
+                self.fail("시간 내에 조건을 만족하지 못함")
+            await asyncio.sleep(0.01)
+
+    def test_unplug_recovers_and_resyncs_sensors(self):
+        """보드가 빠지면 백오프로 다시 연결하고 읽기 루프 재시작, GET_SENSORS로 재동기화"""
+        link = lambda: self.manager.get_device_status("esp32_pty")["link"]
+
+        async def scenario():
+            await self.manager._connect_and_verify_esp32(self.device)
+            await self.manager.start_communication()
+            try:
+                self.replug_failures = 1
+                self.boards[0].unplug()
+                await self._wait_for(lambda: link().get("reconnects") == 1)
+                await self._wait_for(lambda: "get_sensors" in self.boards[-1].commands)
+                return await self.manager.send_command_and_wait("esp32_pty", "GET_STATUS", timeout=2.0)
+            finally:
+                await self.manager.stop_communication()
+
+        ack = asyncio.run(scenario())
+        self.assertEqual(ack.status, "acked")
+        self.assertEqual(len(self.boards), 2)
+
+        stats = self.manager.get_link_stats()["devices"]["esp32_pty"]
+        self.assertEqual((stats["disconnects"], stats["reconnects"], stats["failed_attempts"]), (1, 1, 1))
+        self.assertIn(stats["last_reason"], ("offline", "read_loop_stopped"))
+        self.assertEqual(stats["recovery"]["count"], 1)
+        self.assertLess(stats["last_recovery_ms"], 2000)
+
+    def test_silent_link_is_reconnected(self):
+        """응답하던 보드가 조용해지면 하트비트 후 무응답으로 재연결"""
+        supervisor = self.manager.supervisor
+        supervisor.heartbeat_interval = 0.05
+        supervisor.stale_timeout = 0.3
+
+        async def scenario():
+            await self.manager._connect_and_verify_esp32(self.device)
+            await self.manager.start_communication()
+            try:
+                self.boards[0].silent = True
+                await self._wait_for(lambda: supervisor.get_stats("esp32_pty").get("reconnects", 0) >= 1)
+            finally:
+                await self.manager.stop_communication()
+
+        asyncio.run(scenario())
+        stats = supervisor.get_stats("esp32_pty")
+        self.assertEqual(stats["last_reason"], "no_data")
+        self.assertGreaterEqual(stats["heartbeats"], 1)
+
+    def test_manual_reconnect(self):
+        """수동 재연결 요청은 연결된 디바이스도 다시 엶"""
+        async def scenario():
+            await self.manager._connect_and_verify_esp32(self.device)
+            await self.manager.start_communication()
+            try:
+                started = self.manager.request_reconnect()
+                await self._wait_for(lambda: self.manager.supervisor.get_stats("esp32_pty").get("reconnects") == 1)
+                return started
+            finally:
+                await self.manager.stop_communication()
+
+        self.assertEqual(asyncio.run(scenario()), ["esp32_pty"])
+        self.assertEqual(self.manager.supervisor.get_stats("esp32_pty")["last_reason"], "manual")
+
+
+if __name__ == '__main__':
+    unittest.main()
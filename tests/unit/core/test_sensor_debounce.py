@@ -0,0 +1,158 @@
+"""
+IR 센서 엣지 디바운스 테스트
+
+버스트 병합, 원래 상태로 돌아온 흔들림 억제, 센서별 window, 최대 보류 시간 확인
+"""
+
+import asyncio
+import json
+import unittest
+from pathlib import Path
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.esp32_manager import ESP32Manager, ESP32Device
+from core.sensor_debounce import SensorDebouncer
+
+
+def edge(pin, state, chip_idx=0):
+    return {"chip_idx": chip_idx, "addr": "0x26", "pin": pin, "state": state, "active": state == "LOW"}
+
+
+class TestSensorDebouncer(unittest.TestCase):
+    """SensorDebouncer 테스트"""
+
+    def _run(self, scenario, **kwargs):
+        emitted = []
+
+        async def emit(event_data):
+            emitted.append(event_data)
+
+        async def main():
+            debouncer = SensorDebouncer(emit, **kwargs)
+            await scenario(debouncer)
+            return debouncer
+
+        debouncer = asyncio.run(main())
+        return emitted, debouncer
+
+    def test_burst_collapses_to_single_transition(self):
+        """흔들리다 LOW로 안정되면 LOW 한 번만 전달"""
+        async def scenario(debouncer):
+            for state in ("LOW", "HIGH", "LOW", "HIGH", "LOW"):
+                await debouncer.submit("esp32_a", edge(1, state))
+                await asyncio.sleep(0.005)
+            await asyncio.sleep(0.08)
+
+        emitted, debouncer = self._run(scenario, default_window_ms=30)
+        self.assertEqual([e["state"] for e in emitted], ["LOW"])
+        self.assertEqual(emitted[0]["debounced_edges"], 5)
+
+        stats = debouncer.get_stats("esp32_a")
+        self.assertEqual((stats["edges"], stats["emitted"], stats["suppressed"]), (5, 1, 4))
+        self.assertEqual(stats["sensors"]["0/1"]["stable"], "LOW")
+
+    def test_flap_back_to_stable_state_is_suppressed(self):
+        """마지막으로 넘긴 상태로 돌아오면 아무것도 전달하지 않음"""
+        async def scenario(debouncer):
+            await debouncer.submit("esp32_a", edge(1, "LOW"))
+            await asyncio.sleep(0.06)
+            await debouncer.submit("esp32_a", edge(1, "HIGH"))
+            await debouncer.submit("esp32_a", edge(1, "LOW"))
+            await asyncio.sleep(0.06)
+
+        emitted, debouncer = self._run(scenario, default_window_ms=30)
+        self.assertEqual([e["state"] for e in emitted], ["LOW"])
+        self.assertEqual(debouncer.get_stats()["suppressed"], 2)
+
+    def test_zero_window_passes_through(self):
+        """window 0이면 즉시 전달"""
+        async def scenario(debouncer):
+            await debouncer.submit("esp32_a", edge(1, "LOW"))
+            await debouncer.submit("esp32_a", edge(1, "HIGH"))
+
+        emitted, _ = self._run(scenario, default_window_ms=0)
+        self.assertEqual([e["state"] for e in emitted], ["LOW", "HIGH"])
+
+    def test_per_sensor_window_and_device_keys(self):
+        """센서별 window, 디바이스가 다르면 같은 칩/핀이라도 따로 처리"""
+        def window_for(event_data):
+            return 0 if event_data["pin"] == 2 else None
+
+        async def scenario(debouncer):
+            await debouncer.submit("esp32_a", edge(2, "LOW"))     # 즉시
+            await debouncer.submit("esp32_a", edge(1, "LOW"))     # 기본 window
+            await debouncer.submit("esp32_b", edge(1, "LOW"))
+            self.assertEqual(len(emitted_so_far), 1)
+            await asyncio.sleep(0.08)
+
+        emitted_so_far = []
+
+        async def emit(event_data):
+            emitted_so_far.append(event_data)
+
+        async def main():
+            debouncer = SensorDebouncer(emit, default_window_ms=30, window_for=window_for)
+            await scenario(debouncer)
+            return debouncer
+
+        debouncer = asyncio.run(main())
+        self.assertEqual([e["pin"] for e in emitted_so_far], [2, 1, 1])
+        self.assertEqual(set(debouncer.get_stats()["sensors"]), {"esp32_a/0/2", "esp32_a/0/1", "esp32_b/0/1"})
+
+    def test_max_hold_limits_delay(self):
+        """계속 흔들려도 max_hold가 지나면 현재 상태로 확정"""
+        async def scenario(debouncer):
+            for i in range(12):
+                await debouncer.submit("esp32_a", edge(1, "LOW" if i % 2 == 0 else "HIGH"))
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.06)
+
+        emitted, _ = self._run(scenario, default_window_ms=30, max_hold_ms=50)
+        self.assertGreaterEqual(len(emitted), 1)
+        self.assertLess(emitted[0]["debounced_edges"], 12)
+
+    def test_legacy_raw_field(self):
+        """state 없이 raw만 있는 구형 이벤트도 상태로 사용"""
+        async def scenario(debouncer):
+            await debouncer.submit("esp32_a", {"chip_idx": 0, "pin": 1, "raw": "LOW"})
+            await asyncio.sleep(0.05)
+
+        emitted, _ = self._run(scenario, default_window_ms=10)
+        self.assertEqual(len(emitted), 1)
+
+
+class TestManagerDebounce(unittest.TestCase):
+    """ESP32Manager 디스패치 경로의 디바운스"""
+
+    def test_flapping_key_reaches_handlers_once(self):
+        """반쯤 꽂힌 키의 엣지 버스트가 핸들러를 한 번만 호출"""
+        manager = ESP32Manager()
+        manager.sensor_debouncer.configure(default_window_ms=30)
+        device = ESP32Device("esp32_staff", "/dev/null", "gym_controller")
+        manager.devices[device.device_id] = device
+        events = []
+        manager.register_event_handler("sensor_triggered", events.append)
+
+        async def scenario():
+            for state in ("LOW", "HIGH", "LOW"):
+                frame = json.dumps({"device_id": "esp32_gym", "message_type": "event",
+                                    "event_type": "sensor_triggered", "data": edge(1, state)})
+                await manager._process_received_message(device, frame)
+            await asyncio.sleep(0.08)
+
+        asyncio.run(scenario())
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]["state"], "LOW")
+
+        status = manager.get_device_status("esp32_staff")
+        self.assertEqual(status["debounce"]["suppressed"], 2)
+        # 상태 테이블은 디바운스 전 엣지로 갱신 (스냅샷 대조용)
+        self.assertEqual(status["sensors"]["edges"], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
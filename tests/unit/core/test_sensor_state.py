@@ -0,0 +1,220 @@
+"""
+IR 센서 상태 테이블/스냅샷 대조 테스트
+
+SensorStateTable 단위 동작과, pty로 흉내 낸 펌웨어가 보낸 엣지/스냅샷을
+ESP32Manager가 읽어 놓친 엣지를 복구하는 흐름 확인
+"""
+
+import asyncio
+import json
+import os
+import threading
+import tty
+import unittest
+from pathlib import Path
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.esp32_manager import ESP32Manager, ESP32Device
+from core.sensor_state import SensorStateTable
+from hardware.protocol_handler import format_sensor_snapshot
+
+
+class TestSensorStateTable(unittest.TestCase):
+    """SensorStateTable 테스트"""
+
+    def setUp(self):
+        self.table = SensorStateTable("esp32_test")
+
+    def test_first_snapshot_is_baseline(self):
+        """처음 받은 스냅샷은 기준값으로만 사용 (엣지 없음)"""
+        missed = self.table.reconcile(1, [{"chip_idx": 0, "addr": "0x26", "mask": 0xFFFD}])
+        self.assertEqual(missed, [])
+        self.assertEqual(self.table.get_pin_state(0, 1), "LOW")
+        self.assertEqual(self.table.get_pin_state(0, 0), "HIGH")
+
+    def test_edges_keep_state_in_sync(self):
+        """엣지를 모두 받았으면 스냅샷과 차이 없음"""
+        self.table.reconcile(1, [{"chip_idx": 0, "addr": "0x26", "mask": 0xFFFF}])
+        self.table.apply_edge(0, "0x26", 3, "LOW")
+        missed = self.table.reconcile(2, [{"chip_idx": 0, "addr": "0x26", "mask": 0xFFF7}])
+        self.assertEqual(missed, [])
+        self.assertEqual(self.table.get_stats()["edges"], 1)
+
+    def test_missed_edges_detected(self):
+        """엣지를 놓치면 스냅샷과의 차이로 복구"""
+        self.table.reconcile(1, [{"chip_idx": 0, "addr": "0x26", "mask": 0xFFFF},
+                                 {"chip_idx": 1, "addr": "0x25", "mask": 0xFFFE}])
+        missed = self.table.reconcile(2, [{"chip_idx": 0, "addr": "0x26", "mask": 0xFFDF},
+                                          {"chip_idx": 1, "addr": "0x25", "mask": 0xFFFF}])
+        self.assertEqual(missed, [
+            {"chip_idx": 0, "addr": "0x26", "pin": 5, "state": "LOW", "active": True},
+            {"chip_idx": 1, "addr": "0x25", "pin": 0, "state": "HIGH", "active": False},
+        ])
+        self.assertEqual(self.table.get_stats()["missed_edges"], 2)
+
+    def test_edge_before_first_snapshot_is_compared(self):
+        """스냅샷 전에 본 핀은 대조 대상, 보지 못한 핀은 기준값"""
+        self.table.apply_edge(0, "0x26", 2, "LOW")
+        missed = self.table.reconcile(1, [{"chip_idx": 0, "addr": "0x26", "mask": 0xFF04}])
+        self.assertEqual([edge["pin"] for edge in missed], [2])
+
+    def test_sequence_gaps_and_restarts(self):
+        """빠진 스냅샷 수와 펌웨어 재시작 집계"""
+        chips = [{"chip_idx": 0, "addr": "0x26", "mask": 0xFFFF}]
+        for seq in (1, 2, 5, 1):
+            self.table.reconcile(seq, chips)
+        stats = self.table.get_stats()
+        self.assertEqual(stats["missed_snapshots"], 2)
+        self.assertEqual(stats["firmware_restarts"], 1)
+        self.assertEqual(stats["last_seq"], 1)
+
+    def test_invalid_edge_ignored(self):
+        """잘못된 칩/핀 번호는 무시"""
+        self.assertFalse(self.table.apply_edge(None, "0x26", 1, "LOW"))
+        self.assertFalse(self.table.apply_edge(0, "0x26", 16, "LOW"))
+
+
+class PtyFirmware:
+    """pty 마스터 쪽에서 펌웨어 출력을 흉내 냄 (get_sensors 요청에는 스냅샷으로 응답)"""
+
+    def __init__(self, chips):
+        self.master_fd, self.slave_fd = os.openpty()
+        tty.setraw(self.slave_fd)
+        self.chips = [list(chip) for chip in chips]   # [addr, mask]
+        self.seq = 0
+        self._stop = False
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _write(self, line: str):
+        os.write(self.master_fd, (line + "\r\n").encode())
+
+    def edge(self, chip_idx: int, pin: int, state: str, send: bool = True):
+        """핀 상태 변경 (send=False면 엣지 프레임이 사라진 것처럼 상태만 바꿈)"""
+        addr, mask = self.chips[chip_idx]
+        self.chips[chip_idx][1] = mask | (1 << pin) if state == "HIGH" else mask & ~(1 << pin)
+        if send:
+            self._write(json.dumps({
+                "device_id": "esp32_gym", "message_type": "event", "event_type": "sensor_triggered",
+                "data": {"chip_idx": chip_idx, "addr": f"0x{addr:x}", "pin": pin,
+                         "state": state, "active": state == "LOW"},
+            }))
+
+    def snapshot(self, trigger: str = "P"):
+        self.seq += 1
+        self._write(format_sensor_snapshot(self.seq, [tuple(chip) for chip in self.chips], trigger))
+
+    def _serve(self):
+        buffer = b""
+        while not self._stop:
+            try:
+                data = os.read(self.master_fd, 1024)
+            except OSError:
+                return
+            buffer += data
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                if json.loads(line).get("command") == "get_sensors":
+                    self.snapshot("R")
+
+    def close(self):
+        self._stop = True
+        os.close(self.slave_fd)
+        os.close(self.master_fd)
+
+
+class PtyConnection:
+    """pty 슬레이브를 pyserial 대신 쓰는 연결"""
+
+    def __init__(self, fd: int):
+        self.fd = fd
+        os.set_blocking(fd, False)
+
+    def fileno(self):
+        return self.fd
+
+    def write(self, data: bytes):
+        os.write(self.fd, data)
+
+    def flush(self):
+        pass
+
+
+class TestSnapshotOverPty(unittest.TestCase):
+    """pty 펌웨어 시뮬레이터로 스냅샷 대조 흐름 테스트"""
+
+    def setUp(self):
+        self.firmware = PtyFirmware([(0x26, 0xFFFF), (0x23, 0xFFFF)])
+        self.manager = ESP32Manager()
+        self.device = ESP32Device("esp32_pty", "/dev/pts/x", "gym_controller")
+        self.device.serial_connection = PtyConnection(self.firmware.slave_fd)
+        self.device.is_online = True
+        self.manager.devices[self.device.device_id] = self.device
+
+        self.edges = []
+        self.snapshots = []
+        self.manager.register_event_handler("sensor_triggered", self.edges.append)
+        self.manager.register_event_handler("sensor_snapshot", self.snapshots.append)
+
+    def tearDown(self):
+        self.firmware.close()
+
+    async def _wait_for(self, predicate, timeout=2.0):
+        deadline = asyncio.get_running_loop().time() + timeout
+        while not predicate():
+            if asyncio.get_running_loop().time() > deadline:
+                self.fail("시간 내에 이벤트를 받지 못함")
+            await asyncio.sleep(0.01)
+
+    def test_missed_edge_recovered_from_periodic_snapshot(self):
+        """엣지 프레임이 사라져도 다음 주기 스냅샷에서 reconciled 엣지로 복구"""
+        async def scenario():
+            await self.manager.start_communication()
+            try:
+                self.firmware.snapshot("B")
+                await self._wait_for(lambda: len(self.snapshots) == 1)
+
+                self.firmware.edge(0, 1, "LOW")                 # 정상 수신
+                self.firmware.edge(1, 4, "LOW", send=False)     # 프레임 유실
+                self.firmware.snapshot("P")
+                await self._wait_for(lambda: len(self.snapshots) == 2)
+                await self._wait_for(lambda: len(self.edges) == 2)     # 디바운스 window 후 전달
+            finally:
+                await self.manager.stop_communication()
+
+        asyncio.run(scenario())
+
+        self.assertEqual(len(self.edges), 2)
+        self.assertNotIn("reconciled", self.edges[0])
+        recovered = self.edges[1]
+        self.assertTrue(recovered["reconciled"])
+        self.assertEqual((recovered["chip_idx"], recovered["addr"], recovered["pin"], recovered["state"]),
+                         (1, "0x23", 4, "LOW"))
+        self.assertEqual(recovered["snapshot_seq"], 2)
+        self.assertEqual(self.snapshots[1]["trigger"], "periodic")
+
+        stats = self.manager.get_device_status("esp32_pty")["sensors"]
+        self.assertEqual(stats["missed_edges"], 1)
+        self.assertEqual(stats["snapshots"], 2)
+
+    def test_snapshot_on_demand(self):
+        """GET_SENSORS 명령은 요청 스냅샷으로 완료"""
+        async def scenario():
+            await self.manager.start_communication()
+            try:
+                return await self.manager.send_command_and_wait("esp32_pty", "GET_SENSORS", timeout=2.0)
+            finally:
+                await self.manager.stop_communication()
+
+        ack = asyncio.run(scenario())
+        self.assertEqual(ack.status, "acked")
+        self.assertEqual(ack.response["trigger"], "request")
+        self.assertEqual([chip["addr"] for chip in ack.response["chips"]], ["0x26", "0x23"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+"""
+시리얼 캡처 기록/재생 테스트
+
+레코드 왕복, 파일 회전, 잘린 끝 레코드 허용,
+가상 보드와 주고받은 바이트 기록 → 새 매니저로 재생했을 때 같은 이벤트가 나오는지 확인
+"""
+
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.esp32_manager import ESP32Manager
+from core.serial_capture import (
+    SerialCapture, CaptureRecord, capture_files, capture_started_at, read_capture, replay_capture, DIRECTION_RX, DIRECTION_TX
+)
+from hardware.simulator import FirmwareModel, SimulatedBoard, attach_boards
+
+
+class TestSerialCaptureFile(unittest.TestCase):
+    """캡처 파일 형식/회전"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "capture.bin"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_roundtrip_keeps_order_direction_and_bytes(self):
+        capture = SerialCapture(self.path)
+        capture.record("esp32_gym", DIRECTION_TX, b'{"command":"get_status"}\n')
+        capture.record("esp32_gym", DIRECTION_RX, b'{"device_id":"esp32_gym",')
+        capture.record("esp32_motor", DIRECTION_RX, b'\xff\xfe garbage')
+        capture.close()
+
+        records = list(read_capture(self.path))
+        self.assertEqual([(r.device_id, r.direction, r.data) for r in records], [
+            ("esp32_gym", "tx", b'{"command":"get_status"}\n'),
+            ("esp32_gym", "rx", b'{"device_id":"esp32_gym",'),
+            ("esp32_motor", "rx", b'\xff\xfe garbage'),
+        ])
+        self.assertEqual([r.t for r in records], sorted(r.t for r in records))
+        self.assertAlmostEqual(capture_started_at(self.path), capture.started_at)
+        self.assertEqual(capture.get_stats()["rx_bytes"], 35)
+
+    def test_rotation_keeps_backups_and_reads_oldest_first(self):
+        capture = SerialCapture(self.path, max_bytes=200, backups=2)
+        for i in range(30):
+            capture.record("esp32_gym", DIRECTION_RX, b"%03d" % i + b"x" * 40)
+        capture.close()
+
+        files = capture_files(self.path)
+        self.assertEqual([f.name for f in files], ["capture.bin.2", "capture.bin.1", "capture.bin"])
+        self.assertTrue(all(f.stat().st_size <= 200 for f in files))
+        self.assertGreater(capture.stats["rotations"], 2)
+
+        numbers = [int(r.data[:3]) for r in read_capture(self.path)]
+        self.assertEqual(numbers, list(range(numbers[0], 30)))
+        self.assertEqual(len(numbers), 6)   # 파일마다 레코드 2개 x 3개 파일
+        self.assertEqual(len(list(read_capture(self.path, rotated=False))), 2)
+
+    def test_truncated_tail_is_ignored(self):
+        capture = SerialCapture(self.path)
+        capture.record("esp32_gym", DIRECTION_RX, b"first")
+        capture.record("esp32_gym", DIRECTION_RX, b"second record")
+        capture.close()
+        self.path.write_bytes(self.path.read_bytes()[:-4])
+
+        with self.assertLogs("core.serial_capture", "WARNING"):
+            self.assertEqual([r.data for r in read_capture(self.path)], [b"first"])
+
+    def test_non_capture_file_is_rejected(self):
+        self.path.write_bytes(b'{"device_id":"esp32_gym"}\n')
+        with self.assertRaises(ValueError):
+            list(read_capture(self.path))
+
+
+class TestCaptureReplay(unittest.TestCase):
+    """가상 보드 트래픽 기록 후 재생"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "capture.bin"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _manager(self, events):
+        manager = ESP32Manager()
+        manager.sensor_debouncer.configure(default_window_ms=0)
+        for event_type in ("sensor_triggered", "barcode_scanned", "sensor_snapshot"):
+            manager.register_event_handler(event_type, lambda event, t=event_type: events.append((t, event)))
+        return manager
+
+    def _record_session(self):
+        """가상 보드에 붙은 매니저로 명령/엣지/스캔을 주고받으며 기록"""
+        live_events = []
+        manager = self._manager(live_events)
+        board = SimulatedBoard(FirmwareModel(motor_delay=0.01)).start()
+
+        async def scenario():
+            await attach_boards(manager, [board])
+            self.assertTrue(manager.start_capture(self.path))
+            await manager.start_communication()
+            try:
+                await manager.send_command_and_wait("esp32_sim_0", "GET_STATUS", timeout=2.0)
+                await asyncio.to_thread(board.burst, 60)
+                board.sensor_edge(2, 7, "HIGH", send=False)   # 유실된 엣지 (버스트에서 LOW가 된 핀)
+                board.barcode("1234567890")
+                await manager.send_command_and_wait("esp32_sim_0", "GET_SENSORS", timeout=2.0)
+                while len([e for e in live_events if e[0] == "sensor_triggered"]) < 61:
+                    await asyncio.sleep(0.01)
+            finally:
+                await manager.stop_communication()
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            for device in manager.devices.values():
+                device.serial_connection.close()
+            board.close()
+        return live_events
+
+    def _replay(self, speed):
+        events = []
+        manager = self._manager(events)
+
+        async def scenario():
+            try:
+                return await replay_capture(manager, read_capture(self.path), speed=speed)
+            finally:
+                await manager.event_dispatcher.close()
+
+        return asyncio.run(scenario()), events, manager
+
+    def test_capture_records_both_directions(self):
+        self._record_session()
+        records = list(read_capture(self.path))
+        sent = b"".join(r.data for r in records if r.direction == "tx")
+        received = b"".join(r.data for r in records if r.direction == "rx")
+        self.assertIn(b'"get_status"', sent)
+        self.assertIn(b'"get_sensors"', sent)
+        self.assertIn(b"sensor_triggered", received)
+        self.assertIn(b"IR:R", received)
+
+    def test_replay_reproduces_live_events(self):
+        """최대 속도 재생도 같은 입력이므로 같은 이벤트 (스냅샷 대조 복구 포함)"""
+        live = self._record_session()
+        stats, replayed, manager = self._replay(speed=0)
+
+        def summary(events):
+            return [(t, e.get("chip_idx"), e.get("pin"), e.get("active"), bool(e.get("reconciled")))
+                    for t, e in events if t != "sensor_snapshot"]
+
+        self.assertEqual(sorted(summary(replayed)), sorted(summary(live)))
+        self.assertIn(("sensor_triggered", 2, 7, False, True), summary(replayed))
+        self.assertEqual(stats["tx_records"], 2)
+        self.assertEqual(stats["errors"], 0)
+        self.assertEqual(list(manager.devices), ["esp32_sim_0"])
+        self.assertGreater(stats["messages_per_sec"], 0)
+
+    def test_realtime_replay_follows_recorded_gaps(self):
+        """1배속 재생은 기록된 간격만큼 기다림"""
+        capture = SerialCapture(self.path)
+        capture.record("esp32_gym", DIRECTION_RX, b'{"device_id":"esp32_gym","message_type":"event"}\n')
+        capture.close()
+        records = list(read_capture(self.path))
+        records.append(CaptureRecord(records[0].t + 0.2, DIRECTION_RX, "esp32_gym", records[0].data))
+        manager = self._manager([])
+
+        stats = asyncio.run(replay_capture(manager, records, speed=1.0))
+        self.assertGreaterEqual(stats["feed_elapsed"], 0.19)
+        self.assertEqual(stats["rx_records"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+시리얼 프레이머 테스트
+
+줄바꿈 구분/연속 JSON/조각난 입력/깨진 프레임 처리 확인
+"""
+
+import json
+import unittest
+from pathlib import Path
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.serial_framer import SerialFramer
+
+EVENT = '{"device_id":"esp32_gym","event_type":"sensor_triggered","data":{"addr":"0x26","pin":%d}}'
+
+
+class TestSerialFramer(unittest.TestCase):
+    """SerialFramer 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.framer = SerialFramer(max_frame=512)
+
+    def test_newline_delimited(self):
+        """줄바꿈 구분 텍스트/JSON 프레임"""
+        frames = self.framer.feed(b'BARCODE:12345\r\n' + (EVENT % 1).encode() + b'\n')
+        self.assertEqual(frames, ['BARCODE:12345', EVENT % 1])
+        self.assertEqual(self.framer.pending, 0)
+
+    def test_concatenated_json(self):
+        """줄바꿈 없이 붙어 오는 JSON 객체 분리"""
+        data = ''.join(EVENT % i for i in range(3)).encode()
+        frames = self.framer.feed(data)
+        self.assertEqual([json.loads(f)["data"]["pin"] for f in frames], [0, 1, 2])
+        self.assertEqual(self.framer.get_stats()["json_frames"], 3)
+
+    def test_byte_by_byte(self):
+        """한 바이트씩 들어와도 같은 결과"""
+        data = ((EVENT % 7) + (EVENT % 8) + '\nSTATUS:OK\n').encode()
+        frames = []
+        for i in range(len(data)):
+            frames.extend(self.framer.feed(data[i:i + 1]))
+        self.assertEqual(frames, [EVENT % 7, EVENT % 8, 'STATUS:OK'])
+
+    def test_braces_inside_strings(self):
+        """문자열 안의 중괄호/이스케이프 따옴표는 무시"""
+        frame = '{"msg":"a}b{c\\"}","n":1}'
+        self.assertEqual(self.framer.feed(frame.encode() + b'{"n":2}'), [frame, '{"n":2}'])
+
+    def test_garbled_json_counted(self):
+        """JSON 도중 줄바꿈이면 버리고 다음 프레임부터 복구"""
+        frames = self.framer.feed(b'{"device_id":"esp\n' + (EVENT % 3).encode() + b'\n')
+        self.assertEqual(frames, [EVENT % 3])
+        self.assertEqual(self.framer.get_stats()["garbled"], 1)
+
+    def test_oversized_frame_dropped(self):
+        """max_frame을 넘는 미완성 프레임은 다음 줄바꿈까지 버림"""
+        self.assertEqual(self.framer.feed(b'{"blob":"' + b'x' * 600), [])
+        self.assertEqual(self.framer.feed(b'y' * 100 + b'"}\nSTATUS:OK\n'), ['STATUS:OK'])
+        stats = self.framer.get_stats()
+        self.assertEqual(stats["dropped"], 1)
+        self.assertEqual(stats["pending_bytes"], 0)
+
+    def test_fragmented_long_frame(self):
+        """긴 프레임이 작은 조각으로 나뉘어 들어와도 한 프레임으로 복원"""
+        payload = '{"data":"' + 'z' * 400 + '"}'
+        frames = []
+        for i in range(0, len(payload), 3):
+            frames.extend(self.framer.feed(payload[i:i + 3].encode()))
+        self.assertEqual(frames, [payload])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+이벤트 기반 시리얼 리더 테스트
+
+파이프 fd로 시리얼 포트를 대신해 add_reader/스레드 모드 동작 확인
+"""
+
+import asyncio
+import os
+import unittest
+from pathlib import Path
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.serial_reader import SerialReader
+from core.esp32_manager import ESP32Manager, ESP32Device
+
+SENSOR_LINE = (b'{"device_id":"esp32_gym","message_type":"event","event_type":"sensor_triggered",'
+               b'"data":{"chip_idx":0,"addr":"0x26","pin":1,"raw":"LOW","active":true}}\n')
+
+
+class PipeConnection:
+    """파이프 읽기 끝을 시리얼 연결처럼 노출 (fileno 지원)"""
+
+    def __init__(self, fd: int):
+        self.fd = fd
+        os.set_blocking(fd, False)
+
+    def fileno(self):
+        return self.fd
+
+
+class BlockingPipeConnection:
+    """fileno 없이 블로킹 read만 제공하는 연결 (스레드 모드)"""
+
+    def __init__(self, fd: int):
+        self.fd = fd
+        self.timeout = 0.1
+        self.in_waiting = 0
+
+    def read(self, size: int = 1) -> bytes:
+        data = os.read(self.fd, size)
+        if not data:
+            # pyserial처럼 포트가 사라지면 예외
+            raise OSError("device disconnected")
+        return data
+
+
+class TestSerialReader(unittest.TestCase):
+    """SerialReader 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.read_fd, self.write_fd = os.pipe()
+
+    def tearDown(self):
+        """테스트 정리"""
+        for fd in (self.read_fd, self.write_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def test_add_reader_wakes_only_on_data(self):
+        """데이터가 없으면 깨어나지 않고, 도착하면 바로 전달"""
+        async def scenario():
+            reader = SerialReader(PipeConnection(self.read_fd), "test")
+            reader.start()
+            self.assertEqual(reader.mode, "add_reader")
+
+            await asyncio.sleep(0.1)
+            self.assertEqual(reader.get_stats()["wakeups"], 0)
+
+            os.write(self.write_fd, b"hello\n")
+            data = await asyncio.wait_for(reader.read(), 1.0)
+            self.assertEqual(data, b"hello\n")
+
+            # 쓰기 끝을 닫으면 EOF → b""
+            os.close(self.write_fd)
+            self.assertEqual(await asyncio.wait_for(reader.read(), 1.0), b"")
+
+            reader.close()
+            return reader.get_stats()
+
+        stats = asyncio.run(scenario())
+        self.assertEqual(stats["chunks"], 1)
+        self.assertEqual(stats["bytes"], 6)
+        self.assertLessEqual(stats["wakeups"], 3)
+        self.assertGreaterEqual(stats["latency_ms_max"], 0.0)
+
+    def test_thread_mode(self):
+        """fileno가 없으면 전용 스레드가 블로킹 읽기"""
+        async def scenario():
+            reader = SerialReader(BlockingPipeConnection(self.read_fd), "test")
+            reader.start()
+            self.assertEqual(reader.mode, "thread")
+
+            os.write(self.write_fd, b"x")
+            data = await asyncio.wait_for(reader.read(), 1.0)
+
+            os.close(self.write_fd)
+            eof = await asyncio.wait_for(reader.read(), 1.0)
+            reader.close()
+            return data, eof
+
+        data, eof = asyncio.run(scenario())
+        self.assertEqual(data, b"x")
+        self.assertEqual(eof, b"")
+
+    def test_manager_read_loop_dispatches_events(self):
+        """ESP32Manager 읽기 루프가 도착한 센서 이벤트를 디스패치"""
+        async def scenario():
+            manager = ESP32Manager()
+            device = ESP32Device("esp32_test", "/dev/null", "gym_controller")
+            device.serial_connection = PipeConnection(self.read_fd)
+            device.is_online = True
+            manager.devices[device.device_id] = device
+
+            received = asyncio.Event()
+            events = []
+
+            async def on_sensor(event_data):
+                events.append(event_data)
+                received.set()
+
+            manager.register_event_handler("sensor_triggered", on_sensor)
+            await manager.start_communication()
+
+            os.write(self.write_fd, SENSOR_LINE)
+            await asyncio.wait_for(received.wait(), 1.0)
+
+            status = manager.get_device_status(device.device_id)
+            await manager.stop_communication()
+            return events, status
+
+        events, status = asyncio.run(scenario())
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]["pin"], 1)
+        self.assertEqual(status["reader"]["mode"], "add_reader")
+        self.assertEqual(status["reader"]["chunks"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
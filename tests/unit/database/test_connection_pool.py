@@ -0,0 +1,254 @@
+"""
+커넥션 풀 테스트
+"""
+
+import unittest
+import tempfile
+import os
+import sqlite3
+import threading
+from pathlib import Path
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from database.connection_pool import ConnectionPool, get_connection_pool
+from database.database_manager import DatabaseManager
+from database.write_queue import get_write_queue
+
+
+class TestConnectionPool(unittest.TestCase):
+    """커넥션 풀 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+        self.db_path = self.temp_db.name
+        self.pool = ConnectionPool(self.db_path, max_size=2, acquire_timeout=0.2)
+
+    def tearDown(self):
+        """테스트 정리"""
+        self.pool.close(checkpoint=False)
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.db_path + suffix):
+                os.unlink(self.db_path + suffix)
+
+    def test_pragmas_configured(self):
+        """생성된 커넥션의 PRAGMA 설정 확인"""
+        conn = self.pool.acquire()
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+        self.assertEqual(conn.execute("PRAGMA foreign_keys").fetchone()[0], 1)
+        self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 2)  # FULL
+        self.pool.release(conn)
+
+    def test_same_thread_reuses_connection(self):
+        """같은 스레드는 같은 커넥션을 참조 카운트로 공유"""
+        conn1 = self.pool.acquire()
+        conn2 = self.pool.acquire()
+        self.assertIs(conn1, conn2)
+
+        self.pool.release(conn2)
+        self.assertEqual(self.pool.get_stats()['in_use'], 1)
+        self.pool.release(conn1)
+
+        stats = self.pool.get_stats()
+        self.assertEqual(stats['in_use'], 0)
+        self.assertEqual(stats['idle'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 1)
+
+    def test_released_connection_reused_by_other_thread(self):
+        """반환된 커넥션은 다른 스레드가 재사용"""
+        conn = self.pool.acquire()
+        self.pool.release(conn)
+
+        result = {}
+
+        def worker():
+            c = self.pool.acquire()
+            result['same'] = c is conn
+            self.pool.release(c)
+
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+
+        self.assertTrue(result['same'])
+        self.assertEqual(self.pool.get_stats()['size'], 1)
+
+    def test_pool_size_limit_timeout(self):
+        """최대 크기 초과 시 대기 후 타임아웃"""
+        barrier = threading.Event()
+        done = threading.Event()
+
+        def holder():
+            c = self.pool.acquire()
+            barrier.set()
+            done.wait(2)
+            self.pool.release(c)
+
+        threads = [threading.Thread(target=holder) for _ in range(2)]
+        for t in threads:
+            t.start()
+            barrier.wait(1)
+            barrier.clear()
+
+        try:
+            with self.assertRaises(sqlite3.OperationalError):
+                self.pool.acquire()
+            self.assertEqual(self.pool.get_stats()['timeouts'], 1)
+        finally:
+            done.set()
+            for t in threads:
+                t.join()
+
+    def test_dead_thread_lease_reclaimed(self):
+        """반환 없이 종료된 스레드의 커넥션 회수"""
+        pool = ConnectionPool(self.db_path, max_size=1, acquire_timeout=0.2)
+
+        def leaker():
+            pool.acquire()
+
+        t = threading.Thread(target=leaker)
+        t.start()
+        t.join()
+
+        conn = pool.acquire()
+        self.assertIsNotNone(conn)
+        self.assertEqual(pool.get_stats()['reclaimed'], 1)
+        pool.release(conn)
+        pool.close(checkpoint=False)
+
+    def test_unhealthy_idle_connection_discarded(self):
+        """헬스 체크 실패한 유휴 커넥션 폐기"""
+        conn = self.pool.acquire()
+        self.pool.release(conn)
+        conn.close()
+
+        new_conn = self.pool.acquire()
+        self.assertIsNot(new_conn, conn)
+        self.assertEqual(self.pool.get_stats()['health_check_failures'], 1)
+        self.pool.release(new_conn)
+
+    def test_database_manager_uses_shared_pool(self):
+        """DatabaseManager 인스턴스들이 전역 풀을 공유"""
+        db1 = DatabaseManager(self.db_path)
+        db2 = DatabaseManager(self.db_path)
+        self.assertTrue(db1.connect())
+        self.assertTrue(db2.connect())
+        self.assertIs(db1.conn, db2.conn)
+
+        db1.close()
+        db2.close()
+        self.assertIsNone(db1.conn)
+
+        stats = db1.get_pool_stats()
+        self.assertEqual(stats['in_use'], 0)
+        self.assertEqual(stats['size'], 1)
+        get_connection_pool(self.db_path).close(checkpoint=False)
+
+    def test_shared_manager_uses_per_thread_connection(self):
+        """공유 DatabaseManager는 스레드마다 별도 커넥션 사용"""
+        db = DatabaseManager(self.db_path)
+        self.assertTrue(db.connect())
+        main_conn = db.conn
+        result = {}
+
+        def worker():
+            result['conn'] = db.conn
+            db.release_thread_connection()
+            result['released'] = db.get_pool_stats()['in_use']
+
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+
+        self.assertIsNotNone(result['conn'])
+        self.assertIsNot(result['conn'], main_conn)
+        self.assertEqual(result['released'], 1)
+        self.assertIs(db.conn, main_conn)
+
+        db.close()
+        get_connection_pool(self.db_path).close(checkpoint=False)
+
+
+    def test_shared_manager_reads_do_not_wait_for_each_other(self):
+        """스레드별 커넥션의 읽기는 매니저 락을 잡지 않음"""
+        db = DatabaseManager(self.db_path)
+        self.assertTrue(db.connect())
+        db.conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+        result = {}
+        done = threading.Event()
+
+        def reader():
+            cursor = db.execute_query("SELECT COUNT(*) AS c FROM items")
+            result['count'] = cursor.fetchone()['c']
+            done.set()
+            db.release_thread_connection()
+
+        t = threading.Thread(target=reader)
+        with db._lock:  # 다른 스레드가 매니저 락을 잡고 있어도 읽기는 진행
+            t.start()
+            self.assertTrue(done.wait(2.0))
+        t.join()
+        self.assertEqual(result['count'], 0)
+
+        db.close()
+        get_connection_pool(self.db_path).close(checkpoint=False)
+
+
+    def test_recreated_file_gets_fresh_connection(self):
+        """DB 파일을 지우고 다시 만들면 예전 파일의 유휴 커넥션을 쓰지 않음"""
+        db = DatabaseManager(self.db_path)
+        self.assertTrue(db.connect())
+        db.conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+        db.execute_query("INSERT INTO items DEFAULT VALUES")
+        db.close()
+
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.db_path + suffix):
+                os.unlink(self.db_path + suffix)
+
+        db = DatabaseManager(self.db_path)
+        self.assertTrue(db.connect())
+        tables = db.execute_query("SELECT name FROM sqlite_master WHERE name = 'items'").fetchall()
+        self.assertEqual(tables, [])
+        db.conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+        self.assertEqual(db.execute_query("INSERT INTO items DEFAULT VALUES").lastrowid, 1)
+        self.assertEqual(db.get_pool_stats()['stale_discarded'], 1)
+
+        db.close()
+        get_connection_pool(self.db_path).close(checkpoint=False)
+        get_write_queue(self.db_path).close()
+
+    def test_memory_manager_pins_one_connection(self):
+        """in-memory 매니저는 풀 없이 자기 커넥션 하나를 모든 스레드에서 사용"""
+        first = DatabaseManager(':memory:')
+        self.assertTrue(first.connect())
+        first.conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+        first.execute_query("INSERT INTO items DEFAULT VALUES")
+        result = {}
+
+        def worker():
+            result['count'] = first.execute_query("SELECT COUNT(*) AS c FROM items").fetchone()['c']
+
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+        self.assertEqual(result['count'], 1)
+        first.close()
+
+        second = DatabaseManager(':memory:')
+        self.assertTrue(second.connect())
+        self.assertIsNone(second.execute_query("SELECT COUNT(*) FROM items"))
+        second.close()
+
+        with self.assertRaises(ValueError):
+            get_connection_pool(':memory:')
+
+
+if __name__ == '__main__':
+    unittest.main()
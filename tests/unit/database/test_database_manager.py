@@ -74,7 +74,54 @@ class TestDatabaseManager(unittest.TestCase):
         # 저장된 설정 확인
         value = self.db_manager.get_system_setting('test_setting')
         self.assertEqual(value, 'test_value')
-    
+
+    def test_system_settings_cache(self):
+        """시스템 설정 캐시 테스트"""
+        self.assertEqual(self.db_manager.get_system_setting('transaction_timeout_seconds'), 30)
+
+        # 캐시가 최신이면 DB를 다시 읽지 않음
+        queries = []
+        self.db_manager.conn.set_trace_callback(queries.append)
+        try:
+            for _ in range(100):
+                self.db_manager.get_system_setting('transaction_timeout_seconds')
+        finally:
+            self.db_manager.conn.set_trace_callback(None)
+        self.assertEqual(queries, [])
+
+        # set_system_setting은 버전을 올리고 새 값이 바로 보임
+        version = self.db_manager.settings_version
+        self.assertTrue(self.db_manager.set_system_setting('transaction_timeout_seconds', 45, 'integer'))
+        self.assertGreater(self.db_manager.settings_version, version)
+        self.assertEqual(self.db_manager.get_system_setting('transaction_timeout_seconds'), 45)
+
+        # 같은 DB 파일을 쓰는 다른 매니저도 같은 캐시를 공유
+        other = create_database_manager(self.db_path, initialize=False)
+        try:
+            self.assertEqual(other.get_system_setting('transaction_timeout_seconds'), 45)
+        finally:
+            other.close()
+
+    def test_memory_managers_do_not_share_settings_cache(self):
+        """in-memory 매니저는 각자 캐시, 파일 DB는 경로별 공유"""
+        first, second = DatabaseManager(':memory:'), DatabaseManager(':memory:')
+        self.assertIsNot(first._settings, second._settings)
+        first.invalidate_settings_cache()
+        self.assertNotEqual(first.settings_version, second.settings_version)
+        self.assertIs(DatabaseManager(self.db_path)._settings, self.db_manager._settings)
+
+    def test_system_settings_invalidate(self):
+        """외부에서 직접 수정한 설정은 무효화 후 반영"""
+        self.assertEqual(self.db_manager.get_system_setting('max_daily_rentals'), 3)
+
+        self.db_manager.execute_query(
+            "UPDATE system_settings SET setting_value = '5' WHERE setting_key = 'max_daily_rentals'"
+        )
+        self.assertEqual(self.db_manager.get_system_setting('max_daily_rentals'), 3)
+
+        self.db_manager.invalidate_settings_cache()
+        self.assertEqual(self.db_manager.get_system_setting('max_daily_rentals'), 5)
+
     def test_member_operations(self):
         """회원 관련 작업 테스트"""
         # 회원 추가
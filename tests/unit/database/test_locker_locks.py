@@ -0,0 +1,77 @@
+"""
+락카/구역 잠금 테이블 테스트
+"""
+
+import unittest
+from pathlib import Path
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from database.locker_locks import LockerLockTable, zone_of_locker
+
+
+class TestLockerLockTable(unittest.TestCase):
+    """LockerLockTable 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.locks = LockerLockTable()
+
+    def test_zone_of_locker(self):
+        """락카 번호 접두어로 구역 추정"""
+        self.assertEqual(zone_of_locker('M01'), 'MALE')
+        self.assertEqual(zone_of_locker('F10'), 'FEMALE')
+        self.assertEqual(zone_of_locker('S03'), 'STAFF')
+        self.assertEqual(zone_of_locker(''), '')
+
+    def test_different_zones_concurrent(self):
+        """서로 다른 구역은 동시에 잠금"""
+        self.assertIsNone(self.locks.try_acquire('tx1', zones=['MALE']))
+        self.assertIsNone(self.locks.try_acquire('tx2', zones=['STAFF']))
+        self.assertIsNone(self.locks.try_acquire('tx3', lockers=['F01']))
+        self.assertEqual(self.locks.get_stats()['max_concurrent'], 3)
+
+    def test_zone_conflicts_with_locker_in_zone(self):
+        """구역 잠금과 그 구역의 락카 잠금은 충돌"""
+        self.assertIsNone(self.locks.try_acquire('tx1', lockers=['M05']))
+        self.assertEqual(self.locks.try_acquire('tx2', zones=['MALE', 'STAFF']), 'zone:MALE')
+        # all-or-nothing: STAFF도 잡히지 않아야 함
+        self.assertIsNone(self.locks.try_acquire('tx3', zones=['STAFF']))
+
+        self.assertEqual(self.locks.try_acquire('tx4', lockers=['S01']), 'zone:STAFF')
+        self.assertIsNone(self.locks.try_acquire('tx5', lockers=['M06']))
+        self.assertEqual(self.locks.try_acquire('tx6', lockers=['M05']), 'locker:M05')
+
+    def test_release(self):
+        """해제 후 다른 트랜잭션이 획득"""
+        self.locks.try_acquire('tx1', zones=['MALE'])
+        self.assertIsNotNone(self.locks.try_acquire('tx2', lockers=['M01']))
+        self.assertTrue(self.locks.release('tx1'))
+        self.assertFalse(self.locks.release('tx1'))
+        self.assertIsNone(self.locks.try_acquire('tx2', lockers=['M01']))
+
+    def test_empty_scope_locks_everything(self):
+        """범위 미지정 시 전체 구역 잠금"""
+        self.assertIsNone(self.locks.try_acquire('tx1'))
+        self.assertEqual(set(self.locks.get_scope('tx1')['zones']), {'MALE', 'FEMALE', 'STAFF'})
+        self.assertIsNotNone(self.locks.try_acquire('tx2', lockers=['F01']))
+
+    def test_contention_stats(self):
+        """경합 통계 집계"""
+        self.locks.try_acquire('tx1', zones=['MALE'])
+        self.locks.try_acquire('tx2', zones=['MALE'])
+        self.locks.try_acquire('tx3', zones=['MALE'])
+
+        stats = self.locks.get_stats()
+        self.assertEqual(stats['acquired'], 1)
+        self.assertEqual(stats['conflicts'], 2)
+        self.assertEqual(stats['conflicts_by_scope'], {'zone:MALE': 2})
+        self.assertAlmostEqual(stats['conflict_rate'], 0.667, places=3)
+        self.assertEqual(stats['held_zones'], {'MALE': 'tx1'})
+
+
+if __name__ == '__main__':
+    unittest.main()
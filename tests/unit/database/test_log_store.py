@@ -0,0 +1,110 @@
+"""
+로그 전용 저장소 테스트
+"""
+
+import unittest
+import tempfile
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from database.log_store import LogStore
+
+
+def _entry(message, level='INFO', created_at='2026-01-01T00:00:00'):
+    return {
+        'log_level': level,
+        'logger_name': 'test',
+        'message': message,
+        'member_id': None,
+        'rental_id': None,
+        'locker_number': None,
+        'extra_data': None,
+        'created_at': created_at,
+    }
+
+
+class TestLogStore(unittest.TestCase):
+    """LogStore 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_db = os.path.join(self.temp_dir, 'logs.db')
+        self.store = LogStore(self.log_db)
+
+    def tearDown(self):
+        """테스트 정리"""
+        self.store.close()
+        for name in os.listdir(self.temp_dir):
+            os.unlink(os.path.join(self.temp_dir, name))
+        os.rmdir(self.temp_dir)
+
+    def test_relaxed_durability(self):
+        """로그 DB는 WAL + synchronous=OFF"""
+        conn = self.store._conn
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+        self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 0)
+
+    def test_append_and_sync_cycle(self):
+        """저장 → 미동기화 조회 → 동기화 표시"""
+        self.assertEqual(self.store.append_many([_entry('a'), _entry('b', 'ERROR')]), 2)
+
+        unsynced = self.store.get_unsynced()
+        self.assertEqual([row['message'] for row in unsynced], ['a', 'b'])
+
+        self.assertEqual(self.store.mark_synced([unsynced[0]['log_id']]), 1)
+        self.assertEqual([row['message'] for row in self.store.get_unsynced()], ['b'])
+        self.assertEqual(self.store.get_stats()['unsynced'], 1)
+
+        errors = self.store.get_recent(level='error')
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0]['message'], 'b')
+
+    def test_purge_synced_uses_isoformat_cutoff(self):
+        """isoformat('T' 구분)으로 저장된 시각을 보관 기간 기준으로 정확히 삭제"""
+        now = datetime.now()
+        self.store.append_many([
+            _entry('expired', created_at=(now - timedelta(days=30, minutes=1)).isoformat()),
+            _entry('recent', created_at=(now - timedelta(days=30) + timedelta(hours=1)).isoformat()),
+            _entry('unsynced', created_at=(now - timedelta(days=40)).isoformat()),
+        ])
+        rows = self.store.get_unsynced()
+        self.store.mark_synced([row['log_id'] for row in rows if row['message'] != 'unsynced'])
+
+        self.assertEqual(self.store.purge_synced(older_than_days=30), 1)
+        self.assertEqual(sorted(row['message'] for row in self.store.get_recent()), ['recent', 'unsynced'])
+
+    def test_migrate_legacy_logs(self):
+        """운영 DB의 미동기화 로그 이전 후 운영 DB에서 삭제"""
+        legacy_db = os.path.join(self.temp_dir, 'gym.db')
+        conn = sqlite3.connect(legacy_db)
+        conn.execute("""
+            CREATE TABLE system_logs (
+                log_id INTEGER PRIMARY KEY AUTOINCREMENT, log_level TEXT NOT NULL,
+                logger_name TEXT, message TEXT NOT NULL, member_id TEXT, rental_id INTEGER,
+                locker_number TEXT, extra_data TEXT, sync_status INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute("INSERT INTO system_logs (log_level, message, sync_status) VALUES ('INFO', 'old', 1)")
+        conn.execute("INSERT INTO system_logs (log_level, message) VALUES ('INFO', 'pending')")
+        conn.commit()
+        conn.close()
+
+        self.assertEqual(self.store.migrate_legacy_logs(legacy_db), 1)
+        self.assertEqual([row['message'] for row in self.store.get_unsynced()], ['pending'])
+
+        conn = sqlite3.connect(legacy_db)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM system_logs").fetchone()[0], 0)
+        conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
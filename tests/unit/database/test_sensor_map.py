@@ -0,0 +1,126 @@
+"""
+센서 매핑 인덱스 테스트
+
+기본 매핑, DB 매핑 우선순위, 리로드, 조회 시 DB 미접근 확인
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from database.database_manager import create_database_manager
+from database.sensor_map import SensorMap, get_sensor_map, normalize_addr
+
+
+class TestSensorMap(unittest.TestCase):
+    """SensorMap 테스트 클래스"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+        self.db_path = self.temp_db.name
+        self.db_manager = create_database_manager(self.db_path, initialize=True)
+        self.sensor_map = SensorMap(self.db_manager, legacy_config_path=None)
+
+    def tearDown(self):
+        """테스트 정리"""
+        self.db_manager.close()
+        if os.path.exists(self.db_path):
+            os.unlink(self.db_path)
+
+    def test_initial_mapping(self):
+        """스키마 기본 sensor_mapping 로드"""
+        self.assertEqual(self.sensor_map.resolve("0x26", 0, 1), (1, "S01"))
+        self.assertEqual(self.sensor_map.resolve("0x23", 0, 1), (11, "M01"))
+        self.assertEqual(self.sensor_map.resolve("0x27", 3, 9), (60, "F08"))
+        self.assertEqual(self.sensor_map.resolve("0x20", 0, 0), (None, None))
+        self.assertEqual(self.sensor_map.get_sensor_num_by_locker("M40"), 50)
+        self.assertEqual(self.sensor_map.get_stats()["sources"]["db"], 60)
+
+    def test_pins_for_chip(self):
+        """칩 단위 핀 → 센서 번호 조회 (스냅샷 처리용)"""
+        pins = self.sensor_map.pins_for_chip("26", 0)
+        self.assertEqual(len(pins), 10)
+        self.assertEqual((pins[1], pins[0]), (1, 2))
+        self.assertEqual(self.sensor_map.pins_for_chip("0x20", 0), {})
+        self.assertEqual(self.sensor_map.get_stats()["misses"], 0)
+
+    def test_without_db(self):
+        """DB 없이도 기본 매핑으로 동작"""
+        sensor_map = SensorMap(legacy_config_path=None)
+        self.assertEqual(sensor_map.resolve("0x24", 1, 9), (41, "M31"))
+        self.assertEqual(sensor_map.get_locker_id(51), "F01")
+
+    def test_addr_normalization(self):
+        """주소 표기가 달라도 같은 핀으로 조회"""
+        self.assertEqual(normalize_addr(0x26), "0x26")
+        self.assertEqual(normalize_addr("0X26"), "0x26")
+        self.assertEqual(normalize_addr("26"), "0x26")
+        self.assertEqual(self.sensor_map.get_sensor_num(0x26, "0", "1"), 1)
+
+    def test_db_mapping_overrides_default(self):
+        """sensor_mapping 테이블이 기본 매핑보다 우선"""
+        self.assertTrue(self.db_manager.add_sensor_mapping("0x20", 0, 3, 70, "M41"))
+        self.assertTrue(self.db_manager.delete_sensor_mapping("M01"))
+        self.assertTrue(self.db_manager.add_sensor_mapping("0x21", 0, 0, 11, "M99"))
+
+        # 리로드 전에는 이전 스냅샷 유지
+        self.assertIsNone(self.sensor_map.get_sensor_num("0x20", 0, 3))
+
+        version = self.sensor_map.version
+        self.assertTrue(self.sensor_map.reload())
+        self.assertEqual(self.sensor_map.version, version + 1)
+
+        self.assertEqual(self.sensor_map.resolve("0x20", 0, 3), (70, "M41"))
+        self.assertEqual(self.sensor_map.resolve("0x21", 0, 0), (11, "M99"))
+        self.assertEqual(self.sensor_map.get_sensor_num_by_locker("M41"), 70)
+
+        # 해제 후 리로드하면 기본 매핑으로 복귀
+        self.assertTrue(self.db_manager.delete_sensor_mapping("M99"))
+        self.sensor_map.reload()
+        self.assertEqual(self.sensor_map.get_locker_id(11), "M01")
+
+    def test_lookup_does_not_touch_db(self):
+        """조회 경로에서는 DB 쿼리 없음"""
+        queries = []
+        self.db_manager.conn.set_trace_callback(queries.append)
+        try:
+            for _ in range(100):
+                self.sensor_map.resolve("0x23", 0, 1)
+                self.sensor_map.get_locker_id(51)
+        finally:
+            self.db_manager.conn.set_trace_callback(None)
+        self.assertEqual(queries, [])
+
+    def test_legacy_config_file(self):
+        """레거시 설정 파일 매핑 적용 (DB 매핑보다 낮은 우선순위)"""
+        with tempfile.NamedTemporaryFile('w', delete=False, suffix='.json', encoding='utf-8') as f:
+            json.dump({"mapping": {"61": "X01", "2": "S98"}}, f)
+            config_path = f.name
+        try:
+            sensor_map = SensorMap(self.db_manager, legacy_config_path=Path(config_path))
+            self.assertEqual(sensor_map.get_locker_id(61), "X01")
+            self.assertEqual(sensor_map.get_locker_id(2), "S02")
+            self.assertEqual(sensor_map.get_stats()["sources"]["legacy_file"], 2)
+        finally:
+            os.unlink(config_path)
+
+    def test_registry_shared_per_db(self):
+        """같은 DB 파일이면 같은 인스턴스"""
+        other = create_database_manager(self.db_path, initialize=False)
+        try:
+            self.assertIs(get_sensor_map(self.db_manager), get_sensor_map(other))
+        finally:
+            other.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+트랜잭션 타임아웃 리퍼 테스트
+"""
+
+import unittest
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from database.timeout_reaper import TimeoutReaper
+
+
+class TestTimeoutReaper(unittest.TestCase):
+    """TimeoutReaper 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.expired = []
+        self.event = threading.Event()
+
+        def on_expire(tx_id):
+            self.expired.append((tx_id, time.monotonic()))
+            self.event.set()
+
+        self.reaper = TimeoutReaper(on_expire)
+
+    def tearDown(self):
+        """테스트 정리"""
+        self.reaper.close()
+
+    def _in(self, seconds: float) -> datetime:
+        return datetime.now(timezone.utc) + timedelta(seconds=seconds)
+
+    def test_expires_at_deadline_in_order(self):
+        """마감 시각 순서대로 만료"""
+        start = time.monotonic()
+        self.reaper.schedule('late', self._in(0.15))
+        self.reaper.schedule('early', self._in(0.05))
+
+        deadline = time.monotonic() + 2
+        while len(self.expired) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual([tx_id for tx_id, _ in self.expired], ['early', 'late'])
+        self.assertGreaterEqual(self.expired[0][1] - start, 0.04)
+        self.assertLess(self.expired[0][1] - start, 0.14)
+
+        stats = self.reaper.get_stats()
+        self.assertEqual(stats['expired'], 2)
+        self.assertEqual(stats['pending'], 0)
+
+    def test_cancel(self):
+        """취소된 예약은 만료되지 않음"""
+        self.reaper.schedule('tx1', self._in(0.05))
+        self.assertTrue(self.reaper.cancel('tx1'))
+        self.assertFalse(self.reaper.cancel('tx1'))
+
+        self.assertFalse(self.event.wait(0.15))
+        self.assertEqual(self.expired, [])
+        self.assertEqual(self.reaper.get_stats()['cancelled'], 1)
+
+    def test_reschedule_replaces_deadline(self):
+        """다시 예약하면 이전 마감 시각은 무시"""
+        self.reaper.schedule('tx1', self._in(0.05))
+        self.reaper.schedule('tx1', self._in(0.3))
+
+        self.assertFalse(self.event.wait(0.15))
+        self.assertTrue(self.event.wait(1.0))
+        self.assertEqual(len(self.expired), 1)
+
+    def test_callback_error_does_not_stop_reaper(self):
+        """콜백 예외가 나도 다음 만료를 처리"""
+        calls = []
+
+        def on_expire(tx_id):
+            calls.append(tx_id)
+            if tx_id == 'bad':
+                raise RuntimeError('boom')
+
+        reaper = TimeoutReaper(on_expire)
+        try:
+            reaper.schedule('bad', self._in(0.01))
+            reaper.schedule('good', self._in(0.05))
+            deadline = time.monotonic() + 2
+            while len(calls) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(calls, ['bad', 'good'])
+            self.assertEqual(reaper.get_stats()['callback_errors'], 1)
+        finally:
+            reaper.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
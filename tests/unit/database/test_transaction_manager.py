@@ -47,6 +47,7 @@ class TestTransactionManager(unittest.TestCase):
     
     def tearDown(self):
         """테스트 정리"""
+        self.tx_manager.close()
         if self.db_manager:
             self.db_manager.close()
         if os.path.exists(self.db_path):
@@ -214,22 +215,26 @@ class TestTransactionManager(unittest.TestCase):
             status = await self.tx_manager.get_transaction_status(tx_id)
             self.assertIsNotNone(status)
             
-            # 데이터베이스에서 직접 확인
+            # 데이터베이스에서 직접 확인 (이벤트당 한 행)
             cursor = self.db_manager.execute_query("""
-                SELECT sensor_events FROM active_transactions 
+                SELECT locker_number FROM transaction_events 
                 WHERE transaction_id = ?
+                ORDER BY ts
             """, (tx_id,))
             
             self.assertIsNotNone(cursor)
-            row = cursor.fetchone()
-            self.assertIsNotNone(row)
-            self.assertIsNotNone(row['sensor_events'])
+            rows = cursor.fetchall()
+            self.assertEqual([row['locker_number'] for row in rows], ['A01', 'A02'])
             
-            import json
-            events = json.loads(row['sensor_events'])
+            events = await self.tx_manager.get_transaction_events(tx_id)
             self.assertEqual(len(events), 2)
             self.assertEqual(events[0]['locker_number'], 'A01')
-            self.assertEqual(events[1]['locker_number'], 'A02')
+            self.assertEqual(events[1]['sensor_data'], sensor_data2)
+            
+            # 메모리에 없어도 DB의 최근 구간으로 검증
+            self.tx_manager._recent_sensor_events.clear()
+            self.assertTrue(self.tx_manager._verify_sensor_events(tx_id, 'A01', 'key_removed'))
+            self.assertFalse(self.tx_manager._verify_sensor_events(tx_id, 'A01', 'key_inserted'))
             
             # 트랜잭션 종료
             await self.tx_manager.end_transaction(tx_id)
@@ -247,19 +252,14 @@ class TestTransactionManager(unittest.TestCase):
             self.assertTrue(result['success'])
             tx_id = result['transaction_id']
             
-            # 수동으로 타임아웃 시간을 과거로 설정
+            # 수동으로 타임아웃 시간을 과거로 설정 (메모리 상태가 원본)
             past_time = datetime.now(timezone.utc) - timedelta(seconds=10)
-            cursor = self.db_manager.execute_query("""
-                UPDATE active_transactions 
-                SET timeout_at = ?
-                WHERE transaction_id = ?
-            """, (past_time.isoformat(), tx_id))
-            
-            self.assertIsNotNone(cursor)
+            self.tx_manager._active_transactions[tx_id]['timeout_at'] = past_time
             
             # 타임아웃 정리 실행
             cleanup_count = await self.tx_manager._cleanup_timeout_transactions()
             self.assertGreaterEqual(cleanup_count, 1)
+            self.assertTrue(self.tx_manager.flush())
             
             # 트랜잭션 상태 확인 (타임아웃 상태여야 함)
             cursor = self.db_manager.execute_query("""
@@ -352,6 +352,258 @@ class TestTransactionManager(unittest.TestCase):
         
         asyncio.run(run_test())
 
+    
+    def test_sensor_verification_event_driven(self):
+        """다른 스레드의 센서 이벤트 기록 즉시 검증 완료"""
+        import threading
+        import time
+        
+        async def run_test():
+            result = await self.tx_manager.start_transaction(
+                self.test_member_id, 
+                TransactionType.RENTAL
+            )
+            tx_id = result['transaction_id']
+            
+            def sensor_thread():
+                time.sleep(0.05)
+                # ESP32 루프처럼 별도 이벤트 루프에서 기록
+                asyncio.run(self.tx_manager.record_sensor_event(
+                    tx_id, 'A01', {'active': False}
+                ))
+            
+            t = threading.Thread(target=sensor_thread)
+            start = time.monotonic()
+            t.start()
+            verified = await self.tx_manager.wait_for_sensor_verification(tx_id, 'A01', 'key_removed')
+            elapsed = time.monotonic() - start
+            t.join()
+            
+            self.assertTrue(verified)
+            self.assertLess(elapsed, 0.4)  # 500ms 폴링 없이 완료
+            self.assertEqual(self.tx_manager._sensor_waiters, {})
+            
+            await self.tx_manager.end_transaction(tx_id)
+        
+        asyncio.run(run_test())
+    
+    def test_sensor_verification_already_recorded(self):
+        """대기 시작 전에 도착한 이벤트로도 검증"""
+        async def run_test():
+            result = await self.tx_manager.start_transaction(
+                self.test_member_id, 
+                TransactionType.RETURN
+            )
+            tx_id = result['transaction_id']
+            
+            await self.tx_manager.record_sensor_event(tx_id, 'A02', {'active': True})
+            verified = await self.tx_manager.wait_for_sensor_verification(tx_id, 'A02', 'key_inserted')
+            self.assertTrue(verified)
+            
+            await self.tx_manager.end_transaction(tx_id)
+        
+        asyncio.run(run_test())
+    
+    def test_sensor_verification_released_on_end(self):
+        """트랜잭션 종료 시 대기자는 실패로 즉시 깨어남"""
+        async def run_test():
+            result = await self.tx_manager.start_transaction(
+                self.test_member_id, 
+                TransactionType.RENTAL
+            )
+            tx_id = result['transaction_id']
+            
+            waiter = asyncio.ensure_future(
+                self.tx_manager.wait_for_sensor_verification(tx_id, 'A01', 'key_removed')
+            )
+            await asyncio.sleep(0.01)
+            
+            # 다른 락카 이벤트는 대기자를 깨우지 않음
+            await self.tx_manager.record_sensor_event(tx_id, 'A05', {'active': False})
+            await asyncio.sleep(0.01)
+            self.assertFalse(waiter.done())
+            
+            await self.tx_manager.end_transaction(tx_id, TransactionStatus.CANCELLED)
+            self.assertFalse(await asyncio.wait_for(waiter, 1.0))
+        
+        asyncio.run(run_test())
+
+    
+    def test_start_transaction_without_db_reads(self):
+        """트랜잭션 시작 시 활성 트랜잭션 확인은 메모리에서만 수행"""
+        async def run_test():
+            self.db_manager.get_system_setting = lambda key, default=None: default
+            queries = []
+            original = self.db_manager.execute_query
+            
+            def tracking_execute(query, params=()):
+                queries.append(query.strip().split()[0].upper())
+                return original(query, params)
+            
+            self.db_manager.execute_query = tracking_execute
+            try:
+                result = await self.tx_manager.start_transaction(
+                    self.test_member_id, 
+                    TransactionType.RENTAL
+                )
+                self.assertTrue(result['success'])
+                
+                busy = await self.tx_manager.start_transaction('MEMBER_002', TransactionType.RENTAL)
+                self.assertEqual(busy['error'], 'TRANSACTION_ACTIVE')
+            finally:
+                self.db_manager.execute_query = original
+            
+            self.assertNotIn('SELECT', queries)
+            
+            # write-behind 기록 확인
+            self.assertTrue(self.tx_manager.flush())
+            cursor = self.db_manager.execute_query("""
+                SELECT status FROM active_transactions WHERE transaction_id = ?
+            """, (result['transaction_id'],))
+            self.assertEqual(cursor.fetchone()['status'], TransactionStatus.ACTIVE.value)
+            
+            await self.tx_manager.end_transaction(result['transaction_id'])
+        
+        asyncio.run(run_test())
+    
+    def test_rebuild_from_db(self):
+        """재시작 시 DB 기록으로 활성 트랜잭션 복구"""
+        async def run_test():
+            result = await self.tx_manager.start_transaction(
+                self.test_member_id, 
+                TransactionType.RETURN
+            )
+            tx_id = result['transaction_id']
+            await self.tx_manager.update_transaction_step(tx_id, TransactionStep.SENSOR_WAIT)
+            self.assertTrue(self.tx_manager.flush())
+            
+            # 이미 만료된 활성 기록 (재시작 시 TIMEOUT 처리 대상)
+            past_time = datetime.now(timezone.utc) - timedelta(seconds=10)
+            self.db_manager.execute_query("""
+                INSERT INTO active_transactions 
+                (transaction_id, member_id, transaction_type, timeout_at, step, status)
+                VALUES ('stale', 'MEMBER_002', 'rental', ?, 'started', 'active')
+            """, (past_time.isoformat(),))
+            
+            restarted = TransactionManager(self.db_manager)
+            status = await restarted.get_transaction_status(tx_id)
+            self.assertEqual(status['status'], TransactionStatus.ACTIVE.value)
+            self.assertEqual(status['step'], TransactionStep.SENSOR_WAIT.value)
+            self.assertNotIn('stale', restarted._active_transactions)
+            
+            stale = await restarted.get_transaction_status('stale')
+            self.assertEqual(stale['status'], TransactionStatus.TIMEOUT.value)
+            
+            await restarted.end_transaction(tx_id)
+        
+        asyncio.run(run_test())
+
+
+    def test_events_table_created_for_legacy_db(self):
+        """transaction_events가 없는 기존 DB는 schema.sql의 정의로 테이블/인덱스 생성"""
+        self.db_manager.conn.execute("DROP TABLE transaction_events")
+        restarted = TransactionManager(self.db_manager)
+        try:
+            rows = self.db_manager.execute_query("""
+                SELECT type, name FROM sqlite_master WHERE tbl_name = 'transaction_events' AND sql IS NOT NULL
+            """).fetchall()
+            self.assertEqual(sorted((row['type'], row['name']) for row in rows), [
+                ('index', 'idx_transaction_events_tx_ts'), ('table', 'transaction_events')
+            ])
+        finally:
+            restarted.close()
+    
+    def test_concurrent_transactions_in_different_zones(self):
+        """구역이 다르면 대여/반납이 동시에 진행"""
+        async def run_test():
+            male = await self.tx_manager.start_transaction(
+                self.test_member_id, TransactionType.RENTAL, zones=['MALE']
+            )
+            self.assertTrue(male['success'])
+            
+            staff = await self.tx_manager.start_transaction(
+                'MEMBER_002', TransactionType.RETURN, locker_number='S01'
+            )
+            self.assertTrue(staff['success'])
+            
+            active = await self.tx_manager.get_active_transactions()
+            self.assertEqual(len(active), 2)
+            
+            # 같은 구역의 락카는 대여 중인 구역 잠금과 충돌
+            self.db_manager.execute_query("""
+                INSERT INTO members (member_id, member_name, status, expiry_date)
+                VALUES ('MEMBER_003', '테스트 회원3', 'active', '2025-12-31')
+            """)
+            blocked = await self.tx_manager.start_transaction(
+                'MEMBER_003', TransactionType.RETURN, locker_number='M01'
+            )
+            self.assertFalse(blocked['success'])
+            self.assertEqual(blocked['conflict'], 'zone:MALE')
+            
+            stats = self.tx_manager.get_lock_stats()
+            self.assertEqual(stats['conflicts'], 1)
+            self.assertEqual(stats['active_transactions'], 2)
+            
+            await self.tx_manager.end_transaction(male['transaction_id'])
+            retry = await self.tx_manager.start_transaction(
+                'MEMBER_003', TransactionType.RETURN, locker_number='M01'
+            )
+            self.assertTrue(retry['success'])
+            
+            await self.tx_manager.end_transaction(staff['transaction_id'])
+            await self.tx_manager.end_transaction(retry['transaction_id'])
+        
+        asyncio.run(run_test())
+
+    
+    def test_reaper_expires_transaction_at_deadline(self):
+        """리퍼가 마감 시각에 트랜잭션을 만료하고 잠금을 해제"""
+        import threading
+        
+        async def run_test():
+            self.db_manager.get_system_setting = lambda key, default=None: 0.1
+            expired = []
+            fired = threading.Event()
+            
+            def on_expiry(transaction):
+                expired.append(transaction)
+                fired.set()
+            
+            self.tx_manager.add_expiry_listener(on_expiry)
+            
+            result = await self.tx_manager.start_transaction(
+                self.test_member_id, TransactionType.RENTAL, zones=['MALE']
+            )
+            tx_id = result['transaction_id']
+            
+            self.assertTrue(fired.wait(2.0))
+            self.assertEqual(expired[0]['transaction_id'], tx_id)
+            self.assertEqual(expired[0]['status'], TransactionStatus.TIMEOUT.value)
+            self.assertEqual(self.tx_manager.get_lock_stats()['holders'], 0)
+            self.assertEqual(await self.tx_manager.get_active_transactions(), [])
+            
+            self.assertTrue(self.tx_manager.flush())
+            status = await self.tx_manager.get_transaction_status(tx_id)
+            self.assertEqual(status['status'], TransactionStatus.TIMEOUT.value)
+            
+            stats = self.tx_manager.get_reaper_stats()
+            self.assertEqual(stats['expired'], 1)
+            self.assertEqual(stats['pending'], 0)
+        
+        asyncio.run(run_test())
+    
+    def test_reaper_cancelled_on_end(self):
+        """정상 종료된 트랜잭션은 만료 예약 취소"""
+        async def run_test():
+            result = await self.tx_manager.start_transaction(
+                self.test_member_id, TransactionType.RENTAL
+            )
+            self.assertEqual(self.tx_manager.get_reaper_stats()['pending'], 1)
+            await self.tx_manager.end_transaction(result['transaction_id'])
+            self.assertEqual(self.tx_manager.get_reaper_stats()['pending'], 0)
+        
+        asyncio.run(run_test())
+
 
 if __name__ == '__main__':
     # 로깅 설정
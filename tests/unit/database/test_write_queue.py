@@ -0,0 +1,259 @@
+"""
+단일 writer 스레드 (그룹 커밋) 테스트
+"""
+
+import unittest
+import tempfile
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from database.write_queue import WriteQueue, get_write_queue, is_write_query
+from database.database_manager import DatabaseManager
+
+
+class TestWriteQueue(unittest.TestCase):
+    """WriteQueue 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+        self.db_path = self.temp_db.name
+
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT UNIQUE)")
+        conn.commit()
+        conn.close()
+
+        self.wq = WriteQueue(self.db_path, batch_interval=0.02)
+
+    def tearDown(self):
+        """테스트 정리"""
+        self.wq.close()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.db_path + suffix):
+                os.unlink(self.db_path + suffix)
+
+    def _count(self) -> int:
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_is_write_query(self):
+        """쓰기 쿼리 판별"""
+        self.assertTrue(is_write_query("  insert into items VALUES (1)"))
+        self.assertTrue(is_write_query("UPDATE items SET name = 'a'"))
+        self.assertTrue(is_write_query("\nDELETE FROM items"))
+        self.assertFalse(is_write_query("SELECT * FROM items"))
+        self.assertFalse(is_write_query("CREATE TABLE t (a)"))
+
+    def test_concurrent_writes_grouped(self):
+        """여러 스레드의 쓰기가 적은 수의 트랜잭션으로 커밋"""
+        futures = []
+        lock = threading.Lock()
+
+        def writer(i):
+            f = self.wq.submit("INSERT INTO items (name) VALUES (?)", (f"item{i}",))
+            with lock:
+                futures.append(f)
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        for f in futures:
+            self.assertEqual(f.result(5).rowcount, 1)
+
+        stats = self.wq.get_stats()
+        self.assertEqual(stats['writes'], 20)
+        self.assertLess(stats['batches'], 20)
+        self.assertEqual(self._count(), 20)
+
+    def test_failed_item_does_not_affect_batch(self):
+        """실패한 요청만 롤백되고 같은 배치의 다른 요청은 커밋"""
+        ok1 = self.wq.submit("INSERT INTO items (name) VALUES (?)", ("dup",))
+        bad = self.wq.submit("INSERT INTO items (name) VALUES (?)", ("dup",))
+        ok2 = self.wq.submit("INSERT INTO items (name) VALUES (?)", ("other",))
+
+        self.assertEqual(ok1.result(5).rowcount, 1)
+        self.assertEqual(ok2.result(5).rowcount, 1)
+        with self.assertRaises(sqlite3.IntegrityError):
+            bad.result(5)
+
+        self.assertEqual(self._count(), 2)
+        self.assertEqual(self.wq.get_stats()['failed_writes'], 1)
+
+    def test_submit_callable_atomic(self):
+        """함수 제출 시 여러 문장이 원자적으로 실행"""
+        def work(conn):
+            conn.execute("INSERT INTO items (name) VALUES ('a')")
+            conn.execute("INSERT INTO items (name) VALUES ('a')")
+
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.wq.submit_callable(work).result(5)
+        self.assertEqual(self._count(), 0)
+
+    def test_idle_write_commits_without_batch_delay(self):
+        """큐가 비어 있으면 batch_interval을 기다리지 않고 바로 커밋"""
+        self.wq.close()
+        self.wq = WriteQueue(self.db_path, batch_interval=1.0)
+        started = time.monotonic()
+        for i in range(3):
+            self.wq.execute("INSERT INTO items (name) VALUES (?)", (f"x{i}",))
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(self.wq.get_stats()['batches'], 3)
+
+    def test_timeout_while_running_returns_real_result(self):
+        """이미 실행 중인 쓰기는 시간 초과로 실패 처리하지 않고 커밋 결과를 돌려줌"""
+        def slow_insert(conn):
+            time.sleep(0.2)
+            return conn.execute("INSERT INTO items (name) VALUES ('slow')").rowcount
+
+        self.assertEqual(WriteQueue.wait(self.wq.submit_callable(slow_insert), 0.05), 1)
+        self.assertEqual(self._count(), 1)
+
+    def test_begin_timeout_fails_batch(self):
+        """다른 커넥션이 쓰기 락을 계속 잡고 있으면 begin_timeout 후 배치 전체 실패"""
+        self.wq.close()
+        self.wq = WriteQueue(self.db_path, batch_interval=0.02, begin_timeout=0.2)
+        self.wq.execute("DELETE FROM items")  # writer 커넥션 생성 완료 대기
+        blocker = sqlite3.connect(self.db_path, isolation_level=None)
+        blocker.execute("BEGIN IMMEDIATE")
+        try:
+            futures = [self.wq.submit("INSERT INTO items (name) VALUES (?)", (f"x{i}",)) for i in range(3)]
+            for f in futures:
+                with self.assertRaises(sqlite3.OperationalError):
+                    f.result(5)
+        finally:
+            blocker.execute("ROLLBACK")
+            blocker.close()
+
+        stats = self.wq.get_stats()
+        self.assertEqual((stats['begin_timeouts'], stats['commit_failures']), (1, 1))
+        self.assertEqual(self._count(), 0)
+
+    def test_timed_out_write_is_not_committed(self):
+        """execute가 시간 초과로 끝난 쓰기는 락이 풀린 뒤에도 커밋되지 않음"""
+        self.wq.execute("DELETE FROM items")  # writer 커넥션 생성 완료 대기
+        blocker = sqlite3.connect(self.db_path, isolation_level=None)
+        blocker.execute("BEGIN IMMEDIATE")
+        try:
+            first = self.wq.submit("INSERT INTO items (name) VALUES ('first')")
+            with self.assertRaises(TimeoutError):
+                self.wq.execute("INSERT INTO items (name) VALUES ('late')", timeout=0.1)
+        finally:
+            blocker.execute("ROLLBACK")
+            blocker.close()
+
+        self.assertEqual(first.result(5).rowcount, 1)
+        self.wq.execute("INSERT INTO items (name) VALUES ('after')")
+        conn = sqlite3.connect(self.db_path)
+        try:
+            names = [row[0] for row in conn.execute("SELECT name FROM items ORDER BY id")]
+        finally:
+            conn.close()
+        self.assertEqual(names, ['first', 'after'])
+
+    def test_closed_queue_rejects_writes(self):
+        """종료된 큐는 새 쓰기를 거부"""
+        self.wq.close()
+        with self.assertRaises(sqlite3.OperationalError):
+            self.wq.execute("INSERT INTO items (name) VALUES ('x')")
+
+
+class TestDatabaseManagerWriteQueue(unittest.TestCase):
+    """DatabaseManager 쓰기 경로 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+        self.db_path = self.temp_db.name
+
+        self.db = DatabaseManager(self.db_path)
+        self.db.connect()
+        self.db.conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+
+    def tearDown(self):
+        """테스트 정리"""
+        self.db.close()
+        get_write_queue(self.db_path).close()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.db_path + suffix):
+                os.unlink(self.db_path + suffix)
+
+    def test_execute_query_returns_write_result(self):
+        """쓰기 쿼리는 커밋 후 rowcount/lastrowid 반환"""
+        result = self.db.execute_query("INSERT INTO items (name) VALUES (?)", ("a",))
+        self.assertEqual(result.rowcount, 1)
+        self.assertEqual(result.lastrowid, 1)
+
+        row = self.db.execute_query("SELECT name FROM items WHERE id = ?", (1,)).fetchone()
+        self.assertEqual(row['name'], 'a')
+        self.assertGreaterEqual(self.db.get_write_queue_stats()['writes'], 1)
+
+    def test_execute_query_failure_returns_none(self):
+        """쓰기 실패 시 None 반환"""
+        self.assertIsNone(self.db.execute_query("INSERT INTO missing (name) VALUES ('a')"))
+
+    def test_explicit_transaction_bypasses_queue(self):
+        """begin_transaction 중의 쓰기는 같은 커넥션에서 실행되어 롤백 가능"""
+        self.db.begin_transaction()
+        self.db.execute_query("INSERT INTO items (name) VALUES ('tx')")
+        self.db.rollback()
+
+        count = self.db.execute_query("SELECT COUNT(*) AS c FROM items").fetchone()['c']
+        self.assertEqual(count, 0)
+
+    def test_execute_many(self):
+        """다중 쓰기도 writer 스레드에서 커밋"""
+        self.assertTrue(self.db.execute_many(
+            "INSERT INTO items (name) VALUES (?)", [("a",), ("b",), ("c",)]
+        ))
+        count = self.db.execute_query("SELECT COUNT(*) AS c FROM items").fetchone()['c']
+        self.assertEqual(count, 3)
+
+
+class TestInMemoryDatabaseWrites(unittest.TestCase):
+    """in-memory DB는 writer 스레드를 거치지 않고 자기 커넥션에 씀"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.db = DatabaseManager(':memory:')
+        self.db.connect()
+        self.db.conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+
+    def tearDown(self):
+        """테스트 정리"""
+        self.db.close()
+
+    def test_writes_visible_to_same_connection(self):
+        self.assertFalse(self.db.use_write_queue)
+        result = self.db.execute_query("INSERT INTO items (name) VALUES (?)", ("a",))
+        self.assertEqual((result.rowcount, result.lastrowid), (1, 1))
+        self.assertTrue(self.db.execute_many("INSERT INTO items (name) VALUES (?)", [("b",), ("c",)]))
+        self.assertEqual(self.db.submit_write("INSERT INTO items (name) VALUES ('d')").result(1.0).lastrowid, 4)
+
+        count = self.db.execute_query("SELECT COUNT(*) AS c FROM items").fetchone()['c']
+        self.assertEqual(count, 4)
+        self.assertEqual(self.db.get_write_queue_stats(), {})
+
+    def test_get_write_queue_rejects_memory(self):
+        with self.assertRaises(ValueError):
+            get_write_queue(':memory:')
+
+
+if __name__ == '__main__':
+    unittest.main()
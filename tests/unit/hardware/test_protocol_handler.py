@@ -0,0 +1,165 @@
+"""
+프로토콜 핸들러 테스트
+
+접두사 디스패치, JSON 이벤트 변환, 통계 집계 확인
+"""
+
+import logging
+import unittest
+from pathlib import Path
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from hardware.protocol_handler import (
+    ProtocolHandler, ParsedMessage, MessageType, format_sensor_snapshot, parse_sensor_snapshot
+)
+
+SENSOR_EVENT = ('{"device_id":"esp32_gym","message_type":"event","event_type":"sensor_triggered",'
+                '"data":{"chip_idx":0,"addr":"0x26","pin":1,"raw":"LOW","active":true}}')
+BARCODE_EVENT = ('{"device_id":"esp32_gym","message_type":"event","event_type":"barcode_scanned",'
+                 '"data":{"barcode":" 1234567890 ","scan_type":"barcode"}}')
+
+
+class TestProtocolHandler(unittest.TestCase):
+    """ProtocolHandler 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.handler = ProtocolHandler()
+
+    def test_prefix_messages(self):
+        """접두사 메시지 분기"""
+        cases = {
+            "QR:QRS:MEMBER123:1700000000:abc:sig": MessageType.QR_SCAN,
+            "BARCODE:123456789": MessageType.BARCODE_SCAN,
+            "STATUS:door=closed,uptime=42": MessageType.STATUS_REPORT,
+            "HEARTBEAT": MessageType.HEARTBEAT,
+            "RESP:CMD_0001:OK": MessageType.COMMAND_RESPONSE,
+            "ERROR:motor jam": MessageType.ERROR,
+            "123456789": MessageType.BARCODE_SCAN,
+        }
+        for raw, expected in cases.items():
+            with self.subTest(raw=raw):
+                self.assertEqual(self.handler.parse_message(raw + "\r\n").type, expected)
+
+        self.assertEqual(self.handler.parse_message("QR:QRS:MEMBER123:1700000000:abc:sig").data["member_id"],
+                         "MEMBER123")
+        self.assertEqual(self.handler.parse_message("STATUS:door=closed,uptime=42").data["uptime_seconds"], 42)
+        self.assertTrue(self.handler.parse_message("RESP:CMD_0001:OK").data["success"])
+        self.assertEqual(self.handler.parse_message("ERROR:motor jam").data, {"error_message": "motor jam"})
+
+    def test_prefix_mismatch_falls_through(self):
+        """첫 글자만 같은 메시지는 알 수 없는 메시지"""
+        for raw in ("Booting...", "HEARTBEATX", "RESET", "{not json"):
+            with self.subTest(raw=raw):
+                message = self.handler.parse_message(raw)
+                if raw.startswith("{"):
+                    self.assertIsNone(message)
+                else:
+                    self.assertEqual(message.type, MessageType.UNKNOWN)
+                    self.assertEqual(message.data, {"content": raw})
+
+    def test_sensor_event(self):
+        """IR 센서 JSON 이벤트"""
+        message = self.handler.parse_message(SENSOR_EVENT)
+        self.assertIsInstance(message, ParsedMessage)
+        self.assertEqual(message.type, MessageType.STATUS_REPORT)
+        self.assertEqual(message.data["sensor_type"], "ir_sensor")
+        self.assertEqual(message.data["addr"], "0x26")
+        self.assertEqual(message.data["pin"], 1)
+        self.assertIs(message.data["active"], True)
+        self.assertEqual(message.raw_message, SENSOR_EVENT)
+
+    def test_json_events(self):
+        """바코드/모터/응답/에러 JSON 이벤트"""
+        barcode = self.handler.parse_message(BARCODE_EVENT)
+        self.assertEqual(barcode.type, MessageType.BARCODE_SCAN)
+        self.assertEqual(barcode.data["barcode"], "1234567890")
+
+        motor = self.handler.parse_message(
+            '{"device_id":"esp32_gym","event_type":"motor_completed","data":{"action":"open","status":"ok"}}')
+        self.assertEqual(motor.data["response_type"], "motor_event")
+
+        response = self.handler.parse_message(
+            '{"device_id":"esp32_gym","message_type":"response","data":{"status":"ready","uptime":5}}')
+        self.assertEqual(response.type, MessageType.STATUS_REPORT)
+        self.assertEqual(response.data["uptime"], 5)
+
+        error = self.handler.parse_message(
+            '{"device_id":"esp32_gym","message_type":"error","data":{"error_code":"E1"}}')
+        self.assertEqual(error.type, MessageType.ERROR)
+        self.assertEqual(error.data["error_code"], "E1")
+
+    def test_cmd_id_echo(self):
+        """응답에 되돌아온 cmd_id는 data에 포함, 명령에는 cmd_id가 있을 때만 추가"""
+        response = self.handler.parse_message(
+            '{"device_id":"esp32_gym","message_type":"response","event_type":"locker_opened",'
+            '"cmd_id":"CMD_0007","data":{"status":"opened"}}')
+        self.assertEqual(response.data["cmd_id"], "CMD_0007")
+        self.assertIn('"cmd_id": "CMD_0001"', self.handler.create_esp32_status_command(cmd_id="CMD_0001"))
+        self.assertNotIn("cmd_id", self.handler.create_esp32_status_command())
+
+    def test_sensor_snapshot(self):
+        """IR 센서 스냅샷 프레임 (칩별 16비트 마스크 + 일련번호 + 체크섬)"""
+        frame = format_sensor_snapshot(42, [("0x26", 0xFFFD), (0x23, 0xFFFF)])
+        self.assertEqual(frame, "IR:P:42:26=FFFD,23=FFFF*7D")
+
+        message = self.handler.parse_message(frame)
+        self.assertEqual(message.type, MessageType.SENSOR_SNAPSHOT)
+        self.assertEqual(message.data, {
+            "seq": 42,
+            "trigger": "periodic",
+            "chips": [{"chip_idx": 0, "addr": "0x26", "mask": 0xFFFD},
+                      {"chip_idx": 1, "addr": "0x23", "mask": 0xFFFF}],
+        })
+        self.assertTrue(self.handler.validate_message_format(frame))
+
+        # get_sensors 요청 응답은 명령 매칭용 response_type 포함
+        requested = parse_sensor_snapshot(format_sensor_snapshot(43, [], "R"))
+        self.assertEqual(requested["response_type"], "sensor_snapshot")
+        self.assertEqual(requested["chips"], [])
+
+    def test_sensor_snapshot_rejects_corruption(self):
+        """체크섬/형식이 틀린 스냅샷은 버림"""
+        frame = format_sensor_snapshot(42, [("0x26", 0xFFFD)])
+        self.assertIsNone(self.handler.parse_message(frame.replace("FFFD", "FFFC")))
+        self.assertIsNone(self.handler.parse_message(frame[:-3]))
+        self.assertIsNone(parse_sensor_snapshot("IR:P:x:26=FFFD*00"))
+        self.assertEqual(self.handler.stats["invalid_messages"], 2)
+
+    def test_json_without_device_id(self):
+        """device_id 없는 JSON은 알 수 없는 메시지"""
+        message = self.handler.parse_message('{"hello":1}')
+        self.assertEqual(message.type, MessageType.UNKNOWN)
+
+    def test_parsed_message_slots(self):
+        """ParsedMessage는 __dict__ 없는 slotted 객체"""
+        message = self.handler.parse_message("HEARTBEAT")
+        self.assertFalse(hasattr(message, "__dict__"))
+        with self.assertRaises(AttributeError):
+            message.extra = 1
+
+    def test_stats(self):
+        """성공/무효/오류 집계"""
+        self.handler.parse_message(SENSOR_EVENT)
+        self.handler.parse_message("HEARTBEAT")
+        self.handler.parse_message("garbage")
+        self.handler.parse_message("BARCODE:")
+        self.handler.parse_message("{broken")
+        stats = self.handler.stats
+        self.assertEqual(stats["messages_parsed"], 3)
+        self.assertEqual(stats["invalid_messages"], 3)
+        self.assertEqual(stats["parse_errors"], 1)
+
+    def test_no_stdout_output(self):
+        """이벤트는 print 대신 DEBUG 로그로만 기록"""
+        with self.assertLogs("hardware.protocol_handler", level=logging.DEBUG) as captured:
+            self.handler.parse_message(SENSOR_EVENT)
+        self.assertTrue(any("ESP32 센서" in line for line in captured.output))
+
+
+if __name__ == '__main__':
+    unittest.main()
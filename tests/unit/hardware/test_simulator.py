@@ -0,0 +1,155 @@
+"""
+ESP32 시뮬레이터 테스트
+
+펌웨어 모델 출력이 ProtocolHandler로 그대로 해석되는지,
+pty 가상 보드에 ESP32Manager를 붙였을 때 이벤트/명령 응답/버스트가 모두 도착하는지 확인
+"""
+
+import asyncio
+import json
+import unittest
+from pathlib import Path
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.esp32_manager import ESP32Manager
+from hardware.protocol_handler import ProtocolHandler, MessageType
+from hardware.simulator import FirmwareModel, SimulatedBoard, attach_boards
+
+
+class TestFirmwareModel(unittest.TestCase):
+    """FirmwareModel 출력 형식"""
+
+    def setUp(self):
+        self.firmware = FirmwareModel(motor_delay=0.2)
+        self.handler = ProtocolHandler()
+
+    def parse(self, line):
+        return self.handler.parse_message(line)
+
+    def test_events_parse_like_real_firmware(self):
+        edge = self.parse(self.firmware.sensor_edge(1, 4, "LOW"))
+        self.assertEqual(edge.type, MessageType.STATUS_REPORT)
+        self.assertEqual((edge.data["chip_idx"], edge.data["pin"], edge.data["active"]), (1, 4, True))
+
+        barcode = self.parse(self.firmware.barcode("1234567890"))
+        self.assertEqual(barcode.type, MessageType.BARCODE_SCAN)
+        self.assertEqual(barcode.data["barcode"], "1234567890")
+
+        nfc = self.parse(self.firmware.nfc("04a1b2c3"))
+        self.assertEqual(nfc.type, MessageType.NFC_SCAN)
+        self.assertEqual(nfc.data["nfc_uid"], "04A1B2C3")
+
+    def test_snapshot_follows_edges(self):
+        self.firmware.sensor_edge(0, 3, "LOW")
+        snapshot = self.parse(self.firmware.snapshot("R"))
+        self.assertEqual(snapshot.type, MessageType.SENSOR_SNAPSHOT)
+        self.assertEqual(snapshot.data["chips"][0]["mask"], 0xFFFF & ~(1 << 3))
+        self.assertEqual(self.firmware.pin_state(0, 3), "LOW")
+
+        self.firmware.sensor_edge(0, 3, "HIGH")
+        self.assertEqual(self.parse(self.firmware.snapshot()).data["chips"][0]["mask"], 0xFFFF)
+
+    def test_motor_reply_is_delayed_and_echoes_cmd_id(self):
+        replies = self.firmware.handle_command(json.dumps({"command": "open_locker", "cmd_id": "CMD_0007"}))
+        self.assertEqual(len(replies), 1)
+        delay, line = replies[0]
+        self.assertEqual(delay, 0.2)
+        response = self.parse(line)
+        self.assertEqual(response.data["response_type"], "locker_opened")
+        self.assertEqual(response.data["cmd_id"], "CMD_0007")
+
+        self.firmware.motor_events = True
+        replies = self.firmware.handle_command('{"command":"motor_move","revs":1.0}')
+        self.assertEqual([self.parse(line).data["response_type"] for _, line in replies],
+                         ["motor_moved", "motor_event"])
+
+    def test_status_and_unknown_commands(self):
+        status = self.parse(self.firmware.handle_command('{"command":"get_status","cmd_id":"CMD_0001"}')[0][1])
+        self.assertEqual(status.data["response_type"], "status_response")
+        self.assertEqual(self.firmware.handle_command('{"command":"self_destruct"}'), [])
+        self.assertEqual(self.firmware.handle_command("garbage"), [])
+
+
+class TestSimulatedBoard(unittest.TestCase):
+    """가상 보드 + ESP32Manager 종단 간 테스트"""
+
+    def setUp(self):
+        self.board = SimulatedBoard(FirmwareModel(motor_delay=0.05)).start()
+        self.manager = ESP32Manager()
+        self.manager.sensor_debouncer.configure(default_window_ms=0)
+        self.events = {"sensor_triggered": [], "barcode_scanned": [], "nfc_scanned": []}
+        for event_type, received in self.events.items():
+            self.manager.register_event_handler(event_type, received.append)
+
+    def tearDown(self):
+        for device in self.manager.devices.values():
+            if device.serial_connection is not None:
+                device.serial_connection.close()
+        self.board.close()
+
+    async def _wait_for(self, predicate, timeout=3.0):
+        deadline = asyncio.get_running_loop().time() + timeout
+        while not predicate():
+            if asyncio.get_running_loop().time() > deadline:
+                self.fail("시간 내에 조건을 만족하지 못함")
+            await asyncio.sleep(0.01)
+
+    def run_with_manager(self, scenario):
+        async def wrapper():
+            self.device_ids = await attach_boards(self.manager, [self.board])
+            await self.manager.start_communication()
+            try:
+                return await scenario()
+            finally:
+                await self.manager.stop_communication()
+        return asyncio.run(wrapper())
+
+    def test_events_reach_handlers(self):
+        """센서/바코드/NFC 이벤트가 수정 없는 매니저 핸들러까지 도착"""
+        async def scenario():
+            self.board.sensor_edge(0, 5, "LOW")
+            self.board.barcode("1234567890")
+            self.board.nfc("04a1b2c3")
+            await self._wait_for(lambda: all(self.events.values()))
+
+        self.run_with_manager(scenario)
+        sensor = self.events["sensor_triggered"][0]
+        self.assertEqual((sensor["chip_idx"], sensor["pin"], sensor["active"]), (0, 5, True))
+        self.assertEqual(self.events["barcode_scanned"][0]["barcode"], "1234567890")
+        self.assertEqual(self.events["nfc_scanned"][0]["nfc_uid"], "04A1B2C3")
+
+    def test_open_locker_is_acked_after_motor_delay(self):
+        """OPEN_LOCKER는 모터 지연 후 locker_opened로 완료"""
+        async def scenario():
+            return await self.manager.send_command_and_wait("esp32_sim_0", "OPEN_LOCKER", timeout=2.0,
+                                                            locker_id="M01")
+
+        ack = self.run_with_manager(scenario)
+        self.assertEqual(ack.status, "acked")
+        self.assertEqual(ack.response["response_type"], "locker_opened")
+        self.assertGreaterEqual(ack.rtt_ms, 50)
+        self.assertIn("open_locker", self.board.commands[-1])
+
+    def test_burst_is_fully_delivered(self):
+        """엣지 버스트가 유실 없이 센서별 순서대로 도착"""
+        async def scenario():
+            # pty 버퍼가 차면 쓰기가 막히므로 읽기 루프와 다른 스레드에서 보냄
+            sent = await asyncio.to_thread(self.board.burst, 200)
+            await self._wait_for(lambda: len(self.events["sensor_triggered"]) >= len(sent))
+            return sent
+
+        sent = self.run_with_manager(scenario)
+        received = self.events["sensor_triggered"]
+        self.assertEqual(len(received), 200)
+        first_pin = [e for e in received if (e["chip_idx"], e["pin"]) == (0, 0)]
+        self.assertEqual([e["active"] for e in first_pin], [True, False, True, False, True])
+        self.assertEqual(self.manager.get_event_stats()["dropped"], 0)
+        self.assertEqual(self.board.get_stats()["ir_events"], len(sent))
+
+
+if __name__ == '__main__':
+    unittest.main()
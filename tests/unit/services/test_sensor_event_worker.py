@@ -0,0 +1,121 @@
+"""
+센서 이벤트 워커 테스트
+
+스레드/루프 하나에서 순서대로 처리, 대기열 상한, 처리 오류 후 계속 동작, 종료 시 남은 이벤트 처리 확인
+"""
+
+import asyncio
+import threading
+import unittest
+from pathlib import Path
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.services.sensor_event_worker import SensorEventWorker
+
+
+class FakeSensorHandler:
+    """처리한 이벤트와 실행 스레드/루프를 기록하는 SensorEventHandler 대역"""
+
+    def __init__(self, delay: float = 0.0, fail_on=None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.calls = []
+
+    async def handle_sensor_event(self, sensor_num, state, timestamp=None):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if sensor_num == self.fail_on:
+            raise RuntimeError("DB 오류")
+        self.calls.append((sensor_num, state, threading.current_thread().name, id(asyncio.get_running_loop())))
+        return {'success': True, 'completed': state == 'HIGH'}
+
+
+class TestSensorEventWorker(unittest.TestCase):
+    """SensorEventWorker 테스트"""
+
+    def tearDown(self):
+        self.worker.stop()
+
+    def test_events_run_in_order_on_one_worker_loop(self):
+        """엣지가 많아도 스레드/루프는 하나, 받은 순서대로 처리"""
+        handler = FakeSensorHandler()
+        self.worker = SensorEventWorker(handler)
+        threads_before = threading.active_count()
+
+        expected = []
+        for i in range(60):
+            state = 'LOW' if i % 2 == 0 else 'HIGH'
+            expected.append((5, state))
+            self.assertTrue(self.worker.submit(5, state))
+        self.assertTrue(self.worker.drain(timeout=2.0))
+
+        self.assertEqual([(num, state) for num, state, _, _ in handler.calls], expected)
+        self.assertEqual({thread for _, _, thread, _ in handler.calls}, {"sensor-worker"})
+        self.assertEqual(len({loop for _, _, _, loop in handler.calls}), 1)
+        self.assertLessEqual(threading.active_count(), threads_before + 1)
+
+        stats = self.worker.get_stats()
+        self.assertEqual((stats["submitted"], stats["processed"], stats["completed_transactions"]), (60, 60, 30))
+        self.assertEqual(stats["pending"], 0)
+        self.assertEqual(stats["queue_lag"]["count"], 60)
+        self.assertEqual(stats["processing"]["count"], 60)
+        self.assertTrue(stats["running"])
+
+    def test_submit_from_many_threads(self):
+        """여러 생산자 스레드가 동시에 넣어도 모두 처리"""
+        handler = FakeSensorHandler()
+        self.worker = SensorEventWorker(handler)
+
+        def produce(sensor_num):
+            for _ in range(25):
+                self.worker.submit(sensor_num, 'LOW')
+
+        producers = [threading.Thread(target=produce, args=(n,)) for n in range(1, 5)]
+        for producer in producers:
+            producer.start()
+        for producer in producers:
+            producer.join()
+        self.assertTrue(self.worker.drain(timeout=2.0))
+        self.assertEqual(len(handler.calls), 100)
+
+    def test_bounded_queue_drops_and_counts(self):
+        """대기 이벤트가 상한이면 새 이벤트를 버리고 집계"""
+        self.worker = SensorEventWorker(FakeSensorHandler(delay=0.05), max_pending=3)
+
+        accepted = [self.worker.submit(7, 'LOW') for _ in range(10)]
+        self.assertEqual(accepted.count(True), 3)
+        self.assertTrue(self.worker.drain(timeout=2.0))
+
+        stats = self.worker.get_stats()
+        self.assertEqual((stats["dropped"], stats["processed"], stats["max_pending"]), (7, 3, 3))
+
+    def test_handler_error_does_not_stop_worker(self):
+        handler = FakeSensorHandler(fail_on=13)
+        self.worker = SensorEventWorker(handler)
+
+        with self.assertLogs("app.services.sensor_event_worker", "ERROR"):
+            self.worker.submit(13, 'LOW')
+            self.worker.submit(14, 'LOW')
+            self.assertTrue(self.worker.drain(timeout=2.0))
+
+        self.assertEqual([call[0] for call in handler.calls], [14])
+        self.assertEqual(self.worker.get_stats()["errors"], 1)
+
+    def test_stop_finishes_pending_then_rejects(self):
+        handler = FakeSensorHandler(delay=0.01)
+        self.worker = SensorEventWorker(handler)
+        for _ in range(5):
+            self.worker.submit(21, 'LOW')
+
+        self.worker.stop()
+        self.assertEqual(len(handler.calls), 5)
+        self.assertFalse(self.worker.get_stats()["running"])
+        self.assertFalse(self.worker.submit(21, 'HIGH'))
+
+
+if __name__ == '__main__':
+    unittest.main()